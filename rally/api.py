@@ -30,6 +30,7 @@ from rally import consts
 from rally.deployment import engine as deploy_engine
 from rally import exceptions
 from rally import osclients
+from rally.plugins.openstack.context.keystone import users as users_ctx
 from rally.task import engine
 from rally.verification.tempest import tempest
 
@@ -84,6 +85,7 @@ class Deployment(object):
             deployment["config"]["type"], deployment)
 
         tempest.Tempest(deployment["uuid"]).uninstall()
+        users_ctx.drain_pool(deployment)
         with deployer:
             deployer.make_cleanup()
             deployment.delete()
@@ -19,6 +19,7 @@ from __future__ import print_function
 import json
 import os
 import sys
+import time
 import webbrowser
 
 import jsonschema
@@ -39,8 +40,9 @@ from rally.common import utils as rutils
 from rally import consts
 from rally import exceptions
 from rally import plugins
+from rally.task import overhead as runner_overhead
+from rally.task.processing import aggregation
 from rally.task.processing import plot
-from rally.task.processing import utils
 
 
 class FailedToLoadTask(exceptions.RallyException):
@@ -275,6 +277,85 @@ class TaskCommands(object):
         print(_("Task %(task_id)s: %(status)s")
               % {"task_id": task_id, "status": task["status"]})
 
+        # NOTE: summary columns of results are written when scenarios are
+        #       finished, so they are displayed only for finished tasks
+        if task["status"] not in (consts.TaskStatus.FINISHED,
+                                  consts.TaskStatus.ABORTED):
+            return
+        for summary in objects.Task(task).get_results_summary():
+            print(_("%(name)s (args position %(pos)s): %(iterations)d "
+                    "iterations, %(failed)d failed, load duration "
+                    "%(load_duration).3f sec, SLA %(sla)s") % {
+                "name": summary["key"]["name"],
+                "pos": summary["key"]["pos"],
+                "iterations": summary["iterations_count"],
+                "failed": summary["failed_iterations_count"],
+                "load_duration": summary["load_duration"],
+                "sla": _("passed") if summary["sla_success"] else _("failed")})
+
+    @cliutils.args("--uuid", type=str, dest="task_id", help="UUID of task")
+    @cliutils.args("--interval", type=float, dest="interval", default=2.0,
+                   help="Interval in seconds between checks of updates")
+    @envutils.with_default_task_id
+    def watch(self, task_id=None, interval=2.0):
+        """Display live statistics of scenarios while the task is running.
+
+        Statistics of a scenario are printed each time the engine updates
+        them (see live_stats_interval option), raw iterations are not
+        read. Command exits when the task is finished.
+
+        :param task_id: Task uuid
+        :param interval: Interval in seconds between checks of updates
+        """
+
+        def _print_live_stats(key, live_stats, completed):
+            print("-" * 80)
+            print(_("%(name)s (args position %(pos)s): %(state)s") % {
+                "name": key["name"], "pos": key["pos"],
+                "state": _("finished") if completed else _("running")})
+            print(_("Iterations: %(iterations)d, errors: %(errors)d") %
+                  live_stats)
+            print(_("Last %(window)s sec: %(throughput).2f iterations per "
+                    "sec, error rate %(error_rate).1f%%") % {
+                        "window": live_stats["window"],
+                        "throughput": live_stats["throughput"],
+                        "error_rate": live_stats["error_rate"] * 100})
+            table_cols = ["action", "50%ile", "95%ile", "count"]
+            formatters = dict(
+                (col, cliutils.pretty_float_formatter(col, 3))
+                for col in ("50%ile", "95%ile"))
+            table_rows = [rutils.Struct(action=row["name"],
+                                        count=row["count"],
+                                        **{"50%ile": row["50%ile"],
+                                           "95%ile": row["95%ile"]})
+                          for row in live_stats["actions"]]
+            cliutils.print_list(table_rows, fields=table_cols,
+                                formatters=formatters,
+                                table_label="Response Times (sec)",
+                                sortby_index=None)
+
+        finished = (consts.TaskStatus.FINISHED, consts.TaskStatus.FAILED,
+                    consts.TaskStatus.ABORTED)
+        status = None
+        shown = {}
+        while True:
+            task = db.task_get(task_id)
+            if task["status"] != status:
+                status = task["status"]
+                print(_("Task %(task_id)s: %(status)s")
+                      % {"task_id": task_id, "status": status})
+            for result in db.task_result_get_all_by_uuid(task_id):
+                live_stats = result["data"].get("live")
+                if (not live_stats or
+                        shown.get(result["id"]) == live_stats["updated_at"]):
+                    continue
+                shown[result["id"]] = live_stats["updated_at"]
+                _print_live_stats(result["key"], live_stats,
+                                  result["data"].get("completed", True))
+            if status in finished:
+                break
+            time.sleep(interval)
+
     @cliutils.args("--uuid", type=str, dest="task_id",
                    help=("uuid of task, if --uuid is \"last\" results of most "
                          "recently created task will be displayed."))
@@ -321,9 +402,11 @@ class TaskCommands(object):
                                 formatters=formatters)
             print()
 
-        task = db.task_get_detailed(task_id)
-
-        if task is None:
+        # NOTE: results are read by Task.get_results() below, so only the
+        #       task record itself is loaded here
+        try:
+            task = db.task_get(task_id)
+        except exceptions.TaskNotFound:
             print("The task %s can not be found" % task_id)
             return(1)
 
@@ -346,7 +429,7 @@ class TaskCommands(object):
                 print(yaml.safe_load(verification[2]))
             return
 
-        for result in task["results"]:
+        for result in objects.Task(task).get_results(stream=True):
             key = result["key"]
             print("-" * 80)
             print()
@@ -355,7 +438,17 @@ class TaskCommands(object):
             print("args values:")
             print(json.dumps(key["kw"], indent=2))
 
-            raw = result["data"]["raw"]
+            # NOTE: tables are built from the summary stored when the
+            #       scenario was finished, raw iterations are read only if
+            #       they are displayed or there is no summary (e.g. it was
+            #       not stored by older versions)
+            stats = objects.Task.get_results_stats(result["id"])
+            aggregator = None
+            if iterations_data or stats is None:
+                aggregator = aggregation.ScenarioAggregator(result)
+            if stats is None:
+                stats = aggregation.ScenarioStats.from_iterations(
+                    aggregator.iterations)
             table_cols = ["action", "min", "median",
                           "90%ile", "95%ile", "max",
                           "avg", "success", "count"]
@@ -367,23 +460,8 @@ class TaskCommands(object):
                                    for col in float_cols]))
             table_rows = []
 
-            actions_data = utils.get_atomic_actions_data(raw)
-            for action in actions_data:
-                durations = actions_data[action]
-                if durations:
-                    data = [action,
-                            round(min(durations), 3),
-                            round(utils.median(durations), 3),
-                            round(utils.percentile(durations, 0.90), 3),
-                            round(utils.percentile(durations, 0.95), 3),
-                            round(max(durations), 3),
-                            round(utils.mean(durations), 3),
-                            "%.1f%%" % (len(durations) * 100.0 / len(raw)),
-                            len(raw)]
-                else:
-                    data = [action, None, None, None, None, None, None,
-                            "0.0%", len(raw)]
-                table_rows.append(rutils.Struct(**dict(zip(table_cols, data))))
+            for row in stats.atomic_actions_table():
+                table_rows.append(rutils.Struct(**dict(zip(table_cols, row))))
 
             cliutils.print_list(table_rows, fields=table_cols,
                                 formatters=formatters,
@@ -391,21 +469,26 @@ class TaskCommands(object):
                                 sortby_index=None)
 
             if iterations_data:
-                _print_iterations_data(raw)
+                _print_iterations_data(aggregator.iterations)
 
             print(_("Load duration: %s") % result["data"]["load_duration"])
             print(_("Full duration: %s") % result["data"]["full_duration"])
+            runner_stats = result["data"].get("runner_stats")
+            if runner_stats and "achieved_rps" in runner_stats:
+                print(_("Requested rps: %(rps)s, achieved rps: "
+                        "%(achieved_rps)s, missed slots: %(missed_slots)s, "
+                        "max start lag: %(max_start_lag)s") % runner_stats)
+            if runner_stats and "mean_runner_overhead" in runner_stats:
+                print(_("Runner overhead: mean %(mean_runner_overhead)s, "
+                        "max %(max_runner_overhead)s") % runner_stats)
+            if runner_stats and "keystone_cache_hits" in runner_stats:
+                print(_("Keystone client cache: hits "
+                        "%(keystone_cache_hits)s, misses "
+                        "%(keystone_cache_misses)s") % runner_stats)
 
             # NOTE(hughsaunders): ssrs=scenario specific results
-            ssrs = []
-            for result in raw:
-                data = result["scenario_output"].get("data")
-                if data:
-                    ssrs.append(data)
+            ssrs = stats.output_stats_table()
             if ssrs:
-                keys = set()
-                for ssr in ssrs:
-                    keys.update(ssr.keys())
                 headers = ["key", "min", "median",
                            "90%ile", "95%ile", "max",
                            "avg"]
@@ -414,31 +497,21 @@ class TaskCommands(object):
                 formatters = dict(zip(float_cols,
                                   [cliutils.pretty_float_formatter(col, 3)
                                    for col in float_cols]))
-                table_rows = []
-                for key in keys:
-                    values = [float(ssr[key]) for ssr in ssrs if key in ssr]
-
-                    if values:
-                        row = [str(key),
-                               round(min(values), 3),
-                               round(utils.median(values), 3),
-                               round(utils.percentile(values, 0.90), 3),
-                               round(utils.percentile(values, 0.95), 3),
-                               round(max(values), 3),
-                               round(utils.mean(values), 3)]
-                    else:
-                        row = [str(key)] + ["n/a"] * 6
-                    table_rows.append(rutils.Struct(**dict(zip(headers, row))))
+                table_rows = [rutils.Struct(**dict(zip(headers, row)))
+                              for row in ssrs]
                 print("\nScenario Specific Results\n")
                 cliutils.print_list(table_rows,
                                     fields=headers,
                                     formatters=formatters,
                                     table_label="Response Times (sec)")
 
-                for result in raw:
-                    errors = result["scenario_output"].get("errors")
-                    if errors:
+                if aggregator is not None:
+                    for idx, errors in aggregator.output_errors():
                         print(errors)
+                elif stats.output_errors_count:
+                    print(_("Scenario output errors in %d iterations, run "
+                            "with --iterations-data to see them")
+                          % stats.output_errors_count)
 
         print()
         print("HINTS:")
@@ -487,9 +560,15 @@ class TaskCommands(object):
                    " Available statuses: %s" % ", ".join(consts.TaskStatus))
     @cliutils.args("--uuids-only", action="store_true",
                    dest="uuids_only", help="List task UUIDs only")
+    @cliutils.args("--limit", type=int, dest="limit",
+                   help="List only specified number of the most recently "
+                        "created tasks")
+    @cliutils.args("--marker", type=str, dest="marker",
+                   help="List tasks created before the task with "
+                        "specified UUID")
     @envutils.with_default_deployment(cli_arg_name="deployment")
     def list(self, deployment=None, all_deployments=False, status=None,
-             uuids_only=False):
+             uuids_only=False, limit=None, marker=None):
         """List tasks, started and finished.
 
         Displayed tasks could be filtered by status or deployment.
@@ -500,6 +579,10 @@ class TaskCommands(object):
             Available task statuses are in rally.consts.TaskStatus
         :param all_deployments: display tasks from all deployments
         :param uuids_only: list task UUIDs only
+        :param limit: list only specified number of the most recently
+                      created tasks
+        :param marker: list tasks created before the task with specified
+                       UUID, e.g. the first task of the previous page
         """
 
         filters = {}
@@ -517,6 +600,10 @@ class TaskCommands(object):
 
         if not all_deployments:
             filters.setdefault("deployment", deployment)
+        if limit is not None:
+            filters["limit"] = limit
+        if marker is not None:
+            filters["marker"] = marker
 
         task_list = [task.to_dict() for task in objects.Task.list(**filters)]
 
@@ -541,6 +628,119 @@ class TaskCommands(object):
                 print(_("There are no tasks. To run a new task, use:\n"
                         "\trally task start"))
 
+    @cliutils.args("--task", "--filename", dest="task",
+                   help="Path to the input task file with Dummy scenarios. "
+                        "The built-in runner overhead suite is used by "
+                        "default.")
+    @cliutils.args("--task-args", dest="task_args",
+                   help="Input task args (dict in json). These args are used "
+                        "to render input task that is jinja2 template.")
+    @cliutils.args("--task-args-file", dest="task_args_file",
+                   help="Path to the file with input task args (dict in "
+                        "json/yaml). These args are used to render input "
+                        "task that is jinja2 template.")
+    @cliutils.args("--iterations", type=int, dest="iterations",
+                   default=runner_overhead.ITERATIONS,
+                   help="Number of iterations of serial and constant "
+                        "runners in the built-in suite")
+    @cliutils.args("--duration", type=int, dest="duration",
+                   default=runner_overhead.DURATION,
+                   help="Duration in seconds of constant_for_duration and "
+                        "rps workloads in the built-in suite")
+    @cliutils.args("--baseline", type=str, dest="baseline",
+                   help="Path to the json output of previous run. Return "
+                        "non-zero code if any runner became slower.")
+    @cliutils.args("--tolerance", type=float, dest="tolerance", default=0.2,
+                   help="Allowed relative decrease of iterations per second "
+                        "comparing to baseline")
+    @cliutils.args("--json", dest="tojson", action="store_true",
+                   help="Output in json format")
+    @plugins.ensure_plugins_are_loaded
+    def overhead(self, task=None, task_args=None, task_args_file=None,
+                 iterations=runner_overhead.ITERATIONS,
+                 duration=runner_overhead.DURATION,
+                 baseline=None, tolerance=0.2, tojson=False):
+        """Measure the load which Rally itself is able to generate.
+
+        Dummy scenarios are run with each scenario runner at increasing
+        concurrency without deployment, so the max achieved iterations
+        per second, scheduling delays, CPU usage of rally process and its
+        memory growth show the overhead of the engine.
+
+        :param task: a file with yaml/json task with Dummy scenarios
+        :param task_args: Input task args (dict in json/yaml). These args are
+                          used to render input task that is jinja2 template.
+        :param task_args_file: File with input task args (dict in json/yaml).
+                               These args are used to render input task that
+                               is jinja2 template.
+        :param iterations: number of iterations of serial and constant
+                           runners in the built-in suite
+        :param duration: duration of constant_for_duration and rps
+                         workloads in the built-in suite
+        :param baseline: json output of previous run to compare with
+        :param tolerance: allowed relative decrease of iterations per second
+        :param tojson: output results in json format
+        """
+        try:
+            if task:
+                config = self._load_task(task, task_args, task_args_file)
+            else:
+                config = runner_overhead.default_suite(iterations, duration)
+            results = runner_overhead.run(config)
+        except (exceptions.InvalidTaskException, FailedToLoadTask) as e:
+            print(e, file=sys.stderr)
+            return(1)
+
+        if tojson:
+            print(json.dumps(results, sort_keys=True, indent=4))
+        else:
+            cols = ["runner", "load", "iterations", "errors",
+                    "iterations_per_sec", "delay_mean", "delay_95",
+                    "delay_max", "parent_cpu_percent", "workers_cpu",
+                    "memory"]
+            labels = ["runner", "load", "iterations", "errors", "iter/sec",
+                      "delay avg", "delay 95%ile", "delay max",
+                      "parent CPU %", "workers CPU (sec)", "KiB/1k iter"]
+            float_cols = cols[4:]
+            formatters = dict(zip(float_cols,
+                                  [cliutils.pretty_float_formatter(col, 4)
+                                   for col in float_cols]))
+            rows = []
+            for workload in results["workloads"]:
+                conf = workload["runner"]
+                load = ", ".join("%s=%s" % (k, v)
+                                 for k, v in sorted(six.iteritems(conf))
+                                 if k != "type")
+                delay = workload["scheduling_delay"]
+                rows.append(rutils.Struct(**dict(zip(cols, [
+                    conf["type"], load, workload["iterations"],
+                    workload["errors"], workload["iterations_per_sec"],
+                    delay["mean"], delay["95%ile"], delay["max"],
+                    workload["parent_cpu_percent"], workload["workers_cpu"],
+                    workload["memory_kb_per_1k_iterations"]]))))
+            cliutils.print_list(rows, fields=cols, field_labels=labels,
+                                formatters=formatters,
+                                table_label="Runner overhead",
+                                sortby_index=None)
+            for runner_type, ips in sorted(
+                    six.iteritems(results["summary"])):
+                print(_("Max iterations per second of %(runner)s runner: "
+                        "%(ips).1f") % {"runner": runner_type, "ips": ips})
+
+        if baseline:
+            with open(os.path.expanduser(baseline)) as f:
+                regressions = runner_overhead.find_regressions(
+                    results, json.load(f), tolerance)
+            for runner_type, expected, actual in regressions:
+                print(_("Regression of %(runner)s runner: %(actual).1f "
+                        "iterations per second, baseline is "
+                        "%(expected).1f") % {"runner": runner_type,
+                                             "actual": actual,
+                                             "expected": expected},
+                      file=sys.stderr)
+            if regressions:
+                return(1)
+
     @cliutils.args("--tasks", dest="tasks", nargs="+",
                    help="uuids of tasks or json files with task results")
     @cliutils.args("--out", type=str, dest="out", required=True,
@@ -553,6 +753,11 @@ class TaskCommands(object):
     @cliutils.args("--junit", dest="out_format",
                    action="store_const", const="junit",
                    help="Generate the report in the JUnit format.")
+    @cliutils.args("--trends", dest="out_format",
+                   action="store_const", const="trends",
+                   help="Generate the HTML report with trends of scenarios "
+                        "across the tasks, only UUIDs of tasks are "
+                        "accepted.")
     @envutils.default_from_global("tasks", envutils.ENV_TASK, "--uuid")
     @cliutils.suppress_warnings
     def report(self, tasks=None, out=None, open_it=False, out_format="html"):
@@ -562,11 +767,31 @@ class TaskCommands(object):
         :param tasks: list, UUIDs od tasks or pathes files with tasks results
         :param out: str, output file name
         :param open_it: bool, whether to open output file in web browser
-        :param out_format: output format (junit or html)
+        :param out_format: output format (junit, html or trends)
         """
 
         tasks = isinstance(tasks, list) and tasks or [tasks]
 
+        if out_format == "trends":
+            # NOTE: trends are built from aggregates stored with results,
+            #       raw iterations are not read
+            tasks_results = []
+            for task_id in tasks:
+                if not uuidutils.is_uuid_like(task_id):
+                    print(_("ERROR: Invalid UUID passed: %s, trends are "
+                            "built from tasks stored in the database"
+                            ) % task_id, file=sys.stderr)
+                    return 1
+                task = objects.Task.get(task_id)
+                tasks_results.append((task, task.get_results_aggregates()))
+            tasks_results.sort(key=lambda t: t[0]["created_at"])
+
+            with open(os.path.expanduser(out), "w+") as f:
+                f.write(plot.trends(tasks_results))
+            if open_it:
+                webbrowser.open_new_tab("file://" + os.path.realpath(out))
+            return
+
         results = []
         message = []
         processed_names = {}
@@ -592,8 +817,11 @@ class TaskCommands(object):
                                "sla": x["data"]["sla"],
                                "result": x["data"]["raw"],
                                "load_duration": x["data"]["load_duration"],
-                               "full_duration": x["data"]["full_duration"]},
-                    objects.Task.get(task_file_or_uuid).get_results())
+                               "full_duration": x["data"]["full_duration"],
+                               "stats": objects.Task.get_results_stats(
+                                   x["id"])},
+                    objects.Task.get(task_file_or_uuid).get_results(
+                        stream=True))
             else:
                 print(_("ERROR: Invalid UUID or file name passed: %s"
                         ) % task_file_or_uuid,
@@ -673,7 +901,7 @@ class TaskCommands(object):
         :param task_id: Task uuid.
         :returns: Number of failed criteria.
         """
-        results = objects.Task.get(task_id).get_results()
+        results = objects.Task.get(task_id).get_results(stream=True)
         failed_criteria = 0
         data = []
         STATUS_PASS = "PASS"
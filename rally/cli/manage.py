@@ -22,6 +22,11 @@ import sys
 from rally.cli import cliutils
 from rally.cli import envutils
 from rally.common import db
+from rally.common.db.sqlalchemy import benchmark
+from rally.common.i18n import _
+from rally.common import utils as rutils
+from rally import plugins
+from rally.task import distributed
 
 
 class DBCommands(object):
@@ -32,9 +37,77 @@ class DBCommands(object):
         db.db_create()
         envutils.clear_env()
 
+    @cliutils.args("--batch-size", type=int, dest="batch_size", default=100,
+                   help="Number of records rewritten in one transaction.")
+    def reencode(self, batch_size=100):
+        """Rewrite stored task results with the configured encoding.
+
+        Results are read in any encoding, so it is needed only to convert
+        results stored before database.results_encoding was changed, e.g.
+        to reclaim space after switching to msgpack_zlib.
+
+        :param batch_size: number of records rewritten in one transaction
+        """
+        count = db.task_results_reencode(batch_size=batch_size)
+        print(_("%d records with task results are rewritten.") % count)
+
+    @cliutils.args("--iterations", type=int, dest="iterations",
+                   default=benchmark.ITERATIONS,
+                   help="Number of stored iterations.")
+    @cliutils.args("--chunk-size", type=int, dest="chunk_size",
+                   default=benchmark.CHUNK_SIZE,
+                   help="Number of iterations in a stored chunk.")
+    def benchmark(self, iterations=benchmark.ITERATIONS,
+                  chunk_size=benchmark.CHUNK_SIZE):
+        """Compare encodings of stored task results.
+
+        Synthetic iterations are stored to and loaded from a temporary
+        SQLite database with every available combination of
+        database.results_encoding and database.json_backend options.
+
+        :param iterations: number of stored iterations
+        :param chunk_size: number of iterations in a stored chunk
+        """
+        rows = [rutils.Struct(**r) for r in benchmark.run(
+            iterations=iterations, chunk_size=chunk_size)]
+        formatters = {
+            "store": lambda r: "%.2f" % r.store,
+            "load": lambda r: "%.2f" % r.load,
+            "size": lambda r: "%.1f" % (r.size / 1024.0 / 1024.0)}
+        cliutils.print_list(
+            rows, ["results_encoding", "json_backend", "store", "load",
+                   "size"],
+            formatters=formatters, sortby_index=None,
+            field_labels=["Results encoding", "JSON backend",
+                          "Store (sec)", "Load (sec)", "Size (MB)"])
+
+
+class WorkerCommands(object):
+    """Commands for workers of distributed load generation."""
+
+    @cliutils.args("--hostname", type=str, dest="hostname",
+                   help="Name of the worker, hostname is used by default. "
+                        "It should be unique, so set it to run several "
+                        "workers on one host.")
+    @plugins.ensure_plugins_are_loaded
+    def start(self, hostname=None):
+        """Run iterations of scenarios with the distributed runner.
+
+        The worker registers itself in the database and runs chunks of
+        iterations given by the distributed runner of any task until it is
+        interrupted.
+
+        :param hostname: name of the worker
+        """
+        worker = distributed.Worker(hostname)
+        try:
+            worker.run()
+        except KeyboardInterrupt:
+            worker.stop()
+
 
 def main():
-    categories = {"db": DBCommands}
+    categories = {"db": DBCommands, "worker": WorkerCommands}
     cliutils.run(sys.argv, categories)
 
 
@@ -12,59 +12,178 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
-
-import collections
+import os
 import threading
 import time
 
+from six.moves import queue as Queue
+
 from rally.common.i18n import _
 from rally.common import log as logging
 
 
 LOG = logging.getLogger(__name__)
 
+# NOTE: publisher is blocked while there are this many jobs per consumer
+#       in the queue
+QUEUE_SIZE_PER_CONSUMER = 10
+
+_STOP = object()
+
+
+class JobQueue(object):
+    """Bounded blocking queue of jobs that is passed to publish().
+
+    Publisher is blocked in append() while the queue is full, so it doesn't
+    get far ahead of consumers. Jobs appended after cancellation are dropped.
+    """
+
+    def __init__(self, maxsize=0, cancelled=None):
+        self._queue = Queue.Queue(maxsize)
+        self.cancelled = cancelled or threading.Event()
+        self.published = 0
+
+    def append(self, job):
+        if not self.cancelled.is_set():
+            self._queue.put(job)
+            self.published += 1
+
+    def extend(self, jobs):
+        for job in jobs:
+            self.append(job)
+
+    def get(self):
+        return self._queue.get()
+
+    def close(self, consumers_count):
+        """Stop consumers once they process all published jobs."""
+        for i in range(consumers_count):
+            self._queue.put(_STOP)
+
+
+class _Stats(object):
+    """Thread-safe statistics of consumed jobs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.consumed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+
+    def add(self, duration=None, failed=False, cancelled=False):
+        with self._lock:
+            if cancelled:
+                self.cancelled += 1
+                return
+            self.consumed += 1
+            if failed:
+                self.failed += 1
+            self.total_duration += duration
+            self.max_duration = max(self.max_duration, duration)
+
+
+class _WorkerPool(object):
+    """Pool of reusable threads.
+
+    A thread that finished its function waits IDLE_TIMEOUT seconds for the
+    next one before exiting, so consequent broker runs don't start new
+    threads.
+    """
+
+    IDLE_TIMEOUT = 60
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._idle = []
+
+    def _work(self, inbox):
+        while True:
+            try:
+                func, args, done = inbox.get(timeout=self.IDLE_TIMEOUT)
+            except Queue.Empty:
+                with self._lock:
+                    if inbox in self._idle:
+                        self._idle.remove(inbox)
+                        return
+                # NOTE: the thread was taken by spawn(), the job is coming
+                continue
+            try:
+                func(*args)
+            finally:
+                with self._lock:
+                    self._idle.append(inbox)
+                done.set()
+
+    def spawn(self, func, *args):
+        """Call func(*args) in a pool thread.
+
+        :returns: threading.Event which is set when func returns
+        """
+        done = threading.Event()
+        with self._lock:
+            inbox = self._idle.pop() if self._idle else None
+        if inbox is None:
+            inbox = Queue.Queue()
+            thread = threading.Thread(target=self._work, args=(inbox,))
+            thread.daemon = True
+            thread.start()
+        inbox.put((func, args, done))
+        return done
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
 
-def _consumer(consume, queue, is_published):
-    """Infinity worker that consumes tasks from queue.
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        # NOTE: threads don't survive fork, so forked process needs own pool
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = _WorkerPool()
+        return _pool
 
-    This finishes it's work only in case if is_published.isSet().
+
+def _consumer(consume, queue, stats):
+    """Worker that consumes jobs from queue until it gets stop signal.
 
     :param consume: method that consumes an object removed from the queue
-    :param queue: deque object to popleft() objects from
-    :param is_published: threading.Event that is used to stop the consumer
-                         when the queue is empty
+    :param queue: JobQueue object to get objects from
+    :param stats: _Stats object to store duration and result of each job
     """
     cache = {}
     while True:
-        if not queue:
-            if is_published.isSet():
-                break
-            time.sleep(0.1)
+        args = queue.get()
+        if args is _STOP:
+            break
+        if queue.cancelled.is_set():
+            stats.add(cancelled=True)
             continue
-        else:
-            try:
-                args = queue.popleft()
-            except IndexError:
-                # consumed by other thread
-                continue
+
+        started = time.time()
         try:
             consume(cache, args)
         except Exception as e:
+            stats.add(time.time() - started, failed=True)
             LOG.warning(_("Failed to consume a task from the queue: %s") % e)
             if logging.is_debug():
                 LOG.exception(e)
+        else:
+            stats.add(time.time() - started)
 
 
-def _publisher(publish, queue, is_published):
+def _publisher(publish, queue, consumers_count):
     """Calls a publish method that fills queue with jobs.
 
-    After running publish method it sets is_published variable, that is used to
-    stop workers (consumers).
+    After running publish method it sends stop signal to consumers, so they
+    finish when the queue is processed.
 
     :param publish: method that fills the queue
-    :param queue: deque object to be filled by the publish() method
-    :param is_published: threading.Event that is used to stop consumers and
-                         finish task
+    :param queue: JobQueue object to be filled by the publish() method
+    :param consumers_count: number of consumers to stop
     """
     try:
         publish(queue)
@@ -73,31 +192,50 @@ def _publisher(publish, queue, is_published):
         if logging.is_debug():
             LOG.exception(e)
     finally:
-        is_published.set()
+        queue.close(consumers_count)
 
 
-def run(publish, consume, consumers_count=1):
+def run(publish, consume, consumers_count=1, queue_size=None,
+        cancelled=None):
     """Run broker.
 
     publish() put to queue, consume() process one element from queue.
 
     When publish() is finished and elements from queue are processed process
-    is finished all consumers threads are cleaned.
+    is finished. Consumers are run in reusable threads of a pool shared by
+    all brokers of the process.
 
     :param publish: Function that puts values to the queue
     :param consume: Function that processes a single value from the queue
     :param consumers_count: Number of consumers
+    :param queue_size: Max number of not consumed values in the queue,
+                       publish() is blocked while the queue is full. By
+                       default QUEUE_SIZE_PER_CONSUMER per consumer
+    :param cancelled: threading.Event, when it is set values which are not
+                      consumed yet are dropped
+    :returns: dict with statistics: numbers of published, consumed, failed
+              and cancelled values, duration of the run and mean and max
+              duration of consume() calls
     """
-    queue = collections.deque()
-    is_published = threading.Event()
+    if queue_size is None:
+        queue_size = consumers_count * QUEUE_SIZE_PER_CONSUMER
+    queue = JobQueue(queue_size, cancelled=cancelled)
+    stats = _Stats()
+    started = time.time()
 
-    consumers = []
-    for i in range(consumers_count):
-        consumer = threading.Thread(target=_consumer,
-                                    args=(consume, queue, is_published))
-        consumer.start()
-        consumers.append(consumer)
+    pool = _get_pool()
+    consumers = [pool.spawn(_consumer, consume, queue, stats)
+                 for i in range(consumers_count)]
 
-    _publisher(publish, queue, is_published)
+    _publisher(publish, queue, consumers_count)
     for consumer in consumers:
-        consumer.join()
+        consumer.wait()
+
+    return {"published": queue.published,
+            "consumed": stats.consumed,
+            "failed": stats.failed,
+            "cancelled": stats.cancelled,
+            "duration": time.time() - started,
+            "mean_job_duration": (stats.total_duration / stats.consumed
+                                  if stats.consumed else None),
+            "max_job_duration": stats.max_duration}
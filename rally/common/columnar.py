@@ -0,0 +1,159 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compact in-memory storage of scenario iterations."""
+
+import array
+import math
+
+from rally.common import costilius
+
+
+_MISSING = float("nan")
+# NOTE: atomic action durations may be None (e.g. for failed actions), this
+#       value can't be a real duration so it is used to keep None in a column
+_NONE = float("-inf")
+
+_BASE_FIELDS = ("duration", "idle_duration", "timestamp")
+
+
+def _to_float(value):
+    return _NONE if value is None else float(value)
+
+
+def _from_float(value):
+    return None if value == _NONE else value
+
+
+class ColumnarIterations(object):
+    """Column-oriented container of scenario iterations.
+
+    Each iteration produced by a runner is a dict with several numeric
+    values, an OrderedDict of atomic actions, scenario output and error.
+    Keeping thousands of such dicts in memory is expensive, so this
+    container stores numeric values in parallel array('d') columns:
+
+        * duration, idle_duration and timestamp columns
+        * a column per atomic action name (names are stored once)
+        * a column per any other numeric value of iteration
+          (like runner_overhead or start_lag)
+
+    Errors and non-empty scenario outputs are stored sparsely, by index of
+    iteration. Iteration dicts are rebuilt on access, so the container can
+    be used everywhere a list of iterations is expected for reading.
+    """
+
+    def __init__(self, iterations=None):
+        self._count = 0
+        self.columns = dict((name, array.array("d"))
+                            for name in _BASE_FIELDS)
+        self.extra = costilius.OrderedDict()
+        self.atomic = costilius.OrderedDict()
+        self.errors = {}
+        self.outputs = {}
+        for iteration in iterations or []:
+            self.append(iteration)
+
+    def __len__(self):
+        return self._count
+
+    def _add_column(self, columns, name):
+        if name not in columns:
+            columns[name] = array.array("d", [_MISSING] * self._count)
+        return columns[name]
+
+    def append(self, iteration):
+        """Add iteration to the container.
+
+        :param iteration: dict in ScenarioRunnerResult format
+        """
+        for name in _BASE_FIELDS:
+            self.columns[name].append(_to_float(iteration[name]))
+
+        for name, value in iteration.items():
+            if name in _BASE_FIELDS or not isinstance(value, (int, float)):
+                continue
+            self._add_column(self.extra, name)
+        for name, column in self.extra.items():
+            column.append(_to_float(iteration.get(name, _MISSING)))
+
+        actions = iteration["atomic_actions"]
+        for name in actions:
+            self._add_column(self.atomic, name)
+        for name, column in self.atomic.items():
+            column.append(_to_float(actions.get(name, _MISSING)))
+
+        if iteration["error"]:
+            self.errors[self._count] = iteration["error"]
+        output = iteration["scenario_output"]
+        if output["data"] or output["errors"]:
+            self.outputs[self._count] = output
+
+        self._count += 1
+
+    def extend(self, iterations):
+        for iteration in iterations:
+            self.append(iteration)
+
+    @property
+    def failed(self):
+        """Number of iterations with errors."""
+        return len(self.errors)
+
+    def column(self, name):
+        """Return column of the base value (e.g. duration) as array."""
+        return self.columns[name]
+
+    def atomic_column(self, name):
+        """Return durations of atomic action.
+
+        Iterations where the action was not executed have NaN value.
+        """
+        return self.atomic[name]
+
+    def atomic_values(self, name):
+        """Return list of durations of atomic action.
+
+        Iterations where the action was not executed or has no duration
+        (None) are skipped.
+        """
+        return [value for value in self.atomic[name]
+                if not math.isnan(value) and value != _NONE]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Iteration index out of range")
+
+        iteration = {"error": self.errors.get(index, []),
+                     "scenario_output": self.outputs.get(
+                         index, {"data": {}, "errors": ""})}
+        for name in _BASE_FIELDS:
+            iteration[name] = _from_float(self.columns[name][index])
+        for name, column in self.extra.items():
+            if not math.isnan(column[index]):
+                iteration[name] = _from_float(column[index])
+
+        actions = costilius.OrderedDict()
+        for name, column in self.atomic.items():
+            if not math.isnan(column[index]):
+                actions[name] = _from_float(column[index])
+        iteration["atomic_actions"] = actions
+        return iteration
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
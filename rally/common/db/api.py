@@ -149,17 +149,29 @@ def task_update_status(task_uuid, status, allowed_statuses):
                                          status)
 
 
-def task_list(status=None, deployment=None):
+def task_list(status=None, deployment=None, limit=None, marker=None):
     """Get a list of tasks.
 
+    Tasks are ordered by creation time. Verification log is not loaded,
+    but name of the deployment is available as "deployment_name" of each
+    task, it is None if the deployment doesn't exist.
+
     :param status: Task status to filter the returned list on. If set to
                    None, all the tasks will be returned.
     :param deployment_id: deployment UUID to filter the returned list on.
                       if set to None tasks from all deployments well be
                       returned.
+    :param limit: maximum number of the most recently created tasks to
+                  return, all tasks are returned if it is None.
+    :param marker: UUID of the task, only tasks created before it are
+                   returned, usually it is the first task of the previous
+                   page.
+    :raises: :class:`rally.exceptions.TaskNotFound` if the marker task
+             does not exist.
     :returns: A list of dicts with data on the tasks.
     """
-    return get_impl().task_list(status=status, deployment=deployment)
+    return get_impl().task_list(status=status, deployment=deployment,
+                                limit=limit, marker=marker)
 
 
 def task_delete(uuid, status=None):
@@ -186,6 +198,18 @@ def task_result_get_all_by_uuid(task_uuid):
     return get_impl().task_result_get_all_by_uuid(task_uuid)
 
 
+def task_result_summary_get_all(task_uuid):
+    """Get list of summaries of task results.
+
+    Only key and summary columns of the results are loaded, data of the
+    results (which may be huge) is not.
+
+    :param task_uuid: string with UUID of Task instance.
+    :returns: list instances of TaskResult.
+    """
+    return get_impl().task_result_summary_get_all(task_uuid)
+
+
 def task_result_create(task_uuid, key, data):
     """Append result record to task.
 
@@ -197,6 +221,88 @@ def task_result_create(task_uuid, key, data):
     return get_impl().task_result_create(task_uuid, key, data)
 
 
+def task_result_update(result_id, data, summary=None):
+    """Update data of task result record.
+
+    :param result_id: int ID of TaskResult instance.
+    :param data: new data of task result.
+    :param summary: dict with new values of summary columns of task result
+                    (iterations_count, failed_iterations_count,
+                    load_duration, full_duration, sla_success).
+    :raises: :class:`rally.exceptions.NotFoundException` if the task result
+             does not exist.
+    :returns: TaskResult instance updated.
+    """
+    return get_impl().task_result_update(result_id, data, summary=summary)
+
+
+def task_result_chunk_create(task_uuid, result_id, position, data):
+    """Store a chunk of raw iterations of task result.
+
+    :param task_uuid: string with UUID of Task instance.
+    :param result_id: int ID of TaskResult instance.
+    :param position: int number of the chunk within the task result.
+    :param data: list of iterations.
+    :returns: TaskResultChunk instance created.
+    """
+    return get_impl().task_result_chunk_create(task_uuid, result_id,
+                                               position, data)
+
+
+def task_result_chunk_get_all(result_id):
+    """Get chunks of raw iterations of task result.
+
+    Chunks are read from the DB one by one while the returned generator is
+    consumed.
+
+    :param result_id: int ID of TaskResult instance.
+    :returns: generator of lists of iterations, ordered by chunk position.
+    """
+    return get_impl().task_result_chunk_get_all(result_id)
+
+
+def task_result_stats_create(task_uuid, result_id, rows):
+    """Store rows of the summary of task result.
+
+    :param task_uuid: string with UUID of Task instance.
+    :param result_id: int ID of TaskResult instance.
+    :param rows: list of dicts with position, kind, name, count, errors,
+                 min_value, max_value, mean, stddev and sketch of each row.
+    """
+    return get_impl().task_result_stats_create(task_uuid, result_id, rows)
+
+
+def task_result_stats_get_all(result_id):
+    """Get rows of the summary of task result ordered by position.
+
+    :param result_id: int ID of TaskResult instance.
+    :returns: list of TaskResultStats instances.
+    """
+    return get_impl().task_result_stats_get_all(result_id)
+
+
+def task_result_stats_get_all_by_uuid(uuid):
+    """Get rows of summaries of all results of the task.
+
+    :param uuid: UUID of the task.
+    :returns: list of TaskResultStats instances ordered by result ID and
+              position.
+    """
+    return get_impl().task_result_stats_get_all_by_uuid(uuid)
+
+
+def task_results_reencode(batch_size=100):
+    """Rewrite all stored task results with the current encoding.
+
+    Results are loaded in any encoding, so it is needed only to convert
+    already stored results after database.results_encoding is changed.
+
+    :param batch_size: number of records rewritten in one transaction.
+    :returns: number of rewritten records.
+    """
+    return get_impl().task_results_reencode(batch_size=batch_size)
+
+
 def deployment_create(values):
     """Create a deployment from the values dictionary.
 
@@ -287,6 +393,163 @@ def resource_delete(id):
     return get_impl().resource_delete(id)
 
 
+def pooled_tenant_create(values):
+    """Add a tenant to the users pool of a deployment.
+
+    :param values: dict with record values, it should contain
+                   deployment_uuid, tenant_id, kind and data.
+    :returns: PooledTenant instance created.
+    """
+    return get_impl().pooled_tenant_create(values)
+
+
+def pooled_tenant_get_all(deployment_uuid, lessee=None):
+    """Get tenants of the users pool of a deployment.
+
+    :param deployment_uuid: string with UUID of Deployment instance.
+    :param lessee: return only tenants leased by this task UUID.
+    :returns: list of PooledTenant instances.
+    """
+    return get_impl().pooled_tenant_get_all(deployment_uuid, lessee=lessee)
+
+
+def pooled_tenant_lease(deployment_uuid, kind, lessee, count):
+    """Lease free tenants of the users pool of a deployment.
+
+    Each tenant is leased atomically, so concurrent tasks never get the same
+    tenant.
+
+    :param deployment_uuid: string with UUID of Deployment instance.
+    :param kind: string, lease only tenants of this kind.
+    :param lessee: string with UUID of the task that leases tenants.
+    :param count: max number of tenants to lease.
+    :returns: list of leased PooledTenant instances, it may be shorter than
+              count if there are not enough free tenants.
+    """
+    return get_impl().pooled_tenant_lease(deployment_uuid, kind, lessee,
+                                          count)
+
+
+def pooled_tenant_release(lessee):
+    """Return all tenants leased by the task to the pool.
+
+    :param lessee: string with UUID of the task.
+    :returns: number of released tenants.
+    """
+    return get_impl().pooled_tenant_release(lessee)
+
+
+def pooled_tenant_release_stale(deployment_uuid):
+    """Return tenants leased by tasks which are not running to the pool.
+
+    Tenants are left leased if a task dies before the users context is
+    cleaned up, so they are released once the task is finished, failed,
+    aborted or deleted.
+
+    :param deployment_uuid: string with UUID of Deployment instance.
+    :returns: number of released tenants.
+    """
+    return get_impl().pooled_tenant_release_stale(deployment_uuid)
+
+
+def pooled_tenant_delete(id):
+    """Remove a tenant from the users pool.
+
+    :param id: int ID of PooledTenant instance.
+    :raises: :class:`rally.exceptions.ResourceNotFound` if the tenant does
+             not exist.
+    """
+    return get_impl().pooled_tenant_delete(id)
+
+
+def distributed_chunks_create(task_uuid, workload_id, data, ranges):
+    """Create chunks of iterations of a distributed workload.
+
+    :param task_uuid: string with UUID of Task instance.
+    :param workload_id: string with ID shared by all chunks of the workload.
+    :param data: dict with the workload description for workers.
+    :param ranges: list of (start, count) tuples of iteration ranges.
+    :returns: list of created DistributedChunk instances.
+    """
+    return get_impl().distributed_chunks_create(task_uuid, workload_id,
+                                                data, ranges)
+
+
+def distributed_chunk_get_all(workload_id):
+    """Get all chunks of a distributed workload.
+
+    :param workload_id: string with ID of the workload.
+    :returns: list of DistributedChunk instances ordered by ID.
+    """
+    return get_impl().distributed_chunk_get_all(workload_id)
+
+
+def distributed_chunk_claim(worker):
+    """Take the oldest pending chunk to run it on the worker.
+
+    Each chunk is claimed atomically, so it is never run by two workers.
+
+    :param worker: string with hostname of the worker.
+    :returns: claimed DistributedChunk instance or None if there are no
+              pending chunks.
+    """
+    return get_impl().distributed_chunk_claim(worker)
+
+
+def distributed_chunk_update(chunk_id, values, statuses=None, worker=None):
+    """Update a chunk if it is in one of the given statuses.
+
+    :param chunk_id: int ID of DistributedChunk instance.
+    :param values: dict with values to update.
+    :param statuses: update only if the chunk has one of these statuses.
+    :param worker: update only if the chunk is claimed by this worker.
+    :returns: True if the chunk is updated.
+    """
+    return get_impl().distributed_chunk_update(chunk_id, values,
+                                               statuses=statuses,
+                                               worker=worker)
+
+
+def distributed_chunks_abort(workload_id):
+    """Abort pending chunks and ask workers to abort running chunks.
+
+    :param workload_id: string with ID of the workload.
+    """
+    return get_impl().distributed_chunks_abort(workload_id)
+
+
+def distributed_result_create(chunk_id, worker, sent_at, data):
+    """Store a batch of iteration results of a chunk.
+
+    :param chunk_id: int ID of DistributedChunk instance.
+    :param worker: string with hostname of the worker.
+    :param sent_at: float time of the worker host when the batch is sent.
+    :param data: list of iteration results.
+    :returns: DistributedResult instance created.
+    :raises: :class:`rally.exceptions.ResourceNotFound` if the chunk does
+             not exist.
+    """
+    return get_impl().distributed_result_create(chunk_id, worker, sent_at,
+                                                data)
+
+
+def distributed_results_pop(workload_id):
+    """Get and delete all stored batches of results of a workload.
+
+    :param workload_id: string with ID of the workload.
+    :returns: list of DistributedResult instances ordered by ID.
+    """
+    return get_impl().distributed_results_pop(workload_id)
+
+
+def distributed_workload_delete(workload_id):
+    """Delete all chunks and results of a distributed workload.
+
+    :param workload_id: string with ID of the workload.
+    """
+    return get_impl().distributed_workload_delete(workload_id)
+
+
 def verification_create(deployment_uuid):
     """Create Verification record in DB.
 
@@ -21,11 +21,13 @@ from oslo_db import exception as db_exc
 from oslo_db.sqlalchemy import session as db_session
 from oslo_utils import timeutils
 import sqlalchemy as sa
+from sqlalchemy.orm import attributes as sa_attributes
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm import load_only as sa_loadonly
 
 from rally.common.db.sqlalchemy import models
 from rally.common.i18n import _
+from rally import consts
 from rally import exceptions
 
 
@@ -150,19 +152,38 @@ class Connection(object):
             raise exceptions.RallyException(msg)
         return query
 
-    def task_list(self, status=None, deployment=None):
-        query = self.model_query(models.Task)
+    def task_list(self, status=None, deployment=None, limit=None,
+                  marker=None):
+        # NOTE: verification_log may be huge and it is not needed in the
+        #       list, name of the deployment is fetched by the same query
+        #       instead of reading the deployment for each task. Tasks are
+        #       selected from the most recent one, so a page contains the
+        #       newest tasks, but they are returned in order of creation.
+        query = (self.model_query(models.Task).
+                 options(sa.orm.defer("verification_log")).
+                 outerjoin(models.Deployment,
+                           models.Task.deployment_uuid ==
+                           models.Deployment.uuid).
+                 add_columns(models.Deployment.name).
+                 order_by(models.Task.id.desc()))
 
-        filters = {}
         if status is not None:
-            filters["status"] = status
+            query = query.filter(models.Task.status == status)
         if deployment is not None:
-            filters["deployment_uuid"] = self.deployment_get(
-                deployment)["uuid"]
-
-        if filters:
-            query = query.filter_by(**filters)
-        return query.all()
+            query = query.filter(models.Task.deployment_uuid ==
+                                 self.deployment_get(deployment)["uuid"])
+        if marker is not None:
+            marker_id = self._task_get(marker, load_only="id").id
+            query = query.filter(models.Task.id < marker_id)
+        if limit is not None:
+            query = query.limit(limit)
+
+        tasks = []
+        for task, deployment_name in query:
+            task.deployment_name = deployment_name
+            tasks.append(task)
+        tasks.reverse()
+        return tasks
 
     def task_delete(self, uuid, status=None):
         session = get_session()
@@ -172,8 +193,11 @@ class Connection(object):
             if status is not None:
                 query = base_query.filter_by(status=status)
 
-            (self.model_query(models.TaskResult).filter_by(task_uuid=uuid).
-             delete(synchronize_session=False))
+            for model in (models.DistributedResult, models.DistributedChunk,
+                          models.TaskResultChunk, models.TaskResultStats,
+                          models.TaskResult):
+                (self.model_query(model).filter_by(task_uuid=uuid).
+                 delete(synchronize_session=False))
 
             count = query.delete(synchronize_session=False)
             if not count:
@@ -195,6 +219,190 @@ class Connection(object):
         return (self.model_query(models.TaskResult).
                 filter_by(task_uuid=uuid).all())
 
+    def task_result_summary_get_all(self, uuid):
+        return (self.model_query(models.TaskResult).
+                options(sa_loadonly(*models.TaskResult.SUMMARY_COLUMNS)).
+                filter_by(task_uuid=uuid).
+                order_by(models.TaskResult.id).all())
+
+    def task_result_update(self, result_id, data, summary=None):
+        session = get_session()
+        with session.begin():
+            result = (self.model_query(models.TaskResult, session=session).
+                      filter_by(id=result_id).first())
+            if not result:
+                raise exceptions.NotFoundException(
+                    "Can't find any task result with following id '%s'." %
+                    result_id)
+            values = dict(summary or {})
+            values["data"] = data
+            result.update(values)
+        return result
+
+    def task_result_chunk_create(self, task_uuid, result_id, position, data):
+        chunk = models.TaskResultChunk()
+        chunk.update({"task_uuid": task_uuid, "task_result_id": result_id,
+                      "position": position, "data": data})
+        chunk.save()
+        return chunk
+
+    def task_result_chunk_get_all(self, result_id):
+        query = (self.model_query(models.TaskResultChunk).
+                 filter_by(task_result_id=result_id).
+                 order_by(models.TaskResultChunk.position).
+                 options(sa_loadonly("data")).
+                 yield_per(1))
+        for chunk in query:
+            yield chunk.data
+
+    def task_result_stats_create(self, task_uuid, result_id, rows):
+        session = get_session()
+        with session.begin():
+            for row in rows:
+                stats = models.TaskResultStats()
+                stats.update(row)
+                stats.update({"task_uuid": task_uuid,
+                              "task_result_id": result_id})
+                session.add(stats)
+
+    def task_result_stats_get_all(self, result_id):
+        return (self.model_query(models.TaskResultStats).
+                filter_by(task_result_id=result_id).
+                order_by(models.TaskResultStats.position).all())
+
+    def task_result_stats_get_all_by_uuid(self, uuid):
+        return (self.model_query(models.TaskResultStats).
+                filter_by(task_uuid=uuid).
+                order_by(models.TaskResultStats.task_result_id,
+                         models.TaskResultStats.position).all())
+
+    def task_results_reencode(self, batch_size=100):
+        columns = ((models.TaskResult, "data"),
+                   (models.TaskResultChunk, "data"),
+                   (models.TaskResultStats, "sketch"),
+                   (models.DistributedResult, "data"))
+        count = 0
+        for model, column in columns:
+            ids = [row.id for row in
+                   self.model_query(model).options(sa_loadonly("id"))]
+            for start in range(0, len(ids), batch_size):
+                session = get_session()
+                with session.begin():
+                    query = (self.model_query(model, session=session).
+                             filter(model.id.in_(
+                                 ids[start:start + batch_size])))
+                    for row in query:
+                        # NOTE: value is written again with the current
+                        #       encoding, updated_at is kept as is
+                        sa_attributes.flag_modified(row, column)
+                        sa_attributes.flag_modified(row, "updated_at")
+                        count += 1
+        return count
+
+    def distributed_chunks_create(self, task_uuid, workload_id, data,
+                                  ranges):
+        session = get_session()
+        chunks = []
+        with session.begin():
+            for start, count in ranges:
+                chunk = models.DistributedChunk()
+                chunk.update({"task_uuid": task_uuid,
+                              "workload_id": workload_id,
+                              "start": start, "count": count, "data": data})
+                session.add(chunk)
+                chunks.append(chunk)
+        return chunks
+
+    def distributed_chunk_get_all(self, workload_id):
+        return (self.model_query(models.DistributedChunk).
+                filter_by(workload_id=workload_id).
+                order_by(models.DistributedChunk.id).all())
+
+    def distributed_chunk_claim(self, worker):
+        pending = consts.DistributedChunkStatus.PENDING
+        while True:
+            chunk = (self.model_query(models.DistributedChunk).
+                     filter_by(status=pending).
+                     order_by(models.DistributedChunk.id).
+                     options(sa_loadonly("id")).first())
+            if not chunk:
+                return None
+            # NOTE: the chunk may be claimed by another worker between select
+            #       and update, in this case the next one is tried
+            updated = (self.model_query(models.DistributedChunk).
+                       filter_by(id=chunk.id, status=pending).
+                       update({"status": consts.DistributedChunkStatus.RUNNING,
+                               "worker": worker,
+                               "updated_at": timeutils.utcnow()},
+                              synchronize_session=False))
+            if updated:
+                return (self.model_query(models.DistributedChunk).
+                        filter_by(id=chunk.id).one())
+
+    def distributed_chunk_update(self, chunk_id, values, statuses=None,
+                                 worker=None):
+        query = self.model_query(models.DistributedChunk).filter_by(
+            id=chunk_id)
+        if statuses is not None:
+            query = query.filter(
+                models.DistributedChunk.status.in_(statuses))
+        if worker is not None:
+            query = query.filter_by(worker=worker)
+        return bool(query.update(values, synchronize_session=False))
+
+    def distributed_chunks_abort(self, workload_id):
+        statuses = consts.DistributedChunkStatus
+        session = get_session()
+        with session.begin():
+            query = (self.model_query(models.DistributedChunk,
+                                      session=session).
+                     filter_by(workload_id=workload_id))
+            query.filter_by(status=statuses.PENDING).update(
+                {"status": statuses.ABORTED}, synchronize_session=False)
+            query.filter_by(status=statuses.RUNNING).update(
+                {"status": statuses.ABORTING}, synchronize_session=False)
+
+    def distributed_result_create(self, chunk_id, worker, sent_at, data):
+        session = get_session()
+        with session.begin():
+            chunk = (self.model_query(models.DistributedChunk,
+                                      session=session).
+                     filter_by(id=chunk_id).
+                     options(sa_loadonly("task_uuid", "workload_id")).
+                     first())
+            if not chunk:
+                raise exceptions.ResourceNotFound(id=chunk_id)
+            result = models.DistributedResult()
+            result.update({"task_uuid": chunk.task_uuid,
+                           "workload_id": chunk.workload_id,
+                           "chunk_id": chunk_id, "worker": worker,
+                           "sent_at": sent_at, "data": data})
+            session.add(result)
+        return result
+
+    def distributed_results_pop(self, workload_id):
+        session = get_session()
+        with session.begin():
+            results = (self.model_query(models.DistributedResult,
+                                        session=session).
+                       filter_by(workload_id=workload_id).
+                       order_by(models.DistributedResult.id).all())
+            if results:
+                (self.model_query(models.DistributedResult,
+                                  session=session).
+                 filter(models.DistributedResult.id.in_(
+                     [r.id for r in results])).
+                 delete(synchronize_session=False))
+        return results
+
+    def distributed_workload_delete(self, workload_id):
+        session = get_session()
+        with session.begin():
+            for model in models.DistributedResult, models.DistributedChunk:
+                (self.model_query(model, session=session).
+                 filter_by(workload_id=workload_id).
+                 delete(synchronize_session=False))
+
     def _deployment_get(self, deployment, session=None):
         stored_deployment = self.model_query(
             models.Deployment,
@@ -220,10 +428,11 @@ class Connection(object):
     def deployment_delete(self, uuid):
         session = get_session()
         with session.begin():
-            count = (self.model_query(models.Resource, session=session).
-                     filter_by(deployment_uuid=uuid).count())
-            if count:
-                raise exceptions.DeploymentIsBusy(uuid=uuid)
+            for model in models.Resource, models.PooledTenant:
+                count = (self.model_query(model, session=session).
+                         filter_by(deployment_uuid=uuid).count())
+                if count:
+                    raise exceptions.DeploymentIsBusy(uuid=uuid)
 
             count = (self.model_query(models.Deployment, session=session).
                      filter_by(uuid=uuid).delete(synchronize_session=False))
@@ -272,6 +481,66 @@ class Connection(object):
         if not count:
             raise exceptions.ResourceNotFound(id=id)
 
+    def pooled_tenant_create(self, values):
+        tenant = models.PooledTenant()
+        tenant.update(values)
+        tenant.save()
+        return tenant
+
+    def pooled_tenant_get_all(self, deployment_uuid, lessee=None):
+        query = (self.model_query(models.PooledTenant).
+                 filter_by(deployment_uuid=deployment_uuid))
+        if lessee is not None:
+            query = query.filter_by(lessee=lessee)
+        return query.all()
+
+    def pooled_tenant_lease(self, deployment_uuid, kind, lessee, count):
+        leased = []
+        while len(leased) < count:
+            free = (self.model_query(models.PooledTenant).
+                    filter_by(deployment_uuid=deployment_uuid, kind=kind,
+                              lessee=None).
+                    options(sa_loadonly("id")).
+                    limit(count - len(leased)).all())
+            if not free:
+                break
+            for tenant in free:
+                # NOTE: the tenant may be leased by a concurrent task between
+                #       select and update, so only the tenants updated here
+                #       are taken
+                updated = (self.model_query(models.PooledTenant).
+                           filter_by(id=tenant.id, lessee=None).
+                           update({"lessee": lessee},
+                                  synchronize_session=False))
+                if updated:
+                    leased.append(tenant.id)
+        if not leased:
+            return []
+        return (self.model_query(models.PooledTenant).
+                filter(models.PooledTenant.id.in_(leased)).all())
+
+    def pooled_tenant_release(self, lessee):
+        return (self.model_query(models.PooledTenant).
+                filter_by(lessee=lessee).
+                update({"lessee": None}, synchronize_session=False))
+
+    def pooled_tenant_release_stale(self, deployment_uuid):
+        active = sa.select([models.Task.uuid]).where(
+            models.Task.status.notin_([consts.TaskStatus.FINISHED,
+                                       consts.TaskStatus.FAILED,
+                                       consts.TaskStatus.ABORTED]))
+        return (self.model_query(models.PooledTenant).
+                filter_by(deployment_uuid=deployment_uuid).
+                filter(models.PooledTenant.lessee.isnot(None)).
+                filter(models.PooledTenant.lessee.notin_(active)).
+                update({"lessee": None}, synchronize_session=False))
+
+    def pooled_tenant_delete(self, id):
+        count = (self.model_query(models.PooledTenant).
+                 filter_by(id=id).delete(synchronize_session=False))
+        if not count:
+            raise exceptions.ResourceNotFound(id=id)
+
     def verification_create(self, deployment_uuid):
         verification = models.Verification()
         verification.update({"deployment_uuid": deployment_uuid})
@@ -0,0 +1,147 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of encodings of stored task results.
+
+Synthetic iterations are written by chunks to a temporary SQLite database
+and read back with every available combination of results_encoding and
+json_backend options, so the cost of storing results and the size of the
+database can be compared before the options are changed.
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from oslo_config import cfg
+import sqlalchemy as sa
+
+from rally.common.db.sqlalchemy import models
+from rally.common.db.sqlalchemy import types
+
+
+CONF = cfg.CONF
+
+ITERATIONS = 1000000
+CHUNK_SIZE = 1000
+
+
+def available_encodings():
+    """Return (results_encoding, json_backend) pairs which can be used."""
+    encodings = [("json", "json")]
+    if types.orjson is not None:
+        encodings.append(("json", "orjson"))
+    if types.msgpack is not None:
+        encodings.append(("msgpack_zlib", "json"))
+    return encodings
+
+
+def generate_iterations(count, seed=0):
+    """Generate results of iterations similar to the real ones.
+
+    Every iteration has two atomic actions, every 50th one failed.
+    """
+    rand = random.Random(seed)
+    timestamp = 1440000000.0
+    for i in range(count):
+        first = rand.uniform(0.1, 2.0)
+        second = rand.uniform(0.1, 2.0)
+        error = []
+        if i % 50 == 0:
+            error = ["TimeoutException",
+                     "Rally tired waiting for server to become ACTIVE",
+                     "Traceback (most recent call last):\n" * 10]
+        yield {"duration": first + second,
+               "idle_duration": 0.0,
+               "timestamp": timestamp + i * 0.1,
+               "error": error,
+               "scenario_output": {"errors": "", "data": {}},
+               "atomic_actions": {"nova.boot_server": first,
+                                  "nova.delete_server": second}}
+
+
+def _chunks(iterations, chunk_size):
+    chunk = []
+    for iteration in iterations:
+        chunk.append(iteration)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def measure(results_encoding, json_backend, iterations=ITERATIONS,
+            chunk_size=CHUNK_SIZE):
+    """Store and load iterations with the given encoding.
+
+    :param results_encoding: value of database.results_encoding option
+    :param json_backend: value of database.json_backend option
+    :param iterations: number of iterations
+    :param chunk_size: number of iterations in a stored chunk
+    :returns: dict with store and load time in seconds and database size
+              in bytes
+    """
+    CONF.set_override("results_encoding", results_encoding, "database")
+    CONF.set_override("json_backend", json_backend, "database")
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, "results.sqlite")
+        engine = sa.create_engine("sqlite:///%s" % path)
+        table = models.TaskResultChunk.__table__
+        table.create(engine)
+
+        store = 0.0
+        for position, chunk in enumerate(
+                _chunks(generate_iterations(iterations), chunk_size)):
+            row = {"task_uuid": "benchmark", "task_result_id": 1,
+                   "position": position, "data": chunk}
+            started_at = time.time()
+            engine.execute(table.insert(), row)
+            store += time.time() - started_at
+
+        started_at = time.time()
+        loaded = 0
+        query = sa.select([table.c.data]).order_by(table.c.position)
+        for row in engine.execute(query):
+            loaded += len(row[0])
+        load = time.time() - started_at
+        engine.dispose()
+
+        return {"results_encoding": results_encoding,
+                "json_backend": json_backend,
+                "iterations": loaded,
+                "store": store,
+                "load": load,
+                "size": os.path.getsize(path)}
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        CONF.clear_override("results_encoding", "database")
+        CONF.clear_override("json_backend", "database")
+
+
+def run(iterations=ITERATIONS, chunk_size=CHUNK_SIZE, encodings=None):
+    """Measure all available encodings.
+
+    :param encodings: list of (results_encoding, json_backend) pairs,
+                      all available ones by default
+    :returns: list of dicts returned by measure()
+    """
+    encodings = encodings or available_encodings()
+    return [measure(results_encoding, json_backend, iterations=iterations,
+                    chunk_size=chunk_size)
+            for results_encoding, json_backend in encodings]
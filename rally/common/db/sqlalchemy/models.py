@@ -135,6 +135,40 @@ class Resource(BASE, RallyBase):
     )
 
 
+class PooledTenant(BASE, RallyBase):
+    """Represents a tenant with users that is kept between tasks.
+
+    Pooled tenants are created by the users context and leased to its next
+    runs instead of creating new tenants and users for every scenario.
+    """
+    __tablename__ = "pooled_tenants"
+    __table_args__ = (
+        sa.Index("pooled_tenant_deployment_uuid_and_kind", "deployment_uuid",
+                 "kind"),
+        sa.Index("pooled_tenant_lessee", "lessee"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    tenant_id = sa.Column(sa.String(255), nullable=False)
+    # NOTE: only tenants of the same kind (e.g. with the same number of
+    #       users and domains) can be used instead of each other
+    kind = sa.Column(sa.String(255), nullable=False)
+    # NOTE: UUID of the task that uses the tenant, None if it is free
+    lessee = sa.Column(sa.String(36), nullable=True)
+
+    data = sa.Column(
+        sa_types.MutableJSONEncodedDict(ordered=False),
+        default={},
+        nullable=False,
+    )
+
+    deployment_uuid = sa.Column(
+        sa.String(36),
+        sa.ForeignKey(Deployment.uuid),
+        nullable=False,
+    )
+
+
 class Task(BASE, RallyBase):
     """Represents a Benchmark task."""
     __tablename__ = "tasks"
@@ -169,13 +203,30 @@ class Task(BASE, RallyBase):
 
 class TaskResult(BASE, RallyBase):
     __tablename__ = "task_results"
-    __table_args__ = ()
+    __table_args__ = (
+        sa.Index("task_result_task_uuid", "task_uuid"),
+    )
+
+    # NOTE: columns which are enough to display summary of the scenario
+    #       without loading its data
+    SUMMARY_COLUMNS = ("key", "task_uuid", "iterations_count",
+                       "failed_iterations_count", "load_duration",
+                       "full_duration", "sla_success", "created_at",
+                       "updated_at")
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
 
     key = sa.Column(sa_types.MutableJSONEncodedDict, nullable=False)
     data = sa.Column(sa_types.BigMutableJSONEncodedDict, nullable=False)
 
+    # NOTE: summary of the scenario is written when the scenario is
+    #       finished, so it can be displayed without reading the results
+    iterations_count = sa.Column(sa.Integer, default=0)
+    failed_iterations_count = sa.Column(sa.Integer, default=0)
+    load_duration = sa.Column(sa.Float, default=0.0)
+    full_duration = sa.Column(sa.Float, default=0.0)
+    sla_success = sa.Column(sa.Boolean, default=True)
+
     task_uuid = sa.Column(sa.String(36), sa.ForeignKey("tasks.uuid"))
     task = sa.orm.relationship(Task,
                                backref=sa.orm.backref("results"),
@@ -183,6 +234,112 @@ class TaskResult(BASE, RallyBase):
                                primaryjoin="TaskResult.task_uuid == Task.uuid")
 
 
+class TaskResultChunk(BASE, RallyBase):
+    """Represents a chunk of raw iterations of a task result.
+
+    Iterations are stored by chunks while the scenario is running, so they
+    are not kept in memory until the end of the scenario and can be read
+    back chunk by chunk.
+    """
+    __tablename__ = "task_result_chunks"
+    __table_args__ = (
+        sa.Index("task_result_chunk_task_uuid", "task_uuid"),
+        sa.Index("task_result_chunk_position", "task_result_id", "position"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    task_uuid = sa.Column(sa.String(36), sa.ForeignKey("tasks.uuid"),
+                          nullable=False)
+    task_result_id = sa.Column(sa.Integer, sa.ForeignKey("task_results.id"),
+                               nullable=False)
+    position = sa.Column(sa.Integer, nullable=False)
+    data = sa.Column(sa_types.BigJSONEncodedDict, nullable=False)
+
+
+class TaskResultStats(BASE, RallyBase):
+    """Represents a row of the summary of a task result.
+
+    Rows are written when the scenario is finished, one per atomic action,
+    whole iteration ("total") and scenario output value, plus rows of
+    atomic actions of all iterations and the number of scenario output
+    errors, see rally.task.processing.aggregation.ScenarioStats.
+    """
+    __tablename__ = "task_result_stats"
+    __table_args__ = (
+        sa.Index("task_result_stats_task_uuid", "task_uuid"),
+        sa.Index("task_result_stats_result_id", "task_result_id"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    task_uuid = sa.Column(sa.String(36), sa.ForeignKey("tasks.uuid"),
+                          nullable=False)
+    task_result_id = sa.Column(sa.Integer, sa.ForeignKey("task_results.id"),
+                               nullable=False)
+    position = sa.Column(sa.Integer, nullable=False)
+    kind = sa.Column(sa.String(16), nullable=False)
+    name = sa.Column(sa.String(255), nullable=False)
+    count = sa.Column(sa.Integer, nullable=False)
+    errors = sa.Column(sa.Integer, nullable=False)
+    min_value = sa.Column(sa.Float, nullable=True)
+    max_value = sa.Column(sa.Float, nullable=True)
+    mean = sa.Column(sa.Float, nullable=True)
+    stddev = sa.Column(sa.Float, nullable=True)
+    # NOTE: serialized rally.common.streaming_algorithms.QuantileSketch
+    sketch = sa.Column(sa_types.BigJSONEncodedDict(ordered=False),
+                       nullable=False)
+
+
+class DistributedChunk(BASE, RallyBase):
+    """Represents a range of iterations of a distributed workload.
+
+    Chunks are created by the distributed runner and are claimed and run by
+    registered workers.
+    """
+    __tablename__ = "distributed_chunks"
+    __table_args__ = (
+        sa.Index("distributed_chunk_status", "status"),
+        sa.Index("distributed_chunk_workload_id", "workload_id"),
+        sa.Index("distributed_chunk_task_uuid", "task_uuid"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    task_uuid = sa.Column(sa.String(36), sa.ForeignKey("tasks.uuid"),
+                          nullable=False)
+    # NOTE: all chunks of a single run of the runner share workload_id
+    workload_id = sa.Column(sa.String(36), nullable=False)
+    start = sa.Column(sa.Integer, nullable=False)
+    count = sa.Column(sa.Integer, nullable=False)
+    status = sa.Column(sa.Enum(*list(consts.DistributedChunkStatus),
+                       name="enum_distributed_chunk_status"),
+                       default=consts.DistributedChunkStatus.PENDING,
+                       nullable=False)
+    worker = sa.Column(sa.String(255), nullable=True)
+    error = sa.Column(sa.Text, nullable=True)
+
+    data = sa.Column(sa_types.MutableJSONEncodedDict, nullable=False)
+
+
+class DistributedResult(BASE, RallyBase):
+    """Represents a batch of iteration results sent by a worker."""
+    __tablename__ = "distributed_results"
+    __table_args__ = (
+        sa.Index("distributed_result_workload_id", "workload_id"),
+        sa.Index("distributed_result_task_uuid", "task_uuid"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    task_uuid = sa.Column(sa.String(36), sa.ForeignKey("tasks.uuid"),
+                          nullable=False)
+    workload_id = sa.Column(sa.String(36), nullable=False)
+    chunk_id = sa.Column(sa.Integer, sa.ForeignKey("distributed_chunks.id"),
+                         nullable=False)
+    worker = sa.Column(sa.String(255), nullable=False)
+    # NOTE: time of the worker host when the batch was sent
+    sent_at = sa.Column(sa.Float, nullable=False)
+
+    data = sa.Column(sa_types.BigJSONEncodedDict, nullable=False)
+
+
 class Verification(BASE, RallyBase):
     """Represents a verifier result."""
 
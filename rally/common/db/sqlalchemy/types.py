@@ -13,29 +13,160 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
 import json
+import sys
+import zlib
 
+from oslo_config import cfg
 from sqlalchemy.dialects import mysql as mysql_types
 from sqlalchemy.ext import mutable
 from sqlalchemy import types as sa_types
 
 from rally.common import costilius
+from rally.common.i18n import _
+from rally.common import log as logging
+from rally import exceptions
+
+# NOTE: orjson and msgpack are optional, they are needed only if they
+#       are chosen with json_backend and results_encoding options.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+LOG = logging.getLogger(__name__)
+
+DB_ENCODING_OPTS = [
+    cfg.StrOpt("json_backend",
+               default="json",
+               choices=["json", "orjson"],
+               help="Library which encodes and decodes JSON columns. "
+                    "orjson (Python 3 only, should be installed separately) "
+                    "is several times faster than the standard json module"),
+    cfg.StrOpt("results_encoding",
+               default="json",
+               choices=["json", "msgpack_zlib"],
+               help="Encoding of stored task results. msgpack_zlib "
+                    "(requires msgpack library) is compressed binary "
+                    "encoding which takes several times less space than "
+                    "JSON. Results are read in any encoding, use "
+                    "`rally-manage db reencode` to convert already stored "
+                    "results after the option is changed"),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(DB_ENCODING_OPTS, group="database")
+
+# NOTE: since Python 3.7 dicts keep insertion order, so there is no need
+#       to decode JSON to much slower OrderedDict.
+DICTS_ARE_ORDERED = sys.version_info >= (3, 7)
+
+MSGPACK_ZLIB_PREFIX = "msgpack_zlib:"
+
+# NOTE: the backend is checked for each encoded column, so the warning
+#       about missing orjson is logged only once
+_orjson_warned = False
+
+
+def _json_backend():
+    global _orjson_warned
+    if CONF.database.json_backend == "orjson":
+        if orjson is not None:
+            return "orjson"
+        if not _orjson_warned:
+            _orjson_warned = True
+            LOG.warning(_("orjson is not installed, standard json module "
+                          "is used to encode and decode database columns"))
+    return "json"
+
+
+def dumps(value, encoding="json"):
+    """Serialize value to a string which is stored in the database.
+
+    :param value: JSON serializable object
+    :param encoding: "json" or "msgpack_zlib"
+    :returns: str, prefixed with MSGPACK_ZLIB_PREFIX for msgpack_zlib
+    """
+    if encoding == "msgpack_zlib":
+        if msgpack is None:
+            raise exceptions.RallyException(
+                _("msgpack library is required to store results with "
+                  "msgpack_zlib encoding"))
+        data = zlib.compress(msgpack.packb(value, use_bin_type=True), 1)
+        return MSGPACK_ZLIB_PREFIX + base64.b64encode(data).decode("ascii")
+    if _json_backend() == "orjson":
+        return orjson.dumps(
+            value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(value, sort_keys=False)
+
+
+def loads(data, ordered=True):
+    """Deserialize a string stored in the database.
+
+    Format of data is detected by its prefix, so values stored with any
+    encoding are loaded.
+
+    :param data: str returned by dumps()
+    :param ordered: whether order of keys in dicts should be kept. It is
+                    kept by plain dicts since Python 3.7, otherwise slower
+                    OrderedDict is used.
+    """
+    ordered = ordered and not DICTS_ARE_ORDERED
+    if data.startswith(MSGPACK_ZLIB_PREFIX):
+        if msgpack is None:
+            raise exceptions.RallyException(
+                _("msgpack library is required to load results stored "
+                  "with msgpack_zlib encoding"))
+        data = zlib.decompress(
+            base64.b64decode(data[len(MSGPACK_ZLIB_PREFIX):]))
+        kwargs = {"raw": False, "strict_map_key": False}
+        if ordered:
+            kwargs["object_pairs_hook"] = costilius.OrderedDict
+        return msgpack.unpackb(data, **kwargs)
+    if ordered:
+        return costilius.json_loads(
+            data, object_pairs_hook=costilius.OrderedDict)
+    if _json_backend() == "orjson":
+        return orjson.loads(data)
+    return costilius.json_loads(data)
 
 
 class JSONEncodedDict(sa_types.TypeDecorator):
-    """Represents an immutable structure as a json-encoded string."""
+    """Represents an immutable structure as a json-encoded string.
+
+       :param ordered: whether order of keys of loaded dicts matters, pass
+                       False for columns where it does not to load them
+                       faster on old Pythons.
+    """
 
     impl = sa_types.Text
 
+    # NOTE: only columns with task results are stored with encoding
+    #       chosen by results_encoding option
+    results = False
+
+    def __init__(self, *args, **kwargs):
+        self.ordered = kwargs.pop("ordered", True)
+        super(JSONEncodedDict, self).__init__(*args, **kwargs)
+
     def process_bind_param(self, value, dialect):
         if value is not None:
-            value = json.dumps(value, sort_keys=False)
+            encoding = "json"
+            if self.results:
+                encoding = CONF.database.results_encoding
+            value = dumps(value, encoding=encoding)
         return value
 
     def process_result_value(self, value, dialect):
         if value is not None:
-            value = costilius.json_loads(
-                value, object_pairs_hook=costilius.OrderedDict)
+            value = loads(value, ordered=self.ordered)
         return value
 
 
@@ -46,8 +177,12 @@ class BigJSONEncodedDict(JSONEncodedDict):
        sqlite we are able to store more then 1GB. In some cases, like storing
        results of task 64kb is not enough. So this type uses for MySql
        LONGTEXT that allows us to store 4GiB.
+
+       Values are stored with encoding set by results_encoding option.
     """
 
+    results = True
+
     def load_dialect_impl(self, dialect):
         if dialect.name == "mysql":
             return dialect.type_descriptor(mysql_types.LONGTEXT)
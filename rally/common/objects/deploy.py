@@ -86,5 +86,33 @@ class Deployment(object):
     def delete_resource(resource_id):
         db.resource_delete(resource_id)
 
+    def add_pooled_tenant(self, tenant_id, kind, data, lessee=None):
+        return db.pooled_tenant_create({
+            "deployment_uuid": self.deployment["uuid"],
+            "tenant_id": tenant_id,
+            "kind": kind,
+            "data": data,
+            "lessee": lessee
+        })
+
+    def get_pooled_tenants(self, lessee=None):
+        return db.pooled_tenant_get_all(self.deployment["uuid"],
+                                        lessee=lessee)
+
+    def lease_pooled_tenants(self, kind, lessee, count):
+        return db.pooled_tenant_lease(self.deployment["uuid"], kind, lessee,
+                                      count)
+
+    @staticmethod
+    def release_pooled_tenants(lessee):
+        return db.pooled_tenant_release(lessee)
+
+    def release_stale_pooled_tenants(self):
+        return db.pooled_tenant_release_stale(self.deployment["uuid"])
+
+    @staticmethod
+    def delete_pooled_tenant(pooled_tenant_id):
+        db.pooled_tenant_delete(pooled_tenant_id)
+
     def delete(self):
         db.deployment_delete(self.deployment["uuid"])
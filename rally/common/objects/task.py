@@ -13,14 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import json
 import uuid
 
-from rally.common import costilius
 from rally.common import db
 from rally.common.i18n import _LE
 from rally import consts
 from rally import exceptions
+from rally.task.processing import aggregation
 
 
 TASK_RESULT_SCHEMA = {
@@ -200,7 +201,8 @@ TASK_EXTENDED_RESULT_SCHEMA = {
                 "max_duration": {"type": "number"},
                 "tstamp_start": {"type": "number"},
                 "full_duration": {"type": "number"},
-                "load_duration": {"type": "number"}
+                "load_duration": {"type": "number"},
+                "runner_stats": {"type": "object"}
             }
         }
     },
@@ -219,6 +221,11 @@ class Task(object):
     NOT_IMPLEMENTED_STAGES_FOR_ABORT = [consts.TaskStatus.VERIFYING,
                                         consts.TaskStatus.INIT]
 
+    # NOTE: columns of results written when the scenario is finished
+    RESULT_SUMMARY_COLUMNS = ("key", "iterations_count",
+                              "failed_iterations_count", "load_duration",
+                              "full_duration", "sla_success")
+
     def __init__(self, task=None, temporary=False, **attributes):
         """Task object init
 
@@ -241,8 +248,10 @@ class Task(object):
 
     def to_dict(self):
         db_task = self.task
-        deployment_name = db.deployment_get(self.task.deployment_uuid)["name"]
-        db_task["deployment_name"] = deployment_name
+        # NOTE: tasks returned by list() already have deployment name
+        if "deployment_name" not in db_task:
+            db_task["deployment_name"] = db.deployment_get(
+                db_task["deployment_uuid"])["name"]
         return db_task
 
     @staticmethod
@@ -254,8 +263,9 @@ class Task(object):
         return db.task_get_status(uuid)
 
     @staticmethod
-    def list(status=None, deployment=None):
-        return [Task(db_task) for db_task in db.task_list(status, deployment)]
+    def list(status=None, deployment=None, limit=None, marker=None):
+        return [Task(db_task) for db_task in db.task_list(
+            status, deployment, limit=limit, marker=marker)]
 
     @staticmethod
     def delete_by_uuid(uuid, status=None):
@@ -278,8 +288,41 @@ class Task(object):
         self._update({"status": consts.TaskStatus.FAILED,
                       "verification_log": json.dumps(log)})
 
-    def get_results(self):
-        return db.task_result_get_all_by_uuid(self.task["uuid"])
+    def get_results(self, stream=False, include_incomplete=False):
+        """Get results of all scenarios of the task.
+
+        Raw iterations of a scenario are stored partially in the result
+        record itself and partially by chunks, this method joins them in
+        data["raw"] of each result.
+
+        :param stream: if True, data["raw"] of each result is a generator
+                       which reads chunks of iterations from the DB one by
+                       one while it is consumed, otherwise it is a list
+        :param include_incomplete: if True, results of scenarios that are
+                                   still running (or were interrupted) are
+                                   returned as well, they have
+                                   data["completed"] set to False
+        :returns: list of dicts with task results
+        """
+        results = []
+        for result in db.task_result_get_all_by_uuid(self.task["uuid"]):
+            if (not include_incomplete and
+                    not result["data"].get("completed", True)):
+                continue
+            result = dict(result)
+            result["data"] = dict(result["data"])
+            raw = self._iter_raw(result["id"], result["data"]["raw"])
+            result["data"]["raw"] = raw if stream else list(raw)
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _iter_raw(result_id, raw):
+        for iteration in raw:
+            yield iteration
+        for chunk in db.task_result_chunk_get_all(result_id):
+            for iteration in chunk:
+                yield iteration
 
     @classmethod
     def extend_results(cls, results, serializable=False):
@@ -291,9 +334,9 @@ class Task(object):
         be taken as-is directly from the database.
 
         Each scenario results have extra `info' with aggregated data,
-        and iterations data is represented by iterator - this simplifies
-        its future implementation as generator and gives ability to process
-        arbitrary number of iterations with low memory usage.
+        and iterations data is represented by iterator over compact
+        columnar storage. Iterations are read only once, see
+        rally.task.processing.aggregation.ScenarioAggregator.
 
         :param results: list of db.sqlalchemy.models.TaskResult
         :param serializable: bool, whether to convert json non-serializable
@@ -319,41 +362,12 @@ class Task(object):
                       tstamp_start - float timestamp of the first iteration
                       full_duration - float full scenario duration
                       load_duration - float load scenario duration
+                      runner_stats - dict with runner specific statistics
         """
         extended = []
         for scenario_result in results:
             scenario = dict(scenario_result)
-            tstamp_start = 0
-            min_duration = 0
-            max_duration = 0
-            iterations_failed = 0
-            atomic = costilius.OrderedDict()
-            output_names = set()
-
-            for itr in scenario["data"]["raw"]:
-                for atomic_name, duration in itr["atomic_actions"].items():
-                    duration = duration or 0
-                    if atomic_name not in atomic:
-                        atomic[atomic_name] = {"min_duration": duration,
-                                               "max_duration": duration}
-                    elif duration < atomic[atomic_name]["min_duration"]:
-                        atomic[atomic_name]["min_duration"] = duration
-                    elif duration > atomic[atomic_name]["max_duration"]:
-                        atomic[atomic_name]["max_duration"] = duration
-
-                output_names.update(itr["scenario_output"]["data"].keys())
-
-                if not tstamp_start or itr["timestamp"] < tstamp_start:
-                    tstamp_start = itr["timestamp"]
-
-                if itr["error"]:
-                    iterations_failed += 1
-                else:
-                    duration = itr["duration"] or 0
-                    if not min_duration or duration < min_duration:
-                        min_duration = duration
-                    if not max_duration or duration > max_duration:
-                        max_duration = duration
+            aggregator = aggregation.ScenarioAggregator(scenario)
 
             for k in "created_at", "updated_at":
                 if serializable:
@@ -364,20 +378,11 @@ class Task(object):
                 else:
                     del scenario[k]
 
-            scenario["info"] = {
-                "atomic": atomic,
-                "output_names": list(output_names),
-                "iterations_count": len(scenario["data"]["raw"]),
-                "iterations_failed": iterations_failed,
-                "min_duration": min_duration,
-                "max_duration": max_duration,
-                "tstamp_start": tstamp_start,
-                "full_duration": scenario["data"]["full_duration"],
-                "load_duration": scenario["data"]["load_duration"]}
+            scenario["info"] = aggregator.info
             if serializable:
-                scenario["iterations"] = scenario["data"]["raw"]
+                scenario["iterations"] = list(aggregator.iterations)
             else:
-                scenario["iterations"] = iter(scenario["data"]["raw"])
+                scenario["iterations"] = iter(aggregator.iterations)
             scenario["sla"] = scenario["data"]["sla"]
             del scenario["data"]
             del scenario["task_uuid"]
@@ -386,7 +391,78 @@ class Task(object):
         return extended
 
     def append_results(self, key, value):
-        db.task_result_create(self.task["uuid"], key, value)
+        return db.task_result_create(self.task["uuid"], key, value)
+
+    def update_results(self, result_id, value, summary=None):
+        db.task_result_update(result_id, value, summary=summary)
+
+    def get_results_summary(self):
+        """Get summaries of results of all scenarios of the task.
+
+        Summaries are read from the summary columns of the results, which
+        are written when the scenario is finished, so neither data of the
+        results nor raw iterations are loaded.
+
+        :returns: list of dicts with key, iterations_count,
+                  failed_iterations_count, load_duration, full_duration
+                  and sla_success of each result
+        """
+        return [dict((column, result[column])
+                     for column in self.RESULT_SUMMARY_COLUMNS)
+                for result in db.task_result_summary_get_all(
+                    self.task["uuid"])]
+
+    def get_results_aggregates(self):
+        """Get summaries and stored statistics of all scenarios of the task.
+
+        Only aggregates written when scenarios are finished are read, so
+        it is cheap even for tasks with millions of iterations.
+
+        :returns: list of dicts returned by get_results_summary() with
+                  "stats" item, which is
+                  rally.task.processing.aggregation.ScenarioStats or None
+                  if it was not stored
+        """
+        rows = collections.defaultdict(list)
+        for row in db.task_result_stats_get_all_by_uuid(self.task["uuid"]):
+            rows[row["task_result_id"]].append(row)
+
+        results = []
+        for result in db.task_result_summary_get_all(self.task["uuid"]):
+            summary = dict((column, result[column])
+                           for column in self.RESULT_SUMMARY_COLUMNS)
+            summary["stats"] = None
+            if rows.get(result["id"]):
+                summary["stats"] = aggregation.ScenarioStats.from_rows(
+                    rows[result["id"]])
+            results.append(summary)
+        return results
+
+    def append_results_chunk(self, result_id, position, iterations):
+        db.task_result_chunk_create(self.task["uuid"], result_id, position,
+                                    iterations)
+
+    def append_results_stats(self, result_id, stats):
+        """Store the summary of iterations of a scenario.
+
+        :param result_id: ID of the result of the scenario
+        :param stats: rally.task.processing.aggregation.ScenarioStats
+        """
+        db.task_result_stats_create(self.task["uuid"], result_id,
+                                    stats.to_rows())
+
+    @staticmethod
+    def get_results_stats(result_id):
+        """Get the stored summary of iterations of a scenario.
+
+        :param result_id: ID of the result of the scenario
+        :returns: rally.task.processing.aggregation.ScenarioStats or None
+                  if the summary was not stored (e.g. by older versions)
+        """
+        rows = db.task_result_stats_get_all(result_id)
+        if not rows:
+            return None
+        return aggregation.ScenarioStats.from_rows(rows)
 
     def delete(self, status=None):
         db.task_delete(self.task["uuid"], status=status)
@@ -14,6 +14,7 @@
 
 import itertools
 
+from rally.common.db.sqlalchemy import types as db_types
 from rally.common import log
 from rally import osclients
 from rally.plugins.openstack.context.cleanup import base as cleanup_base
@@ -28,6 +29,10 @@ from rally.plugins.openstack.scenarios.murano import utils as murano_utils
 from rally.plugins.openstack.scenarios.nova import utils as nova_utils
 from rally.plugins.openstack.scenarios.sahara import utils as sahara_utils
 from rally.plugins.openstack.scenarios.vm import utils as vm_utils
+from rally.task import distributed
+from rally.task import live
+from rally.task import runner
+from rally.task import utils as task_utils
 from rally.verification.tempest import config as tempest_conf
 
 
@@ -46,10 +51,15 @@ def list_opts():
                          murano_utils.MURANO_BENCHMARK_OPTS,
                          nova_utils.NOVA_BENCHMARK_OPTS,
                          sahara_utils.SAHARA_BENCHMARK_OPTS,
-                         vm_utils.VM_BENCHMARK_OPTS)),
+                         vm_utils.VM_BENCHMARK_OPTS,
+                         runner.RUNNER_BENCHMARK_OPTS,
+                         task_utils.STATUS_POLLER_OPTS,
+                         distributed.DISTRIBUTED_OPTS,
+                         live.LIVE_OPTS)),
         ("image",
          itertools.chain(tempest_conf.IMAGE_OPTS)),
         ("role", itertools.chain(tempest_conf.ROLE_OPTS)),
         ("users_context", itertools.chain(users.USER_CONTEXT_OPTS)),
-        ("cleanup", itertools.chain(cleanup_base.CLEANUP_OPTS))
+        ("cleanup", itertools.chain(cleanup_base.CLEANUP_OPTS)),
+        ("database", itertools.chain(db_types.DB_ENCODING_OPTS))
     ]
@@ -14,6 +14,7 @@
 #    under the License.
 
 import imp
+import json
 import os
 import sys
 
@@ -25,6 +26,13 @@ from rally.common import log as logging
 
 LOG = logging.getLogger(__name__)
 
+PLUGIN_INDEX_FILE = os.path.expanduser("~/.rally/plugin_index.json")
+
+# NOTE: list of indexed plugins, it is set by load_plugin_index() and
+#       is used by Plugin.get() and Plugin.get_all() to import only modules
+#       which define requested plugins
+_PLUGIN_INDEX = None
+
 
 def itersubclasses(cls, seen=None):
     """Generator over all subclasses of a given class in depth first order."""
@@ -42,13 +50,17 @@ def itersubclasses(cls, seen=None):
                 yield sub
 
 
+def _get_package_path(package):
+    path = [os.path.dirname(rally.__file__), ".."] + package.split(".")
+    return os.path.join(*path)
+
+
 def import_modules_from_package(package):
     """Import modules from package and append into sys.modules
 
     :param: package - Full package name. For example: rally.deployment.engines
     """
-    path = [os.path.dirname(rally.__file__), ".."] + package.split(".")
-    path = os.path.join(*path)
+    path = _get_package_path(package)
     for root, dirs, files in os.walk(path):
         for filename in files:
             if filename.startswith("__") or not filename.endswith(".py"):
@@ -60,6 +72,129 @@ def import_modules_from_package(package):
                     module_name)
 
 
+def _get_mtimes(packages):
+    mtimes = {}
+    for package in packages:
+        for root, dirs, files in os.walk(_get_package_path(package)):
+            for filename in files:
+                if filename.endswith(".py"):
+                    path = os.path.join(root, filename)
+                    mtimes[path] = os.path.getmtime(path)
+    return mtimes
+
+
+def _get_class_path(cls):
+    return "%s.%s" % (cls.__module__, cls.__name__)
+
+
+def build_plugin_index(packages, base):
+    """Import all modules of packages and list plugins defined in them.
+
+    :param packages: list of full package names
+    :param base: base class of plugins
+    :returns: list of dicts with name, namespace, module which defines the
+              plugin and bases - paths of plugin base classes
+    """
+    for package in packages:
+        import_modules_from_package(package)
+
+    index = []
+    for plugin in itersubclasses(base):
+        if not plugin._meta_is_inited(raise_exc=False):
+            continue
+        module = getattr(plugin, "func_ref", plugin).__module__
+        # NOTE: plugins from custom plugin paths could be already loaded,
+        #       they are loaded eagerly, so they are not indexed
+        if not any(module.startswith(package + ".") for package in packages):
+            continue
+        index.append({
+            "name": plugin.get_name(),
+            "namespace": plugin.get_namespace(),
+            "module": module,
+            "bases": sorted(set(_get_class_path(cls) for cls in plugin.__mro__
+                                if issubclass(cls, base)))})
+    return index
+
+
+def load_plugin_index(packages, base, index_file=None):
+    """Load index of plugins from packages, so they are imported lazily.
+
+    The index is stored in index_file with modification times of modules
+    of packages. If any module is changed, added or removed, all modules
+    are imported and the index is rebuilt.
+
+    :param packages: list of full package names
+    :param base: base class of plugins
+    :param index_file: path to the index, PLUGIN_INDEX_FILE by default
+    """
+    global _PLUGIN_INDEX
+
+    index_file = index_file or PLUGIN_INDEX_FILE
+    packages = list(packages)
+    mtimes = _get_mtimes(packages)
+    try:
+        with open(index_file) as f:
+            index = json.load(f)
+    except (IOError, OSError, ValueError):
+        index = {}
+
+    if index.get("packages") != packages or index.get("mtimes") != mtimes:
+        LOG.debug("Building index of plugins in %s" % index_file)
+        index = {"packages": packages, "mtimes": mtimes,
+                 "plugins": build_plugin_index(packages, base)}
+        try:
+            index_dir = os.path.dirname(index_file)
+            if not os.path.exists(index_dir):
+                os.makedirs(index_dir)
+            tmp_file = "%s.%d" % (index_file, os.getpid())
+            with open(tmp_file, "w") as f:
+                json.dump(index, f)
+            os.rename(tmp_file, index_file)
+        except (IOError, OSError) as e:
+            LOG.warning(_("Failed to save index of plugins to %(file)s: "
+                          "%(error)s") % {"file": index_file, "error": e})
+    _PLUGIN_INDEX = index["plugins"]
+
+
+def import_indexed_modules(base, name=None, namespace=None):
+    """Import modules which define indexed plugins.
+
+    Nothing is imported unless load_plugin_index() was called.
+
+    :param base: import modules with subclasses of base
+    :param name: import only module with plugin of this name
+    :param namespace: import only modules with plugins of this namespace
+    :returns: True if any modules were imported
+    """
+    if _PLUGIN_INDEX is None:
+        return False
+
+    base = _get_class_path(base)
+    modules = set()
+    for plugin in _PLUGIN_INDEX:
+        if (base in plugin["bases"] and
+                (name is None or plugin["name"] == name) and
+                (namespace is None or plugin["namespace"] == namespace) and
+                plugin["module"] not in sys.modules):
+            modules.add(plugin["module"])
+    for module in sorted(modules):
+        importutils.import_module(module)
+    return bool(modules)
+
+
+def get_indexed_module(name, namespace):
+    """Return module which defines the indexed plugin.
+
+    :param name: name of the plugin
+    :param namespace: namespace of the plugin
+    :returns: full module name or None if the plugin is not indexed
+    """
+    for plugin in _PLUGIN_INDEX or []:
+        if plugin["name"] == name and plugin["namespace"] == namespace:
+            return plugin["module"]
+    return None
+
+
 def load_plugins(dir_or_file):
     if os.path.isdir(dir_or_file):
         directory = dir_or_file
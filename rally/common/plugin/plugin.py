@@ -141,14 +141,17 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
 
     @classmethod
     def _set_name_and_namespace(cls, name, namespace):
-        try:
-            Plugin.get(name, namespace=namespace)
-        except exceptions.PluginNotFound:
-            cls._meta_set("name", name)
-            cls._meta_set("namespace", namespace)
-        else:
+        # NOTE: plugins of modules which are not imported yet are checked
+        #       in the plugin index, so registration of plugin doesn't import
+        #       other modules, but custom plugins still can't shadow them
+        module = getattr(cls, "func_ref", cls).__module__
+        indexed_module = discover.get_indexed_module(name, namespace)
+        if (Plugin._find(name, namespace) is not None or
+                indexed_module not in (None, module)):
             raise exceptions.PluginWithSuchNameExists(name=name,
                                                       namespace=namespace)
+        cls._meta_set("name", name)
+        cls._meta_set("namespace", namespace)
 
     @classmethod
     def _set_deprecated(cls, reason, rally_version):
@@ -174,15 +177,27 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
         If namespace is not specified it will return first found plugin from
         any of namespaces.
 
+        If plugins are loaded with the plugin index, only the module which
+        defines the plugin is imported.
+
         :param name: Plugin's name
         :param namespace: Namespace where to search for plugins
         """
-        for p in cls.get_all(namespace=namespace):
+        plugin = cls._find(name, namespace)
+        if plugin is None and discover.import_indexed_modules(
+                cls, name=name, namespace=namespace):
+            plugin = cls._find(name, namespace)
+        if plugin is None:
+            raise exceptions.PluginNotFound(
+                name=name, namespace=namespace or "any of")
+        return plugin
+
+    @classmethod
+    def _find(cls, name, namespace=None):
+        for p in cls._get_all_loaded(namespace=namespace):
             if p.get_name() == name:
                 return p
-
-        raise exceptions.PluginNotFound(
-            name=name, namespace=namespace or "any of")
+        return None
 
     @classmethod
     def get_all(cls, namespace=None):
@@ -192,6 +207,11 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
 
         :param namespace: return only plugins from specified namespace.
         """
+        discover.import_indexed_modules(cls, namespace=namespace)
+        return cls._get_all_loaded(namespace=namespace)
+
+    @classmethod
+    def _get_all_loaded(cls, namespace=None):
         plugins = []
 
         for p in discover.itersubclasses(cls):
@@ -14,13 +14,13 @@
 #    under the License.
 
 import abc
+import bisect
 import math
 
 import six
 
 from rally.common.i18n import _
 from rally import exceptions
-from rally.task.processing import utils
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -125,30 +125,220 @@ class MaxComputation(StreamingAlgorithm):
         return self._value
 
 
+class QuantileSketch(object):
+    """Mergeable streaming quantile sketch with bounded memory.
+
+    Values are stored as is until there are more than exact_size of them,
+    so quantiles of small streams are exact. Then values are counted in
+    logarithmic buckets (DDSketch-like): a bucket with index i holds values
+    from gamma ** (i - 1) to gamma ** i, so any quantile is estimated with
+    relative error not greater than relative_accuracy regardless of the
+    number of values. Number of buckets is limited by max_buckets, the
+    lowest buckets are collapsed if it is exceeded.
+
+    Sketches with the same relative_accuracy can be merged, e.g. to
+    combine results of several worker processes or several tasks, and
+    serialized to JSON-compatible dicts with to_dict().
+    """
+
+    # NOTE: values with smaller absolute value are counted as zeros
+    MIN_VALUE = 1e-9
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048,
+                 exact_size=1000):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Unexpected relative accuracy: %s"
+                             % relative_accuracy)
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.exact_size = exact_size
+        self.count = 0
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        # NOTE: exact values are kept sorted and sorted bucket indexes are
+        #       cached, so quantile() which is called for each iteration by
+        #       SLA checks doesn't have to sort anything
+        self._values = []
+        self._positive = {}
+        self._negative = {}
+        self._zeros = 0
+        self._indexes = None
+
+    @property
+    def is_exact(self):
+        return self._values is not None
+
+    def add(self, value, count=1):
+        """Add value to the sketch."""
+        self.count += count
+        if self.is_exact:
+            for i in range(count):
+                bisect.insort(self._values, value)
+            if len(self._values) > self.exact_size:
+                self._to_buckets()
+        else:
+            self._add_to_buckets(value, count)
+
+    def merge(self, other):
+        """Add all values of other sketch to this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Can't merge sketches with different relative "
+                             "accuracy: %s and %s"
+                             % (self.relative_accuracy,
+                                other.relative_accuracy))
+        if other.is_exact:
+            for value in other._values:
+                self.add(value)
+            return
+        if self.is_exact:
+            self._to_buckets()
+        self.count += other.count
+        self._zeros += other._zeros
+        for own, others in ((self._positive, other._positive),
+                            (self._negative, other._negative)):
+            for index, count in others.items():
+                own[index] = own.get(index, 0) + count
+            self._collapse(own)
+        self._indexes = None
+
+    def quantile(self, percent):
+        """Estimate quantile of values.
+
+        :param percent: float value from 0.0 to 1.0
+        :returns: float value or None if there are no values
+        """
+        if not self.count:
+            return None
+        if self.is_exact:
+            value_at_rank = self._values.__getitem__
+        else:
+            value_at_rank = self._value_at_rank
+        k = (self.count - 1) * percent
+        f = math.floor(k)
+        c = math.ceil(k)
+        if f == c:
+            return value_at_rank(int(k))
+        return (value_at_rank(int(f)) * (c - k) +
+                value_at_rank(int(c)) * (k - f))
+
+    def to_dict(self):
+        """Serialize the sketch to JSON-compatible dict."""
+        return {"relative_accuracy": self.relative_accuracy,
+                "max_buckets": self.max_buckets,
+                "exact_size": self.exact_size,
+                "count": self.count,
+                "values": self._values,
+                "positive": sorted(self._positive.items()),
+                "negative": sorted(self._negative.items()),
+                "zeros": self._zeros}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore the sketch serialized by to_dict()."""
+        sketch = cls(data["relative_accuracy"], data["max_buckets"],
+                     data["exact_size"])
+        sketch.count = data["count"]
+        sketch._values = (None if data["values"] is None
+                          else sorted(data["values"]))
+        sketch._positive = dict((int(i), c) for i, c in data["positive"])
+        sketch._negative = dict((int(i), c) for i, c in data["negative"])
+        sketch._zeros = data["zeros"]
+        return sketch
+
+    def _to_buckets(self):
+        values, self._values = self._values, None
+        for value in values:
+            self._add_to_buckets(value, 1)
+
+    def _add_to_buckets(self, value, count):
+        if value > self.MIN_VALUE:
+            buckets = self._positive
+        elif value < -self.MIN_VALUE:
+            buckets = self._negative
+            value = -value
+        else:
+            self._zeros += count
+            return
+        index = int(math.ceil(math.log(value) / self._log_gamma))
+        if index in buckets:
+            buckets[index] += count
+            return
+        buckets[index] = count
+        self._indexes = None
+        if len(buckets) > self.max_buckets:
+            self._collapse(buckets)
+
+    def _collapse(self, buckets):
+        extra = len(buckets) - self.max_buckets
+        if extra <= 0:
+            return
+        indexes = sorted(buckets)
+        target = indexes[extra]
+        for index in indexes[:extra]:
+            buckets[target] += buckets.pop(index)
+
+    def _value(self, index):
+        return 2 * self._gamma ** index / (self._gamma + 1)
+
+    def _value_at_rank(self, rank):
+        if self._indexes is None:
+            self._indexes = (sorted(self._negative, reverse=True),
+                             sorted(self._positive))
+        negative, positive = self._indexes
+        # NOTE: buckets are walked from the nearest end, so high
+        #       percentiles (which are usually checked) are found quickly
+        reverse = rank > self.count // 2
+        if reverse:
+            rank = self.count - 1 - rank
+            sides = ((reversed(positive), self._positive, 1),
+                     (reversed(negative), self._negative, -1))
+        else:
+            sides = ((negative, self._negative, -1),
+                     (positive, self._positive, 1))
+
+        for i, (indexes, buckets, sign) in enumerate(sides):
+            for index in indexes:
+                rank -= buckets[index]
+                if rank < 0:
+                    return sign * self._value(index)
+            if i == 0:
+                rank -= self._zeros
+                if rank < 0:
+                    return 0.0
+        return 0.0
+
+
 class PercentileComputation(StreamingAlgorithm):
-    """Compute percentile value from a stream of numbers."""
+    """Compute percentile value from a stream of numbers.
 
-    def __init__(self, percent, length):
+    It uses QuantileSketch, so memory usage is bounded and the number of
+    values doesn't have to be known in advance.
+    """
+
+    def __init__(self, percent, length=None, relative_accuracy=0.01):
         """Init streaming computation.
 
         :param percent: numeric percent (from 0.00..1 to 0.999..)
-        :param length: count of the measurements
+        :param length: deprecated, count of the measurements is not
+                       needed anymore
+        :param relative_accuracy: max relative error of the result
         """
         if not 0 < percent < 1:
             raise ValueError("Unexpected percent: %s" % percent)
         self._percent = percent
-
-        self._graph_zipper = utils.GraphZipper(length, 10000)
+        self.sketch = QuantileSketch(relative_accuracy)
 
     def add(self, value):
-        self._graph_zipper.add_point(value)
+        self.sketch.add(self._cast_to_float(value))
+
+    def merge(self, other):
+        """Merge values processed by other PercentileComputation."""
+        self.sketch.merge(other.sketch)
 
     def result(self):
-        results = list(
-            map(lambda x: x[1], self._graph_zipper.get_zipped_graph()))
-        if not results:
+        if not self.sketch.count:
             raise ValueError("No values have been processed")
-        return utils.percentile(results, self._percent)
+        return self.sketch.quantile(self._percent)
 
 
 class IncrementComputation(StreamingAlgorithm):
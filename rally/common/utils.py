@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 import functools
 import inspect
 import multiprocessing
@@ -97,6 +98,63 @@ class Struct(object):
         self.__dict__.update(entries)
 
 
+def _lock(value):
+    if isinstance(value, dict) and not isinstance(value, LockedDict):
+        return LockedDict(value)
+    if isinstance(value, list):
+        return [_lock(item) for item in value]
+    return value
+
+
+def _unlock(value, memo):
+    if isinstance(value, LockedDict):
+        return dict((k, _unlock(v, memo)) for k, v in value.items())
+    if isinstance(value, list):
+        return [_unlock(item, memo) for item in value]
+    return copy.deepcopy(value, memo)
+
+
+class LockedDict(dict):
+    """Read-only dict, nested dicts are locked as well.
+
+    Locked dict can be shared between consumers without copying, since
+    none of them is able to change it. Dicts inside of nested lists are
+    locked too, but lists themselves are not, so they should not be
+    modified.
+
+    Deep copy of locked dict is an ordinary (unlocked) dict.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(LockedDict, self).__init__()
+        data = dict(*args, **kwargs)
+        for key, value in data.items():
+            super(LockedDict, self).__setitem__(key, _lock(value))
+
+    def _readonly(self, *args, **kwargs):
+        raise exceptions.ImmutableException()
+
+    __setitem__ = __delitem__ = _readonly
+    update = pop = popitem = clear = _readonly
+
+    def setdefault(self, key, default=None):
+        # NOTE: setdefault() of existing key doesn't change anything, so it
+        #       is allowed, e.g. for Context.__init__ of already set up
+        #       contexts
+        if key not in self:
+            raise exceptions.ImmutableException()
+        return self[key]
+
+    def __reduce__(self):
+        return LockedDict, (dict(self),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return _unlock(self, memo)
+
+
 class RAMInt(object):
     """Share RAM integer, for IPC.
 
@@ -105,9 +163,9 @@ class RAMInt(object):
     share integer among processes and threads.
     """
 
-    def __init__(self):
+    def __init__(self, value=0):
         self.__lock = multiprocessing.Lock()
-        self.__int = multiprocessing.Value("I", 0)
+        self.__int = multiprocessing.Value("I", value)
 
     def __int__(self):
         return self.__int.value
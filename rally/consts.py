@@ -75,6 +75,15 @@ class _DeployStatus(utils.ImmutableMixin, utils.EnumMixin):
     CLEANUP_FAILED = "cleanup->failed"
 
 
+class _DistributedChunkStatus(utils.ImmutableMixin, utils.EnumMixin):
+    PENDING = "pending"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+    ABORTING = "aborting"
+    ABORTED = "aborted"
+
+
 class _EndpointPermission(utils.ImmutableMixin, utils.EnumMixin):
     ADMIN = "admin"
     USER = "user"
@@ -174,6 +183,7 @@ class _ServiceType(utils.ImmutableMixin, utils.EnumMixin):
 
 TaskStatus = _TaskStatus()
 DeployStatus = _DeployStatus()
+DistributedChunkStatus = _DistributedChunkStatus()
 EndpointPermission = _EndpointPermission()
 ServiceType = _ServiceType()
 Service = _Service()
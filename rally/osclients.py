@@ -13,7 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import multiprocessing
 import os
+import threading
 
 from oslo_config import cfg
 
@@ -34,7 +36,13 @@ OSCLIENTS_OPTS = [
                 deprecated_for_removal=True),
     cfg.StrOpt("https_cacert", default=None,
                help="Path to CA server certificate for SSL",
-               deprecated_for_removal=True)
+               deprecated_for_removal=True),
+    cfg.BoolOpt("openstack_client_cache", default=True,
+                help="Share authenticated keystone clients between "
+                     "benchmark scenario iterations"),
+    cfg.IntOpt("openstack_client_token_stale_duration", default=60,
+               help="Seconds before token expiration when a shared "
+                    "keystone client is re-authenticated")
 ]
 CONF.register_opts(OSCLIENTS_OPTS)
 
@@ -68,11 +76,82 @@ def create_keystone_client(args):
         "Failed to discover keystone version for url %(auth_url)s.", **args)
 
 
+class KeystoneClientCache(object):
+    """Process-wide cache of authenticated keystone clients.
+
+    Clients are shared by all threads of the process and keyed by endpoint,
+    so scenario iterations reuse a token instead of authenticating each time.
+    A client whose token is about to expire is replaced by a new one.
+
+    Hits and misses are counted in shared memory, so lookups made in runner
+    worker processes forked after the cache creation are counted as well.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._hits = multiprocessing.Value("L", 0)
+        self._misses = multiprocessing.Value("L", 0)
+
+    @staticmethod
+    def _key(endpoint):
+        return tuple(sorted(endpoint.to_dict(include_permission=True).items()))
+
+    def _is_stale(self, client):
+        return client.auth_ref.will_expire_soon(
+            CONF.openstack_client_token_stale_duration)
+
+    def _count(self, counter):
+        with counter.get_lock():
+            counter.value += 1
+
+    def get(self, endpoint, create):
+        """Return cached keystone client for endpoint.
+
+        :param endpoint: objects.Endpoint instance
+        :param create: callable that returns a new authenticated client, it
+                       is called if there is no valid client in the cache
+        """
+        key = self._key(endpoint)
+        with self._lock:
+            client = self._clients.get(key)
+        if client is not None and not self._is_stale(client):
+            self._count(self._hits)
+            return client
+
+        # NOTE: authentication is done without holding the lock, so slow
+        #       keystone doesn't block threads that use other endpoints
+        self._count(self._misses)
+        client = create()
+        with self._lock:
+            self._clients[key] = client
+        return client
+
+    def clear(self):
+        """Remove all cached clients."""
+        with self._lock:
+            self._clients = {}
+
+    def stats(self):
+        """Return dict with numbers of cache hits and misses."""
+        return {"hits": self._hits.value, "misses": self._misses.value}
+
+
+keystone_cache = KeystoneClientCache()
+
+
 class Clients(object):
     """This class simplify and unify work with openstack python clients."""
 
-    def __init__(self, endpoint):
+    def __init__(self, endpoint, cache=None):
+        """Clients constructor.
+
+        :param endpoint: objects.Endpoint instance
+        :param cache: KeystoneClientCache instance to take keystone client
+                      from, by default new client is created
+        """
         self.endpoint = endpoint
+        self.keystone_cache = cache
         # NOTE(kun) Apply insecure/cacert settings from rally.conf if those are
         # not set in deployment config. Remove it when invaild.
         if self.endpoint.insecure is None:
@@ -99,6 +178,12 @@ class Clients(object):
     @cached
     def keystone(self):
         """Return keystone client."""
+        if self.keystone_cache is not None:
+            return self.keystone_cache.get(self.endpoint,
+                                           self._create_keystone)
+        return self._create_keystone()
+
+    def _create_keystone(self):
         new_kw = {
             "timeout": CONF.openstack_client_http_timeout,
             "insecure": self.endpoint.insecure, "cacert": self.endpoint.cacert
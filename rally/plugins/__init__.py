@@ -18,18 +18,32 @@ import os
 import decorator
 
 from rally.common.plugin import discover
+from rally.common.plugin import plugin
 
 
 PLUGINS_LOADED = False
 
+PLUGIN_PACKAGES = ("rally.deployment.engines",
+                   "rally.deployment.serverprovider",
+                   "rally.plugins")
 
-def load():
+
+def load(lazy=True):
+    """Load plugins of Rally and custom plugins.
+
+    :param lazy: if True, modules of Rally packages are imported only when
+                 their plugins are requested, see
+                 discover.load_plugin_index(), otherwise all of them are
+                 imported at once
+    """
     global PLUGINS_LOADED
 
     if not PLUGINS_LOADED:
-        discover.import_modules_from_package("rally.deployment.engines")
-        discover.import_modules_from_package("rally.deployment.serverprovider")
-        discover.import_modules_from_package("rally.plugins")
+        if lazy:
+            discover.load_plugin_index(PLUGIN_PACKAGES, plugin.Plugin)
+        else:
+            for package in PLUGIN_PACKAGES:
+                discover.import_modules_from_package(package)
 
         discover.load_plugins("/opt/rally/plugins/")
         discover.load_plugins(os.path.expanduser("~/.rally/plugins/"))
@@ -0,0 +1,210 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import sys
+import time
+
+import six
+
+from rally.common import log as logging
+from rally import consts
+from rally import exceptions
+from rally.task import runner
+from rally.task import utils
+
+try:
+    import asyncio
+except ImportError:
+    # asyncio is a part of standard library since Python 3.4, the runner
+    # can't be used with older versions.
+    asyncio = None
+
+
+LOG = logging.getLogger(__name__)
+
+
+def _start_iteration(loop, args, timeout):
+    """Start a single scenario iteration in the event loop.
+
+    The scenario method is expected to return an awaitable object
+    (a coroutine or a future). The iteration is finished when it is done.
+
+    :param loop: asyncio event loop
+    :param args: (iteration, cls, method_name, context_obj, kwargs) tuple,
+                 the same as for runner._run_scenario_once
+    :param timeout: number of seconds after which the iteration is
+                    cancelled, 0 means no timeout
+    :returns: asyncio.Future with the iteration result dict
+    """
+    iteration, cls, method_name, context_obj, kwargs = args
+    result = asyncio.Future(loop=loop)
+
+    context_obj["iteration"] = iteration
+    scenario_inst = cls(context_obj)
+    start = time.time()
+
+    def finish(error, scenario_output):
+        duration = time.time() - start
+        result.set_result({
+            "duration": duration - scenario_inst.idle_duration(),
+            "timestamp": start,
+            "idle_duration": scenario_inst.idle_duration(),
+            "error": error,
+            "scenario_output": scenario_output or {"errors": "", "data": {}},
+            "atomic_actions": scenario_inst.atomic_actions()})
+
+    def on_done(future):
+        if timer:
+            timer.cancel()
+        if future.cancelled():
+            exc = asyncio.TimeoutError("Iteration took more than %s seconds"
+                                       % timeout)
+            result.set_result(runner.format_result_on_timeout(exc, timeout))
+        elif future.exception():
+            exc = future.exception()
+            if logging.is_debug():
+                LOG.exception(exc)
+            finish(utils.format_exc(exc), None)
+        else:
+            finish([], future.result())
+
+    timer = None
+    try:
+        future = asyncio.ensure_future(
+            getattr(scenario_inst, method_name)(**kwargs), loop=loop)
+    except Exception as e:
+        if logging.is_debug():
+            LOG.exception(e)
+        finish(utils.format_exc(e), None)
+        return result
+
+    if timeout:
+        timer = loop.call_later(timeout, future.cancel)
+    future.add_done_callback(on_done)
+    return result
+
+
+@runner.configure(name="asyncio")
+class AsyncioScenarioRunner(runner.ScenarioRunner):
+    """Creates constant load of coroutine scenarios in an event loop.
+
+    This runner executes a specified number of iterations of a scenario
+    which returns an awaitable object (e.g. HttpRequests.check_request_async)
+    in a single asyncio event loop. The concurrency parameter limits number
+    of iterations that are in progress at the same time, it is not bound to
+    number of threads or processes, so a single Rally process can keep tens
+    of thousands of I/O-bound iterations in flight.
+
+    This runner requires Python 3.4 or newer.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "concurrency": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "times": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "timeout": {
+                "type": "number",
+                "minimum": 0
+            }
+        },
+        "required": ["type"],
+        "additionalProperties": False
+    }
+
+    def _run_scenario(self, cls, method_name, context, args):
+        """Runs the specified benchmark scenario with given arguments.
+
+        Iterations are started in the event loop as long as less than
+        concurrency of them are in progress; a new iteration is started as
+        soon as one of the running ones is finished.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Benchmark context that contains users, admin & other
+                        information, that was created before benchmark started.
+        :param args: Arguments to call the scenario method with
+
+        :returns: List of results fore each single scenario iteration,
+                  where each result is a dictionary
+        """
+        if asyncio is None:
+            raise exceptions.IncompatiblePythonVersion(
+                version=sys.version, required_version=">=3.4")
+
+        times = self.config.get("times", 1)
+        concurrency = self.config.get("concurrency", 1)
+        timeout = self.config.get("timeout", 0)  # 0 means no timeout
+
+        self._log_debug_info(times=times, concurrency=concurrency,
+                             timeout=timeout)
+
+        loop = asyncio.new_event_loop()
+        state = {"started": 0, "running": 0, "error": None}
+
+        def stop_on_error(func):
+            # NOTE: exceptions of loop callbacks are only passed to the loop
+            #       exception handler, so the loop would never be stopped
+            def wrapper(*args):
+                if state["error"]:
+                    return
+                try:
+                    func(*args)
+                except Exception:
+                    state["error"] = sys.exc_info()
+                    loop.stop()
+            return wrapper
+
+        @stop_on_error
+        def start_iterations():
+            while (state["running"] < concurrency and
+                   state["started"] < times and not self.aborted.is_set()):
+                run_args = (state["started"], cls, method_name,
+                            runner._get_scenario_context(context), args)
+                state["started"] += 1
+                state["running"] += 1
+                _start_iteration(loop, run_args, timeout).add_done_callback(
+                    on_iteration_done)
+            if not state["running"]:
+                loop.stop()
+
+        @stop_on_error
+        def on_iteration_done(future):
+            state["running"] -= 1
+            self._send_result(future.result())
+            start_iterations()
+
+        # NOTE: scenarios get the loop of the runner by
+        #       asyncio.get_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.call_soon(start_iterations)
+        try:
+            loop.run_forever()
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+        if state["error"]:
+            six.reraise(*state["error"])
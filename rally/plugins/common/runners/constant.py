@@ -13,7 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import collections
 import multiprocessing
 import threading
 import time
@@ -27,21 +26,55 @@ from rally.task import utils as butils
 LOG = logging.getLogger(__name__)
 
 
+def _worker_thread(results, iteration_gen, times, context, cls,
+                   method_name, args, aborted):
+    """Run scenario iterations one after another until there are no more.
+
+    Threads of a worker process share iteration_gen, so each of them takes
+    the next free iteration number as soon as the previous iteration it ran
+    has finished. The time spent by the runner itself to prepare each
+    iteration is stored in the result as runner_overhead.
+
+    :param results: ResultBatcher object to put results to
+    :param iteration_gen: next iteration number generator
+    :param times: number of the iteration after the last one to be run
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    """
+    while not aborted.is_set():
+        started_at = time.time()
+        iteration = next(iteration_gen)
+        if iteration >= times:
+            break
+        scenario_context = runner._get_scenario_context(context)
+        overhead = time.time() - started_at
+
+        result = runner._run_scenario_once(
+            (iteration, cls, method_name, scenario_context, args))
+        result["runner_overhead"] = overhead
+        results.put(result)
+
+
 def _worker_process(queue, iteration_gen, timeout, concurrency, times, context,
                     cls, method_name, args, aborted, info):
     """Start the scenario within threads.
 
-    Spawn threads to support scenario execution for a fixed number of times.
-    This generates a constant load on the cloud under test by executing each
-    scenario iteration without pausing between iterations. Each thread runs
-    the scenario method once with passed scenario arguments and context.
-    After execution the result is appended to the queue.
+    Start a fixed pool of threads to support scenario execution for a fixed
+    number of times. This generates a constant load on the cloud under test
+    by executing each scenario iteration without pausing between iterations.
+    Each thread runs scenario iterations one by one with passed scenario
+    arguments and context, until all iterations are taken. After execution
+    results are sent to the queue.
 
     :param queue: queue object to append results
     :param iteration_gen: next iteration number generator
     :param timeout: operation's timeout
     :param concurrency: number of concurrently running scenario iterations
-    :param times: total number of scenario iterations to be run
+    :param times: number of the iteration after the last one to be run
     :param context: scenario context object
     :param cls: scenario class
     :param method_name: scenario method name
@@ -51,52 +84,25 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times, context,
     :param info: info about all processes count and counter of launched process
     """
 
-    pool = collections.deque()
-    alive_threads_in_pool = 0
-    finished_threads_in_pool = 0
+    results = runner.ResultBatcher(queue)
 
     runner._log_worker_info(times=times, concurrency=concurrency,
                             timeout=timeout, cls=cls, method_name=method_name,
                             args=args)
 
-    iteration = next(iteration_gen)
-    while iteration < times and not aborted.is_set():
-        scenario_context = runner._get_scenario_context(context)
-        scenario_args = (iteration, cls, method_name, scenario_context, args)
-        worker_args = (queue, scenario_args)
-
-        thread = threading.Thread(target=runner._worker_thread,
-                                  args=worker_args)
+    pool = []
+    for i in range(concurrency):
+        thread = threading.Thread(
+            target=_worker_thread,
+            args=(results, iteration_gen, times, context, cls, method_name,
+                  args, aborted))
         thread.start()
-        pool.append((thread, time.time()))
-        alive_threads_in_pool += 1
-
-        while alive_threads_in_pool == concurrency:
-            prev_finished_threads_in_pool = finished_threads_in_pool
-            finished_threads_in_pool = 0
-            for t in pool:
-                if not t[0].isAlive():
-                    finished_threads_in_pool += 1
-
-            alive_threads_in_pool -= finished_threads_in_pool
-            alive_threads_in_pool += prev_finished_threads_in_pool
-
-            if alive_threads_in_pool < concurrency:
-                # NOTE(boris-42): cleanup pool array. This is required because
-                # in other case array length will be equal to times which
-                # is unlimited big
-                while pool and not pool[0][0].isAlive():
-                    pool.popleft()[0].join()
-                    finished_threads_in_pool -= 1
-                break
-
-            # we should wait to not create big noise with these checks
-            time.sleep(0.001)
-        iteration = next(iteration_gen)
+        pool.append(thread)
 
     # Wait until all threads are done
-    while pool:
-        pool.popleft()[0].join()
+    for thread in pool:
+        thread.join()
+    results.close()
 
 
 @runner.configure(name="constant")
@@ -141,6 +147,39 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
         "additionalProperties": False
     }
 
+    def __init__(self, task, config):
+        super(ConstantScenarioRunner, self).__init__(task, config)
+        # NOTE: iterations are numbered from first_iteration, distributed
+        #       workers set it to run a part of iterations of a workload
+        self.first_iteration = 0
+        self._iterations = 0
+        self._overhead_sum = 0.0
+        self._max_overhead = 0.0
+
+    def _send_results(self, results):
+        """Send results to consumer and account runner overhead."""
+        super(ConstantScenarioRunner, self)._send_results(results)
+        for result in results:
+            overhead = result.get("runner_overhead")
+            if overhead is not None:
+                self._iterations += 1
+                self._overhead_sum += overhead
+                self._max_overhead = max(self._max_overhead, overhead)
+
+    def get_stats(self):
+        """Return time spent by the runner itself to prepare iterations.
+
+        :returns: dict with the following keys:
+                  mean_runner_overhead - float mean overhead of iteration,
+                                         None if there were no iterations
+                  max_runner_overhead - float max overhead of iteration
+        """
+        mean_overhead = None
+        if self._iterations:
+            mean_overhead = self._overhead_sum / self._iterations
+        return {"mean_runner_overhead": mean_overhead,
+                "max_runner_overhead": self._max_overhead}
+
     def _run_scenario(self, cls, method_name, context, args):
         """Runs the specified benchmark scenario with given arguments.
 
@@ -161,7 +200,7 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
         timeout = self.config.get("timeout", 0)  # 0 means no timeout
         times = self.config.get("times", 1)
         concurrency = self.config.get("concurrency", 1)
-        iteration_gen = utils.RAMInt()
+        iteration_gen = utils.RAMInt(self.first_iteration)
 
         cpu_count = multiprocessing.cpu_count()
         max_cpu_used = min(cpu_count,
@@ -183,7 +222,8 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
             while True:
                 yield (result_queue, iteration_gen, timeout,
                        concurrency_per_worker + (concurrency_overhead and 1),
-                       times, context, cls, method_name, args, self.aborted)
+                       self.first_iteration + times, context, cls,
+                       method_name, args, self.aborted)
                 if concurrency_overhead:
                     concurrency_overhead -= 1
 
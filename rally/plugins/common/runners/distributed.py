@@ -0,0 +1,239 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import time
+import uuid
+
+from oslo_config import cfg
+from oslo_utils import timeutils
+
+from rally.common import db
+from rally.common.i18n import _
+from rally.common import log as logging
+from rally import consts
+from rally import exceptions
+from rally.task import distributed
+from rally.task import runner
+
+
+LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
+
+STATUSES = consts.DistributedChunkStatus
+DONE_STATUSES = (STATUSES.FINISHED, STATUSES.FAILED, STATUSES.ABORTED)
+
+
+@runner.configure(name="distributed")
+class DistributedScenarioRunner(runner.ScenarioRunner):
+    """Spreads iterations of a scenario between registered workers.
+
+    Iterations are split into chunks of chunk_size iterations, which are
+    claimed by workers started with "rally-manage worker start" on any
+    hosts that use the same database. Each worker runs its chunk with the
+    constant runner with the given concurrency, so the total concurrency
+    is multiplied by the number of workers.
+
+    Timestamps of iterations are shifted from the worker clock to the
+    clock of this host. The offset is estimated as the min delay between
+    sending a batch of results by the worker and receiving it here, so it
+    is precise up to the poll interval even if clocks of the hosts are not
+    synchronized.
+
+    Chunks of workers that stop sending heartbeats for worker_timeout
+    seconds are returned to the queue without iterations that are already
+    done.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "times": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "concurrency": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "chunk_size": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "timeout": {
+                "type": "number",
+            },
+            "worker_timeout": {
+                "type": "number",
+                "minimum": 0.0
+            }
+        },
+        "required": ["type"],
+        "additionalProperties": False
+    }
+
+    DEFAULT_CHUNK_SIZE = 100
+    DEFAULT_WORKER_TIMEOUT = 60
+
+    def __init__(self, task, config):
+        super(DistributedScenarioRunner, self).__init__(task, config)
+        self._name = None
+        self._raw_args = None
+        self._workers = set()
+        self._clock_offsets = {}
+        self._requeued = 0
+
+    def run(self, name, context, args):
+        # NOTE: workers preprocess scenario args by themselves, so args are
+        #       sent to them as they are in the task
+        self._name = name
+        self._raw_args = args
+        return super(DistributedScenarioRunner, self).run(name, context, args)
+
+    def _receive(self, workload_id, owners, received):
+        """Pass new results of workers to the consumer.
+
+        :param owners: dict of chunk id to the worker that runs it now
+        :param received: dict of chunk id to the number of results received
+                         from its current worker
+        """
+        for batch in db.distributed_results_pop(workload_id):
+            if owners.get(batch.chunk_id) != batch.worker:
+                # NOTE: results of the worker which lost the chunk
+                continue
+            offset = time.time() - batch.sent_at
+            offset = min(offset, self._clock_offsets.get(batch.worker,
+                                                         offset))
+            self._clock_offsets[batch.worker] = offset
+            self._workers.add(batch.worker)
+            results = batch.data
+            for result in results:
+                result["timestamp"] += offset
+            received[batch.chunk_id] = (received.get(batch.chunk_id, 0) +
+                                        len(results))
+            self._send_results(results)
+
+    def _is_worker_alive(self, hostname, worker_timeout):
+        try:
+            worker = db.get_worker(hostname)
+        except exceptions.WorkerNotFound:
+            return False
+        deadline = timeutils.utcnow() - datetime.timedelta(
+            seconds=worker_timeout)
+        return worker["updated_at"] > deadline
+
+    def _requeue(self, chunk, received, worker_timeout):
+        """Return the chunk of a dead worker to the queue."""
+        if self._is_worker_alive(chunk.worker, worker_timeout):
+            return
+        done = received.pop(chunk.id, 0)
+        values = {"status": STATUSES.PENDING, "worker": None,
+                  "start": chunk.start + done, "count": chunk.count - done}
+        if chunk.status == STATUSES.ABORTING:
+            values = {"status": STATUSES.ABORTED}
+        elif done >= chunk.count:
+            values = {"status": STATUSES.FINISHED}
+        if db.distributed_chunk_update(chunk.id, values,
+                                       statuses=[chunk.status],
+                                       worker=chunk.worker):
+            LOG.warning(_("Worker %(worker)s is lost, chunk %(id)s is "
+                          "returned to the queue.") % {"worker": chunk.worker,
+                                                       "id": chunk.id})
+            self._requeued += 1
+
+    def _send_failed(self, chunk, received):
+        """Send errors for iterations of a failed chunk that were not run."""
+        missing = chunk.count - received.get(chunk.id, 0)
+        error = ["DistributedChunkFailed",
+                 chunk.error or _("Worker %s failed") % chunk.worker, ""]
+        self._send_results([{"duration": 0, "idle_duration": 0,
+                             "timestamp": time.time(), "error": error,
+                             "scenario_output": {"errors": "", "data": {}},
+                             "atomic_actions": {}}] * missing)
+
+    def _run_scenario(self, cls, method_name, context, args):
+        """Runs the specified benchmark scenario on registered workers.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Benchmark context that contains users, admin & other
+                        information, that was created before benchmark started.
+        :param args: Arguments to call the scenario method with
+        """
+        times = self.config.get("times", 1)
+        chunk_size = self.config.get("chunk_size", self.DEFAULT_CHUNK_SIZE)
+        worker_timeout = self.config.get("worker_timeout",
+                                         self.DEFAULT_WORKER_TIMEOUT)
+        workload_id = str(uuid.uuid4())
+        data = {"scenario": self._name, "args": self._raw_args,
+                "concurrency": self.config.get("concurrency", 1),
+                "timeout": self.config.get("timeout", 0),
+                "context": distributed.serialize_context(context)}
+        ranges = [(start, min(chunk_size, times - start))
+                  for start in range(0, times, chunk_size)]
+
+        self._log_debug_info(times=times, chunk_size=chunk_size,
+                             chunks=len(ranges), workload_id=workload_id,
+                             concurrency=data["concurrency"])
+        db.distributed_chunks_create(self.task["uuid"], workload_id, data,
+                                     ranges)
+        received = {}
+        aborting = False
+        started_at = time.time()
+        try:
+            while True:
+                chunks = db.distributed_chunk_get_all(workload_id)
+                owners = dict((c.id, c.worker) for c in chunks)
+                self._receive(workload_id, owners, received)
+                if all(c.status in DONE_STATUSES for c in chunks):
+                    break
+                if (not self._workers and
+                        time.time() - started_at > worker_timeout and
+                        all(c.status == STATUSES.PENDING for c in chunks)):
+                    raise exceptions.RallyException(
+                        _("No workers took iterations of the scenario in "
+                          "%s seconds, start them with \"rally-manage "
+                          "worker start\".") % worker_timeout)
+                if self.aborted.is_set() and not aborting:
+                    db.distributed_chunks_abort(workload_id)
+                    aborting = True
+                for chunk in chunks:
+                    if chunk.status in (STATUSES.RUNNING, STATUSES.ABORTING):
+                        self._requeue(chunk, received, worker_timeout)
+                time.sleep(CONF.benchmark.distributed_poll_interval)
+
+            for chunk in chunks:
+                if chunk.status == STATUSES.FAILED:
+                    self._send_failed(chunk, received)
+        finally:
+            db.distributed_workload_delete(workload_id)
+
+    def get_stats(self):
+        """Return statistics of the distributed load generation.
+
+        :returns: dict with the following keys:
+                  workers - number of workers that ran iterations
+                  requeued_chunks - number of chunks of lost workers
+                                    returned to the queue
+                  clock_offsets - dict of estimated difference between
+                                  clocks of this host and each worker
+        """
+        return {"workers": len(self._workers),
+                "requeued_chunks": self._requeued,
+                "clock_offsets": self._clock_offsets}
@@ -18,6 +18,8 @@ import multiprocessing
 import threading
 import time
 
+import six
+
 from rally.common import log as logging
 from rally.common import utils
 from rally import consts
@@ -26,15 +28,59 @@ from rally.task import runner
 LOG = logging.getLogger(__name__)
 
 
+def _worker_thread(results, slots, scheduled_start, args):
+    """Run the scenario once and record how late it was started.
+
+    :param results: ResultBatcher object to put the result to
+    :param slots: semaphore limiting concurrently running iterations,
+                  it is released once the iteration is finished
+    :param scheduled_start: timestamp when the iteration had to be started
+    :param args: arguments for runner._run_scenario_once
+    """
+    try:
+        result = runner._run_scenario_once(args)
+    finally:
+        slots.release()
+    result["start_lag"] = max(result["timestamp"] - scheduled_start, 0.0)
+    results.put(result)
+
+
+def _acquire_slot(slots, aborted, interval=0.1):
+    """Wait for a free slot unless load generation is aborted.
+
+    :param slots: semaphore limiting concurrently running iterations
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param interval: how often (in seconds) the aborted flag is checked
+    :returns: True if the slot is acquired, False if aborted
+    """
+    while not aborted.is_set():
+        if six.PY2:
+            # NOTE: acquire() doesn't support timeout in Python 2
+            if slots.acquire(False):
+                return True
+            aborted.wait(min(interval, 0.01))
+        elif slots.acquire(timeout=interval):
+            return True
+    return False
+
+
 def _worker_process(queue, iteration_gen, timeout, rps, times,
                     max_concurrent, context, cls, method_name,
                     args, aborted, info):
     """Start scenario within threads.
 
-    Spawn N threads per second. Each thread runs the scenario once, and appends
-    result to queue. A maximum of max_concurrent threads will be ran
+    Start N threads per second. Each thread runs the scenario once, and
+    sends result to queue. A maximum of max_concurrent threads will be run
     concurrently.
 
+    The load is open-loop: start time of the i-th iteration is computed in
+    advance as start + i / rps, so the worker catches up after a delay
+    instead of shifting the whole schedule. If an iteration can not be
+    started in time (e.g. max_concurrent iterations are still running), the
+    difference between its scheduled and actual start is stored in the
+    result as start_lag, so coordinated omission is visible in the results.
+
     :param queue: queue object to append results
     :param iteration_gen: next iteration number generator
     :param timeout: operation's timeout
@@ -51,47 +97,47 @@ def _worker_process(queue, iteration_gen, timeout, rps, times,
     """
 
     pool = collections.deque()
-    sleep = 1.0 / rps
+    results = runner.ResultBatcher(queue)
+    slots = threading.BoundedSemaphore(max_concurrent)
+    interval = 1.0 / rps
 
     runner._log_worker_info(times=times, rps=rps, timeout=timeout,
                             cls=cls, method_name=method_name, args=args)
 
-    time.sleep(
-        (sleep * info["processes_counter"]) / info["processes_to_start"])
-
-    start = time.time()
+    # shift start of each worker, so all of them together produce evenly
+    # distributed load
+    start = time.time() + (
+        (interval * info["processes_counter"]) / info["processes_to_start"])
 
     i = 0
     while i < times and not aborted.is_set():
+        scheduled_start = start + i * interval
+        delay = scheduled_start - time.time()
+        if delay > 0 and aborted.wait(delay):
+            break
+
+        # blocks while max_concurrent iterations are running
+        if not _acquire_slot(slots, aborted):
+            break
         scenario_context = runner._get_scenario_context(context)
         scenario_args = (next(iteration_gen), cls, method_name,
                          scenario_context, args)
-        worker_args = (queue, scenario_args)
-        thread = threading.Thread(target=runner._worker_thread,
-                                  args=worker_args)
+        thread = threading.Thread(
+            target=_worker_thread,
+            args=(results, slots, scheduled_start, scenario_args))
         i += 1
         thread.start()
         pool.append(thread)
 
-        time_gap = time.time() - start
-        real_rps = i / time_gap if time_gap else "Infinity"
+        LOG.debug("Worker: %s start lag: %.4f (requested rps: %s)" %
+                  (i, max(time.time() - scheduled_start, 0.0), rps))
 
-        LOG.debug("Worker: %s rps: %s (requested rps: %s)" %
-                  (i, real_rps, rps))
-
-        # try to join latest thread(s) until it finished, or until time to
-        # start new thread (if we have concurrent slots available)
-        while i / (time.time() - start) > rps or len(pool) >= max_concurrent:
-            if pool:
-                pool[0].join(0.001)
-                if not pool[0].isAlive():
-                    pool.popleft()
-            else:
-                time.sleep(0.001)
+        while pool and not pool[0].is_alive():
+            pool.popleft().join()
 
     while pool:
-        thr = pool.popleft()
-        thr.join()
+        pool.popleft().join()
+    results.close()
 
 
 @runner.configure(name="rps")
@@ -138,6 +184,56 @@ class RPSScenarioRunner(runner.ScenarioRunner):
         "additionalProperties": False
     }
 
+    def __init__(self, task, config):
+        super(RPSScenarioRunner, self).__init__(task, config)
+        self._slot_duration = 0
+        self._iterations = 0
+        self._missed_slots = 0
+        self._max_start_lag = 0.0
+        self._first_start = None
+        self._last_start = None
+
+    def _send_results(self, results):
+        """Send results to consumer and account their start lags.
+
+        An iteration is counted as a missed slot if it was started later
+        than the next iteration of the same worker had to be started.
+        """
+        super(RPSScenarioRunner, self)._send_results(results)
+        for result in results:
+            self._iterations += 1
+            lag = result.get("start_lag", 0)
+            if self._slot_duration and lag >= self._slot_duration:
+                self._missed_slots += 1
+            self._max_start_lag = max(self._max_start_lag, lag)
+            timestamp = result.get("timestamp")
+            if timestamp is not None:
+                if self._first_start is None or timestamp < self._first_start:
+                    self._first_start = timestamp
+                if self._last_start is None or timestamp > self._last_start:
+                    self._last_start = timestamp
+
+    def get_stats(self):
+        """Return requested and achieved rate of starting iterations.
+
+        :returns: dict with the following keys:
+                  rps - float requested iterations per second
+                  achieved_rps - float number of iterations actually started
+                                 per second, None if less than two
+                                 iterations were started
+                  missed_slots - int number of iterations that were not
+                                 started in their time slot
+                  max_start_lag - float max delay of iteration start
+        """
+        achieved_rps = None
+        if self._iterations > 1 and self._last_start > self._first_start:
+            achieved_rps = ((self._iterations - 1) /
+                            (self._last_start - self._first_start))
+        return {"rps": float(self.config["rps"]),
+                "achieved_rps": achieved_rps,
+                "missed_slots": self._missed_slots,
+                "max_start_lag": self._max_start_lag}
+
     def _run_scenario(self, cls, method_name, context, args):
         """Runs the specified benchmark scenario with given arguments.
 
@@ -166,6 +262,7 @@ class RPSScenarioRunner(runner.ScenarioRunner):
         processes_to_start = min(max_cpu_used, times,
                                  self.config.get("max_concurrency", times))
         rps_per_worker = float(self.config["rps"]) / processes_to_start
+        self._slot_duration = 1.0 / rps_per_worker
         times_per_worker, times_overhead = divmod(times, processes_to_start)
 
         # Determine concurrency per worker
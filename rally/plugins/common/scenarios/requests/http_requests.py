@@ -34,6 +34,26 @@ class HttpRequests(utils.RequestScenario):
 
         self._check_request(url, method, status_code, **kwargs)
 
+    @scenario.configure()
+    def check_request_async(self, url, method, status_code, headers=None,
+                            data=None):
+        """Benchmark web services with non-blocking requests.
+
+        This benchmark works like check_request, but it doesn't block while
+        waiting for the response, so it should be run by the asyncio runner,
+        which keeps many such requests in flight in a single process.
+
+        :param url: url for the request
+        :param method: method for the request
+        :param status_code: expected response code
+        :param headers: optional dict of additional request headers
+        :param data: optional body of the request
+        :returns: asyncio.Future which is done when the response is checked
+        """
+
+        return self._check_request_async(url, method, status_code,
+                                         headers=headers, data=data)
+
     @scenario.configure()
     def check_random_request(self, requests, status_code):
         """Benchmark the list of requests
@@ -10,12 +10,62 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
+
 import requests
+from six.moves.urllib import parse
 
 from rally.common.i18n import _
 from rally.task import atomic
 from rally.task import scenario
 
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+
+class _HTTPStatusProtocol(object):
+    """asyncio protocol that sends one HTTP request and reads status code.
+
+    The connection is closed as soon as the status line of the response is
+    received, since only the status code is checked.
+    """
+
+    def __init__(self, request, status):
+        """_HTTPStatusProtocol constructor.
+
+        :param request: bytes of the whole HTTP request to send
+        :param status: asyncio.Future to set the response status code to
+        """
+        self.request = request
+        self.status = status
+        self.buffer = b""
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.write(self.request)
+
+    def data_received(self, data):
+        self.buffer += data
+        if b"\r\n" in self.buffer and not self.status.done():
+            status_line = self.buffer.split(b"\r\n", 1)[0].split()
+            try:
+                self.status.set_result(int(status_line[1]))
+            except (IndexError, ValueError):
+                self.status.set_exception(ValueError(
+                    _("Invalid HTTP response: %s") % self.buffer[:80]))
+            self.transport.close()
+
+    def eof_received(self):
+        return False
+
+    def connection_lost(self, exc):
+        if not self.status.done():
+            self.status.set_exception(exc or ValueError(
+                _("Connection closed without HTTP response")))
+
 
 class RequestScenario(scenario.Scenario):
     """Base class for Request scenarios with basic atomic actions."""
@@ -37,3 +87,82 @@ class RequestScenario(scenario.Scenario):
             error_msg = _("Expected HTTP request code is `%s` actual `%s`")
             raise ValueError(
                 error_msg % (status_code, resp.status_code))
+
+    def _check_request_async(self, url, method, status_code, headers=None,
+                             data=None):
+        """Compare status code of asynchronous request with specified code
+
+        Unlike _check_request, it doesn't block the caller: the request is
+        sent by the event loop set by the asyncio runner, so the method is
+        intended for scenarios executed by this runner.
+
+        :param url: Uniform resource locator
+        :param method: Type of request method (GET | POST ..)
+        :param status_code: Expected status code of request
+        :param headers: Optional dict of additional request headers
+        :param data: Optional str body of the request
+        :returns: asyncio.Future which is done when the response is received,
+                  its exception is ValueError if return http status code
+                  is not equal to expected status code
+        """
+        loop = asyncio.get_event_loop()
+        parsed = parse.urlsplit(url)
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        body = (data or "").encode("utf-8")
+        lines = ["%s %s HTTP/1.1" % (method, path),
+                 "Host: %s" % parsed.netloc,
+                 "Connection: close",
+                 "Content-Length: %d" % len(body)]
+        lines.extend("%s: %s" % item for item in (headers or {}).items())
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8") + body
+
+        status = asyncio.Future(loop=loop)
+        result = asyncio.Future(loop=loop)
+        name = atomic.ActionTimer(self, "requests.check_request_async").name
+        start = time.time()
+
+        def on_status(future):
+            exc = future.exception()
+            if result.done():
+                # NOTE: result is cancelled by the runner on timeout
+                return
+            if exc:
+                result.set_exception(exc)
+                return
+            self._atomic_actions[name] = time.time() - start
+            if status_code != future.result():
+                error_msg = _("Expected HTTP request code is `%s` actual `%s`")
+                result.set_exception(ValueError(
+                    error_msg % (status_code, future.result())))
+            else:
+                result.set_result(None)
+
+        status.add_done_callback(on_status)
+        connect = asyncio.ensure_future(loop.create_connection(
+            lambda: _HTTPStatusProtocol(request, status),
+            parsed.hostname,
+            parsed.port or (443 if parsed.scheme == "https" else 80),
+            ssl=parsed.scheme == "https"), loop=loop)
+
+        def on_connect(future):
+            if future.cancelled():
+                # NOTE: connect is cancelled by on_result on timeout
+                return
+            if future.exception() and not status.done():
+                status.set_exception(future.exception())
+
+        connect.add_done_callback(on_connect)
+
+        def on_result(future):
+            if not future.cancelled():
+                return
+            if not connect.done():
+                connect.cancel()
+            elif not connect.cancelled() and not connect.exception():
+                transport, protocol = connect.result()
+                transport.close()
+
+        result.add_done_callback(on_result)
+        return result
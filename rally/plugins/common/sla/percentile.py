@@ -0,0 +1,162 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""
+SLA (Service-level agreement) is set of details for determining compliance
+with contracted values such as maximum error rate or minimum response time.
+"""
+
+from rally.common import costilius
+from rally.common.i18n import _
+from rally.common import streaming_algorithms
+from rally import consts
+from rally.task import sla
+
+
+PERCENTILES_SCHEMA = {
+    "type": "object",
+    "patternProperties": {
+        "^[0-9]{1,2}(\\.[0-9]+)?$": {"type": "number", "minimum": 0.0,
+                                     "exclusiveMinimum": True}
+    },
+    "minProperties": 1,
+    "additionalProperties": False
+}
+
+
+class _Percentiles(object):
+    """Tracks percentiles of a stream of durations with bounded memory."""
+
+    def __init__(self, limits):
+        """Init percentiles.
+
+        :param limits: dict {"<percentile>": <max duration>, ...}, e.g.
+                       {"95": 1.5, "99.9": 4}
+        """
+        self.limits = sorted((float(p) / 100, float(p), m)
+                             for p, m in limits.items())
+        self.sketch = streaming_algorithms.QuantileSketch(exact_size=100)
+        self.values = {}
+
+    def add(self, duration):
+        self.sketch.add(duration)
+
+    def check(self):
+        """Recalculate percentiles and compare them with the limits."""
+        success = True
+        for percent, name, limit in self.limits:
+            self.values[name] = self.sketch.quantile(percent)
+            success = success and self.values[name] <= limit
+        return success
+
+    def details(self):
+        return ", ".join(
+            "%s%%ile %.2fs <= %.2fs" % (("%g" % name),
+                                        self.values.get(name) or 0, limit)
+            for percent, name, limit in self.limits)
+
+
+@sla.configure(name="max_duration_percentile")
+class MaxDurationPercentile(sla.SLA):
+    """Maximum percentiles of duration of successful iterations in seconds.
+
+    Percentiles are calculated after each iteration (with a bounded-memory
+    streaming estimator), so the SLA fails as soon as the tail latency
+    exceeds the limit, e.g.:
+
+        "max_duration_percentile": {"percentiles": {"95": 2, "99": 5},
+                                    "min_iterations": 10}
+    """
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "percentiles": PERCENTILES_SCHEMA,
+            "min_iterations": {"type": "integer", "minimum": 1}
+        },
+        "required": ["percentiles"],
+        "additionalProperties": False
+    }
+
+    def __init__(self, criterion_value):
+        super(MaxDurationPercentile, self).__init__(criterion_value)
+        self.min_iterations = self.criterion_value.get("min_iterations", 1)
+        self.percentiles = _Percentiles(self.criterion_value["percentiles"])
+
+    def add_iteration(self, iteration):
+        if not iteration.get("error"):
+            self.percentiles.add(iteration["duration"])
+            if self.percentiles.sketch.count >= self.min_iterations:
+                self.success = self.percentiles.check()
+        return self.success
+
+    def details(self):
+        return (_("Duration %s - %s") % (self.percentiles.details(),
+                                         self.status()))
+
+
+@sla.configure(name="max_atomic_duration_percentile")
+class MaxAtomicDurationPercentile(sla.SLA):
+    """Maximum percentiles of duration of atomic actions in seconds.
+
+    Percentiles are calculated separately for each atomic action after each
+    iteration, e.g.:
+
+        "max_atomic_duration_percentile": {
+            "actions": {"nova.boot_server": {"95": 10, "99": 20}},
+            "min_iterations": 10}
+    """
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "actions": {
+                "type": "object",
+                "patternProperties": {".+": PERCENTILES_SCHEMA},
+                "minProperties": 1,
+                "additionalProperties": False
+            },
+            "min_iterations": {"type": "integer", "minimum": 1}
+        },
+        "required": ["actions"],
+        "additionalProperties": False
+    }
+
+    def __init__(self, criterion_value):
+        super(MaxAtomicDurationPercentile, self).__init__(criterion_value)
+        self.min_iterations = self.criterion_value.get("min_iterations", 1)
+        self.actions = costilius.OrderedDict(
+            (name, _Percentiles(limits)) for name, limits
+            in sorted(self.criterion_value["actions"].items()))
+        self.passed = dict((name, True) for name in self.actions)
+
+    def add_iteration(self, iteration):
+        atomic_actions = iteration.get("atomic_actions", {})
+        for name, percentiles in self.actions.items():
+            duration = atomic_actions.get(name)
+            if duration is None:
+                continue
+            percentiles.add(duration)
+            if percentiles.sketch.count >= self.min_iterations:
+                self.passed[name] = percentiles.check()
+        self.success = all(self.passed.values())
+        return self.success
+
+    def details(self):
+        return (_("Atomic actions duration %s - %s") % (
+            "; ".join("%s %s" % (name, percentiles.details())
+                      for name, percentiles in self.actions.items()),
+            self.status()))
@@ -23,7 +23,10 @@ CONF = cfg.CONF
 
 CLEANUP_OPTS = [
     cfg.IntOpt("resource_deletion_timeout", default=600,
-               help="A timeout in seconds for deleting resources")
+               help="A timeout in seconds for deleting resources"),
+    cfg.IntOpt("cleanup_threads", default=40,
+               help="Max number of resources of all types that are deleted "
+                    "simultaneously")
 ]
 cleanup_group = cfg.OptGroup(name="cleanup", title="Cleanup Options")
 CONF.register_group(cleanup_group)
@@ -13,8 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import sys
+import threading
 import time
 
+from oslo_config import cfg
+import six
+
 from rally.common import broker
 from rally.common.i18n import _
 from rally.common import log as logging
@@ -22,14 +27,24 @@ from rally.common.plugin import discover
 from rally.common import utils as rutils
 from rally import osclients
 from rally.plugins.openstack.context.cleanup import base
+# NOTE: resource managers are found by subclasses of base.ResourceManager,
+#       so they should be imported even if plugins are loaded lazily
+from rally.plugins.openstack.context.cleanup import resources  # noqa
 
 
+CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
+# NOTE: Resources of these services are not used by resources of other
+#       services and don't use them, so they are deleted in parallel with
+#       resources of other services.
+INDEPENDENT_SERVICES = ("ceilometer", "designate", "glance", "mistral",
+                        "swift", "zaqar")
+
 
 class SeekAndDestroy(object):
 
-    def __init__(self, manager_cls, admin, users):
+    def __init__(self, manager_cls, admin, users, workers=None):
         """Resource deletion class.
 
         This class contains method exterminate() that finds and deletes
@@ -38,10 +53,19 @@ class SeekAndDestroy(object):
         :param manager_cls: subclass of base.ResourceManager
         :param admin: admin endpoint like in context["admin"]
         :param users: users endpoints like in context["users"]
+        :param workers: semaphore shared by resource managers which limits
+                        the number of resources deleted simultaneously
         """
         self.manager_cls = manager_cls
         self.admin = admin
         self.users = users or []
+        self.workers = workers
+        self.stats = {"listed": 0, "deleted": 0, "failed": 0, "duration": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
 
     @staticmethod
     def _get_cached_client(user, cache=None):
@@ -69,6 +93,7 @@ class SeekAndDestroy(object):
 
         :param resource: instance of resource manager initiated with resource
                          that should be deleted.
+        :returns: True if the resource is deleted
         """
 
         msg_kw = {
@@ -96,7 +121,7 @@ class SeekAndDestroy(object):
             while time.time() - started < resource._timeout:
                 try:
                     if resource.is_deleted():
-                        return
+                        return True
                 except Exception as e:
                     LOG.warning(
                         _("Seems like %s.%s.is_deleted(self) method is broken "
@@ -116,6 +141,7 @@ class SeekAndDestroy(object):
             LOG.warning(_("Resource deletion failed, timeout occurred for "
                           "%(service)s.%(resource)s: %(uuid)s.")
                         % msg_kw)
+        return False
 
     def _gen_publisher(self):
         """Returns publisher for deletion jobs.
@@ -136,6 +162,7 @@ class SeekAndDestroy(object):
                 try:
                     for raw_resource in rutils.retry(3, manager.list):
                         queue.append((admin, user, raw_resource))
+                        self._count("listed")
                 except Exception as e:
                     LOG.warning(
                         _("Seems like %s.%s.list(self) method is broken. "
@@ -180,15 +207,26 @@ class SeekAndDestroy(object):
                 user=self._get_cached_client(user, cache=cache),
                 tenant_uuid=user and user["tenant_id"])
 
-            self._delete_single_resource(manager)
+            if self.workers is None:
+                deleted = self._delete_single_resource(manager)
+            else:
+                with self.workers:
+                    deleted = self._delete_single_resource(manager)
+            self._count("deleted" if deleted else "failed")
 
         return consumer
 
     def exterminate(self):
-        """Delete all resources for passed users, admin and resource_mgr."""
+        """Delete all resources for passed users, admin and resource_mgr.
 
+        :returns: dict with numbers of listed, deleted and failed to delete
+                  resources and duration of deletion
+        """
+        started = time.time()
         broker.run(self._gen_publisher(), self._gen_consumer(),
                    consumers_count=self.manager_cls._threads)
+        self.stats["duration"] = time.time() - started
+        return self.stats
 
 
 def list_resource_names(admin_required=None):
@@ -248,6 +286,22 @@ def find_resource_managers(names=None, admin_required=None):
     return resource_managers
 
 
+def _must_precede(mgr, other):
+    """Whether resources of mgr should be deleted before resources of other.
+
+    Resources are deleted in order of resource managers _order, except that
+    resources of INDEPENDENT_SERVICES don't wait and are not waited for by
+    resources of other services. Keystone resources are deleted last, since
+    other resources are deleted with credentials of keystone users.
+    """
+    if mgr._order >= other._order:
+        return False
+    if mgr._service == other._service or other._service == "keystone":
+        return True
+    return (mgr._service not in INDEPENDENT_SERVICES and
+            other._service not in INDEPENDENT_SERVICES)
+
+
 def cleanup(names=None, admin_required=None, admin=None, users=None):
     """Generic cleaner.
 
@@ -257,6 +311,11 @@ def cleanup(names=None, admin_required=None, admin=None, users=None):
     Then goes through all passed users and using cleaners cleans all related
     resources.
 
+    Resource managers are run in parallel threads, each one waits until
+    resource managers that must precede it (see _must_precede()) finish.
+    The total number of resources deleted simultaneously is limited by
+    cleanup.cleanup_threads option.
+
     :param names: Use only resource manages that has name from this list.
                   There are in as _service or
                   (%s.%s % (_service, _resource)) from
@@ -274,9 +333,46 @@ def cleanup(names=None, admin_required=None, admin=None, users=None):
                     "endpoint": <rally.common.objects.Endpoint>
 
                   }
+    :returns: dict {"<service>.<resource>": stats}, where stats are
+              returned by SeekAndDestroy.exterminate()
+    :raises: the first exception raised by a resource manager, other
+             resource managers are run to the end anyway
     """
-    for manager in find_resource_managers(names, admin_required):
-        LOG.debug("Cleaning up %(service)s %(resource)s objects" %
-                  {"service": manager._service,
-                   "resource": manager._resource})
-        SeekAndDestroy(manager, admin, users).exterminate()
+    managers = find_resource_managers(names, admin_required)
+    workers = threading.BoundedSemaphore(CONF.cleanup.cleanup_threads)
+    finished = dict((mgr, threading.Event()) for mgr in managers)
+    results = {}
+    errors = []
+
+    def _exterminate(mgr):
+        name = "%s.%s" % (mgr._service, mgr._resource)
+        try:
+            for other in managers:
+                if _must_precede(other, mgr):
+                    finished[other].wait()
+
+            LOG.debug("Cleaning up %s objects" % name)
+            stats = SeekAndDestroy(mgr, admin, users,
+                                   workers=workers).exterminate()
+            results[name] = stats
+            LOG.debug(
+                "Cleanup of %(name)s objects finished: %(deleted)s deleted, "
+                "%(failed)s failed of %(listed)s in %(duration).2f sec "
+                "(%(rate).2f per sec)" %
+                dict(stats, name=name,
+                     rate=stats["deleted"] / max(stats["duration"], 1e-3)))
+        except Exception:
+            LOG.exception(_("Cleanup of %s objects failed") % name)
+            errors.append(sys.exc_info())
+        finally:
+            finished[mgr].set()
+
+    threads = [threading.Thread(target=_exterminate, args=(mgr,))
+               for mgr in managers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        six.reraise(*errors[0])
+    return results
@@ -15,6 +15,7 @@
 
 import collections
 import random
+import sys
 import uuid
 
 from oslo_config import cfg
@@ -28,6 +29,7 @@ from rally.common import utils as rutils
 from rally import consts
 from rally import exceptions
 from rally import osclients
+from rally.plugins.openstack.context.cleanup import manager as resource_manager
 from rally.plugins.openstack.wrappers import keystone
 from rally.plugins.openstack.wrappers import network
 from rally.task import context
@@ -46,6 +48,11 @@ USER_CONTEXT_OPTS = [
     cfg.StrOpt("user_domain",
                default="default",
                help="ID of domain in which users will be created."),
+    cfg.BoolOpt("use_pool",
+                default=False,
+                help="Keep tenants and users in a pool of the deployment "
+                     "and reuse them in next scenarios and tasks instead of "
+                     "creating new ones."),
 ]
 
 CONF = cfg.CONF
@@ -100,6 +107,9 @@ class UserGenerator(UserContextMixin, context.Context):
             "user_domain": {
                 "type": "string",
             },
+            "use_pool": {
+                "type": "boolean",
+            },
         },
         "additionalProperties": False
     }
@@ -112,7 +122,8 @@ class UserGenerator(UserContextMixin, context.Context):
         "resource_management_workers":
             cfg.CONF.users_context.resource_management_workers,
         "project_domain": cfg.CONF.users_context.project_domain,
-        "user_domain": cfg.CONF.users_context.user_domain
+        "user_domain": cfg.CONF.users_context.user_domain,
+        "use_pool": cfg.CONF.users_context.use_pool
     }
 
     def __init__(self, context):
@@ -165,14 +176,16 @@ class UserGenerator(UserContextMixin, context.Context):
                                 "Exception: %(ex)s" %
                                 {"tenant_id": network_tenant_id, "ex": ex})
 
-    def _create_tenants(self):
+    def _create_tenants(self, count=None, task_id=None):
         threads = self.config["resource_management_workers"]
+        count = self.config["tenants"] if count is None else count
+        task_id = task_id or self.task["uuid"]
 
         tenants = collections.deque()
 
         def publish(queue):
-            for i in range(self.config["tenants"]):
-                args = (self.config["project_domain"], self.task["uuid"], i)
+            for i in range(count):
+                args = (self.config["project_domain"], task_id, i)
                 queue.append(args)
 
         def consume(cache, args):
@@ -193,15 +206,17 @@ class UserGenerator(UserContextMixin, context.Context):
 
         return tenants_dict
 
-    def _create_users(self):
+    def _create_users(self, tenants=None):
         # NOTE(msdubov): This should be called after _create_tenants().
         threads = self.config["resource_management_workers"]
         users_per_tenant = self.config["users_per_tenant"]
+        if tenants is None:
+            tenants = self.context.get("tenants", {})
 
         users = collections.deque()
 
         def publish(queue):
-            for tenant_id in self.context["tenants"]:
+            for tenant_id in tenants:
                 for user_id in range(users_per_tenant):
                     username = self.PATTERN_USER % {"tenant_id": tenant_id,
                                                     "uid": user_id}
@@ -221,7 +236,7 @@ class UserGenerator(UserContextMixin, context.Context):
                                       tenant_id, user_dom)
             user_endpoint = objects.Endpoint(
                 client.auth_url, user.name, password,
-                self.context["tenants"][tenant_id]["name"],
+                tenants[tenant_id]["name"],
                 consts.EndpointPermission.USER, client.region_name,
                 project_domain_name=project_dom, user_domain_name=user_dom,
                 endpoint_type=self.endpoint.endpoint_type,
@@ -269,6 +284,109 @@ class UserGenerator(UserContextMixin, context.Context):
         broker.run(publish, consume, threads)
         self.context["users"] = []
 
+    def _pool_kind(self):
+        return "%(project_domain)s:%(user_domain)s:%(users_per_tenant)d" % (
+            self.config)
+
+    def _check_pooled_tenants(self, pooled_tenants):
+        """Return IDs of pooled tenants whose users can authenticate."""
+        threads = self.config["resource_management_workers"]
+        invalid = set()
+
+        for pooled in pooled_tenants:
+            if len(pooled.data["users"]) != self.config["users_per_tenant"]:
+                invalid.add(pooled.id)
+
+        def publish(queue):
+            for pooled in pooled_tenants:
+                for user in pooled.data["users"]:
+                    queue.append((pooled.id, user["endpoint"]))
+
+        def consume(cache, args):
+            pooled_id, endpoint = args
+            try:
+                osclients.Clients(objects.Endpoint(**endpoint)).keystone()
+            except Exception as e:
+                LOG.warning(_("Pooled user %(user)s is invalid: %(error)s") %
+                            {"user": endpoint["username"], "error": e})
+                invalid.add(pooled_id)
+
+        broker.run(publish, consume, threads)
+        return set(p.id for p in pooled_tenants) - invalid
+
+    def _setup_from_pool(self):
+        """Lease tenants from the pool, create only the missing ones.
+
+        Leases are released if the setup fails. Leases of tasks which died
+        before the cleanup of the context are reclaimed here.
+        """
+        deployment = objects.Deployment.get(self.task["deployment_uuid"])
+        released = deployment.release_stale_pooled_tenants()
+        if released:
+            LOG.info(_("Released %d pooled tenants leased by tasks which "
+                       "are not running") % released)
+        leased = deployment.lease_pooled_tenants(self._pool_kind(),
+                                                 self.task["uuid"],
+                                                 self.config["tenants"])
+        try:
+            self._use_pooled_tenants(deployment, leased)
+        except Exception:
+            exc_info = sys.exc_info()
+            with logging.ExceptionLogger(
+                    LOG, _("Unable to release pooled tenants")):
+                objects.Deployment.release_pooled_tenants(self.task["uuid"])
+            six.reraise(*exc_info)
+
+    def _use_pooled_tenants(self, deployment, leased):
+        """Add leased tenants to the context, create the missing ones."""
+        kind = self._pool_kind()
+        valid = self._check_pooled_tenants(leased)
+
+        for pooled in leased:
+            if pooled.id not in valid:
+                _delete_pooled_tenant(pooled, self.endpoint)
+                continue
+            self.context["tenants"][pooled.tenant_id] = (
+                pooled.data["tenant"])
+            for user in pooled.data["users"]:
+                self.context["users"].append(
+                    {"id": user["id"],
+                     "endpoint": objects.Endpoint(**user["endpoint"]),
+                     "tenant_id": pooled.tenant_id})
+
+        missing = self.config["tenants"] - len(self.context["tenants"])
+        LOG.debug("Leased %(leased)d pooled tenants, creating %(missing)d" %
+                  {"leased": len(self.context["tenants"]),
+                   "missing": missing})
+        if not missing:
+            return
+
+        # NOTE: names of tenants are based on a new UUID, since pooled
+        #       tenants created by this task may exist already
+        tenants = self._create_tenants(missing, task_id=str(uuid.uuid4()))
+        users = self._create_users(tenants)
+        for tenant_id, tenant in six.iteritems(tenants):
+            deployment.add_pooled_tenant(
+                tenant_id, kind,
+                {"tenant": tenant,
+                 "users": [{"id": u["id"],
+                            "endpoint": u["endpoint"].to_dict(
+                                include_permission=True)}
+                           for u in users if u["tenant_id"] == tenant_id]},
+                lessee=self.task["uuid"])
+
+        self.context["tenants"].update(tenants)
+        self.context["users"].extend(users)
+
+    def _scrub_pooled_tenants(self):
+        """Delete resources left in pooled tenants by the scenario."""
+        clients = osclients.Clients(self.endpoint)
+        available = set(clients.services().values())
+        names = [name for name in resource_manager.list_resource_names(
+                 admin_required=False) if name in available]
+        resource_manager.cleanup(names=names, admin_required=False,
+                                 users=self.context["users"])
+
     @rutils.log_task_wrapper(LOG.info, _("Enter context: `users`"))
     def setup(self):
         """Create tenants and users, using the broker pattern."""
@@ -277,9 +395,13 @@ class UserGenerator(UserContextMixin, context.Context):
 
         threads = self.config["resource_management_workers"]
 
-        LOG.debug("Creating %(tenants)d tenants using %(threads)s threads" %
-                  {"tenants": self.config["tenants"], "threads": threads})
-        self.context["tenants"] = self._create_tenants()
+        if self.config["use_pool"]:
+            self._setup_from_pool()
+        else:
+            LOG.debug("Creating %(tenants)d tenants using %(threads)s "
+                      "threads" % {"tenants": self.config["tenants"],
+                                   "threads": threads})
+            self.context["tenants"] = self._create_tenants()
 
         if len(self.context["tenants"]) < self.config["tenants"]:
             raise exceptions.ContextSetupFailure(
@@ -287,9 +409,10 @@ class UserGenerator(UserContextMixin, context.Context):
                 msg=_("Failed to create the requested number of tenants."))
 
         users_num = self.config["users_per_tenant"] * self.config["tenants"]
-        LOG.debug("Creating %(users)d users using %(threads)s threads" %
-                  {"users": users_num, "threads": threads})
-        self.context["users"] = self._create_users()
+        if not self.config["use_pool"]:
+            LOG.debug("Creating %(users)d users using %(threads)s threads" %
+                      {"users": users_num, "threads": threads})
+            self.context["users"] = self._create_users()
 
         if len(self.context["users"]) < users_num:
             raise exceptions.ContextSetupFailure(
@@ -299,6 +422,43 @@ class UserGenerator(UserContextMixin, context.Context):
     @rutils.log_task_wrapper(LOG.info, _("Exit context: `users`"))
     def cleanup(self):
         """Delete tenants and users, using the broker pattern."""
+        if self.config["use_pool"]:
+            try:
+                self._scrub_pooled_tenants()
+            finally:
+                objects.Deployment.release_pooled_tenants(self.task["uuid"])
+                self.context["users"] = []
+                self.context["tenants"] = {}
+            return
+
         self._remove_default_security_group()
         self._delete_users()
         self._delete_tenants()
+
+
+def _delete_pooled_tenant(pooled, admin_endpoint, client=None):
+    """Delete users and tenant of the users pool from keystone and DB."""
+    client = client or keystone.wrap(osclients.Clients(
+        admin_endpoint).keystone())
+    for user in pooled.data["users"]:
+        with logging.ExceptionLogger(
+                LOG, _("Unable to delete pooled user %s") % user["id"]):
+            client.delete_user(user["id"])
+    with logging.ExceptionLogger(
+            LOG, _("Unable to delete pooled tenant %s") % pooled.tenant_id):
+        client.delete_project(pooled.tenant_id)
+    objects.Deployment.delete_pooled_tenant(pooled.id)
+
+
+def drain_pool(deployment):
+    """Delete all tenants and users of the users pool of the deployment.
+
+    :param deployment: objects.Deployment instance
+    """
+    pooled_tenants = deployment.get_pooled_tenants()
+    if not pooled_tenants:
+        return
+    admin_endpoint = objects.Endpoint(**deployment["admin"])
+    client = keystone.wrap(osclients.Clients(admin_endpoint).keystone())
+    for pooled in pooled_tenants:
+        _delete_pooled_tenant(pooled, admin_endpoint, client=client)
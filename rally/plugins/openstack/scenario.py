@@ -13,9 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo_config import cfg
+
 from rally import osclients
 from rally.task import scenario
 
+CONF = cfg.CONF
+
 # NOTE(boris-42): Shortcut to remove import of both rally.task.scenario and
 #                 rally.plugins.openstack.scenario
 configure = scenario.configure
@@ -27,11 +31,17 @@ class OpenStackScenario(scenario.Scenario):
     def __init__(self, context=None, admin_clients=None, clients=None):
         super(OpenStackScenario, self).__init__(context)
         if context:
+            # NOTE: scenario is instantiated for each iteration, so keystone
+            #       clients are shared between iterations to avoid getting
+            #       new token each time
+            cache = (osclients.keystone_cache
+                     if CONF.openstack_client_cache else None)
             if "admin" in context:
                 self._admin_clients = osclients.Clients(
-                    context["admin"]["endpoint"])
+                    context["admin"]["endpoint"], cache=cache)
             if "user" in context:
-                self._clients = osclients.Clients(context["user"]["endpoint"])
+                self._clients = osclients.Clients(context["user"]["endpoint"],
+                                                  cache=cache)
         if admin_clients:
             if hasattr(self, "_admin_clients"):
                 raise ValueError(
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from rally import osclients
 from rally.plugins.openstack import scenario
 from rally.task import atomic
 from rally.task import validation
@@ -28,7 +29,9 @@ class Authenticate(scenario.OpenStackScenario):
     @scenario.configure()
     def keystone(self):
         """Check Keystone Client."""
-        self.clients("keystone")
+        # NOTE: shared keystone client would make this scenario measure
+        #       nothing, so new client is authenticated on each iteration
+        osclients.Clients(self.context["user"]["endpoint"]).keystone()
 
     @validation.number("repetitions", minval=1)
     @validation.required_openstack(users=True)
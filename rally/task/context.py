@@ -21,6 +21,7 @@ import six
 
 from rally.common import log as logging
 from rally.common.plugin import plugin
+from rally.common import utils
 from rally import exceptions
 from rally.task import functional
 
@@ -96,6 +97,12 @@ class Context(plugin.Plugin, functional.FunctionalMixin):
     def get_order(cls):
         return cls._meta_get("order")
 
+    @classmethod
+    def is_mapping(cls):
+        """Whether context changes scenario context in map_for_scenario()."""
+        return (six.get_unbound_function(cls.map_for_scenario) is not
+                six.get_unbound_function(Context.map_for_scenario))
+
     @abc.abstractmethod
     def setup(self):
         """Prepare environment for test.
@@ -188,11 +195,21 @@ class ContextManager(object):
         and performs transformation of each of them to full context, order of
         transformation is the same as order of context creation.
         """
-        # NOTE(boris-42): Original context_obj is read only and should not
-        #                 be modified
-        context_obj = copy.deepcopy(self.context_obj)
-
-        for ctx in self._get_sorted_context_lst():
+        if isinstance(self.context_obj, utils.LockedDict):
+            # NOTE: Locked context can't be modified, so only the top level
+            #       dict is copied and only contexts that really map data
+            #       are used
+            context_obj = dict(self.context_obj)
+            ctxlst = sorted(ctx(self.context_obj) for ctx
+                            in map(Context.get, self.context_obj["config"])
+                            if ctx.is_mapping())
+        else:
+            # NOTE(boris-42): Original context_obj is read only and should not
+            #                 be modified
+            context_obj = copy.deepcopy(self.context_obj)
+            ctxlst = self._get_sorted_context_lst()
+
+        for ctx in ctxlst:
             context_obj = ctx.map_for_scenario(context_obj)
 
         return context_obj
@@ -0,0 +1,223 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Distributed load generation.
+
+The distributed runner (coordinator) splits iterations of a workload into
+chunks stored in the database. Workers registered in the workers table
+claim pending chunks, run them with the constant runner and send results
+back in batches, which the coordinator passes to its ResultConsumer.
+"""
+
+import socket
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_utils import timeutils
+import six
+
+from rally.common import db
+from rally.common.i18n import _
+from rally.common import log as logging
+from rally.common import objects
+from rally.common import utils as rutils
+from rally import consts
+from rally import exceptions
+from rally.task import runner
+
+
+LOG = logging.getLogger(__name__)
+
+DISTRIBUTED_OPTS = [
+    cfg.FloatOpt("distributed_poll_interval",
+                 default=0.5,
+                 help="Interval in seconds between checks of new chunks of "
+                      "iterations by workers and new results by the "
+                      "distributed runner"),
+    cfg.FloatOpt("distributed_heartbeat_interval",
+                 default=5.0,
+                 help="Interval in seconds between updates of worker "
+                      "registration, which shows that the worker is alive")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
+CONF.register_opts(DISTRIBUTED_OPTS, group=benchmark_group)
+
+_ENDPOINT_KEY = "__endpoint__"
+
+
+def serialize_context(context):
+    """Convert context of a workload to JSON-compatible structure.
+
+    Endpoints are stored as dicts and the task is replaced with its UUID,
+    so the context can be stored in the database and restored by workers.
+
+    :raises RallyException: if context contains other objects
+    """
+    def serialize(value, path):
+        if isinstance(value, objects.Endpoint):
+            return {_ENDPOINT_KEY: value.to_dict(include_permission=True)}
+        if isinstance(value, objects.Task):
+            return {"uuid": value["uuid"]}
+        if isinstance(value, dict):
+            return dict((k, serialize(v, path + [k]))
+                        for k, v in six.iteritems(value))
+        if isinstance(value, (list, tuple)):
+            return [serialize(v, path + [i]) for i, v in enumerate(value)]
+        if value is None or isinstance(value, six.string_types + (
+                bool, float) + six.integer_types):
+            return value
+        raise exceptions.RallyException(
+            _("Context can't be sent to workers, value of %(path)s is not "
+              "serializable: %(value)r") % {
+                "path": "/".join(map(str, path)), "value": value})
+
+    return serialize(context, [])
+
+
+def deserialize_context(context):
+    """Restore context serialized by serialize_context()."""
+    if isinstance(context, dict):
+        if _ENDPOINT_KEY in context:
+            return objects.Endpoint(**context[_ENDPOINT_KEY])
+        return dict((k, deserialize_context(v))
+                    for k, v in six.iteritems(context))
+    if isinstance(context, list):
+        return [deserialize_context(v) for v in context]
+    return context
+
+
+class Worker(object):
+    """Service that runs chunks of iterations of distributed workloads.
+
+    Typical usage (see "rally-manage worker start"):
+
+        worker = Worker()
+        worker.run()   # blocks until worker.stop() is called
+    """
+
+    def __init__(self, hostname=None):
+        self.hostname = hostname or socket.gethostname()
+        self.stopped = threading.Event()
+
+    def _register(self):
+        try:
+            db.register_worker({"hostname": self.hostname})
+        except exceptions.WorkerAlreadyRegistered:
+            # NOTE: registration is left by a worker that was not stopped
+            #       properly, so it is just taken over
+            LOG.warning(_("Worker %s is already registered, probably it "
+                          "was not stopped properly.") % self.hostname)
+            db.update_worker(self.hostname)
+
+    def _heartbeat(self):
+        while True:
+            self.stopped.wait(CONF.benchmark.distributed_heartbeat_interval)
+            if self.stopped.is_set():
+                break
+            try:
+                db.update_worker(self.hostname)
+            except exceptions.WorkerNotFound:
+                self._register()
+
+    def run(self):
+        """Register the worker and run chunks until it is stopped."""
+        self._register()
+        heartbeat = threading.Thread(target=self._heartbeat)
+        heartbeat.daemon = True
+        heartbeat.start()
+        LOG.info(_("Worker %s is started.") % self.hostname)
+        try:
+            while not self.stopped.is_set():
+                chunk = db.distributed_chunk_claim(self.hostname)
+                if chunk is None:
+                    self.stopped.wait(CONF.benchmark.distributed_poll_interval)
+                    continue
+                self.run_chunk(chunk)
+        finally:
+            self.stopped.set()
+            heartbeat.join()
+            db.unregister_worker(self.hostname)
+            LOG.info(_("Worker %s is stopped.") % self.hostname)
+
+    def stop(self):
+        self.stopped.set()
+
+    def _send_results(self, chunk, runner_obj):
+        statuses = consts.DistributedChunkStatus
+        while True:
+            results = runner_obj.result_queue.get_batch()
+            if results is None:
+                break
+            db.distributed_result_create(chunk["id"], self.hostname,
+                                         time.time(), results)
+            still_running = db.distributed_chunk_update(
+                chunk["id"], {"updated_at": timeutils.utcnow()},
+                statuses=[statuses.RUNNING], worker=self.hostname)
+            if not still_running and not runner_obj.aborted.is_set():
+                LOG.info(_("Chunk %s is aborted by the coordinator.")
+                         % chunk["id"])
+                runner_obj.abort()
+
+    def run_chunk(self, chunk):
+        """Run iterations of the chunk and send results to the coordinator.
+
+        :param chunk: claimed DistributedChunk
+        """
+        statuses = consts.DistributedChunkStatus
+        data = chunk["data"]
+        conf = {"type": "constant", "times": chunk["count"],
+                "concurrency": min(data["concurrency"], chunk["count"])}
+        if data.get("timeout"):
+            conf["timeout"] = data["timeout"]
+        context = deserialize_context(data["context"])
+
+        LOG.info(_("Running iterations %(start)d-%(end)d of %(scenario)s "
+                   "(task %(task)s)") % {
+                       "start": chunk["start"],
+                       "end": chunk["start"] + chunk["count"] - 1,
+                       "scenario": data["scenario"],
+                       "task": chunk["task_uuid"]})
+        runner_obj = runner.ScenarioRunner.get("constant")(
+            context["task"], conf)
+        # NOTE: iterations keep their numbers in the workload, even if the
+        #       chunk is returned to the queue and run again partially
+        runner_obj.first_iteration = chunk["start"]
+        sender = threading.Thread(target=self._send_results,
+                                  args=(chunk, runner_obj))
+        sender.start()
+        values = {"status": statuses.FINISHED}
+        try:
+            with rutils.Timer() as timer:
+                runner_obj.run(data["scenario"], context, data["args"])
+        except Exception as e:
+            LOG.exception(e)
+            values = {"status": statuses.FAILED,
+                      "error": "%s: %s" % (type(e).__name__, e)}
+        finally:
+            runner_obj.result_queue.close()
+            sender.join()
+
+        if runner_obj.aborted.is_set():
+            values = {"status": statuses.ABORTED}
+        db.distributed_chunk_update(
+            chunk["id"], values,
+            statuses=[statuses.RUNNING, statuses.ABORTING],
+            worker=self.hostname)
+        LOG.info(_("Chunk %(id)s is %(status)s in %(duration).2f sec") % {
+            "id": chunk["id"], "status": values["status"],
+            "duration": timer.duration()})
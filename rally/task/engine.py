@@ -20,6 +20,7 @@ import time
 import traceback
 
 import jsonschema
+from oslo_config import cfg
 import six
 
 from rally.common.i18n import _
@@ -32,12 +33,15 @@ from rally import osclients
 from rally.plugins.openstack.context.keystone import existing_users
 from rally.plugins.openstack.context.keystone import users as users_ctx
 from rally.task import context
+from rally.task import live
+from rally.task.processing import aggregation
 from rally.task import runner
 from rally.task import scenario
 from rally.task import sla
 
 
 LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
 
 
 CONFIG_SCHEMA = {
@@ -74,7 +78,17 @@ CONFIG_SCHEMA = {
 
 
 class ResultConsumer(object):
-    """ResultConsumer class stores results from ScenarioRunner, checks SLA."""
+    """ResultConsumer class stores results from ScenarioRunner, checks SLA.
+
+    Iterations are written to the database by chunks of CHUNK_SIZE while the
+    scenario is running, so memory usage doesn't grow with number of
+    iterations. Live statistics of the scenario are stored in data["live"]
+    of the result every CONF.benchmark.live_stats_interval seconds, and
+    the summary of all iterations (see aggregation.ScenarioStats) is stored
+    when the scenario is finished.
+    """
+
+    CHUNK_SIZE = 1000
 
     def __init__(self, key, task, runner, abort_on_sla_failure):
         """ResultConsumer constructor.
@@ -95,36 +109,85 @@ class ResultConsumer(object):
         self.is_done = threading.Event()
         self.unexpected_failure = {}
         self.results = []
+        self.chunks = 0
+        self.result_id = None
+        self.live_stats = live.LiveStats()
+        self.stats = aggregation.ScenarioStats()
         self.thread = threading.Thread(
             target=self._consume_results
         )
         self.aborting_checker = threading.Thread(target=self.wait_and_abort)
+        self.live_publisher = threading.Thread(
+            target=self._publish_live_stats)
 
     def __enter__(self):
+        # NOTE: the result is updated with real values when the scenario is
+        #       finished, until then it is marked as incomplete, so it is
+        #       not taken as a result of finished scenario
+        self.result_id = self.task.append_results(self.key, {
+            "raw": [],
+            "load_duration": 0,
+            "full_duration": 0,
+            "sla": [],
+            "completed": False})["id"]
         self.thread.start()
         self.aborting_checker.start()
+        if CONF.benchmark.live_stats_interval > 0:
+            self.live_publisher.start()
+        self.keystone_cache_stats = osclients.keystone_cache.stats()
         self.start = time.time()
         return self
 
     def _consume_results(self):
         while True:
-            if self.runner.result_queue:
-                result = self.runner.result_queue.popleft()
+            results = self.runner.result_queue.get_batch()
+            if results is None:
+                break
+            for result in results:
                 self.results.append(result)
+                self.live_stats.add(result)
+                self.stats.add(result)
                 success = self.sla_checker.add_iteration(result)
                 if self.abort_on_sla_failure and not success:
                     self.sla_checker.set_aborted_on_sla()
                     self.runner.abort()
-            elif self.is_done.isSet():
+                if len(self.results) >= self.CHUNK_SIZE:
+                    self._flush_results()
+
+    def _publish_live_stats(self):
+        interval = CONF.benchmark.live_stats_interval
+        while True:
+            self.is_done.wait(interval)
+            if self.is_done.is_set():
                 break
-            else:
-                time.sleep(0.1)
+            try:
+                self.task.update_results(self.result_id, {
+                    "raw": [],
+                    "load_duration": 0,
+                    "full_duration": time.time() - self.start,
+                    "sla": [],
+                    "completed": False,
+                    "live": self.live_stats.to_dict()})
+            except Exception as e:
+                # NOTE: live statistics are informational only, so failure
+                #       to store them should not break the scenario
+                LOG.warning(_("Failed to store live statistics: %s") % e)
+
+    def _flush_results(self):
+        if self.results:
+            self.task.append_results_chunk(self.result_id, self.chunks,
+                                           self.results)
+            self.chunks += 1
+            self.results = []
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
         self.finish = time.time()
         self.is_done.set()
+        self.runner.result_queue.close()
         self.aborting_checker.join()
         self.thread.join()
+        if self.live_publisher.is_alive():
+            self.live_publisher.join()
 
         if exc_type:
             self.sla_checker.set_unexpected_failure(exc_value)
@@ -133,11 +196,29 @@ class ResultConsumer(object):
                 self.task["uuid"]) == consts.TaskStatus.ABORTED:
             self.sla_checker.set_aborted_manually()
 
-        self.task.append_results(self.key, {
-            "raw": self.results,
+        runner_stats = dict(self.runner.get_stats())
+        cache_stats = osclients.keystone_cache.stats()
+        for k in "hits", "misses":
+            runner_stats["keystone_cache_%s" % k] = (
+                cache_stats[k] - self.keystone_cache_stats[k])
+
+        self._flush_results()
+        # NOTE: the summary is stored before the result is updated, so
+        #       it is available once the scenario is seen as finished
+        self.task.append_results_stats(self.result_id, self.stats)
+        sla_results = self.sla_checker.results()
+        self.task.update_results(self.result_id, {
+            "raw": [],
+            "load_duration": self.runner.run_duration,
+            "full_duration": self.finish - self.start,
+            "runner_stats": runner_stats,
+            "sla": sla_results,
+            "live": self.live_stats.to_dict()}, summary={
+            "iterations_count": self.live_stats.iterations,
+            "failed_iterations_count": self.live_stats.errors,
             "load_duration": self.runner.run_duration,
             "full_duration": self.finish - self.start,
-            "sla": self.sla_checker.results()})
+            "sla_success": all(s["success"] for s in sla_results)})
 
     @staticmethod
     def is_task_in_aborting_status(task_uuid, check_soft=True):
@@ -166,7 +247,7 @@ class ResultConsumer(object):
                 self.runner.abort()
                 self.task.update_status(consts.TaskStatus.ABORTED)
                 break
-            time.sleep(2.0)
+            self.is_done.wait(2.0)
 
 
 class BenchmarkEngine(object):
@@ -216,12 +297,17 @@ class BenchmarkEngine(object):
     @rutils.log_task_wrapper(LOG.info,
                              _("Task validation of scenarios names."))
     def _validate_config_scenarios_name(self, config):
-        available = set(s.get_name() for s in scenario.Scenario.get_all())
-        specified = set(six.iterkeys(config))
-
-        if not specified.issubset(available):
-            names = ", ".join(specified - available)
-            raise exceptions.NotFoundScenarios(names=names)
+        # NOTE: scenarios are looked up one by one, so only their modules
+        #       are imported if plugins are loaded with the plugin index
+        missing = []
+        for name in sorted(six.iterkeys(config)):
+            try:
+                scenario.Scenario.get(name)
+            except exceptions.PluginNotFound:
+                missing.append(name)
+
+        if missing:
+            raise exceptions.NotFoundScenarios(names=", ".join(missing))
 
     @rutils.log_task_wrapper(LOG.info, _("Task validation of syntax."))
     def _validate_config_syntax(self, config):
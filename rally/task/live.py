@@ -0,0 +1,129 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Live statistics of running scenarios.
+
+ResultConsumer feeds every iteration to LiveStats and periodically stores
+its snapshot in data["live"] of the scenario result record, so progress of
+a running task can be watched without reading raw iterations.
+"""
+
+import collections
+import threading
+import time
+
+from oslo_config import cfg
+
+from rally.task.processing import utils
+
+
+LIVE_OPTS = [
+    cfg.FloatOpt("live_stats_interval",
+                 default=5.0,
+                 help="Interval in seconds between updates of live "
+                      "statistics of running scenarios in the database, "
+                      "0 disables the updates"),
+    cfg.FloatOpt("live_stats_window",
+                 default=60.0,
+                 help="Length in seconds of the rolling window of live "
+                      "statistics of running scenarios")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
+CONF.register_opts(LIVE_OPTS, group=benchmark_group)
+
+
+class LiveStats(object):
+    """Rolling aggregates of iterations of a running scenario.
+
+    Totals are counted for all iterations, while throughput, error rate
+    and percentiles of durations are computed only for iterations which
+    have finished during the last `window` seconds.
+    """
+
+    def __init__(self, window=None):
+        self.window = window or CONF.benchmark.live_stats_window
+        self.started_at = time.time()
+        self.iterations = 0
+        self.errors = 0
+        self._recent = collections.deque()
+        self._actions = []
+        self._lock = threading.Lock()
+
+    def add(self, result):
+        """Add the result of an iteration."""
+        with self._lock:
+            self.iterations += 1
+            if result["error"]:
+                self.errors += 1
+            for name in result["atomic_actions"]:
+                if name not in self._actions:
+                    self._actions.append(name)
+            end = result["timestamp"] + result["duration"]
+            self._recent.append((end, bool(result["error"]),
+                                 result["duration"], result["atomic_actions"]))
+            # NOTE: snapshots may be never taken (live_stats_interval is 0),
+            #       so old iterations are dropped here to bound the memory
+            self._trim(end)
+
+    def _trim(self, now):
+        while self._recent and self._recent[0][0] < now - self.window:
+            self._recent.popleft()
+
+    def to_dict(self, now=None):
+        """Return the snapshot of statistics.
+
+        :param now: time of the snapshot, current time by default
+        :returns: dict with total iterations and errors, throughput
+                  (iterations per second) and error rate in the window,
+                  and 50%ile/95%ile of durations of each atomic action
+                  and of the whole iteration ("total") in the window
+        """
+        now = now or time.time()
+        with self._lock:
+            self._trim(now)
+            recent = list(self._recent)
+            names = list(self._actions)
+            iterations, errors = self.iterations, self.errors
+
+        period = min(self.window, max(now - self.started_at, 0.001))
+        durations = dict((name, []) for name in names)
+        durations["total"] = []
+        window_errors = 0
+        for end, error, duration, actions in recent:
+            if error:
+                window_errors += 1
+                continue
+            durations["total"].append(duration)
+            for name, value in actions.items():
+                if value is not None:
+                    durations[name].append(value)
+
+        actions = []
+        for name in names + ["total"]:
+            values = durations[name]
+            actions.append({"name": name,
+                            "count": len(values),
+                            "50%ile": utils.percentile(values, 0.5),
+                            "95%ile": utils.percentile(values, 0.95)})
+        return {"updated_at": now,
+                "iterations": iterations,
+                "errors": errors,
+                "window": self.window,
+                "throughput": len(recent) / period,
+                "error_rate": (float(window_errors) / len(recent)
+                               if recent else 0.0),
+                "actions": actions}
@@ -0,0 +1,270 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the load which Rally itself is able to generate.
+
+Dummy scenarios are run by scenario runners directly in the current
+process, without deployment, contexts and database, so the measured
+numbers show only the cost of runners and of consuming their results.
+"""
+
+import resource
+import threading
+import time
+import uuid
+
+import jsonschema
+import six
+
+from rally.common import log as logging
+from rally.common import objects
+from rally.common import streaming_algorithms as streaming
+from rally import exceptions
+from rally.task import engine
+from rally.task import runner
+from rally.task import sla
+
+
+LOG = logging.getLogger(__name__)
+
+CONCURRENCY_LEVELS = (1, 5, 10, 25, 50)
+RPS_LEVELS = (50, 100, 250, 500, 1000, 2000)
+ITERATIONS = 1000
+DURATION = 10
+
+
+def default_suite(iterations=ITERATIONS, duration=DURATION):
+    """Return task config of the default runner overhead suite.
+
+    Each runner runs Dummy.dummy without sleep at increasing concurrency
+    (or rps), so the load is limited only by the runner itself.
+
+    :param iterations: number of iterations of serial and constant runners
+    :param duration: duration in seconds of constant_for_duration and rps
+                     workloads
+    :returns: dict with task config
+    """
+    runners = [{"type": "serial", "times": iterations}]
+    for concurrency in CONCURRENCY_LEVELS:
+        runners.append({"type": "constant", "times": iterations,
+                        "concurrency": concurrency})
+    for concurrency in CONCURRENCY_LEVELS:
+        runners.append({"type": "constant_for_duration",
+                        "duration": duration, "concurrency": concurrency})
+    for rps in RPS_LEVELS:
+        runners.append({"type": "rps", "times": rps * duration, "rps": rps})
+    return {"Dummy.dummy": [{"args": {"sleep": 0}, "runner": r}
+                            for r in runners]}
+
+
+def validate(config):
+    """Check that task config can be run by the overhead suite.
+
+    Only Dummy scenarios without contexts can be used, because there is
+    no deployment to create contexts in.
+
+    :raises InvalidTaskException: if config can't be used
+    """
+    try:
+        jsonschema.validate(config, engine.CONFIG_SCHEMA)
+        for name, workloads in six.iteritems(config):
+            if not name.startswith("Dummy."):
+                raise exceptions.InvalidArgumentsException(
+                    "only Dummy scenarios can be used, got %s" % name)
+            for kw in workloads:
+                if kw.get("context"):
+                    raise exceptions.InvalidArgumentsException(
+                        "contexts can't be used, got %s for %s"
+                        % (kw["context"], name))
+                runner.ScenarioRunner.validate(kw.get("runner", {}))
+                sla.SLA.validate(kw.get("sla", {}))
+    except (exceptions.RallyException, jsonschema.ValidationError) as e:
+        raise exceptions.InvalidTaskException(six.text_type(e))
+
+
+def _get_rss():
+    """Return resident memory of the current process in KiB."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / 1024.0
+    except (IOError, OSError, IndexError, ValueError):
+        # NOTE: ru_maxrss is a peak value, so it is the best we can get
+        #       where /proc is not available
+        return float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _get_cpu(who):
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+class _OverheadConsumer(object):
+    """Consume results of the runner like the engine does and measure them.
+
+    Scheduling delay of an iteration is its start_lag (rps runner) or
+    runner_overhead (constant runners). For runners which don't report
+    them the delay is the gap between the end of previous iteration and
+    the start of the next one.
+    """
+
+    def __init__(self, runner_obj, sla_checker):
+        self.runner = runner_obj
+        self.sla_checker = sla_checker
+        self.iterations = 0
+        self.errors = 0
+        self.rss_start = _get_rss()
+        self.rss_peak = self.rss_start
+        self.delay_mean = streaming.MeanComputation()
+        self.delay_p95 = streaming.PercentileComputation(0.95)
+        self.delay_max = streaming.MaxComputation()
+        self._prev_end = None
+        self.thread = threading.Thread(target=self._consume)
+
+    def _add_delay(self, result):
+        if "start_lag" in result:
+            delay = result["start_lag"]
+        elif "runner_overhead" in result:
+            delay = result["runner_overhead"]
+        elif self._prev_end is not None:
+            delay = max(result["timestamp"] - self._prev_end, 0.0)
+        else:
+            delay = None
+        self._prev_end = (result["timestamp"] + result["duration"] +
+                          result["idle_duration"])
+        if delay is not None:
+            self.delay_mean.add(delay)
+            self.delay_p95.add(delay)
+            self.delay_max.add(delay)
+
+    def _consume(self):
+        while True:
+            results = self.runner.result_queue.get_batch()
+            if results is None:
+                break
+            for result in results:
+                self.iterations += 1
+                if result["error"]:
+                    self.errors += 1
+                self._add_delay(result)
+                self.sla_checker.add_iteration(result)
+            self.rss_peak = max(self.rss_peak, _get_rss())
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.runner.result_queue.close()
+        self.thread.join()
+
+    def delay(self):
+        if not self.delay_mean.count:
+            return {"mean": None, "95%ile": None, "max": None}
+        return {"mean": self.delay_mean.result(),
+                "95%ile": self.delay_p95.result(),
+                "max": self.delay_max.result()}
+
+
+def run_workload(name, kw):
+    """Run single workload of the suite and measure the load generation.
+
+    :param name: name of Dummy scenario
+    :param kw: workload config with runner, args and sla sections
+    :returns: dict with measurements of the workload
+    """
+    conf = kw.get("runner", {"type": "serial"})
+    task = {"uuid": str(uuid.uuid4())}
+    runner_obj = runner.ScenarioRunner.get(conf["type"])(task, conf)
+    # NOTE: there is no deployment, admin endpoint is required only by
+    #       preprocessing of scenario arguments and is never connected to
+    admin = objects.Endpoint("http://localhost/", "admin", "")
+    context_obj = {"task": task, "admin": {"endpoint": admin}, "config": {},
+                   "scenario_name": name}
+
+    LOG.info("Measuring overhead of %(runner)s runner: %(config)s"
+             % {"runner": conf["type"], "config": conf})
+    parent_cpu = _get_cpu(resource.RUSAGE_SELF)
+    workers_cpu = _get_cpu(resource.RUSAGE_CHILDREN)
+    with _OverheadConsumer(runner_obj, sla.SLAChecker(kw)) as consumer:
+        start = time.time()
+        load_duration = runner_obj.run(name, context_obj, kw.get("args", {}))
+    full_duration = time.time() - start
+    parent_cpu = _get_cpu(resource.RUSAGE_SELF) - parent_cpu
+    workers_cpu = _get_cpu(resource.RUSAGE_CHILDREN) - workers_cpu
+
+    iterations = consumer.iterations
+    memory = consumer.rss_peak - consumer.rss_start
+    return {
+        "scenario": name,
+        "runner": conf,
+        "iterations": iterations,
+        "errors": consumer.errors,
+        "load_duration": load_duration,
+        "full_duration": full_duration,
+        "iterations_per_sec": (iterations / load_duration
+                               if load_duration else 0.0),
+        "scheduling_delay": consumer.delay(),
+        "parent_cpu": parent_cpu,
+        "parent_cpu_percent": (100.0 * parent_cpu / full_duration
+                               if full_duration else 0.0),
+        "workers_cpu": workers_cpu,
+        "memory_kb_per_1k_iterations": (1000.0 * memory / iterations
+                                        if iterations else 0.0),
+        "runner_stats": runner_obj.get_stats(),
+        "sla": consumer.sla_checker.results()
+    }
+
+
+def run(config=None):
+    """Run the runner overhead suite.
+
+    :param config: task config with Dummy workloads, default_suite() is
+                   used by default
+    :returns: dict with "workloads" - list of run_workload() results and
+              "summary" - dict of max iterations per second achieved by
+              each runner type
+    """
+    config = config or default_suite()
+    validate(config)
+
+    workloads = []
+    for name in sorted(config):
+        for kw in config[name]:
+            workloads.append(run_workload(name, kw))
+
+    summary = {}
+    for workload in workloads:
+        runner_type = workload["runner"]["type"]
+        summary[runner_type] = max(summary.get(runner_type, 0.0),
+                                   workload["iterations_per_sec"])
+    return {"workloads": workloads, "summary": summary}
+
+
+def find_regressions(results, baseline, tolerance=0.2):
+    """Compare max iterations per second with results of previous run.
+
+    :param results: result of run()
+    :param baseline: result of previous run()
+    :param tolerance: allowed relative decrease of iterations per second
+    :returns: list of (runner type, baseline value, current value) tuples
+              of runners which became slower
+    """
+    regressions = []
+    for runner_type, expected in sorted(six.iteritems(baseline["summary"])):
+        actual = results["summary"].get(runner_type)
+        if actual is not None and actual < expected * (1 - tolerance):
+            regressions.append((runner_type, expected, actual))
+    return regressions
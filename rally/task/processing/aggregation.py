@@ -0,0 +1,381 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.common import columnar
+from rally.common import costilius
+from rally.common import streaming_algorithms as streaming
+from rally.task.processing import charts
+
+
+class ScenarioAggregator(object):
+    """Aggregates iterations of a scenario in a single pass.
+
+    Stored iterations are read only once: summary info is calculated
+    while iterations are packed into compact columnar storage, so all the
+    tables and charts can be built from this storage without reading the
+    results again. It is used by `rally task detailed', `rally task report'
+    and Task.extend_results().
+    """
+
+    def __init__(self, result, stats=None):
+        """Read and aggregate iterations.
+
+        :param result: dict with scenario results, data["raw"] may be
+                       a generator of iterations
+        :param stats: ScenarioStats stored for the scenario, if it is given
+                      stats_table() is built from it
+        """
+        data = result["data"]
+        self.key = result["key"]
+        self.stats = stats
+        self.sla = data.get("sla", [])
+        self.iterations = columnar.ColumnarIterations()
+
+        tstamp_start = 0
+        min_duration = 0
+        max_duration = 0
+        atomic = costilius.OrderedDict()
+        output_names = set()
+
+        for itr in data["raw"]:
+            self.iterations.append(itr)
+
+            for atomic_name, duration in itr["atomic_actions"].items():
+                duration = duration or 0
+                if atomic_name not in atomic:
+                    atomic[atomic_name] = {"min_duration": duration,
+                                           "max_duration": duration}
+                elif duration < atomic[atomic_name]["min_duration"]:
+                    atomic[atomic_name]["min_duration"] = duration
+                elif duration > atomic[atomic_name]["max_duration"]:
+                    atomic[atomic_name]["max_duration"] = duration
+
+            output_names.update(itr["scenario_output"]["data"].keys())
+
+            if not tstamp_start or itr["timestamp"] < tstamp_start:
+                tstamp_start = itr["timestamp"]
+
+            if not itr["error"]:
+                duration = itr["duration"] or 0
+                if not min_duration or duration < min_duration:
+                    min_duration = duration
+                if not max_duration or duration > max_duration:
+                    max_duration = duration
+
+        self.info = {
+            "atomic": atomic,
+            "output_names": list(output_names),
+            "iterations_count": len(self.iterations),
+            "iterations_failed": self.iterations.failed,
+            "min_duration": min_duration,
+            "max_duration": max_duration,
+            "tstamp_start": tstamp_start,
+            "full_duration": data["full_duration"],
+            "load_duration": data["load_duration"],
+            "runner_stats": data.get("runner_stats", {})}
+
+    def stats_table(self):
+        """Response times of atomic actions and whole iterations.
+
+        :returns: dict {"cols": [str, ...], "rows": [[...], ...]}, see
+                  charts.MainStatsTable
+        """
+        if self.stats is not None:
+            return self.stats.stats_table()
+        table = charts.MainStatsTable(self.info)
+        for itr in self.iterations:
+            table.add_iteration(itr)
+        return table.render()
+
+    def output_stats_table(self):
+        """Statistics of scenario output values.
+
+        :returns: list of [name, min, median, 90%ile, 95%ile, max, avg]
+                  rows, values are None if there are no data for the name
+        """
+        stats = costilius.OrderedDict()
+        for name in sorted(self.info["output_names"]):
+            stats[name] = [streaming.MinComputation(),
+                           streaming.PercentileComputation(0.5),
+                           streaming.PercentileComputation(0.9),
+                           streaming.PercentileComputation(0.95),
+                           streaming.MaxComputation(),
+                           streaming.MeanComputation()]
+
+        found = set()
+        for output in self.iterations.outputs.values():
+            for name, value in output["data"].items():
+                found.add(name)
+                for computation in stats[name]:
+                    computation.add(float(value))
+
+        rows = []
+        for name, computations in stats.items():
+            if name in found:
+                rows.append([name] + [round(c.result(), 3)
+                                      for c in computations])
+            else:
+                rows.append([name] + [None] * len(computations))
+        return rows
+
+    def output_errors(self):
+        """List of (iteration index, scenario output errors) tuples."""
+        return [(idx, output["errors"])
+                for idx, output in sorted(self.iterations.outputs.items())
+                if output["errors"]]
+
+    def errors(self):
+        """List of iteration errors in report format."""
+        errors = []
+        for idx, error in sorted(self.iterations.errors.items()):
+            typ, msg, trace = error
+            errors.append({"iteration": idx,
+                           "type": typ, "message": msg, "traceback": trace})
+        return errors
+
+
+class _ValueStats(object):
+    """Statistics of values of an atomic action or a scenario output."""
+
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+        self.count = 0
+        self.errors = 0
+        self.min_value = None
+        self.max_value = None
+        self.sketch = streaming.QuantileSketch()
+        self._stddev = streaming.StdDevComputation()
+        self._mean = None
+        self._stddev_value = None
+
+    def add(self, value, error=False):
+        self.count += 1
+        if error:
+            self.errors += 1
+            return
+        if value is None:
+            return
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+        self.sketch.add(value)
+        self._stddev.add(value)
+
+    @property
+    def mean(self):
+        if self._stddev.count:
+            return self._stddev.mean
+        return self._mean
+
+    @property
+    def stddev(self):
+        if self._stddev.count > 1:
+            return self._stddev.result()
+        return self._stddev_value
+
+    def to_dict(self, position):
+        return {"position": position,
+                "kind": self.kind,
+                "name": self.name,
+                "count": self.count,
+                "errors": self.errors,
+                "min_value": self.min_value,
+                "max_value": self.max_value,
+                "mean": self.mean,
+                "stddev": self.stddev,
+                "sketch": self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, row):
+        stats = cls(row["kind"], row["name"])
+        stats.count = row["count"]
+        stats.errors = row["errors"]
+        stats.min_value = row["min_value"]
+        stats.max_value = row["max_value"]
+        stats.sketch = streaming.QuantileSketch.from_dict(row["sketch"])
+        stats._mean = row["mean"]
+        stats._stddev_value = row["stddev"]
+        return stats
+
+
+class ScenarioStats(object):
+    """Summary of iterations of a scenario which can be stored.
+
+    ResultConsumer adds each iteration of the scenario while it is running,
+    and stores rows of the summary (one per atomic action, whole iteration
+    and scenario output value) when the scenario is finished. Tables of
+    `rally task detailed' and `rally task report' are built from these rows
+    in O(actions) time, without reading raw iterations.
+
+    Durations of atomic actions and whole iterations are taken from
+    successful iterations only, like in charts.MainStatsTable. Durations
+    of atomic actions shown by `rally task detailed' are taken from all
+    iterations, so they are summarized separately.
+    """
+
+    ATOMIC = "atomic"
+    DETAILED = "detailed"
+    OUTPUT = "output"
+    OUTPUT_ERRORS = "output_errors"
+
+    def __init__(self):
+        self._atomic = costilius.OrderedDict()
+        self._total = _ValueStats(self.ATOMIC, "total")
+        self._outputs = {}
+        self._detailed = {}
+        # NOTE: `rally task detailed' shows actions of the first successful
+        #       iteration in their order
+        self._detailed_names = None
+        self._output_errors = _ValueStats(self.OUTPUT_ERRORS, "errors")
+
+    @classmethod
+    def from_iterations(cls, iterations):
+        """Summarize iterations, e.g. of results stored without summary."""
+        scenario_stats = cls()
+        for iteration in iterations:
+            scenario_stats.add(iteration)
+        return scenario_stats
+
+    @property
+    def output_errors_count(self):
+        """Number of iterations with scenario output errors."""
+        return self._output_errors.count
+
+    def add(self, iteration):
+        """Add the result of an iteration."""
+        error = bool(iteration["error"])
+        for name, duration in iteration["atomic_actions"].items():
+            if name not in self._atomic:
+                self._atomic[name] = _ValueStats(self.ATOMIC, name)
+                self._detailed[name] = _ValueStats(self.DETAILED, name)
+            self._atomic[name].add(duration, error)
+            self._detailed[name].add(duration)
+        if not error and self._detailed_names is None:
+            self._detailed_names = list(iteration["atomic_actions"])
+        self._total.add(iteration["duration"], error)
+        if iteration["scenario_output"].get("errors"):
+            self._output_errors.add(None)
+        for name, value in iteration["scenario_output"]["data"].items():
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                # NOTE: the summary should not break consuming of results
+                continue
+            if name not in self._outputs:
+                self._outputs[name] = _ValueStats(self.OUTPUT, name)
+            self._outputs[name].add(value)
+
+    def _all(self):
+        return (list(self._atomic.values()) + [self._total] +
+                [self._outputs[name] for name in sorted(self._outputs)] +
+                [self._detailed[name]
+                 for name in self._detailed_names or []] +
+                [self._output_errors])
+
+    def to_rows(self):
+        """Return list of JSON-compatible dicts, one per row."""
+        return [stats.to_dict(i) for i, stats in enumerate(self._all())]
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Restore the summary from rows returned by to_rows()."""
+        scenario_stats = cls()
+        for row in sorted(rows, key=lambda r: r["position"]):
+            stats = _ValueStats.from_dict(row)
+            if stats.kind == cls.OUTPUT:
+                scenario_stats._outputs[stats.name] = stats
+            elif stats.kind == cls.DETAILED:
+                scenario_stats._detailed[stats.name] = stats
+                scenario_stats._detailed_names = (
+                    (scenario_stats._detailed_names or []) + [stats.name])
+            elif stats.kind == cls.OUTPUT_ERRORS:
+                scenario_stats._output_errors = stats
+            elif stats.name == "total":
+                scenario_stats._total = stats
+            else:
+                scenario_stats._atomic[stats.name] = stats
+        return scenario_stats
+
+    @staticmethod
+    def _durations(stats):
+        quantile = stats.sketch.quantile
+        return [round(stats.min_value, 3), round(quantile(0.5), 3),
+                round(quantile(0.9), 3), round(quantile(0.95), 3),
+                round(stats.max_value, 3), round(stats.mean, 3)]
+
+    def stats_table(self):
+        """Response times in format of ScenarioAggregator.stats_table()."""
+        rows = [row if row[1] is not None else
+                [row[0]] + ["n/a"] * 7 + [row[-1]]
+                for row in self.durations_table()]
+        return {"cols": ["Action", "Min (sec)", "Median (sec)",
+                         "90%ile (sec)", "95%ile (sec)", "Max (sec)",
+                         "Avg (sec)", "Success", "Count"],
+                "rows": rows}
+
+    def durations_table(self):
+        """Response times of successful iterations.
+
+        :returns: list of [name, min, median, 90%ile, 95%ile, max, avg,
+                  success, count] rows, durations are None if all
+                  iterations failed
+        """
+        rows = []
+        for stats in list(self._atomic.values()) + [self._total]:
+            if stats.sketch.count:
+                rows.append([stats.name] + self._durations(stats) +
+                            ["%.1f%%" % ((stats.count - stats.errors) *
+                                         100.0 / stats.count),
+                             stats.count])
+            else:
+                rows.append([stats.name] + [None] * 6 +
+                            ["0.0%", stats.count])
+        return rows
+
+    def atomic_actions_table(self):
+        """Response times in format of `rally task detailed'.
+
+        Unlike durations_table(), durations of atomic actions are taken
+        from all iterations (failed ones as well), "success" is a share of
+        iterations where the action has a duration and "count" is a number
+        of all iterations. Actions are taken from the first successful
+        iteration.
+
+        :returns: list of [name, min, median, 90%ile, 95%ile, max, avg,
+                  success, count] rows
+        """
+        count = self._total.count
+        rows = []
+        for stats in ([self._detailed[name]
+                       for name in self._detailed_names or []] +
+                      [self._total]):
+            if stats.sketch.count:
+                rows.append([stats.name] + self._durations(stats) +
+                            ["%.1f%%" % (stats.sketch.count * 100.0 / count),
+                             count])
+            else:
+                rows.append([stats.name] + [None] * 6 + ["0.0%", count])
+        return rows
+
+    def output_stats_table(self):
+        """Statistics of scenario output values.
+
+        :returns: list of [name, min, median, 90%ile, 95%ile, max, avg]
+                  rows
+        """
+        return [[stats.name] + self._durations(stats)
+                for name, stats in sorted(self._outputs.items())]
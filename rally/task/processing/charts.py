@@ -52,8 +52,8 @@ class Chart(object):
         """
         for name, value in self._map_iteration_values(iteration):
             if name not in self._data:
-                self._data[name] = utils.GraphZipper(self.base_size,
-                                                     self.zipped_size)
+                self._data[name] = utils.MinMaxGraphZipper(
+                    self.base_size, self.zipped_size)
             self._data[name].add_point(value)
 
     def render(self):
@@ -203,6 +203,10 @@ class HistogramChart(Chart):
     And each histogram has several data views.
     """
 
+    # NOTE: number of bins of every view is limited, so size of rendered
+    #       data does not depend on number of iterations
+    MAX_BINS = 100
+
     def _init_views(self, min_value, max_value):
         """Generate initial data for each histogram view."""
         if not self.base_size:
@@ -218,6 +222,7 @@ class HistogramChart(Chart):
                  int(math.ceil(2 * self.base_size ** (1.0 / 3)))),
                 ("One Half",
                  int(math.ceil(self.base_size / 2.0)))]:
+            bins = min(bins, self.MAX_BINS)
             bin_width = float(max_value - min_value) / bins
             x_axis = [min_value + (bin_width * x) for x in range(1, bins + 1)]
             views.append({"view": view, "bins": bins,
@@ -228,11 +233,10 @@ class HistogramChart(Chart):
         for name, value in self._map_iteration_values(iteration):
             if name not in self._data:
                 raise KeyError("Unexpected histogram name: %s" % name)
-            for i, view in enumerate(self._data[name]["views"]):
-                for bin_i, bin_v in enumerate(view["x"]):
-                    if (value or 0) <= bin_v:
-                        self._data[name]["views"][i]["y"][bin_i] += 1
-                        break
+            for view in self._data[name]["views"]:
+                bin_i = bisect.bisect_left(view["x"], value or 0)
+                if bin_i < len(view["x"]):
+                    view["y"][bin_i] += 1
 
     def render(self):
         data = []
@@ -274,7 +278,7 @@ class AtomicHistogramChart(HistogramChart):
 
 class MainStatsTable(Chart):
 
-    def _init_row(self, name, iterations_count):
+    def _init_row(self, name):
 
         def round_3(stream, no_result):
             if no_result:
@@ -285,11 +289,11 @@ class MainStatsTable(Chart):
             ("Action", name),
             ("Min (sec)", streaming.MinComputation(), round_3),
             ("Median (sec)",
-             streaming.PercentileComputation(0.5, iterations_count), round_3),
+             streaming.PercentileComputation(0.5), round_3),
             ("90%ile (sec)",
-             streaming.PercentileComputation(0.9, iterations_count), round_3),
+             streaming.PercentileComputation(0.9), round_3),
             ("95%ile (sec)",
-             streaming.PercentileComputation(0.95, iterations_count), round_3),
+             streaming.PercentileComputation(0.95), round_3),
             ("Max (sec)", streaming.MaxComputation(), round_3),
             ("Avg (sec)", streaming.MeanComputation(), round_3),
             ("Success", streaming.MeanComputation(),
@@ -303,8 +307,7 @@ class MainStatsTable(Chart):
         self.rows = list(benchmark_info["atomic"].keys())
         self.rows.append("total")
         self.rows_index = dict((name, i) for i, name in enumerate(self.rows))
-        self.table = [self._init_row(name, benchmark_info["iterations_count"])
-                      for name in self.rows]
+        self.table = [self._init_row(name) for name in self.rows]
 
     def add_iteration(self, iteration):
         data = copy.copy(iteration["atomic_actions"])
@@ -16,38 +16,34 @@
 import collections
 import json
 
-from rally.common import objects
+from rally.task.processing import aggregation
 from rally.task.processing import charts
+from rally.task.processing import trends as trends_
 from rally.ui import utils as ui_utils
 
+# NOTE: only first errors are embedded into the report, so its size does
+#       not depend on number of failed iterations
+MAX_ERRORS = 100
 
-def _process_scenario(data, pos):
-    main_area = charts.MainStackedAreaChart(data["info"])
-    main_hist = charts.MainHistogramChart(data["info"])
-    main_stat = charts.MainStatsTable(data["info"])
-    load_profile = charts.LoadProfileChart(data["info"])
-    atomic_pie = charts.AtomicAvgChart(data["info"])
-    atomic_area = charts.AtomicStackedAreaChart(data["info"])
-    atomic_hist = charts.AtomicHistogramChart(data["info"])
-    output_area = charts.OutputStackedAreaChart(data["info"])
-
-    errors = []
-    output_errors = []
-    for idx, itr in enumerate(data["iterations"]):
-        if itr["error"]:
-            typ, msg, trace = itr["error"]
-            errors.append({"iteration": idx,
-                           "type": typ, "message": msg, "traceback": trace})
-
-        if itr["scenario_output"]["errors"]:
-            output_errors.append((idx, itr["scenario_output"]["errors"]))
-
-        for chart in (main_area, main_hist, main_stat, load_profile,
-                      atomic_pie, atomic_area, atomic_hist, output_area):
+
+def _process_scenario(aggregator, pos):
+    info = aggregator.info
+    main_area = charts.MainStackedAreaChart(info)
+    main_hist = charts.MainHistogramChart(info)
+    load_profile = charts.LoadProfileChart(info)
+    atomic_pie = charts.AtomicAvgChart(info)
+    atomic_area = charts.AtomicStackedAreaChart(info)
+    atomic_hist = charts.AtomicHistogramChart(info)
+    output_area = charts.OutputStackedAreaChart(info)
+
+    for itr in aggregator.iterations:
+        for chart in (main_area, main_hist, load_profile, atomic_pie,
+                      atomic_area, atomic_hist, output_area):
             chart.add_iteration(itr)
 
-    kw = data["key"]["kw"]
-    cls, method = data["key"]["name"].split(".")
+    errors = aggregator.errors()
+    kw = aggregator.key["kw"]
+    cls, method = aggregator.key["name"].split(".")
 
     return {
         "cls": cls,
@@ -55,65 +51,74 @@ def _process_scenario(data, pos):
         "pos": str(pos),
         "name": method + (pos and " [%d]" % (pos + 1) or ""),
         "runner": kw["runner"]["type"],
-        "config": json.dumps({data["key"]["name"]: [kw]}, indent=2),
+        "config": json.dumps({aggregator.key["name"]: [kw]}, indent=2),
         "iterations": {
             "iter": main_area.render(),
-            "pie": [("success", (data["info"]["iterations_count"]
-                                 - len(errors))),
+            "pie": [("success", info["iterations_count"] - len(errors)),
                     ("errors", len(errors))],
             "histogram": main_hist.render()[0]},
         "load_profile": load_profile.render(),
         "atomic": {"histogram": atomic_hist.render(),
                    "iter": atomic_area.render(),
                    "pie": atomic_pie.render()},
-        "table": main_stat.render(),
+        "table": aggregator.stats_table(),
         "output": output_area.render(),
-        "output_errors": output_errors,
-        "errors": errors,
-        "load_duration": data["info"]["load_duration"],
-        "full_duration": data["info"]["full_duration"],
-        "sla": data["sla"],
-        "sla_success": all([s["success"] for s in data["sla"]]),
-        "iterations_count": data["info"]["iterations_count"],
+        "output_errors": aggregator.output_errors()[:MAX_ERRORS],
+        "errors": errors[:MAX_ERRORS],
+        "errors_count": len(errors),
+        "load_duration": info["load_duration"],
+        "full_duration": info["full_duration"],
+        "sla": aggregator.sla,
+        "sla_success": all([s["success"] for s in aggregator.sla]),
+        "iterations_count": info["iterations_count"],
     }
 
 
-def _process_tasks(tasks_results):
+def _process_tasks(aggregators):
     tasks = []
     source_dict = collections.defaultdict(list)
     position = collections.defaultdict(lambda: -1)
 
-    for scenario in tasks_results:
-        name = scenario["key"]["name"]
+    for aggregator in aggregators:
+        name = aggregator.key["name"]
         position[name] += 1
-        source_dict[name].append(scenario["key"]["kw"])
-        tasks.append(_process_scenario(scenario, position[name]))
+        source_dict[name].append(aggregator.key["kw"])
+        tasks.append(_process_scenario(aggregator, position[name]))
 
     source = json.dumps(source_dict, indent=2, sort_keys=True)
     return source, sorted(tasks, key=lambda r: r["cls"] + r["name"])
 
 
 def plot(tasks_results):
-    # NOTE(amaretskiy): Transform generic results into extended
-    #   results, so they can be processed by charts classes
-    extended_results = []
+    # NOTE: iterations of each scenario are read only once, tables and
+    #       charts are built from the aggregated data, see
+    #       rally.task.processing.aggregation.ScenarioAggregator
+    aggregators = []
     for result in tasks_results:
-        generic = {
-            "id": None,
-            "task_uuid": None,
+        aggregators.append(aggregation.ScenarioAggregator({
             "key": result["key"],
             "data": {
                 "sla": result["sla"],
                 "raw": result["result"],
-                "full_duration": result[
-                    "full_duration"],
-                "load_duration": result[
-                    "load_duration"]},
-            "created_at": None,
-            "updated_at": None}
-        extended_results.extend(
-            objects.Task.extend_results([generic]))
+                "full_duration": result["full_duration"],
+                "load_duration": result["load_duration"]}},
+            stats=result.get("stats")))
 
     template = ui_utils.get_template("task/report.mako")
-    source, data = _process_tasks(extended_results)
+    source, data = _process_tasks(aggregators)
     return template.render(source=json.dumps(source), data=json.dumps(data))
+
+
+def trends(tasks_results):
+    """Render the report with trends of scenarios across several tasks.
+
+    :param tasks_results: list of (task, results) pairs in order of tasks
+                          in the report, results are returned by
+                          Task.get_results_aggregates()
+    """
+    trends_data = trends_.Trends()
+    for task, results in tasks_results:
+        trends_data.add_task(task, results)
+
+    template = ui_utils.get_template("task/trends.mako")
+    return template.render(data=json.dumps(trends_data.render()))
@@ -0,0 +1,144 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from rally.common import costilius
+
+
+class Trends(object):
+    """Trends of scenarios across several tasks.
+
+    Results of the same scenario (the same name and arguments) of each
+    task are compared using only aggregates stored when the scenario is
+    finished (see Task.get_results_aggregates()), so raw iterations are
+    not read and hundreds of tasks are processed in seconds.
+    """
+
+    DURATIONS = ("min", "median", "90%ile", "95%ile", "max", "avg")
+
+    def __init__(self):
+        self._tasks = []
+        self._scenarios = costilius.OrderedDict()
+
+    @staticmethod
+    def _scenario_id(key):
+        return "%s %s" % (key["name"], json.dumps(key.get("kw", {}),
+                                                  sort_keys=True))
+
+    @staticmethod
+    def _durations(stats):
+        # NOTE: rows of stats are [name, min, median, 90%ile, 95%ile, max,
+        #       avg, success, count], durations are None if all iterations
+        #       failed
+        if stats is None:
+            return costilius.OrderedDict()
+        return costilius.OrderedDict(
+            (row[0], row[1:7]) for row in stats.durations_table())
+
+    def add_task(self, task, results):
+        """Add aggregates of a task.
+
+        Tasks should be added in order they are shown in the report,
+        usually in order of their creation.
+
+        :param task: dict with "uuid" and "created_at" of the task
+        :param results: list of dicts returned by
+                        Task.get_results_aggregates()
+        """
+        idx = len(self._tasks) + 1
+        self._tasks.append({"idx": idx, "uuid": task["uuid"],
+                            "created_at": str(task["created_at"])})
+        runs = {}
+        for result in results:
+            name = self._scenario_id(result["key"])
+            # NOTE: the same scenario may be run several times by one task
+            runs[name] = runs.get(name, -1) + 1
+            scenario_id = (name, runs[name])
+            if scenario_id not in self._scenarios:
+                self._scenarios[scenario_id] = {"key": result["key"],
+                                                "points": []}
+
+            iterations = result["iterations_count"]
+            failed = result["failed_iterations_count"]
+            success = throughput = None
+            if iterations:
+                success = round((iterations - (failed or 0)) * 100.0 /
+                                iterations, 1)
+                if result["load_duration"]:
+                    throughput = round(
+                        iterations / float(result["load_duration"]), 3)
+            self._scenarios[scenario_id]["points"].append({
+                "idx": idx,
+                "iterations_count": iterations,
+                "failed_iterations_count": failed,
+                "success": success,
+                "throughput": throughput,
+                "load_duration": result["load_duration"],
+                "full_duration": result["full_duration"],
+                "sla_success": result["sla_success"],
+                "durations": self._durations(result["stats"])})
+
+    def _render_scenario(self, scenario, pos):
+        points = scenario["points"]
+        actions = costilius.OrderedDict()
+        for point in points:
+            for name in point["durations"]:
+                actions.setdefault(name, None)
+
+        charts = []
+        for name in actions:
+            series = []
+            for i, label in enumerate(self.DURATIONS):
+                series.append(
+                    (label, [[p["idx"], p["durations"][name][i]]
+                             for p in points if name in p["durations"] and
+                             p["durations"][name][i] is not None]))
+            charts.append({"name": name, "series": series})
+
+        def metric(name):
+            return [[p["idx"], p[name]] for p in points
+                    if p[name] is not None]
+
+        key = scenario["key"]
+        cls, method = key["name"].split(".")
+        return {
+            "cls": cls,
+            "met": method,
+            "name": method + (pos and " [%d]" % (pos + 1) or ""),
+            "config": json.dumps({key["name"]: [key.get("kw", {})]},
+                                 indent=2),
+            "length": len(points),
+            "actions": charts,
+            "success": [("success rate", metric("success"))],
+            "throughput": [("throughput", metric("throughput"))],
+            "tasks": [dict((k, v) for k, v in p.items()
+                           if k != "durations") for p in points]}
+
+    def render(self):
+        """Generate data for the trends report.
+
+        :returns: dict with list of tasks and list of scenarios sorted by
+                  their names
+        """
+        scenarios = []
+        position = {}
+        for scenario in self._scenarios.values():
+            name = scenario["key"]["name"]
+            position[name] = position.get(name, -1) + 1
+            scenarios.append(self._render_scenario(scenario, position[name]))
+        return {"tasks": self._tasks,
+                "scenarios": sorted(scenarios,
+                                    key=lambda s: s["cls"] + s["name"])}
@@ -15,7 +15,6 @@
 
 import math
 
-from rally.common import costilius
 from rally.common.i18n import _
 from rally import exceptions
 
@@ -74,32 +73,6 @@ def percentile(values, percent):
     return (d0 + d1)
 
 
-# TODO(amaretskiy): This function is deprecated and should be removed
-#                   after it becomes not used by rally.cli.commands.task
-def get_atomic_actions_data(raw_data):
-    """Retrieve detailed (by atomic actions & total runtime) benchmark data.
-
-    :parameter raw_data: list of raw records (scenario runner output)
-
-    :returns: dictionary containing atomic action + total duration lists
-              for all atomic action keys
-    """
-    atomic_actions = []
-    for row in raw_data:
-        # find first non-error result to get atomic actions names
-        if not row["error"] and "atomic_actions" in row:
-            atomic_actions = row["atomic_actions"].keys()
-            break
-    actions_data = costilius.OrderedDict()
-    for atomic_action in atomic_actions:
-        actions_data[atomic_action] = [
-            r["atomic_actions"][atomic_action]
-            for r in raw_data
-            if r["atomic_actions"].get(atomic_action) is not None]
-    actions_data["total"] = [r["duration"] for r in raw_data if not r["error"]]
-    return actions_data
-
-
 class GraphZipper(object):
 
     def __init__(self, base_size, zipped_size=1000):
@@ -161,3 +134,65 @@ class GraphZipper(object):
 
     def get_zipped_graph(self):
         return self.zipped_graph
+
+
+class MinMaxGraphZipper(object):
+    """Downsample a graph keeping its minimal and maximal values.
+
+    Points are split into buckets of equal size and every bucket is
+    represented by its minimal and maximal values in order of their
+    appearance. Unlike GraphZipper, which averages points, spikes are not
+    smoothed out.
+
+    Points of a bucket are placed at its first and last orders, so graphs
+    of the same size have the same X values and can be stacked.
+    """
+
+    def __init__(self, base_size, zipped_size=1000):
+        """Init graph zipper.
+
+        :param base_size: Amount of points in raw graph
+        :param zipped_size: Maximum amount of points in zipped graph
+        """
+        self.base_size = base_size
+        self.zipped_size = zipped_size
+        if self.base_size > self.zipped_size:
+            # NOTE: every bucket is represented by two points
+            self.bucket_size = int(math.ceil(
+                self.base_size / float(max(self.zipped_size // 2, 1))))
+        else:
+            self.bucket_size = 1
+
+        self.point_order = 0
+        self.bucket = []
+        self.zipped_graph = []
+
+    def _get_zipped_points(self):
+        if len(self.bucket) == 1:
+            return [self.bucket[0]]
+        first, last = self.bucket[0][0], self.bucket[-1][0]
+        low = min(self.bucket, key=lambda p: p[1])
+        high = max(self.bucket, key=lambda p: p[1])
+        if low[0] > high[0]:
+            low, high = high, low
+        return [[first, low[1]], [last, high[1]]]
+
+    def add_point(self, value):
+        self.point_order += 1
+
+        if self.point_order > self.base_size:
+            raise RuntimeError("GraphZipper is already full. "
+                               "You can't add more points.")
+
+        if not isinstance(value, (int, float)):
+            value = 0
+
+        self.bucket.append([self.point_order, value])
+        if len(self.bucket) >= self.bucket_size:
+            self.zipped_graph.extend(self._get_zipped_points())
+            self.bucket = []
+
+    def get_zipped_graph(self):
+        if self.bucket:
+            return self.zipped_graph + self._get_zipped_points()
+        return self.zipped_graph
@@ -16,9 +16,13 @@
 import abc
 import collections
 import multiprocessing
+import threading
 import time
 
 import jsonschema
+from oslo_config import cfg
+import six
+from six.moves import queue as Queue
 
 from rally.common import log as logging
 from rally.common.plugin import plugin
@@ -32,6 +36,18 @@ from rally.task import utils
 
 LOG = logging.getLogger(__name__)
 
+RUNNER_BENCHMARK_OPTS = [
+    cfg.BoolOpt("strict_result_validation",
+                default=False,
+                help="Validate each iteration result against full JSON "
+                     "schema instead of a fast structural check. It is much "
+                     "slower and is useful for debugging of runner plugins.")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
+CONF.register_opts(RUNNER_BENCHMARK_OPTS, group=benchmark_group)
+
 
 def format_result_on_timeout(exc, timeout):
     return {
@@ -84,6 +100,111 @@ def _worker_thread(queue, args):
     queue.put(_run_scenario_once(args))
 
 
+class ResultBatcher(object):
+    """Sends results from a worker process to the parent in batches.
+
+    Worker threads put single results into the batcher, which forwards them
+    to the multiprocessing queue as lists. A batch is sent as soon as it
+    holds batch_size results or flush_interval seconds after its first
+    result arrived, whichever comes first, so the parent receives few large
+    messages under high load and still gets every result with bounded delay.
+    """
+
+    def __init__(self, queue, batch_size=100, flush_interval=0.05):
+        """ResultBatcher constructor.
+
+        :param queue: multiprocessing.Queue to send batches of results to
+        :param batch_size: max number of results in a single batch
+        :param flush_interval: max number of seconds a result is buffered
+        """
+        self.queue = queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._batch = []
+        self._batch_started = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._flusher = threading.Thread(target=self._flush_periodically)
+        self._flusher.daemon = True
+        self._flusher.start()
+
+    def put(self, result):
+        with self._cond:
+            if not self._batch:
+                self._batch_started = time.time()
+                self._cond.notify()
+            self._batch.append(result)
+            if len(self._batch) >= self.batch_size:
+                self._flush()
+
+    def _flush(self):
+        if self._batch:
+            self.queue.put(self._batch)
+            self._batch = []
+
+    def _flush_periodically(self):
+        with self._cond:
+            while not self._closed:
+                if not self._batch:
+                    self._cond.wait()
+                    continue
+                delay = self._batch_started + self.flush_interval - time.time()
+                if delay > 0:
+                    self._cond.wait(delay)
+                else:
+                    self._flush()
+
+    def close(self):
+        """Send all buffered results and stop the flushing thread."""
+        with self._cond:
+            self._closed = True
+            self._flush()
+            self._cond.notify()
+        self._flusher.join()
+
+
+class ResultQueue(collections.deque):
+    """Thread-safe deque of results passed from runner to consumer.
+
+    Unlike polling a plain deque, a consumer blocks in get_batch() until
+    either new results arrive or the queue is closed by the producer, so no
+    CPU is spent while there is nothing to process and every batch of
+    results is handled right away.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(ResultQueue, self).__init__(*args, **kwargs)
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put_batch(self, results):
+        """Append a list of results and wake up the consumer."""
+        with self._cond:
+            self.extend(results)
+            self._cond.notify()
+
+    def get_batch(self):
+        """Wait for results and pop all of them at once.
+
+        :returns: list of results or None if the queue is closed and all
+                  results have already been consumed
+        """
+        with self._cond:
+            while not self and not self._closed:
+                self._cond.wait()
+            if not self:
+                return None
+            batch = list(self)
+            self.clear()
+            return batch
+
+    def close(self):
+        """Mark that no more results will be put and wake up consumers."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
 def _log_worker_info(**info):
     """Log worker parameters for debugging.
 
@@ -94,8 +215,23 @@ def _log_worker_info(**info):
     LOG.debug("Starting a worker.\n\t%s" % info_message)
 
 
+def _is_number(value):
+    # NOTE: JSON schema doesn't treat booleans as numbers
+    return (isinstance(value, six.integer_types + (float,)) and
+            not isinstance(value, bool))
+
+
 class ScenarioRunnerResult(dict):
-    """Class for all scenario runners' result."""
+    """Class for all scenario runners' result.
+
+    Results are checked by a fast structural validator which is equivalent
+    to RESULT_SCHEMA. Full jsonschema validation is used only in strict
+    mode (see strict_result_validation option), because it is too slow to
+    be done for every iteration.
+    """
+
+    NUMBER_FIELDS = ("duration", "timestamp", "idle_duration",
+                     "runner_overhead", "start_lag")
 
     RESULT_SCHEMA = {
         "type": "object",
@@ -110,6 +246,12 @@ class ScenarioRunnerResult(dict):
             "idle_duration": {
                 "type": "number"
             },
+            "runner_overhead": {
+                "type": "number"
+            },
+            "start_lag": {
+                "type": "number"
+            },
             "scenario_output": {
                 "type": "object",
                 "properties": {
@@ -141,9 +283,78 @@ class ScenarioRunnerResult(dict):
         "additionalProperties": False
     }
 
-    def __init__(self, result_list):
+    FIELDS = frozenset(NUMBER_FIELDS +
+                       ("scenario_output", "atomic_actions", "error"))
+
+    def __init__(self, result_list, strict=None):
+        """Validate the result and create ScenarioRunnerResult.
+
+        :param result_list: dict with result of a single iteration
+        :param strict: use full jsonschema validation, by default it is
+                       defined by strict_result_validation option
+        :raises jsonschema.ValidationError: if result is invalid
+        """
         super(ScenarioRunnerResult, self).__init__(result_list)
-        jsonschema.validate(result_list, self.RESULT_SCHEMA)
+        if strict is None:
+            strict = CONF.benchmark.strict_result_validation
+        if strict:
+            jsonschema.validate(result_list, self.RESULT_SCHEMA)
+        else:
+            self.validate(result_list)
+
+    @classmethod
+    def validate(cls, result):
+        """Check that result matches RESULT_SCHEMA without jsonschema.
+
+        :raises jsonschema.ValidationError: if result is invalid
+        """
+        def fail(message, *args):
+            raise jsonschema.ValidationError(message % args)
+
+        if not isinstance(result, dict):
+            fail("%r is not of type 'object'", result)
+        extra = set(result) - cls.FIELDS
+        if extra:
+            fail("Additional properties are not allowed (%s were "
+                 "unexpected)", ", ".join(sorted(map(repr, extra))))
+
+        for name in cls.NUMBER_FIELDS:
+            if name in result and not _is_number(result[name]):
+                fail("%r is not of type 'number'", result[name])
+
+        if "scenario_output" in result:
+            output = result["scenario_output"]
+            if not isinstance(output, dict):
+                fail("%r is not of type 'object'", output)
+            extra = set(output) - set(["data", "errors"])
+            if extra:
+                fail("Additional properties are not allowed (%s were "
+                     "unexpected)", ", ".join(sorted(map(repr, extra))))
+            if "data" in output:
+                if not isinstance(output["data"], dict):
+                    fail("%r is not of type 'object'", output["data"])
+                for value in output["data"].values():
+                    if not _is_number(value):
+                        fail("%r is not of type 'number'", value)
+            if ("errors" in output and
+                    not isinstance(output["errors"], six.string_types)):
+                fail("%r is not of type 'string'", output["errors"])
+
+        if "atomic_actions" in result:
+            actions = result["atomic_actions"]
+            if not isinstance(actions, dict):
+                fail("%r is not of type 'object'", actions)
+            for value in actions.values():
+                if value is not None and not _is_number(value):
+                    fail("%r is not of type 'number', 'null'", value)
+
+        if "error" in result:
+            error = result["error"]
+            if not isinstance(error, list):
+                fail("%r is not of type 'array'", error)
+            for item in error:
+                if not isinstance(item, six.string_types):
+                    fail("%r is not of type 'string'", item)
 
 
 def configure(name, namespace="default"):
@@ -163,18 +374,23 @@ class ScenarioRunner(plugin.Plugin):
 
     CONFIG_SCHEMA = {}
 
+    # NOTE: interval (in seconds) between checks of worker processes
+    #       liveness while no results are being received
+    JOIN_CHECK_INTERVAL = 0.1
+
     def __init__(self, task, config):
         """Runner constructor.
 
         It sets task and config to local variables. Also initialize
-        result_queue, where results will be put by _send_result method.
+        result_queue, where results will be put by _send_result and
+        _send_results methods.
 
         :param task: Instance of objects.Task
         :param config: Dict with runner section from benchmark configuration
         """
         self.task = task
         self.config = config
-        self.result_queue = collections.deque()
+        self.result_queue = ResultQueue()
         self.aborted = multiprocessing.Event()
         self.run_duration = 0
 
@@ -205,6 +421,10 @@ class ScenarioRunner(plugin.Plugin):
         # NOTE(boris-42): processing @types decorators
         args = types.preprocess(name, context, args)
 
+        # NOTE: context is locked once here, so scenario context of each
+        #       iteration can be mapped from it without deep copying
+        context = rutils.LockedDict(context)
+
         with rutils.Timer() as timer:
             self._run_scenario(cls, method_name, context, args)
         self.run_duration = timer.duration()
@@ -214,6 +434,13 @@ class ScenarioRunner(plugin.Plugin):
         """Abort the execution of further benchmark scenario iterations."""
         self.aborted.set()
 
+    def get_stats(self):
+        """Return runner specific statistics of the load generation.
+
+        The returned dict is stored in task results as runner_stats.
+        """
+        return {}
+
     @staticmethod
     def _create_process_pool(processes_to_start, worker_process,
                              worker_args_gen):
@@ -240,21 +467,37 @@ class ScenarioRunner(plugin.Plugin):
     def _join_processes(self, process_pool, result_queue):
         """Join the processes in the pool and send their results to the queue.
 
+        Worker processes are expected to put lists of results (see
+        ResultBatcher) into result_queue. This method blocks on the queue, so
+        it does not consume CPU while workers are busy, and forwards all
+        results that are available at the moment as a single batch.
+
         :param process_pool: pool of processes to join
         :result_queue: multiprocessing.Queue that receives the results
         """
         while process_pool:
+            try:
+                results = result_queue.get(timeout=self.JOIN_CHECK_INTERVAL)
+            except Queue.Empty:
+                results = []
+            self._send_results(results + self._drain(result_queue))
+
             while process_pool and not process_pool[0].is_alive():
                 process_pool.popleft().join()
 
-            if result_queue.empty():
-                # sleep a bit to avoid 100% usage of CPU by this method
-                time.sleep(0.001)
-
-            while not result_queue.empty():
-                self._send_result(result_queue.get())
+        self._send_results(self._drain(result_queue))
         result_queue.close()
 
+    @staticmethod
+    def _drain(result_queue):
+        """Get all batches of results which are already in the queue."""
+        results = []
+        while True:
+            try:
+                results.extend(result_queue.get_nowait())
+            except Queue.Empty:
+                return results
+
     def _send_result(self, result):
         """Send partial result to consumer.
 
@@ -262,7 +505,18 @@ class ScenarioRunner(plugin.Plugin):
                        ScenarioRunnerResult schema, otherwise
                        ValidationError is raised.
         """
-        self.result_queue.append(ScenarioRunnerResult(result))
+        self._send_results([result])
+
+    def _send_results(self, results):
+        """Send a batch of partial results to consumer.
+
+        :param results: list of result dicts, each of them should match the
+                        ScenarioRunnerResult schema, otherwise
+                        ValidationError is raised.
+        """
+        if results:
+            self.result_queue.put_batch(
+                [ScenarioRunnerResult(r) for r in results])
 
     def _log_debug_info(self, **info):
         """Log runner parameters for debugging.
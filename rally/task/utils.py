@@ -14,11 +14,15 @@
 #    under the License.
 
 import itertools
+import os
+import sys
+import threading
 import time
 import traceback
 
 import jsonschema
 from novaclient import exceptions as nova_exc
+from oslo_config import cfg
 import six
 
 from rally.common.i18n import _
@@ -30,6 +34,20 @@ from rally import exceptions
 
 LOG = logging.getLogger(__name__)
 
+STATUS_POLLER_OPTS = [
+    cfg.BoolOpt("batch_status_polling", default=True,
+                help="Check statuses of servers and volumes which are waited "
+                     "for in parallel iterations by listing them with one "
+                     "API call per user, instead of getting each of them"),
+    cfg.FloatOpt("batch_status_polling_max_interval", default=5.0,
+                 help="Max interval between batched status checks, it grows "
+                      "up to this value while statuses don't change")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
+CONF.register_opts(STATUS_POLLER_OPTS, group=benchmark_group)
+
 
 def get_status(resource, status_attr="status"):
     """Get the status of a given resource object.
@@ -71,15 +89,7 @@ def get_from_manager(error_statuses=None):
     error_statuses = error_statuses or ["ERROR"]
     error_statuses = map(lambda str: str.upper(), error_statuses)
 
-    def _get_from_manager(resource):
-        # catch client side errors
-        try:
-            res = resource.manager.get(resource.id)
-        except Exception as e:
-            if getattr(e, "code", getattr(e, "http_status", 400)) == 404:
-                raise exceptions.GetResourceNotFound(resource=resource)
-            raise exceptions.GetResourceFailure(resource=resource, err=e)
-
+    def _check_resource(res):
         # catch abnormal status, such as "no valid host" for servers
         status = get_status(res)
 
@@ -92,6 +102,19 @@ def get_from_manager(error_statuses=None):
 
         return res
 
+    def _get_from_manager(resource):
+        # catch client side errors
+        try:
+            res = resource.manager.get(resource.id)
+        except Exception as e:
+            if getattr(e, "code", getattr(e, "http_status", 400)) == 404:
+                raise exceptions.GetResourceNotFound(resource=resource)
+            raise exceptions.GetResourceFailure(resource=resource, err=e)
+
+        return _check_resource(res)
+
+    # NOTE: StatusPoller checks resources obtained from a list call with it
+    _get_from_manager.check_resource = _check_resource
     return _get_from_manager
 
 
@@ -172,6 +195,251 @@ def wait_is_ready(resource, is_ready, update_resource=None,
                 resource_status=get_status(resource))
 
 
+class _StatusChecker(object):
+    """Checks whether resource is in one of ready statuses.
+
+    Status changes are logged, failure statuses raise GetResourceErrorStatus.
+    """
+
+    def __init__(self, resource, ready_statuses, failure_statuses,
+                 status_attr):
+        self.resource_repr = getattr(resource, "name", repr(resource))
+        self.ready_statuses = ready_statuses
+        self.failure_statuses = failure_statuses
+        self.status_attr = status_attr
+        self.latest_status = get_status(resource, status_attr)
+        self.latest_status_update = time.time()
+
+    def __call__(self, resource):
+        status = get_status(resource, self.status_attr)
+
+        if status != self.latest_status:
+            current_time = time.time()
+            delta = current_time - self.latest_status_update
+            LOG.debug(
+                "Waiting for resource %(resource)s. Status changed: "
+                "%(latest)s => %(current)s in %(delta)s" %
+                {"resource": self.resource_repr, "latest": self.latest_status,
+                 "current": status, "delta": delta})
+
+            self.latest_status = status
+            self.latest_status_update = current_time
+
+        if status in self.ready_statuses:
+            return True
+        if status in self.failure_statuses:
+            raise exceptions.GetResourceErrorStatus(
+                resource=resource,
+                status=status,
+                fault="Status in failure list %s" % str(
+                    self.failure_statuses))
+        return False
+
+
+class _StatusWaiter(object):
+    """Resource registered in StatusPoller and state of waiting for it."""
+
+    def __init__(self, resource, update_resource, is_ready, status_attr):
+        self.resource = resource
+        self.update_resource = update_resource
+        self.is_ready = is_ready
+        self.status_attr = status_attr
+        self.done = threading.Event()
+        self.exc_info = None
+
+
+class _StatusGroup(object):
+    """Waiters whose resources are listed with the same API call."""
+
+    def __init__(self, lister, interval):
+        self.lister = lister
+        self.waiters = []
+        self.min_interval = interval
+        self.interval = interval
+        self.next_poll = time.time()
+
+
+class StatusPoller(object):
+    """Shared poller of resource statuses.
+
+    Threads which wait for resources register them in the poller and sleep
+    until the poller wakes them up. A single background thread lists
+    resources of the same type and user with one API call per round and
+    checks all waited resources of the group with the result, so parallel
+    iterations don't poll the cloud independently. The interval between
+    rounds grows while statuses don't change, up to max_interval, and drops
+    back to the smallest requested check interval on any change.
+
+    Resources are batched only if their manager is in LISTERS and they are
+    updated with get_from_manager(). Resources missing in the list are
+    updated one by one, so pagination or listing filters don't break them.
+    """
+
+    # NOTE: "module.ClassName" of resource manager => function that returns
+    #       detailed list of resources visible to the manager user
+    LISTERS = {
+        "novaclient.v2.servers.ServerManager": lambda m: m.list(),
+        "cinderclient.v1.volumes.VolumeManager": lambda m: m.list(),
+        "cinderclient.v2.volumes.VolumeManager": lambda m: m.list()
+    }
+
+    def __init__(self, max_interval):
+        self.max_interval = max_interval
+        self.pid = os.getpid()
+        self._cond = threading.Condition()
+        self._groups = {}
+        self._thread = None
+
+    @classmethod
+    def _group_key(cls, resource):
+        manager = getattr(resource, "manager", None)
+        user_id = getattr(resource, "user_id", None)
+        if manager is None or user_id is None:
+            return None
+        manager_cls = type(manager)
+        name = "%s.%s" % (manager_cls.__module__, manager_cls.__name__)
+        if name not in cls.LISTERS:
+            return None
+        return name, user_id
+
+    @classmethod
+    def is_batchable(cls, resource, update_resource):
+        return (CONF.benchmark.batch_status_polling and
+                hasattr(update_resource, "check_resource") and
+                cls._group_key(resource) is not None)
+
+    def wait(self, resource, update_resource, is_ready, timeout=60,
+             check_interval=1, check_deletion=False, status_attr="status"):
+        """Wait until is_ready returns True for the resource.
+
+        :param resource: resource to wait for, it should be batchable
+        :param update_resource: function returned by get_from_manager()
+        :param is_ready: predicate that takes updated resource, it may raise
+                         an exception to stop waiting
+        :param timeout: Timeout in seconds after which a TimeoutException will
+                        be raised
+        :param check_interval: Interval in seconds between the two
+                               consecutive readiness checks
+        :param check_deletion: return None instead of raising
+                               GetResourceNotFound
+        :param status_attr: The name of the status attribute of the resource,
+                            changes of the status shorten the poll interval
+        :returns: The "ready" resource object
+        """
+        key = self._group_key(resource)
+        waiter = _StatusWaiter(resource, update_resource, is_ready,
+                               status_attr)
+        with self._cond:
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _StatusGroup(
+                    self.LISTERS[key[0]], check_interval)
+            else:
+                group.min_interval = min(group.min_interval, check_interval)
+                group.interval = group.min_interval
+            group.waiters.append(waiter)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+            self._cond.notify()
+
+        waiter.done.wait(timeout)
+
+        with self._cond:
+            if waiter in group.waiters:
+                group.waiters.remove(waiter)
+            if not group.waiters and self._groups.get(key) is group:
+                del self._groups[key]
+
+        if not waiter.done.is_set():
+            raise exceptions.TimeoutException(
+                desired_status=is_ready.ready_statuses,
+                resource_name=getattr(resource, "name", repr(resource)),
+                resource_type=resource.__class__.__name__,
+                resource_id=getattr(resource, "id", "<no id>"),
+                resource_status=get_status(waiter.resource, status_attr))
+        if waiter.exc_info:
+            if (check_deletion and issubclass(waiter.exc_info[0],
+                                              exceptions.GetResourceNotFound)):
+                return
+            six.reraise(*waiter.exc_info)
+        return waiter.resource
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._groups:
+                    self._thread = None
+                    return
+                now = time.time()
+                due = [(key, group) for key, group in self._groups.items()
+                       if group.next_poll <= now]
+                if not due:
+                    self._cond.wait(min(g.next_poll
+                                        for g in self._groups.values()) - now)
+                    continue
+                due = [(group, [w for w in group.waiters
+                                if not w.done.is_set()])
+                       for key, group in due]
+
+            for group, waiters in due:
+                changed = waiters and self._poll(group, waiters)
+                with self._cond:
+                    if changed:
+                        group.interval = group.min_interval
+                    else:
+                        group.interval = min(
+                            group.interval * 1.5,
+                            max(self.max_interval, group.min_interval))
+                    group.next_poll = time.time() + group.interval
+
+    def _poll(self, group, waiters):
+        """Check waited resources of group, return True if any changed."""
+        try:
+            listed = dict((res.id, res)
+                          for res in group.lister(waiters[0].resource.manager))
+        except Exception as e:
+            LOG.warning(_("Failed to list resources: %s") % e)
+            listed = {}
+
+        changed = False
+        for waiter in waiters:
+            try:
+                res = listed.get(waiter.resource.id)
+                if res is None:
+                    res = waiter.update_resource(waiter.resource)
+                else:
+                    res = waiter.update_resource.check_resource(res)
+                if (get_status(res, waiter.status_attr) !=
+                        get_status(waiter.resource, waiter.status_attr)):
+                    changed = True
+                waiter.resource = res
+                if waiter.is_ready(res):
+                    waiter.done.set()
+            except Exception:
+                changed = True
+                waiter.exc_info = sys.exc_info()
+                waiter.done.set()
+        return changed
+
+
+_status_poller = None
+_status_poller_lock = threading.Lock()
+
+
+def get_status_poller():
+    """Return StatusPoller shared by threads of current process."""
+    global _status_poller
+    with _status_poller_lock:
+        # NOTE: threads don't survive fork, so each runner worker process
+        #       gets its own poller
+        if _status_poller is None or _status_poller.pid != os.getpid():
+            _status_poller = StatusPoller(
+                CONF.benchmark.batch_status_polling_max_interval)
+        return _status_poller
+
+
 def wait_for_status(resource, ready_statuses, failure_statuses=None,
                     status_attr="status", update_resource=None,
                     timeout=60, check_interval=1, check_deletion=False):
@@ -204,8 +472,14 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
 
     start = time.time()
 
-    latest_status = get_status(resource, status_attr)
-    latest_status_update = start
+    is_ready = _StatusChecker(resource, ready_statuses, failure_statuses,
+                              status_attr)
+
+    if StatusPoller.is_batchable(resource, update_resource):
+        return get_status_poller().wait(
+            resource, update_resource, is_ready, timeout=timeout,
+            check_interval=check_interval, check_deletion=check_deletion,
+            status_attr=status_attr)
 
     while True:
         try:
@@ -215,27 +489,9 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
                 return
             else:
                 raise
-        status = get_status(resource, status_attr)
-
-        if status != latest_status:
-            current_time = time.time()
-            delta = current_time - latest_status_update
-            LOG.debug(
-                "Waiting for resource %(resource)s. Status changed: "
-                "%(latest)s => %(current)s in %(delta)s" %
-                {"resource": resource_repr, "latest": latest_status,
-                 "current": status, "delta": delta})
-
-            latest_status = status
-            latest_status_update = current_time
 
-        if status in ready_statuses:
+        if is_ready(resource):
             return resource
-        if status in failure_statuses:
-            raise exceptions.GetResourceErrorStatus(
-                resource=resource,
-                status=status,
-                fault="Status in failure list %s" % str(failure_statuses))
 
         time.sleep(check_interval)
         if time.time() - start > timeout:
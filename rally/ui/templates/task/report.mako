@@ -493,11 +493,11 @@
                 </span>
               <th class="sortable"
                   title="Number of errors occured"
-                  ng-click="ov_srt='errors.length'; ov_dir=!ov_dir">
+                  ng-click="ov_srt='errors_count'; ov_dir=!ov_dir">
                 Errors
                 <span class="arrow">
-                  <b ng-show="ov_srt=='errors.length' && !ov_dir">&#x25b4;</b>
-                  <b ng-show="ov_srt=='errors.length' && ov_dir">&#x25be;</b>
+                  <b ng-show="ov_srt=='errors_count' && !ov_dir">&#x25b4;</b>
+                  <b ng-show="ov_srt=='errors_count' && ov_dir">&#x25be;</b>
                 </span>
               <th class="sortable"
                   title="Whether SLA check is successful"
@@ -517,7 +517,7 @@
               <td>{{sc.full_duration | number:3}}
               <td>{{sc.iterations_count}}
               <td>{{sc.runner}}
-              <td>{{sc.errors.length}}
+              <td>{{sc.errors_count}}
               <td>
                 <span ng-show="sc.sla_success" class="status-pass">&#x2714;</span>
                 <span ng-hide="sc.sla_success" class="status-fail">&#x2716;</span>
@@ -551,7 +551,7 @@
             Load duration: <b>{{scenario.load_duration | number:3}} s</b> &nbsp;
             Full duration: <b>{{scenario.full_duration | number:3}} s</b> &nbsp;
             Iterations: <b>{{scenario.iterations_count}}</b> &nbsp;
-            Failures: <b>{{scenario.errors.length}}</b>
+            Failures: <b>{{scenario.errors_count}}</b>
           </p>
 
           <div ng-show="scenario.sla.length">
@@ -647,9 +647,12 @@
 
         <script type="text/ng-template" id="failures">
           <h2>Task failures (<ng-pluralize
-            count="scenario.errors.length"
+            count="scenario.errors_count"
             when="{'1': '1 iteration', 'other': '{} iterations'}"></ng-pluralize> failed)
           </h2>
+          <p ng-show="scenario.errors.length < scenario.errors_count">
+            Only first {{scenario.errors.length}} failures are shown.
+          </p>
           <table class="striped">
             <thead>
               <tr>
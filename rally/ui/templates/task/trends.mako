@@ -0,0 +1,243 @@
+## -*- coding: utf-8 -*-
+<%inherit file="/base.mako"/>
+
+<%block name="html_attr"> ng-app="TrendsApp"</%block>
+
+<%block name="title_text">Rally Tasks Trends</%block>
+
+<%block name="libs">
+  <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/nvd3/1.1.15-beta/nv.d3.min.css">
+  <script type="text/javascript" src="https://ajax.googleapis.com/ajax/libs/angularjs/1.3.3/angular.min.js"></script>
+  <script type="text/javascript" src="https://cdnjs.cloudflare.com/ajax/libs/d3/3.4.13/d3.min.js"></script>
+  <script type="text/javascript" src="https://cdnjs.cloudflare.com/ajax/libs/nvd3/1.1.15-beta/nv.d3.min.js"></script>
+</%block>
+
+<%block name="js_before">
+    "use strict";
+    if (typeof angular === "object") { angular.module("TrendsApp", []).controller(
+      "TrendsController", ["$scope", function($scope) {
+
+      /* Charts */
+
+      var Charts = {
+        line: function(selector, data, conf){
+          var chart = nv.models.lineChart()
+            .x(function(d) { return d[0] })
+            .y(function(d) { return d[1] })
+            .useInteractiveGuideline(true);
+          chart.xAxis
+            .axisLabel("Task")
+            .tickFormat(function(idx) {
+              var task = $scope.tasks_map[idx];
+              return task ? "#" + idx + " " + task.created_at : ""
+            });
+          chart.yAxis
+            .axisLabel(conf.yLabel || "")
+            .tickFormat(d3.format(conf.yFormat || ",.3f"));
+          var data_ = [];
+          for (var i in data) {
+            data_.push({key:data[i][0], values:data[i][1]})
+          }
+          nv.addGraph(function() {
+            d3.select(selector)
+              .datum(data_)
+              .transition()
+              .duration(0)
+              .call(chart);
+            nv.utils.windowResize(chart.update)
+          })
+        }
+      };
+
+      $scope.showScenario = function(idx) {
+        $scope.scenario = idx === null ? null : $scope.scenarios[idx];
+        $scope.scenario_idx = idx
+      }
+
+      $scope.renderScenario = function() {
+        if (! $scope.scenario) {
+          return
+        }
+        for (var i in $scope.scenario.actions) {
+          Charts.line("#action-" + i, $scope.scenario.actions[i].series,
+                      {yLabel: "Duration (seconds)"})
+        }
+        Charts.line("#success-line", $scope.scenario.success,
+                    {yLabel: "Successful iterations (%)", yFormat: ",.1f"});
+        Charts.line("#throughput-line", $scope.scenario.throughput,
+                    {yLabel: "Iterations per second"})
+      }
+
+      $scope.showError = function(message) {
+          return (function (e) {
+            e.style.display = "block";
+            e.textContent = message
+          })(document.getElementById("page-error"))
+      }
+
+      /* Initialization */
+
+      angular.element(document).ready(function(){
+        var data = ${data};
+        $scope.tasks = data.tasks;
+        $scope.scenarios = data.scenarios;
+        if (! $scope.scenarios.length) {
+          return $scope.showError("No data...")
+        }
+        $scope.tasks_map = {};
+        angular.forEach($scope.tasks,
+                        function(task){ this[task.idx] = task }, $scope.tasks_map);
+        for (var i in $scope.scenarios) {
+          var sc = $scope.scenarios[i];
+          sc.last = sc.tasks[sc.tasks.length - 1];
+        }
+        $scope.showScenario(null);
+        $scope.$digest()
+      });
+    }])}
+</%block>
+
+<%block name="css">
+    .aside { margin:0 20px 0 0; display:block; width:255px; float:left }
+    .navcls { color:#678; background:#eee; border:1px solid #ddd; margin-bottom:-1px; display:block; padding:8px 9px; font-weight:bold; text-align:left; overflow:hidden; text-overflow:ellipsis; white-space:nowrap; cursor:pointer }
+    .navcls.active { background:#428bca; background-image:linear-gradient(to bottom, #428bca 0px, #3278b3 100%); border-color:#3278b3; color:#fff }
+    .navmet { color:#555; background:#fff; border:1px solid #ddd; font-size:12px; display:block; margin-bottom:-1px; padding:8px 10px; text-align:left; text-overflow:ellipsis; white-space:nowrap; overflow:hidden; cursor:pointer }
+    .navmet:hover { background:#f8f8f8 }
+    .navmet.active, .navmet.active:hover { background:#428bca; background-image:linear-gradient(to bottom, #428bca 0px, #3278b3 100%); border-color:#3278b3; color:#fff }
+
+    .chart { height:300px }
+    .clearfix { clear:both }
+    .content-main { margin:0 5px; display:block; float:left }
+</%block>
+
+<%block name="media_queries">
+    @media only screen and (min-width: 320px)  { .content-wrap { width:900px  } .content-main { width:600px } }
+    @media only screen and (min-width: 900px)  { .content-wrap { width:880px  } .content-main { width:590px } }
+    @media only screen and (min-width: 1000px) { .content-wrap { width:980px  } .content-main { width:690px } }
+    @media only screen and (min-width: 1100px) { .content-wrap { width:1080px } .content-main { width:790px } }
+    @media only screen and (min-width: 1200px) { .content-wrap { width:1180px } .content-main { width:890px } }
+</%block>
+
+<%block name="body_attr"> ng-controller="TrendsController"</%block>
+
+<%block name="header_text">tasks trends</%block>
+
+<%block name="content">
+    <p id="page-error" class="notify-error" style="display:none"></p>
+
+    <div id="content-nav" class="aside" ng-show="scenarios.length" ng-cloak>
+      <div class="navcls"
+           ng-class="{active:scenario_idx === null}"
+           ng-click="showScenario(null)">Trends overview</div>
+      <div class="navmet" title="{{sc.cls}}.{{sc.name}}"
+           ng-repeat="sc in scenarios track by $index"
+           ng-class="{active:$index === scenario_idx}"
+           ng-click="showScenario($index)">{{sc.cls}}.{{sc.name}}</div>
+    </div>
+
+    <div id="content-main" class="content-main" ng-show="scenarios.length" ng-cloak>
+
+      <div ng-hide="scenario">
+        <h1>Trends overview</h1>
+        <p class="thesis">
+          Tasks: <b>{{tasks.length}}</b> &nbsp;
+          From: <b>{{tasks[0].created_at}}</b> &nbsp;
+          To: <b>{{tasks[tasks.length - 1].created_at}}</b>
+        </p>
+        <table class="linked compact">
+          <thead>
+            <tr>
+              <th>Scenario
+              <th title="Number of tasks which run the scenario">Tasks
+              <th title="Successful iterations of the last run">Last success (%)
+              <th title="Iterations per second of the last run">Last throughput
+              <th title="SLA of the last run">Last SLA
+            <tr>
+          </thead>
+          <tbody>
+            <tr ng-repeat="sc in scenarios track by $index"
+                ng-click="showScenario($index)">
+              <td>{{sc.cls}}.{{sc.name}}
+              <td>{{sc.length}}
+              <td>{{sc.last.success}}
+              <td>{{sc.last.throughput}}
+              <td>
+                <span ng-show="sc.last.sla_success" class="status-pass">&#x2714;</span>
+                <span ng-show="sc.last.sla_success === false" class="status-fail">&#x2716;</span>
+            <tr>
+          </tbody>
+        </table>
+      </div>
+
+      <div ng-show="scenario">
+        <h1>{{scenario.cls}}.<wbr>{{scenario.name}}</h1>
+        <div ng-include="'scenario'"></div>
+
+        <script type="text/ng-template" id="scenario">
+          {{renderScenario()}}
+
+          <div ng-repeat="action in scenario.actions track by $index">
+            <h2>{{action.name}}</h2>
+            <div class="chart">
+              <svg id="action-{{$index}}"></svg>
+            </div>
+          </div>
+
+          <h2>Success rate</h2>
+          <div class="chart">
+            <svg id="success-line"></svg>
+          </div>
+
+          <h2>Throughput</h2>
+          <div class="chart">
+            <svg id="throughput-line"></svg>
+          </div>
+
+          <h2>Tasks</h2>
+          <table class="striped">
+            <thead>
+              <tr>
+                <th>#
+                <th>Task
+                <th>Created at
+                <th>Iterations
+                <th>Failures
+                <th>Success (%)
+                <th>Throughput
+                <th>Load duration (s)
+                <th>SLA
+              <tr>
+            </thead>
+            <tbody>
+              <tr ng-repeat="t in scenario.tasks track by $index">
+                <td>{{t.idx}}
+                <td>{{tasks_map[t.idx].uuid}}
+                <td>{{tasks_map[t.idx].created_at}}
+                <td>{{t.iterations_count}}
+                <td>{{t.failed_iterations_count}}
+                <td>{{t.success}}
+                <td>{{t.throughput}}
+                <td>{{t.load_duration | number:3}}
+                <td>
+                  <span ng-show="t.sla_success" class="status-pass">&#x2714;</span>
+                  <span ng-show="t.sla_success === false" class="status-fail">&#x2716;</span>
+              <tr>
+            </tbody>
+          </table>
+
+          <h2>Subtask Configuration</h2>
+          <pre class="code">{{scenario.config}}</pre>
+        </script>
+      </div>
+
+    </div>
+    <div class="clearfix"></div>
+</%block>
+
+<%block name="js_after">
+    if (! window.angular) {(function(f){
+      f(document.getElementById("content-nav"), "none");
+      f(document.getElementById("content-main"), "none");
+      f(document.getElementById("page-error"), "block").textContent = "Failed to load AngularJS framework"
+    })(function(e, s){e.style.display = s; return e})}
+</%block>
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+import time
 import unittest
 
 from tests.functional import utils
@@ -76,3 +78,30 @@ class PluginTestCase(unittest.TestCase):
     def test_list_not_found_name(self):
         result = self.rally("plugin list Dummy2222")
         self.assertIn("There is no plugin: Dummy2222", result)
+
+
+class PluginIndexTestCase(unittest.TestCase):
+
+    def _validate(self, rally, config):
+        started_at = time.time()
+        rally("task validate --task %s" % config.filename)
+        return time.time() - started_at
+
+    def test_startup_time(self):
+        # NOTE: the index is built by "deployment create" in Rally()
+        rally = utils.Rally()
+        index_file = os.path.join(rally.tmp_dir, ".rally",
+                                  "plugin_index.json")
+        self.assertTrue(os.path.exists(index_file))
+        config = utils.TaskConfig({"Dummy.dummy": [{"args": {"sleep": 0}}]})
+
+        with_index = min(self._validate(rally, config) for i in range(3))
+        os.remove(index_file)
+        without_index = self._validate(rally, config)
+
+        with open(rally.gen_report_path(extension="txt"), "w") as report:
+            report.write("task validate with plugin index: %.3f sec\n"
+                         "task validate building plugin index: %.3f sec\n"
+                         % (with_index, without_index))
+        self.assertTrue(os.path.exists(index_file))
+        self.assertLess(with_index, without_index)
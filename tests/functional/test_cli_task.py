@@ -161,6 +161,24 @@ class TaskTestCase(unittest.TestCase):
         self.assertTrue(os.path.exists(
             rally.gen_report_path(extension="html")))
 
+    def test_report_trends(self):
+        rally = utils.Rally()
+        cfg = self._get_sample_task_config()
+        config = utils.TaskConfig(cfg)
+        task_uuids = []
+        for i in range(3):
+            res = rally("task start --task %s" % config.filename)
+            for line in res.splitlines():
+                if "finished" in line:
+                    task_uuids.append(line.split(" ")[1][:-1])
+        html_report = rally.gen_report_path(extension="html")
+        rally("task report --trends --tasks %s --out %s" % (
+              " ".join(task_uuids), html_report))
+        self.assertTrue(os.path.exists(html_report))
+        self.assertRaises(utils.RallyCliError,
+                          rally, "task report --trends --tasks %s --out %s" %
+                          ("/tmp/task.json", html_report))
+
     def test_report_bunch_files(self):
         rally = utils.Rally()
         cfg = self._get_sample_task_config()
@@ -0,0 +1,72 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import random
+import time
+import unittest
+
+from rally.task.processing import plot
+
+
+class TaskReportSizeTestCase(unittest.TestCase):
+    """Size and generation time of HTML reports of big tasks."""
+
+    # NOTE: report size should not depend on number of iterations
+    MAX_SIZE = 1024 * 1024
+    # NOTE: generation time is linear, report of 1M iterations takes about
+    #       70 seconds without stored stats, so the limit has a margin for
+    #       slow hosts
+    MAX_TIME_PER_ITERATION = 0.0003
+
+    def _iterations(self, count):
+        rand = random.Random(count)
+        for i in range(count):
+            first = rand.uniform(0.1, 2.0)
+            second = rand.uniform(0.1, 2.0)
+            error = []
+            if i % 50 == 0:
+                error = ["TimeoutException", "Timeout",
+                         "Traceback (most recent call last):\n" * 10]
+            yield {"duration": first + second, "idle_duration": 0.0,
+                   "timestamp": 1440000000.0 + i * 0.01, "error": error,
+                   "scenario_output": {"errors": "", "data": {}},
+                   "atomic_actions": {"nova.boot_server": first,
+                                      "nova.delete_server": second}}
+
+    def _check_report(self, count):
+        duration = count * 0.01 + 5
+        result = {"key": {"name": "NovaServers.boot_and_delete_server",
+                          "pos": 0,
+                          "kw": {"runner": {"type": "constant",
+                                            "times": count}}},
+                  "sla": [], "result": self._iterations(count),
+                  "full_duration": duration, "load_duration": duration}
+
+        started_at = time.time()
+        html = plot.plot([result])
+        generation_time = time.time() - started_at
+
+        self.assertLess(len(html), self.MAX_SIZE)
+        self.assertLess(generation_time,
+                        count * self.MAX_TIME_PER_ITERATION + 5)
+
+    def test_report_10k(self):
+        self._check_report(10000)
+
+    def test_report_100k(self):
+        self._check_report(100000)
+
+    def test_report_1m(self):
+        self._check_report(1000000)
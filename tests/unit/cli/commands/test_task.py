@@ -18,6 +18,7 @@ import datetime as date
 import os.path
 
 import mock
+import six
 
 from rally.cli.commands import task
 from rally import consts
@@ -253,14 +254,88 @@ class TaskCommandsTestCase(test.TestCase):
             self.task.status(test_uuid)
             mock_db.task_get.assert_called_once_with(test_uuid)
 
+    @mock.patch("rally.cli.commands.task.objects.Task.get_results_summary")
+    @mock.patch("rally.cli.commands.task.db")
+    def test_status_finished(self, mock_db, mock_task_get_results_summary):
+        test_uuid = "a3e7cefb-bec2-4802-89f6-410cc31f71af"
+        mock_db.task_get.return_value = {
+            "uuid": test_uuid, "status": consts.TaskStatus.FINISHED}
+        mock_task_get_results_summary.return_value = [
+            {"key": {"name": "Dummy.dummy", "pos": 0},
+             "iterations_count": 10, "failed_iterations_count": 1,
+             "load_duration": 2.5, "full_duration": 3.5,
+             "sla_success": False}]
+        with mock.patch("sys.stdout",
+                        new_callable=six.StringIO) as mock_stdout:
+            self.task.status(test_uuid)
+        self.assertIn("Dummy.dummy (args position 0): 10 iterations, "
+                      "1 failed, load duration 2.500 sec, SLA failed",
+                      mock_stdout.getvalue())
+        mock_task_get_results_summary.assert_called_once_with()
+
+    @mock.patch("rally.cli.commands.task.objects.Task.get_results_summary")
+    @mock.patch("rally.cli.commands.task.db")
+    def test_status_running(self, mock_db, mock_task_get_results_summary):
+        mock_db.task_get.return_value = {
+            "uuid": "task_uuid", "status": consts.TaskStatus.RUNNING}
+        self.task.status("task_uuid")
+        self.assertFalse(mock_task_get_results_summary.called)
+
     @mock.patch("rally.cli.commands.task.envutils.get_global")
     def test_status_no_task_id(self, mock_get_global):
         mock_get_global.side_effect = exceptions.InvalidArgumentsException
         self.assertRaises(exceptions.InvalidArgumentsException,
                           self.task.status, None)
 
+    @mock.patch("rally.cli.commands.task.time.sleep")
     @mock.patch("rally.cli.commands.task.db")
-    def test_detailed(self, mock_db):
+    def test_watch(self, mock_db, mock_sleep):
+        test_uuid = "a3e7cefb-bec2-4802-89f6-410cc31f71af"
+        key = {"name": "Dummy.dummy", "pos": 0, "kw": {}}
+        live = {"updated_at": 1, "iterations": 10, "errors": 1,
+                "window": 60, "throughput": 2.5, "error_rate": 0.1,
+                "actions": [{"name": "total", "count": 9, "50%ile": 0.5,
+                             "95%ile": None}]}
+        live_updated = dict(live, updated_at=2)
+        mock_db.task_get.side_effect = [
+            {"status": consts.TaskStatus.RUNNING},
+            {"status": consts.TaskStatus.RUNNING},
+            {"status": consts.TaskStatus.FINISHED}]
+        mock_db.task_result_get_all_by_uuid.side_effect = [
+            [{"id": 1, "key": key, "data": {"completed": False}}],
+            [{"id": 1, "key": key,
+              "data": {"completed": False, "live": live}}],
+            [{"id": 1, "key": key, "data": {"completed": True,
+                                            "live": live_updated}},
+             {"id": 2, "key": key, "data": {"completed": True,
+                                            "live": live_updated}}]]
+
+        with mock.patch("rally.cli.commands.task.cliutils."
+                        "print_list") as mock_print_list:
+            self.task.watch(test_uuid, interval=3)
+
+        self.assertEqual([mock.call(test_uuid)] * 3,
+                         mock_db.task_get.mock_calls)
+        self.assertEqual([mock.call(3)] * 2, mock_sleep.mock_calls)
+        self.assertEqual(3, mock_print_list.call_count)
+        row = mock_print_list.call_args[0][0][0]
+        self.assertEqual(("total", 9, 0.5),
+                         (row.action, row.count, getattr(row, "50%ile")))
+
+    @mock.patch("rally.cli.commands.task.time.sleep")
+    @mock.patch("rally.cli.commands.task.db")
+    def test_watch_finished_task(self, mock_db, mock_sleep):
+        mock_db.task_get.return_value = {"status": consts.TaskStatus.FAILED}
+        mock_db.task_result_get_all_by_uuid.return_value = []
+        self.task.watch("a3e7cefb-bec2-4802-89f6-410cc31f71af")
+        self.assertFalse(mock_sleep.called)
+
+    @mock.patch("rally.cli.commands.task.objects.Task.get_results_stats",
+                return_value=None)
+    @mock.patch("rally.cli.commands.task.objects.Task.get_results")
+    @mock.patch("rally.cli.commands.task.db")
+    def test_detailed(self, mock_db, mock_task_get_results,
+                      mock_task_get_results_stats):
         test_uuid = "c0d874d4-7195-4fd5-8688-abe82bfad36f"
         value = {
             "id": "task",
@@ -268,6 +343,7 @@ class TaskCommandsTestCase(test.TestCase):
             "status": "status",
             "results": [
                 {
+                    "id": 42,
                     "key": {
                         "name": "fake_name",
                         "pos": "fake_pos",
@@ -279,6 +355,7 @@ class TaskCommandsTestCase(test.TestCase):
                         "raw": [
                             {
                                 "duration": 0.9,
+                                "timestamp": 1.0,
                                 "idle_duration": 0.5,
                                 "scenario_output": {
                                     "data": {
@@ -294,6 +371,7 @@ class TaskCommandsTestCase(test.TestCase):
                             },
                             {
                                 "duration": 0.5,
+                                "timestamp": 2.0,
                                 "idle_duration": 0.2,
                                 "scenario_output": {
                                     "data": {
@@ -309,6 +387,7 @@ class TaskCommandsTestCase(test.TestCase):
                             },
                             {
                                 "duration": 0.6,
+                                "timestamp": 3.0,
                                 "idle_duration": 0.4,
                                 "scenario_output": {
                                     "data": {
@@ -327,11 +406,66 @@ class TaskCommandsTestCase(test.TestCase):
                 }
             ]
         }
-        mock_db.task_get_detailed = mock.MagicMock(return_value=value)
+        mock_db.task_get = mock.MagicMock(return_value=value)
+        mock_task_get_results.return_value = value["results"]
         self.task.detailed(test_uuid)
-        mock_db.task_get_detailed.assert_called_once_with(test_uuid)
+        mock_db.task_get.assert_called_once_with(test_uuid)
+        mock_task_get_results_stats.assert_called_once_with(42)
 
+        mock_task_get_results_stats.reset_mock()
         self.task.detailed(test_uuid, iterations_data=True)
+        mock_task_get_results_stats.assert_called_once_with(42)
+
+    @mock.patch("rally.cli.commands.task.aggregation.ScenarioAggregator")
+    @mock.patch("rally.cli.commands.task.objects.Task.get_results_stats")
+    @mock.patch("rally.cli.commands.task.objects.Task.get_results")
+    @mock.patch("rally.cli.commands.task.db")
+    def test_detailed_from_stats(self, mock_db, mock_task_get_results,
+                                 mock_task_get_results_stats,
+                                 mock_scenario_aggregator):
+        mock_db.task_get.return_value = {"uuid": "task_uuid",
+                                         "status": "status"}
+        mock_task_get_results.return_value = [
+            {"id": 42, "key": {"name": "Dummy.dummy", "pos": 0, "kw": {}},
+             "data": {"load_duration": 1.0, "full_duration": 2.0,
+                      "raw": iter([])}}]
+        stats = mock_task_get_results_stats.return_value
+        stats.atomic_actions_table.return_value = [
+            ["total", 0.1, 0.2, 0.3, 0.4, 0.5, 0.2, "100.0%", 10]]
+        stats.output_stats_table.return_value = [
+            ["foo", 1.0, 2.0, 3.0, 4.0, 5.0, 3.0]]
+        stats.output_errors_count = 3
+
+        with mock.patch("rally.cli.commands.task.cliutils."
+                        "print_list") as mock_print_list:
+            with mock.patch("sys.stdout",
+                            new_callable=six.StringIO) as mock_stdout:
+                self.task.detailed("task_uuid")
+
+        self.assertFalse(mock_scenario_aggregator.called)
+        self.assertEqual(2, mock_print_list.call_count)
+        row = mock_print_list.call_args_list[0][0][0][0]
+        self.assertEqual(("total", 10), (row.action, row.count))
+        self.assertIn("Scenario output errors in 3 iterations",
+                      mock_stdout.getvalue())
+
+        # NOTE: tables are built from the same summary if iterations are
+        #       displayed
+        mock_scenario_aggregator.return_value.iterations = []
+        mock_scenario_aggregator.return_value.output_errors.return_value = [
+            (1, "oops")]
+        with mock.patch("rally.cli.commands.task.cliutils."
+                        "print_list") as mock_print_list:
+            with mock.patch("sys.stdout",
+                            new_callable=six.StringIO) as mock_stdout:
+                self.task.detailed("task_uuid", iterations_data=True)
+
+        mock_scenario_aggregator.assert_called_once_with(
+            mock_task_get_results.return_value[0])
+        row = mock_print_list.call_args_list[0][0][0][0]
+        self.assertEqual(("total", 10), (row.action, row.count))
+        self.assertIn("oops", mock_stdout.getvalue())
+        self.assertNotIn("Scenario output errors in", mock_stdout.getvalue())
 
     @mock.patch("rally.cli.commands.task.db")
     @mock.patch("rally.cli.commands.task.logging")
@@ -343,7 +477,7 @@ class TaskCommandsTestCase(test.TestCase):
             "results": [],
             "verification_log": "['1', '2', '3']"
         }
-        mock_db.task_get_detailed = mock.MagicMock(return_value=value)
+        mock_db.task_get = mock.MagicMock(return_value=value)
 
         mock_logging.is_debug.return_value = False
         self.task.detailed("task_uuid")
@@ -360,9 +494,10 @@ class TaskCommandsTestCase(test.TestCase):
     @mock.patch("rally.cli.commands.task.db")
     def test_detailed_wrong_id(self, mock_db):
         test_uuid = "eb290c30-38d8-4c8f-bbcc-fc8f74b004ae"
-        mock_db.task_get_detailed = mock.MagicMock(return_value=None)
-        self.task.detailed(test_uuid)
-        mock_db.task_get_detailed.assert_called_once_with(test_uuid)
+        mock_db.task_get = mock.MagicMock(
+            side_effect=exceptions.TaskNotFound(uuid=test_uuid))
+        self.assertEqual(1, self.task.detailed(test_uuid))
+        mock_db.task_get.assert_called_once_with(test_uuid)
 
     @mock.patch("json.dumps")
     @mock.patch("rally.cli.commands.task.objects.Task.get")
@@ -412,17 +547,19 @@ class TaskCommandsTestCase(test.TestCase):
                 side_effect=mock.mock_open(), create=True)
     @mock.patch("rally.cli.commands.task.plot")
     @mock.patch("rally.cli.commands.task.webbrowser")
+    @mock.patch("rally.cli.commands.task.objects.Task.get_results_stats",
+                side_effect=lambda result_id: "stats_%s" % result_id)
     @mock.patch("rally.cli.commands.task.objects.Task.get")
-    def test_report_one_uuid(self, mock_task_get, mock_webbrowser,
-                             mock_plot, mock_open, mock_realpath,
-                             mock_validate):
+    def test_report_one_uuid(self, mock_task_get, mock_task_get_results_stats,
+                             mock_webbrowser, mock_plot, mock_open,
+                             mock_realpath, mock_validate):
         task_id = "eb290c30-38d8-4c8f-bbcc-fc8f74b004ae"
         data = [
-            {"key": {"name": "class.test", "pos": 0},
+            {"id": 1, "key": {"name": "class.test", "pos": 0},
              "data": {"raw": "foo_raw", "sla": "foo_sla",
                       "load_duration": 0.1,
                       "full_duration": 1.2}},
-            {"key": {"name": "class.test", "pos": 0},
+            {"id": 2, "key": {"name": "class.test", "pos": 0},
              "data": {"raw": "bar_raw", "sla": "bar_sla",
                       "load_duration": 2.1,
                       "full_duration": 2.2}}]
@@ -431,7 +568,8 @@ class TaskCommandsTestCase(test.TestCase):
                     "result": x["data"]["raw"],
                     "sla": x["data"]["sla"],
                     "load_duration": x["data"]["load_duration"],
-                    "full_duration": x["data"]["full_duration"]}
+                    "full_duration": x["data"]["full_duration"],
+                    "stats": "stats_%s" % x["id"]}
                    for x in data]
         mock_results = mock.Mock(return_value=data)
         mock_task_get.return_value = mock.Mock(get_results=mock_results)
@@ -465,18 +603,21 @@ class TaskCommandsTestCase(test.TestCase):
                 side_effect=mock.mock_open(), create=True)
     @mock.patch("rally.cli.commands.task.plot")
     @mock.patch("rally.cli.commands.task.webbrowser")
+    @mock.patch("rally.cli.commands.task.objects.Task.get_results_stats",
+                return_value=None)
     @mock.patch("rally.cli.commands.task.objects.Task.get")
-    def test_report_bunch_uuids(self, mock_task_get, mock_webbrowser,
+    def test_report_bunch_uuids(self, mock_task_get,
+                                mock_task_get_results_stats, mock_webbrowser,
                                 mock_plot, mock_open, mock_realpath,
                                 mock_validate):
         tasks = ["eb290c30-38d8-4c8f-bbcc-fc8f74b004ae",
                  "eb290c30-38d8-4c8f-bbcc-fc8f74b004af"]
         data = [
-            {"key": {"name": "test", "pos": 0},
+            {"id": 1, "key": {"name": "test", "pos": 0},
              "data": {"raw": "foo_raw", "sla": "foo_sla",
                       "load_duration": 0.1,
                       "full_duration": 1.2}},
-            {"key": {"name": "test", "pos": 0},
+            {"id": 2, "key": {"name": "test", "pos": 0},
              "data": {"raw": "bar_raw", "sla": "bar_sla",
                       "load_duration": 2.1,
                       "full_duration": 2.2}}]
@@ -488,7 +629,8 @@ class TaskCommandsTestCase(test.TestCase):
                                "result": x["data"]["raw"],
                                "sla": x["data"]["sla"],
                                "load_duration": x["data"]["load_duration"],
-                               "full_duration": x["data"]["full_duration"]},
+                               "full_duration": x["data"]["full_duration"],
+                               "stats": None},
                     data))
 
         mock_results = mock.Mock(return_value=data)
@@ -577,6 +719,48 @@ class TaskCommandsTestCase(test.TestCase):
                                out="/tmp/tmp.hsml")
         self.assertEqual(ret, 1)
 
+    @mock.patch("rally.cli.commands.task.os.path.realpath",
+                side_effect=lambda p: "realpath_%s" % p)
+    @mock.patch("rally.cli.commands.task.open",
+                side_effect=mock.mock_open(), create=True)
+    @mock.patch("rally.cli.commands.task.plot")
+    @mock.patch("rally.cli.commands.task.webbrowser")
+    @mock.patch("rally.cli.commands.task.objects.Task.get")
+    def test_report_trends(self, mock_task_get, mock_webbrowser, mock_plot,
+                           mock_open, mock_realpath):
+        tasks = ["eb290c30-38d8-4c8f-bbcc-fc8f74b004ae",
+                 "eb290c30-38d8-4c8f-bbcc-fc8f74b004af"]
+        task_objects = {
+            tasks[0]: fakes.FakeTask(uuid=tasks[0], created_at=2),
+            tasks[1]: fakes.FakeTask(uuid=tasks[1], created_at=1)}
+        for uuid, task_obj in task_objects.items():
+            task_obj.get_results_aggregates = mock.Mock(
+                return_value=["aggregates_%s" % uuid])
+        mock_task_get.side_effect = lambda uuid: task_objects[uuid]
+        mock_plot.trends.return_value = "html_report"
+
+        self.assertIsNone(self.task.report(tasks=tasks, out="trends.html",
+                                           open_it=True,
+                                           out_format="trends"))
+        mock_plot.trends.assert_called_once_with(
+            [(task_objects[tasks[1]], ["aggregates_%s" % tasks[1]]),
+             (task_objects[tasks[0]], ["aggregates_%s" % tasks[0]])])
+        self.assertFalse(mock_plot.plot.called)
+        mock_open.assert_called_once_with("trends.html", "w+")
+        mock_open.side_effect().write.assert_called_once_with("html_report")
+        mock_webbrowser.open_new_tab.assert_called_once_with(
+            "file://realpath_trends.html")
+
+    @mock.patch("rally.cli.commands.task.sys.stderr")
+    @mock.patch("rally.cli.commands.task.plot")
+    @mock.patch("rally.cli.commands.task.objects.Task.get")
+    def test_report_trends_file(self, mock_task_get, mock_plot, mock_stderr):
+        self.assertEqual(1, self.task.report(tasks=["/tmp/task.json"],
+                                             out="trends.html",
+                                             out_format="trends"))
+        self.assertFalse(mock_task_get.called)
+        self.assertFalse(mock_plot.trends.called)
+
     @mock.patch("rally.cli.commands.task.sys.stderr")
     @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
     @mock.patch("rally.cli.commands.task.json.load")
@@ -633,6 +817,13 @@ class TaskCommandsTestCase(test.TestCase):
             mock_task_list.return_value, ["uuid"],
             print_header=False, print_border=False)
 
+    @mock.patch("rally.cli.commands.task.objects.Task.list",
+                return_value=[])
+    def test_list_paged(self, mock_task_list):
+        self.task.list(deployment="d", limit=10, marker="a")
+        mock_task_list.assert_called_once_with(deployment="d", limit=10,
+                                               marker="a")
+
     def test_list_wrong_status(self):
         self.assertEqual(1, self.task.list(deployment="fake",
                                            status="wrong non existing status"))
@@ -697,6 +888,66 @@ class TaskCommandsTestCase(test.TestCase):
         result = self.task.sla_check(task_id="fake_task_id", tojson=True)
         self.assertEqual(0, result)
 
+    def _get_overhead_results(self, ips=10.0):
+        return {
+            "workloads": [{
+                "runner": {"type": "constant", "times": 10,
+                           "concurrency": 2},
+                "iterations": 10, "errors": 0, "iterations_per_sec": ips,
+                "scheduling_delay": {"mean": 0.1, "95%ile": 0.2,
+                                     "max": 0.3},
+                "parent_cpu_percent": 50.0, "workers_cpu": 1.0,
+                "memory_kb_per_1k_iterations": 42.0}],
+            "summary": {"constant": ips}}
+
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    @mock.patch("rally.cli.commands.task.runner_overhead")
+    def test_overhead(self, mock_runner_overhead, mock_print_list):
+        mock_runner_overhead.run.return_value = self._get_overhead_results()
+
+        self.assertIsNone(self.task.overhead(iterations=10, duration=2))
+
+        mock_runner_overhead.default_suite.assert_called_once_with(10, 2)
+        mock_runner_overhead.run.assert_called_once_with(
+            mock_runner_overhead.default_suite.return_value)
+        rows = mock_print_list.call_args[0][0]
+        self.assertEqual(1, len(rows))
+        self.assertEqual("constant", rows[0].runner)
+        self.assertEqual("concurrency=2, times=10", rows[0].load)
+        self.assertEqual(10.0, rows[0].iterations_per_sec)
+
+    @mock.patch("rally.cli.commands.task.runner_overhead")
+    @mock.patch("rally.cli.commands.task.TaskCommands._load_task")
+    def test_overhead_with_task(self, mock__load_task,
+                                mock_runner_overhead):
+        mock_runner_overhead.run.return_value = self._get_overhead_results()
+
+        self.task.overhead(task="task.yaml", task_args="{}", tojson=True)
+
+        mock__load_task.assert_called_once_with("task.yaml", "{}", None)
+        mock_runner_overhead.run.assert_called_once_with(
+            mock__load_task.return_value)
+        self.assertFalse(mock_runner_overhead.default_suite.called)
+
+    @mock.patch("rally.cli.commands.task.runner_overhead.run",
+                side_effect=exceptions.InvalidTaskException(message="foo"))
+    def test_overhead_invalid_task(self, mock_run):
+        self.assertEqual(1, self.task.overhead())
+
+    @mock.patch("rally.cli.commands.task.open",
+                side_effect=mock.mock_open(
+                    read_data="{\"summary\": {\"constant\": 100.0}}"),
+                create=True)
+    @mock.patch("rally.cli.commands.task.runner_overhead.run")
+    def test_overhead_baseline(self, mock_run, mock_open):
+        mock_run.return_value = self._get_overhead_results(ips=90.0)
+        self.assertIsNone(self.task.overhead(baseline="base.json",
+                                             tojson=True))
+
+        mock_run.return_value = self._get_overhead_results(ips=50.0)
+        self.assertEqual(1, self.task.overhead(baseline="base.json",
+                                               tojson=True))
+
     @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
     @mock.patch("rally.api.Task.validate")
     @mock.patch("rally.cli.commands.task.open",
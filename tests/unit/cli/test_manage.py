@@ -26,7 +26,8 @@ class CmdManageTestCase(test.TestCase):
     @mock.patch("rally.cli.manage.cliutils")
     def test_main(self, mock_cliutils):
         manage.main()
-        categories = {"db": manage.DBCommands}
+        categories = {"db": manage.DBCommands,
+                      "worker": manage.WorkerCommands}
         mock_cliutils.run.assert_called_once_with(sys.argv, categories)
 
 
@@ -41,3 +42,45 @@ class DBCommandsTestCase(test.TestCase):
         self.db_commands.recreate()
         calls = [mock.call.db_drop(), mock.call.db_create()]
         self.assertEqual(calls, mock_db.mock_calls)
+
+    @mock.patch("rally.cli.manage.db")
+    def test_reencode(self, mock_db):
+        mock_db.task_results_reencode.return_value = 3
+        self.db_commands.reencode(batch_size=10)
+        mock_db.task_results_reencode.assert_called_once_with(batch_size=10)
+
+    @mock.patch("rally.cli.manage.cliutils.print_list")
+    @mock.patch("rally.cli.manage.benchmark.run")
+    def test_benchmark(self, mock_run, mock_print_list):
+        mock_run.return_value = [
+            {"results_encoding": "json", "json_backend": "json",
+             "iterations": 10, "store": 1.0, "load": 0.5, "size": 2097152}]
+        self.db_commands.benchmark(iterations=10, chunk_size=5)
+        mock_run.assert_called_once_with(iterations=10, chunk_size=5)
+        rows, fields = mock_print_list.call_args[0]
+        formatters = mock_print_list.call_args[1]["formatters"]
+        self.assertEqual(["results_encoding", "json_backend", "store",
+                          "load", "size"], fields)
+        self.assertEqual(["json", "json", "1.00", "0.50", "2.0"],
+                         [formatters[f](rows[0]) if f in formatters
+                          else getattr(rows[0], f) for f in fields])
+
+
+class WorkerCommandsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(WorkerCommandsTestCase, self).setUp()
+        self.worker_commands = manage.WorkerCommands()
+
+    @mock.patch("rally.cli.manage.distributed.Worker")
+    def test_start(self, mock_worker):
+        self.worker_commands.start(hostname="w1")
+        mock_worker.assert_called_once_with("w1")
+        mock_worker.return_value.run.assert_called_once_with()
+
+    @mock.patch("rally.cli.manage.distributed.Worker")
+    def test_start_interrupted(self, mock_worker):
+        mock_worker.return_value.run.side_effect = KeyboardInterrupt
+        self.worker_commands.start()
+        mock_worker.assert_called_once_with(None)
+        mock_worker.return_value.stop.assert_called_once_with()
@@ -15,9 +15,13 @@
 
 """Tests for db.api layer."""
 
+import mock
+from oslo_config import cfg
 from six import moves
+import testtools
 
 from rally.common import db
+from rally.common.db.sqlalchemy import types
 from rally import consts
 from rally import exceptions
 from tests.unit import test
@@ -116,6 +120,33 @@ class TasksTestCase(test.DBTestCase):
         self.assertEqual(task_init, get_uuids(INIT))
         self.assertEqual(sorted(task_finished), get_uuids(FINISHED))
 
+    def test_task_list_paged(self):
+        uuids = [self._create_task()["uuid"] for i in moves.range(5)]
+
+        self.assertEqual(uuids, [t["uuid"] for t in db.task_list()])
+        page = db.task_list(limit=2)
+        self.assertEqual(uuids[3:], [t["uuid"] for t in page])
+        page = db.task_list(limit=2, marker=page[0]["uuid"])
+        self.assertEqual(uuids[1:3], [t["uuid"] for t in page])
+        page = db.task_list(limit=2, marker=page[0]["uuid"])
+        self.assertEqual(uuids[:1], [t["uuid"] for t in page])
+        self.assertRaises(exceptions.TaskNotFound,
+                          db.task_list, marker="non-existing-task")
+
+    def test_task_list_deployment_name(self):
+        deploy = db.deployment_create({"name": "foo"})
+        self._create_task({"deployment_uuid": deploy["uuid"]})
+        self._create_task()
+        tasks = db.task_list(deployment="foo")
+        self.assertEqual(1, len(tasks))
+        self.assertEqual("foo", tasks[0]["deployment_name"])
+
+    def test_task_list_without_deployment(self):
+        task = self._create_task({"deployment_uuid": "deleted-deployment"})
+        tasks = db.task_list()
+        self.assertEqual([task["uuid"]], [t["uuid"] for t in tasks])
+        self.assertIsNone(tasks[0]["deployment_name"])
+
     def test_task_delete(self):
         task1, task2 = self._create_task()["uuid"], self._create_task()["uuid"]
         db.task_delete(task1)
@@ -176,6 +207,118 @@ class TasksTestCase(test.DBTestCase):
             self.assertEqual(res[0]["key"], data)
             self.assertEqual(res[0]["data"], data)
 
+    def test_task_result_update(self):
+        task_id = self._create_task()["uuid"]
+        result = db.task_result_create(task_id, {"name": "foo"}, {"raw": []})
+        db.task_result_update(result["id"], {"raw": [], "sla": []})
+        res = db.task_result_get_all_by_uuid(task_id)
+        self.assertEqual({"raw": [], "sla": []}, res[0]["data"])
+
+    def test_task_result_update_summary(self):
+        task_id = self._create_task()["uuid"]
+        result = db.task_result_create(task_id, {"name": "foo"}, {"raw": []})
+        db.task_result_update(result["id"], {"raw": [], "sla": []},
+                              summary={"iterations_count": 10,
+                                       "failed_iterations_count": 2,
+                                       "load_duration": 1.5,
+                                       "full_duration": 2.5,
+                                       "sla_success": False})
+        res = db.task_result_get_all_by_uuid(task_id)
+        self.assertEqual({"raw": [], "sla": []}, res[0]["data"])
+        self.assertEqual((10, 2, 1.5, 2.5, False),
+                         (res[0]["iterations_count"],
+                          res[0]["failed_iterations_count"],
+                          res[0]["load_duration"], res[0]["full_duration"],
+                          res[0]["sla_success"]))
+
+    def test_task_result_summary_get_all(self):
+        task_id = self._create_task()["uuid"]
+        for name in "foo", "bar":
+            result = db.task_result_create(task_id, {"name": name},
+                                           {"raw": [1, 2]})
+            db.task_result_update(result["id"], {"raw": [1, 2]},
+                                  summary={"iterations_count": 2})
+        self._create_task()
+
+        res = db.task_result_summary_get_all(task_id)
+        self.assertEqual([({"name": "foo"}, 2), ({"name": "bar"}, 2)],
+                         [(r["key"], r["iterations_count"]) for r in res])
+        self.assertNotIn("data", res[0].__dict__)
+
+    def test_task_result_update_not_found(self):
+        self.assertRaises(exceptions.NotFoundException,
+                          db.task_result_update, 42, {})
+
+    def test_task_result_chunks(self):
+        task_id = self._create_task()["uuid"]
+        result = db.task_result_create(task_id, {"name": "foo"}, {"raw": []})
+        db.task_result_chunk_create(task_id, result["id"], 1, [3])
+        db.task_result_chunk_create(task_id, result["id"], 0, [1, 2])
+        self.assertEqual([[1, 2], [3]],
+                         list(db.task_result_chunk_get_all(result["id"])))
+        db.task_delete(task_id)
+        self.assertEqual([], list(db.task_result_chunk_get_all(result["id"])))
+
+    def test_task_result_stats(self):
+        task_id = self._create_task()["uuid"]
+        result = db.task_result_create(task_id, {"name": "foo"}, {"raw": []})
+        rows = [{"position": i, "kind": "atomic", "name": name,
+                 "count": 2, "errors": 1, "min_value": 0.5,
+                 "max_value": 0.5, "mean": 0.5, "stddev": None,
+                 "sketch": {"values": [0.5]}}
+                for i, name in ((1, "total"), (0, "foo"))]
+        db.task_result_stats_create(task_id, result["id"], rows)
+
+        stats = db.task_result_stats_get_all(result["id"])
+        self.assertEqual(["foo", "total"], [s["name"] for s in stats])
+        self.assertEqual({"values": [0.5]}, stats[0]["sketch"])
+        self.assertEqual(task_id, stats[0]["task_uuid"])
+
+        db.task_delete(task_id)
+        self.assertEqual([], db.task_result_stats_get_all(result["id"]))
+
+    def test_task_result_stats_get_all_by_uuid(self):
+        task_id = self._create_task()["uuid"]
+        results = [db.task_result_create(task_id, {"name": name}, {})
+                   for name in ("foo", "bar")]
+        for result in reversed(results):
+            db.task_result_stats_create(
+                task_id, result["id"],
+                [{"position": i, "kind": "atomic", "name": name, "count": 1,
+                  "errors": 0, "min_value": 1.0, "max_value": 1.0,
+                  "mean": 1.0, "stddev": None, "sketch": {}}
+                 for i, name in ((1, "total"), (0, "a"))])
+        db.task_result_stats_create(self._create_task()["uuid"],
+                                    results[0]["id"], [])
+
+        stats = db.task_result_stats_get_all_by_uuid(task_id)
+        self.assertEqual(
+            [(results[0]["id"], "a"), (results[0]["id"], "total"),
+             (results[1]["id"], "a"), (results[1]["id"], "total")],
+            [(s["task_result_id"], s["name"]) for s in stats])
+
+    @testtools.skipIf(types.msgpack is None, "msgpack is not installed")
+    def test_task_results_reencode(self):
+        task_id = self._create_task()["uuid"]
+        data = {"raw": [{"duration": 1.0, "error": []}]}
+        result = db.task_result_create(task_id, {"name": "foo"}, data)
+        db.task_result_chunk_create(task_id, result["id"], 0, [{"a": 1}])
+
+        cfg.CONF.set_override("results_encoding", "msgpack_zlib", "database")
+        self.addCleanup(cfg.CONF.clear_override, "results_encoding",
+                        "database")
+        with mock.patch("rally.common.db.sqlalchemy.types.dumps",
+                        wraps=types.dumps) as mock_dumps:
+            self.assertEqual(2, db.task_results_reencode(batch_size=1))
+        self.assertIn(mock.call(data, encoding="msgpack_zlib"),
+                      mock_dumps.mock_calls)
+        self.assertIn(mock.call([{"a": 1}], encoding="msgpack_zlib"),
+                      mock_dumps.mock_calls)
+        self.assertEqual(data, db.task_result_get_all_by_uuid(
+            task_id)[0]["data"])
+        self.assertEqual([[{"a": 1}]],
+                         list(db.task_result_chunk_get_all(result["id"])))
+
     def test_task_get_detailed(self):
         task1 = self._create_task()
         key = {"name": "atata"}
@@ -335,6 +478,93 @@ class DeploymentTestCase(test.DBTestCase):
         self.assertRaises(exceptions.DeploymentIsBusy, db.deployment_delete,
                           deployment["uuid"])
 
+    def test_deployment_delete_has_pooled_tenants(self):
+        deployment = db.deployment_create({})
+        db.pooled_tenant_create({"deployment_uuid": deployment["uuid"],
+                                 "tenant_id": "foo", "kind": "bar"})
+        self.assertRaises(exceptions.DeploymentIsBusy, db.deployment_delete,
+                          deployment["uuid"])
+
+
+class PooledTenantTestCase(test.DBTestCase):
+
+    def setUp(self):
+        super(PooledTenantTestCase, self).setUp()
+        self.deployment = db.deployment_create({})
+
+    def _create(self, tenant_id, kind="kind", lessee=None):
+        return db.pooled_tenant_create({
+            "deployment_uuid": self.deployment["uuid"],
+            "tenant_id": tenant_id, "kind": kind, "lessee": lessee,
+            "data": {"tenant": {"id": tenant_id}}})
+
+    def test_create_and_get_all(self):
+        self._create("t1")
+        self._create("t2", lessee="task")
+        tenants = db.pooled_tenant_get_all(self.deployment["uuid"])
+        self.assertEqual(["t1", "t2"], sorted(t.tenant_id for t in tenants))
+        self.assertEqual({"tenant": {"id": "t1"}}, tenants[0].data)
+
+        tenants = db.pooled_tenant_get_all(self.deployment["uuid"],
+                                           lessee="task")
+        self.assertEqual(["t2"], [t.tenant_id for t in tenants])
+
+    def test_lease(self):
+        self._create("t1")
+        self._create("t2", lessee="other_task")
+        self._create("t3", kind="other_kind")
+        self._create("t4")
+        self._create("t5")
+
+        leased = db.pooled_tenant_lease(self.deployment["uuid"], "kind",
+                                        "task", 2)
+        self.assertEqual(2, len(leased))
+        self.assertEqual(["task", "task"], [t.lessee for t in leased])
+
+        leased = db.pooled_tenant_lease(self.deployment["uuid"], "kind",
+                                        "task2", 5)
+        self.assertEqual(1, len(leased))
+        self.assertEqual([], db.pooled_tenant_lease(
+            self.deployment["uuid"], "kind", "task3", 1))
+
+    def test_release(self):
+        self._create("t1", lessee="task")
+        self._create("t2", lessee="task")
+        self._create("t3", lessee="other_task")
+
+        self.assertEqual(2, db.pooled_tenant_release("task"))
+        leased = db.pooled_tenant_lease(self.deployment["uuid"], "kind",
+                                        "task2", 5)
+        self.assertEqual(["t1", "t2"], sorted(t.tenant_id for t in leased))
+
+    def test_release_stale(self):
+        tasks = {}
+        for status in (consts.TaskStatus.RUNNING, consts.TaskStatus.FINISHED,
+                       consts.TaskStatus.FAILED):
+            tasks[status] = db.task_create(
+                {"deployment_uuid": self.deployment["uuid"],
+                 "status": status})["uuid"]
+        self._create("t1", lessee=tasks[consts.TaskStatus.RUNNING])
+        self._create("t2", lessee=tasks[consts.TaskStatus.FINISHED])
+        self._create("t3", lessee=tasks[consts.TaskStatus.FAILED])
+        self._create("t4", lessee="deleted_task")
+        self._create("t5")
+
+        self.assertEqual(
+            3, db.pooled_tenant_release_stale(self.deployment["uuid"]))
+        leased = db.pooled_tenant_get_all(
+            self.deployment["uuid"], lessee=tasks[consts.TaskStatus.RUNNING])
+        self.assertEqual(["t1"], [t.tenant_id for t in leased])
+        self.assertEqual(0, db.pooled_tenant_release_stale(
+            self.deployment["uuid"]))
+
+    def test_delete(self):
+        tenant = self._create("t1")
+        db.pooled_tenant_delete(tenant.id)
+        self.assertEqual([], db.pooled_tenant_get_all(self.deployment["uuid"]))
+        self.assertRaises(exceptions.ResourceNotFound,
+                          db.pooled_tenant_delete, tenant.id)
+
 
 class ResourceTestCase(test.DBTestCase):
     def test_create(self):
@@ -447,6 +677,102 @@ class VerificationTestCase(test.DBTestCase):
                          ver_result2["verification_uuid"])
 
 
+class DistributedChunkTestCase(test.DBTestCase):
+
+    def setUp(self):
+        super(DistributedChunkTestCase, self).setUp()
+        self.deployment = db.deployment_create({})
+        self.task = db.task_create(
+            {"deployment_uuid": self.deployment["uuid"]})
+        self.chunks = db.distributed_chunks_create(
+            self.task["uuid"], "workload", {"scenario": "Dummy.dummy"},
+            [(0, 10), (10, 10), (20, 5)])
+
+    def test_create_and_get_all(self):
+        chunks = db.distributed_chunk_get_all("workload")
+        self.assertEqual([(0, 10), (10, 10), (20, 5)],
+                         [(c.start, c.count) for c in chunks])
+        for chunk in chunks:
+            self.assertEqual(consts.DistributedChunkStatus.PENDING,
+                             chunk.status)
+            self.assertEqual({"scenario": "Dummy.dummy"}, chunk.data)
+            self.assertIsNone(chunk.worker)
+        self.assertEqual([], db.distributed_chunk_get_all("other"))
+
+    def test_claim(self):
+        first = db.distributed_chunk_claim("host1")
+        second = db.distributed_chunk_claim("host2")
+        third = db.distributed_chunk_claim("host1")
+
+        self.assertEqual([0, 10, 20],
+                         [first.start, second.start, third.start])
+        self.assertEqual(["host1", "host2", "host1"],
+                         [first.worker, second.worker, third.worker])
+        self.assertEqual(consts.DistributedChunkStatus.RUNNING,
+                         first.status)
+        self.assertIsNone(db.distributed_chunk_claim("host1"))
+
+    def test_update(self):
+        statuses = consts.DistributedChunkStatus
+        chunk = db.distributed_chunk_claim("host1")
+
+        self.assertFalse(db.distributed_chunk_update(
+            chunk.id, {"status": statuses.FINISHED}, worker="host2"))
+        self.assertFalse(db.distributed_chunk_update(
+            chunk.id, {"status": statuses.FINISHED},
+            statuses=[statuses.PENDING]))
+        self.assertTrue(db.distributed_chunk_update(
+            chunk.id, {"status": statuses.FINISHED},
+            statuses=[statuses.RUNNING, statuses.ABORTING], worker="host1"))
+        self.assertEqual(statuses.FINISHED,
+                         db.distributed_chunk_get_all("workload")[0].status)
+
+    def test_abort(self):
+        statuses = consts.DistributedChunkStatus
+        db.distributed_chunk_claim("host1")
+
+        db.distributed_chunks_abort("workload")
+
+        self.assertEqual(
+            [statuses.ABORTING, statuses.ABORTED, statuses.ABORTED],
+            [c.status for c in db.distributed_chunk_get_all("workload")])
+        self.assertIsNone(db.distributed_chunk_claim("host1"))
+
+    def test_results(self):
+        chunk = db.distributed_chunk_claim("host1")
+        db.distributed_result_create(chunk.id, "host1", 42.0, [{"a": 1}])
+        db.distributed_result_create(chunk.id, "host1", 43.0, [{"a": 2}])
+
+        results = db.distributed_results_pop("workload")
+        self.assertEqual([[{"a": 1}], [{"a": 2}]], [r.data for r in results])
+        self.assertEqual([42.0, 43.0], [r.sent_at for r in results])
+        self.assertEqual(set([chunk.id]), set(r.chunk_id for r in results))
+        self.assertEqual([], db.distributed_results_pop("workload"))
+
+    def test_result_create_chunk_not_found(self):
+        self.assertRaises(exceptions.ResourceNotFound,
+                          db.distributed_result_create, 424242, "host1",
+                          42.0, [])
+
+    def test_workload_delete(self):
+        chunk = db.distributed_chunk_claim("host1")
+        db.distributed_result_create(chunk.id, "host1", 42.0, [{"a": 1}])
+
+        db.distributed_workload_delete("workload")
+
+        self.assertEqual([], db.distributed_chunk_get_all("workload"))
+        self.assertEqual([], db.distributed_results_pop("workload"))
+
+    def test_task_delete(self):
+        chunk = db.distributed_chunk_claim("host1")
+        db.distributed_result_create(chunk.id, "host1", 42.0, [{"a": 1}])
+
+        db.task_delete(self.task["uuid"])
+
+        self.assertEqual([], db.distributed_chunk_get_all("workload"))
+        self.assertEqual([], db.distributed_results_pop("workload"))
+
+
 class WorkerTestCase(test.DBTestCase):
     def setUp(self):
         super(WorkerTestCase, self).setUp()
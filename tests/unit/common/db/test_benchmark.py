@@ -0,0 +1,52 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import testtools
+
+from rally.common.db.sqlalchemy import benchmark
+from rally.common.db.sqlalchemy import types
+from tests.unit import test
+
+
+class BenchmarkTestCase(test.TestCase):
+
+    def test_generate_iterations(self):
+        iterations = list(benchmark.generate_iterations(100))
+        self.assertEqual(100, len(iterations))
+        self.assertEqual(2, len([i for i in iterations if i["error"]]))
+        self.assertEqual(iterations, list(benchmark.generate_iterations(100)))
+
+    @mock.patch("rally.common.db.sqlalchemy.benchmark.types")
+    def test_available_encodings(self, mock_types):
+        self.assertEqual(
+            [("json", "json"), ("json", "orjson"), ("msgpack_zlib", "json")],
+            benchmark.available_encodings())
+        mock_types.orjson = mock_types.msgpack = None
+        self.assertEqual([("json", "json")], benchmark.available_encodings())
+
+    @testtools.skipIf(types.msgpack is None, "msgpack is not installed")
+    def test_run(self):
+        results = benchmark.run(iterations=250, chunk_size=100,
+                                encodings=[("json", "json"),
+                                           ("msgpack_zlib", "json")])
+        self.assertEqual(
+            [("json", "json", 250), ("msgpack_zlib", "json", 250)],
+            [(r["results_encoding"], r["json_backend"], r["iterations"])
+             for r in results])
+        self.assertLess(results[1]["size"], results[0]["size"])
+        for result in results:
+            self.assertGreater(result["store"], 0)
+            self.assertGreater(result["load"], 0)
@@ -0,0 +1,113 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+from oslo_config import cfg
+import testtools
+
+from rally.common import costilius
+from rally.common.db.sqlalchemy import types
+from rally import exceptions
+from tests.unit import test
+
+
+CONF = cfg.CONF
+
+VALUE = {"raw": [{"duration": 1.5, "error": [], "name": u"\u0444",
+                  "atomic_actions": {"b": 1.0, "a": 0.5}}],
+         "sla": []}
+
+
+class SerializationTestCase(test.TestCase):
+
+    def setUp(self):
+        super(SerializationTestCase, self).setUp()
+        self.addCleanup(CONF.clear_override, "json_backend", "database")
+
+    def test_dumps_json(self):
+        self.assertEqual("{\"a\": [1, null]}", types.dumps({"a": [1, None]}))
+
+    def test_dumps_loads(self):
+        for json_backend in ("json", "orjson"):
+            CONF.set_override("json_backend", json_backend, "database")
+            data = types.dumps(VALUE)
+            self.assertEqual(VALUE, types.loads(data))
+            self.assertEqual(VALUE, types.loads(data, ordered=False))
+
+    @testtools.skipIf(types.msgpack is None, "msgpack is not installed")
+    def test_dumps_loads_msgpack_zlib(self):
+        data = types.dumps(VALUE, encoding="msgpack_zlib")
+        self.assertEqual(VALUE, types.loads(data))
+        self.assertEqual(VALUE, types.loads(data, ordered=False))
+        self.assertTrue(data.startswith(types.MSGPACK_ZLIB_PREFIX))
+        self.assertLess(len(types.dumps([VALUE] * 100,
+                                        encoding="msgpack_zlib")),
+                        len(types.dumps([VALUE] * 100)) / 5)
+
+    @mock.patch("rally.common.db.sqlalchemy.types.msgpack", None)
+    def test_msgpack_is_not_installed(self):
+        self.assertRaises(exceptions.RallyException, types.dumps, VALUE,
+                          encoding="msgpack_zlib")
+        self.assertRaises(exceptions.RallyException, types.loads,
+                          types.MSGPACK_ZLIB_PREFIX + "eJwDAAAAAAE=")
+
+    @mock.patch("rally.common.db.sqlalchemy.types._orjson_warned", False)
+    @mock.patch("rally.common.db.sqlalchemy.types.LOG")
+    @mock.patch("rally.common.db.sqlalchemy.types.orjson", None)
+    def test_orjson_is_not_installed(self, mock_log):
+        CONF.set_override("json_backend", "orjson", "database")
+        self.assertEqual(VALUE, types.loads(types.dumps(VALUE)))
+        self.assertEqual(VALUE, types.loads(types.dumps(VALUE)))
+        self.assertEqual(1, mock_log.warning.call_count)
+
+    @testtools.skipIf(types.msgpack is None, "msgpack is not installed")
+    @mock.patch("rally.common.db.sqlalchemy.types.DICTS_ARE_ORDERED", False)
+    def test_loads_ordered(self):
+        for encoding in ("json", "msgpack_zlib"):
+            data = types.dumps(VALUE, encoding=encoding)
+            atomic = types.loads(data)["raw"][0]["atomic_actions"]
+            self.assertIsInstance(atomic, costilius.OrderedDict)
+            self.assertEqual(["b", "a"], list(atomic))
+            self.assertNotIsInstance(types.loads(data, ordered=False),
+                                     costilius.OrderedDict)
+
+
+class JSONEncodedDictTestCase(test.TestCase):
+
+    def setUp(self):
+        super(JSONEncodedDictTestCase, self).setUp()
+        self.addCleanup(CONF.clear_override, "results_encoding", "database")
+        CONF.set_override("results_encoding", "msgpack_zlib", "database")
+
+    @testtools.skipIf(types.msgpack is None, "msgpack is not installed")
+    def test_process_bind_param(self):
+        self.assertIsNone(
+            types.JSONEncodedDict().process_bind_param(None, None))
+        self.assertEqual(
+            "{\"a\": 1}",
+            types.JSONEncodedDict().process_bind_param({"a": 1}, None))
+        self.assertTrue(
+            types.BigJSONEncodedDict().process_bind_param(
+                {"a": 1}, None).startswith(types.MSGPACK_ZLIB_PREFIX))
+
+    @mock.patch("rally.common.db.sqlalchemy.types.loads")
+    def test_process_result_value(self, mock_loads):
+        self.assertIsNone(
+            types.JSONEncodedDict().process_result_value(None, None))
+        self.assertEqual(
+            mock_loads.return_value,
+            types.JSONEncodedDict(ordered=False).process_result_value(
+                "{}", None))
+        mock_loads.assert_called_once_with("{}", ordered=False)
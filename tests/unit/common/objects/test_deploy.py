@@ -177,6 +177,55 @@ class DeploymentTestCase(test.TestCase):
         self.assertEqual(len(resources), 1)
         self.assertEqual(resources[0]["id"], self.resource["id"])
 
+    @mock.patch("rally.common.objects.deploy.db.pooled_tenant_create")
+    def test_add_pooled_tenant(self, mock_pooled_tenant_create):
+        deploy = objects.Deployment(deployment=self.deployment)
+        tenant = deploy.add_pooled_tenant("tenant_id", "kind", {"foo": "bar"},
+                                          lessee="task_uuid")
+        self.assertEqual(mock_pooled_tenant_create.return_value, tenant)
+        mock_pooled_tenant_create.assert_called_once_with({
+            "deployment_uuid": self.deployment["uuid"],
+            "tenant_id": "tenant_id",
+            "kind": "kind",
+            "data": {"foo": "bar"},
+            "lessee": "task_uuid"
+        })
+
+    @mock.patch("rally.common.objects.deploy.db.pooled_tenant_get_all")
+    def test_get_pooled_tenants(self, mock_pooled_tenant_get_all):
+        deploy = objects.Deployment(deployment=self.deployment)
+        self.assertEqual(mock_pooled_tenant_get_all.return_value,
+                         deploy.get_pooled_tenants(lessee="task_uuid"))
+        mock_pooled_tenant_get_all.assert_called_once_with(
+            self.deployment["uuid"], lessee="task_uuid")
+
+    @mock.patch("rally.common.objects.deploy.db.pooled_tenant_lease")
+    def test_lease_pooled_tenants(self, mock_pooled_tenant_lease):
+        deploy = objects.Deployment(deployment=self.deployment)
+        self.assertEqual(mock_pooled_tenant_lease.return_value,
+                         deploy.lease_pooled_tenants("kind", "task_uuid", 3))
+        mock_pooled_tenant_lease.assert_called_once_with(
+            self.deployment["uuid"], "kind", "task_uuid", 3)
+
+    @mock.patch("rally.common.objects.deploy.db.pooled_tenant_release")
+    def test_release_pooled_tenants(self, mock_pooled_tenant_release):
+        objects.Deployment.release_pooled_tenants("task_uuid")
+        mock_pooled_tenant_release.assert_called_once_with("task_uuid")
+
+    @mock.patch("rally.common.objects.deploy.db.pooled_tenant_release_stale")
+    def test_release_stale_pooled_tenants(self,
+                                          mock_pooled_tenant_release_stale):
+        deploy = objects.Deployment(deployment=self.deployment)
+        self.assertEqual(mock_pooled_tenant_release_stale.return_value,
+                         deploy.release_stale_pooled_tenants())
+        mock_pooled_tenant_release_stale.assert_called_once_with(
+            self.deployment["uuid"])
+
+    @mock.patch("rally.common.objects.deploy.db.pooled_tenant_delete")
+    def test_delete_pooled_tenant(self, mock_pooled_tenant_delete):
+        objects.Deployment.delete_pooled_tenant(42)
+        mock_pooled_tenant_delete.assert_called_once_with(42)
+
     @mock.patch("rally.common.objects.deploy.datetime.datetime")
     @mock.patch("rally.common.objects.deploy.db.deployment_update")
     def test_update_set_started(self, mock_deployment_update, mock_datetime):
@@ -17,6 +17,7 @@
 
 import datetime
 import json
+import types
 
 import ddt
 import jsonschema
@@ -114,7 +115,8 @@ class TaskTestCase(test.TestCase):
                                "deployment_name": "some_name"}])
     def list(self, mock_db_task_list):
         tasks = objects.Task.list(status="somestatus")
-        mock_db_task_list.assert_called_once_with("somestatus", None)
+        mock_db_task_list.assert_called_once_with(
+            "somestatus", None, limit=None, marker=None)
         self.assertIs(type(tasks), list)
         self.assertIsInstance(tasks[0], objects.Task)
         self.assertEqual(mock_db_task_list.return_value["uuis"],
@@ -194,18 +196,19 @@ class TaskTestCase(test.TestCase):
                                                      "min_duration": 10}},
              "iterations_count": 10, "iterations_failed": 0,
              "max_duration": 14, "min_duration": 5, "output_names": [],
-             "tstamp_start": 2, "full_duration": 40, "load_duration": 32}}]
+             "tstamp_start": 2, "full_duration": 40, "load_duration": 32,
+             "runner_stats": {}}}]
 
         # serializable is default
         results = objects.Task.extend_results(obsolete)
-        self.assertIsInstance(results[0]["iterations"], type(iter([])))
+        self.assertIsInstance(results[0]["iterations"], types.GeneratorType)
         self.assertEqual(list(results[0]["iterations"]), iterations)
         results[0]["iterations"] = "foo_iterations"
         self.assertEqual(results, expected)
 
         # serializable is False
         results = objects.Task.extend_results(obsolete, serializable=False)
-        self.assertIsInstance(results[0]["iterations"], type(iter([])))
+        self.assertIsInstance(results[0]["iterations"], types.GeneratorType)
         self.assertEqual(list(results[0]["iterations"]), iterations)
         results[0]["iterations"] = "foo_iterations"
         self.assertEqual(results, expected)
@@ -220,21 +223,154 @@ class TaskTestCase(test.TestCase):
         results[0]["iterations"] = "foo_iterations"
         self.assertEqual(results, expected)
 
-    @mock.patch("rally.common.objects.task.db.task_result_get_all_by_uuid",
-                return_value="foo_results")
-    def test_get_results(self, mock_task_result_get_all_by_uuid):
+    @mock.patch("rally.common.objects.task.db.task_result_chunk_get_all")
+    @mock.patch("rally.common.objects.task.db.task_result_get_all_by_uuid")
+    def test_get_results(self, mock_task_result_get_all_by_uuid,
+                         mock_task_result_chunk_get_all):
+        mock_task_result_get_all_by_uuid.return_value = [
+            {"id": 1, "key": "foo", "data": {"raw": [1], "sla": []}}]
+        mock_task_result_chunk_get_all.return_value = [[2, 3], [4]]
         task = objects.Task(task=self.task)
         results = task.get_results()
         mock_task_result_get_all_by_uuid.assert_called_once_with(
             self.task["uuid"])
-        self.assertEqual(results, "foo_results")
+        mock_task_result_chunk_get_all.assert_called_once_with(1)
+        self.assertEqual(
+            [{"id": 1, "key": "foo", "data": {"raw": [1, 2, 3, 4],
+                                              "sla": []}}],
+            results)
+
+    @mock.patch("rally.common.objects.task.db.task_result_chunk_get_all")
+    @mock.patch("rally.common.objects.task.db.task_result_get_all_by_uuid")
+    def test_get_results_stream(self, mock_task_result_get_all_by_uuid,
+                                mock_task_result_chunk_get_all):
+        mock_task_result_get_all_by_uuid.return_value = [
+            {"id": 1, "key": "foo", "data": {"raw": [], "sla": []}}]
+        mock_task_result_chunk_get_all.return_value = iter([[1, 2], [3]])
+        task = objects.Task(task=self.task)
+        results = task.get_results(stream=True)
+        self.assertFalse(mock_task_result_chunk_get_all.called)
+        self.assertEqual([1, 2, 3], list(results[0]["data"]["raw"]))
+
+    @mock.patch("rally.common.objects.task.db.task_result_chunk_get_all")
+    @mock.patch("rally.common.objects.task.db.task_result_get_all_by_uuid")
+    def test_get_results_incomplete(self, mock_task_result_get_all_by_uuid,
+                                    mock_task_result_chunk_get_all):
+        mock_task_result_get_all_by_uuid.return_value = [
+            {"id": 1, "key": "foo", "data": {"raw": [], "sla": []}},
+            {"id": 2, "key": "bar", "data": {"raw": [], "sla": [],
+                                             "completed": False}}]
+        mock_task_result_chunk_get_all.return_value = []
+        task = objects.Task(task=self.task)
+
+        self.assertEqual(["foo"], [r["key"] for r in task.get_results()])
+        self.assertEqual(
+            ["foo", "bar"],
+            [r["key"] for r in task.get_results(include_incomplete=True)])
 
     @mock.patch("rally.common.objects.task.db.task_result_create")
     def test_append_results(self, mock_task_result_create):
         task = objects.Task(task=self.task)
-        task.append_results("opt", "val")
+        result = task.append_results("opt", "val")
         mock_task_result_create.assert_called_once_with(
             self.task["uuid"], "opt", "val")
+        self.assertEqual(mock_task_result_create.return_value, result)
+
+    @mock.patch("rally.common.objects.task.db.task_result_update")
+    def test_update_results(self, mock_task_result_update):
+        task = objects.Task(task=self.task)
+        task.update_results(42, {"raw": []}, summary={"sla_success": True})
+        mock_task_result_update.assert_called_once_with(
+            42, {"raw": []}, summary={"sla_success": True})
+
+    @mock.patch("rally.common.objects.task.db.task_result_stats_create")
+    def test_append_results_stats(self, mock_task_result_stats_create):
+        task = objects.Task(task=self.task)
+        stats = mock.Mock()
+        task.append_results_stats(42, stats)
+        mock_task_result_stats_create.assert_called_once_with(
+            self.task["uuid"], 42, stats.to_rows.return_value)
+
+    @mock.patch("rally.common.objects.task.aggregation.ScenarioStats")
+    @mock.patch("rally.common.objects.task.db.task_result_stats_get_all")
+    def test_get_results_stats(self, mock_task_result_stats_get_all,
+                               mock_scenario_stats):
+        mock_task_result_stats_get_all.return_value = ["row"]
+        self.assertEqual(mock_scenario_stats.from_rows.return_value,
+                         objects.Task.get_results_stats(42))
+        mock_task_result_stats_get_all.assert_called_once_with(42)
+        mock_scenario_stats.from_rows.assert_called_once_with(["row"])
+
+    @mock.patch("rally.common.objects.task.db.task_result_stats_get_all",
+                return_value=[])
+    def test_get_results_stats_missing(self, mock_task_result_stats_get_all):
+        self.assertIsNone(objects.Task.get_results_stats(42))
+
+    @mock.patch("rally.common.objects.task.db.task_list",
+                return_value=[{"uuid": "a"}])
+    def test_list_paged(self, mock_task_list):
+        tasks = objects.Task.list(deployment="d", limit=10, marker="b")
+        mock_task_list.assert_called_once_with(None, "d", limit=10,
+                                               marker="b")
+        self.assertEqual(["a"], [task["uuid"] for task in tasks])
+
+    @mock.patch("rally.common.objects.task.db.deployment_get")
+    def test_to_dict(self, mock_deployment_get):
+        mock_deployment_get.return_value = {"name": "foo"}
+        task = objects.Task(task={"uuid": "a", "deployment_uuid": "d"})
+        self.assertEqual("foo", task.to_dict()["deployment_name"])
+        mock_deployment_get.assert_called_once_with("d")
+
+    @mock.patch("rally.common.objects.task.db.deployment_get")
+    def test_to_dict_with_deployment_name(self, mock_deployment_get):
+        task = objects.Task(task={"uuid": "a", "deployment_uuid": "d",
+                                  "deployment_name": "foo"})
+        self.assertEqual("foo", task.to_dict()["deployment_name"])
+        self.assertFalse(mock_deployment_get.called)
+
+    @mock.patch("rally.common.objects.task.db.task_result_summary_get_all")
+    def test_get_results_summary(self, mock_task_result_summary_get_all):
+        summary = {"key": {"name": "foo"}, "iterations_count": 10,
+                   "failed_iterations_count": 1, "load_duration": 2.5,
+                   "full_duration": 3.5, "sla_success": False}
+        mock_task_result_summary_get_all.return_value = [
+            dict(summary, id=42)]
+        task = objects.Task(task=self.task)
+        self.assertEqual([summary], task.get_results_summary())
+        mock_task_result_summary_get_all.assert_called_once_with(
+            self.task["uuid"])
+
+    @mock.patch("rally.common.objects.task.aggregation.ScenarioStats")
+    @mock.patch("rally.common.objects.task.db."
+                "task_result_stats_get_all_by_uuid")
+    @mock.patch("rally.common.objects.task.db.task_result_summary_get_all")
+    def test_get_results_aggregates(self, mock_task_result_summary_get_all,
+                                    mock_task_result_stats_get_all_by_uuid,
+                                    mock_scenario_stats):
+        summary = {"key": {"name": "foo"}, "iterations_count": 10,
+                   "failed_iterations_count": 1, "load_duration": 2.5,
+                   "full_duration": 3.5, "sla_success": False}
+        mock_task_result_summary_get_all.return_value = [
+            dict(summary, id=42), dict(summary, id=43)]
+        rows = [{"task_result_id": 42, "name": "a"},
+                {"task_result_id": 42, "name": "total"}]
+        mock_task_result_stats_get_all_by_uuid.return_value = rows
+        task = objects.Task(task=self.task)
+
+        self.assertEqual(
+            [dict(summary, stats=mock_scenario_stats.from_rows.return_value),
+             dict(summary, stats=None)],
+            task.get_results_aggregates())
+        mock_scenario_stats.from_rows.assert_called_once_with(rows)
+        mock_task_result_stats_get_all_by_uuid.assert_called_once_with(
+            self.task["uuid"])
+
+    @mock.patch("rally.common.objects.task.db.task_result_chunk_create")
+    def test_append_results_chunk(self, mock_task_result_chunk_create):
+        task = objects.Task(task=self.task)
+        task.append_results_chunk(42, 3, [1, 2])
+        mock_task_result_chunk_create.assert_called_once_with(
+            self.task["uuid"], 42, 3, [1, 2])
 
     @mock.patch("rally.common.objects.task.db.task_update")
     def test_set_failed(self, mock_task_update):
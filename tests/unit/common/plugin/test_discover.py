@@ -13,9 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+import os
+import shutil
+import tempfile
+
 import mock
 
 from rally.common.plugin import discover
+from rally.common.plugin import plugin
 from tests.unit import test
 
 
@@ -101,3 +107,152 @@ class LoadExtraModulesTestCase(test.TestCase):
         # test no fails if module is broken
         # TODO(olkonami): check exception is handled correct
         discover.load_plugins("/somewhere")
+
+
+class PluginIndexTestCase(test.TestCase):
+
+    def setUp(self):
+        super(PluginIndexTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.index_file = os.path.join(self.tmp_dir, "rally", "index.json")
+        patcher = mock.patch("%s._PLUGIN_INDEX" % DISCOVER, None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch("%s.import_modules_from_package" % DISCOVER)
+    def test_build_plugin_index(self, mock_import_modules_from_package):
+
+        class BasePlugin(plugin.Plugin):
+            pass
+
+        @plugin.configure(name="test_indexed_plugin", namespace="some")
+        class IndexedPlugin(BasePlugin):
+            pass
+
+        self.addCleanup(IndexedPlugin.unregister)
+
+        index = discover.build_plugin_index(["tests.unit", "rally.plugins"],
+                                            BasePlugin)
+
+        self.assertEqual(
+            [mock.call("tests.unit"), mock.call("rally.plugins")],
+            mock_import_modules_from_package.mock_calls)
+        self.assertEqual(
+            [{"name": "test_indexed_plugin", "namespace": "some",
+              "module": __name__,
+              "bases": ["%s.BasePlugin" % __name__,
+                        "%s.IndexedPlugin" % __name__]}],
+            index)
+
+    @mock.patch("%s.import_modules_from_package" % DISCOVER)
+    def test_build_plugin_index_skips_other_packages(
+            self, mock_import_modules_from_package):
+
+        class BasePlugin(plugin.Plugin):
+            pass
+
+        @plugin.configure(name="test_not_indexed_plugin")
+        class NotIndexedPlugin(BasePlugin):
+            pass
+
+        self.addCleanup(NotIndexedPlugin.unregister)
+        self.assertEqual([], discover.build_plugin_index(["rally.plugins"],
+                                                         BasePlugin))
+
+    @mock.patch("%s.build_plugin_index" % DISCOVER)
+    @mock.patch("%s._get_mtimes" % DISCOVER)
+    def test_load_plugin_index(self, mock__get_mtimes,
+                               mock_build_plugin_index):
+        mock__get_mtimes.return_value = {"/a.py": 1.5}
+        mock_build_plugin_index.return_value = [{"name": "foo"}]
+
+        discover.load_plugin_index(("pkg", ), plugin.Plugin,
+                                   index_file=self.index_file)
+
+        mock__get_mtimes.assert_called_once_with(["pkg"])
+        mock_build_plugin_index.assert_called_once_with(["pkg"],
+                                                        plugin.Plugin)
+        self.assertEqual([{"name": "foo"}], discover._PLUGIN_INDEX)
+        with open(self.index_file) as f:
+            self.assertEqual({"packages": ["pkg"], "mtimes": {"/a.py": 1.5},
+                              "plugins": [{"name": "foo"}]}, json.load(f))
+
+        # NOTE: the saved index is used while modules are not changed
+        mock_build_plugin_index.reset_mock()
+        discover._PLUGIN_INDEX = None
+        discover.load_plugin_index(("pkg", ), plugin.Plugin,
+                                   index_file=self.index_file)
+        self.assertFalse(mock_build_plugin_index.called)
+        self.assertEqual([{"name": "foo"}], discover._PLUGIN_INDEX)
+
+        mock__get_mtimes.return_value = {"/a.py": 2.5}
+        mock_build_plugin_index.return_value = [{"name": "bar"}]
+        discover.load_plugin_index(("pkg", ), plugin.Plugin,
+                                   index_file=self.index_file)
+        self.assertTrue(mock_build_plugin_index.called)
+        self.assertEqual([{"name": "bar"}], discover._PLUGIN_INDEX)
+
+    @mock.patch("%s.build_plugin_index" % DISCOVER, return_value=[])
+    @mock.patch("%s._get_mtimes" % DISCOVER, return_value={})
+    def test_load_plugin_index_broken_file(self, mock__get_mtimes,
+                                           mock_build_plugin_index):
+        os.makedirs(os.path.dirname(self.index_file))
+        with open(self.index_file, "w") as f:
+            f.write("{broken")
+        discover.load_plugin_index(["pkg"], plugin.Plugin,
+                                   index_file=self.index_file)
+        self.assertTrue(mock_build_plugin_index.called)
+        self.assertEqual([], discover._PLUGIN_INDEX)
+
+    @mock.patch("%s.build_plugin_index" % DISCOVER, return_value=[])
+    @mock.patch("%s._get_mtimes" % DISCOVER, return_value={})
+    def test_load_plugin_index_save_failed(self, mock__get_mtimes,
+                                           mock_build_plugin_index):
+        index_file = os.path.join(self.tmp_dir, "file", "index.json")
+        with open(os.path.join(self.tmp_dir, "file"), "w"):
+            pass
+        discover.load_plugin_index(["pkg"], plugin.Plugin,
+                                   index_file=index_file)
+        self.assertEqual([], discover._PLUGIN_INDEX)
+
+    @mock.patch("%s.importutils.import_module" % DISCOVER)
+    def test_import_indexed_modules(self, mock_import_module):
+        base = "rally.common.plugin.plugin.Plugin"
+        discover._PLUGIN_INDEX = [
+            {"name": "a", "namespace": "x", "module": "mod.a",
+             "bases": [base]},
+            {"name": "b", "namespace": "y", "module": "mod.b",
+             "bases": [base]},
+            {"name": "c", "namespace": "x", "module": "mod.c",
+             "bases": ["other.Base"]},
+            {"name": "d", "namespace": "x", "module": __name__,
+             "bases": [base]}]
+
+        self.assertTrue(discover.import_indexed_modules(plugin.Plugin))
+        self.assertEqual([mock.call("mod.a"), mock.call("mod.b")],
+                         mock_import_module.mock_calls)
+
+        mock_import_module.reset_mock()
+        self.assertTrue(discover.import_indexed_modules(plugin.Plugin,
+                                                        namespace="y"))
+        mock_import_module.assert_called_once_with("mod.b")
+
+        mock_import_module.reset_mock()
+        self.assertFalse(discover.import_indexed_modules(plugin.Plugin,
+                                                         name="d"))
+        self.assertFalse(mock_import_module.called)
+
+    def test_get_indexed_module(self):
+        self.assertIsNone(discover.get_indexed_module("a", "x"))
+        discover._PLUGIN_INDEX = [
+            {"name": "a", "namespace": "x", "module": "mod.a",
+             "bases": ["rally.common.plugin.plugin.Plugin"]}]
+        self.assertEqual("mod.a", discover.get_indexed_module("a", "x"))
+        self.assertIsNone(discover.get_indexed_module("a", "y"))
+        self.assertIsNone(discover.get_indexed_module("b", "x"))
+
+    @mock.patch("%s.importutils.import_module" % DISCOVER)
+    def test_import_indexed_modules_without_index(self, mock_import_module):
+        self.assertFalse(discover.import_indexed_modules(plugin.Plugin))
+        self.assertFalse(mock_import_module.called)
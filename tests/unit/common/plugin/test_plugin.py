@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from rally.common.plugin import plugin
 from rally import exceptions
 from tests.unit import test
@@ -134,6 +136,37 @@ class PluginTestCase(test.TestCase):
         self.assertRaises(exceptions.PluginNotFound,
                           BasePlugin.get, "non_existing")
 
+    @mock.patch("rally.common.plugin.plugin.discover.import_indexed_modules")
+    def test_get_loaded_does_not_use_index(self,
+                                           mock_import_indexed_modules):
+        self.assertEqual(SomePlugin, BasePlugin.get("test_some_plugin"))
+        self.assertFalse(mock_import_indexed_modules.called)
+
+    @mock.patch("rally.common.plugin.plugin.discover.import_indexed_modules")
+    def test_get_from_index(self, mock_import_indexed_modules):
+
+        def import_indexed_modules(base, name=None, namespace=None):
+            @plugin.configure(name="test_indexed_plugin")
+            class IndexedPlugin(BasePlugin):
+                pass
+
+            self.addCleanup(IndexedPlugin.unregister)
+            return True
+
+        mock_import_indexed_modules.side_effect = import_indexed_modules
+        self.assertEqual("test_indexed_plugin",
+                         BasePlugin.get("test_indexed_plugin").get_name())
+        mock_import_indexed_modules.assert_called_once_with(
+            BasePlugin, name="test_indexed_plugin", namespace=None)
+
+    @mock.patch("rally.common.plugin.plugin.discover.import_indexed_modules",
+                return_value=False)
+    def test_get_not_found_in_index(self, mock_import_indexed_modules):
+        self.assertRaises(exceptions.PluginNotFound,
+                          BasePlugin.get, "non_existing", "some")
+        mock_import_indexed_modules.assert_called_once_with(
+            BasePlugin, name="non_existing", namespace="some")
+
     def test_get_multple_found(self):
 
         @plugin.configure("test_2_plugins_with_same_name")
@@ -146,6 +179,23 @@ class PluginTestCase(test.TestCase):
         self.assertRaises(exceptions.PluginWithSuchNameExists,
                           plugin.configure("test_2_plugins_with_same_name"), B)
 
+    @mock.patch("rally.common.plugin.plugin.discover.get_indexed_module")
+    def test_configure_indexed_name(self, mock_get_indexed_module):
+
+        class A(plugin.Plugin):
+            pass
+
+        mock_get_indexed_module.return_value = "rally.plugins.other"
+        self.assertRaises(exceptions.PluginWithSuchNameExists,
+                          plugin.configure("test_indexed_name"), A)
+        mock_get_indexed_module.assert_called_once_with(
+            "test_indexed_name", "default")
+
+        # NOTE: the module which defines the indexed plugin is imported
+        mock_get_indexed_module.return_value = __name__
+        plugin.configure("test_indexed_name")(A)
+        self.assertEqual("test_indexed_name", A.get_name())
+
     def test_get_name(self):
         self.assertEqual("test_some_plugin", SomePlugin.get_name())
 
@@ -154,6 +204,13 @@ class PluginTestCase(test.TestCase):
                          set(BasePlugin.get_all()))
         self.assertEqual([], SomePlugin.get_all())
 
+    @mock.patch("rally.common.plugin.plugin.discover.import_indexed_modules")
+    def test_get_all_imports_indexed_modules(self,
+                                             mock_import_indexed_modules):
+        BasePlugin.get_all(namespace="some")
+        mock_import_indexed_modules.assert_called_once_with(
+            BasePlugin, namespace="some")
+
     def test_is_deprecated(self):
         self.assertFalse(SomePlugin.is_deprecated())
         self.assertEqual(DeprecatedPlugin.is_deprecated(),
@@ -12,8 +12,7 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
-
-import collections
+import threading
 
 import mock
 
@@ -23,29 +22,33 @@ from tests.unit import test
 
 class BrokerTestCase(test.TestCase):
 
+    def _queue(self, items, consumers_count=1, **kwargs):
+        queue = broker.JobQueue(**kwargs)
+        queue.extend(items)
+        queue.close(consumers_count)
+        return queue
+
     def test__publisher(self):
         mock_publish = mock.MagicMock()
-        mock_is_published = mock.MagicMock()
-        queue = collections.deque()
-        broker._publisher(mock_publish, queue, mock_is_published)
+        queue = mock.MagicMock()
+        broker._publisher(mock_publish, queue, 3)
         mock_publish.assert_called_once_with(queue)
-        mock_is_published.set.assert_called_once_with()
+        queue.close.assert_called_once_with(3)
 
     def test__publisher_fails(self):
         mock_publish = mock.MagicMock(side_effect=Exception())
-        mock_is_published = mock.MagicMock()
-        queue = collections.deque()
-        broker._publisher(mock_publish, queue, mock_is_published)
-        mock_is_published.set.assert_called_once_with()
+        queue = mock.MagicMock()
+        broker._publisher(mock_publish, queue, 3)
+        queue.close.assert_called_once_with(3)
 
     def test__consumer(self):
-        queue = collections.deque([1, 2, 3])
+        queue = self._queue([1, 2, 3])
         mock_consume = mock.MagicMock()
-        mock_is_published = mock.MagicMock()
-        mock_is_published.isSet = mock.MagicMock(return_value=True)
-        broker._consumer(mock_consume, queue, mock_is_published)
+        stats = broker._Stats()
+        broker._consumer(mock_consume, queue, stats)
         self.assertEqual(3, mock_consume.call_count)
-        self.assertEqual(0, len(queue))
+        self.assertEqual(3, stats.consumed)
+        self.assertEqual(0, stats.failed)
 
     def test__consumer_cache(self):
         cache_keys_history = []
@@ -54,32 +57,42 @@ class BrokerTestCase(test.TestCase):
             cache[item] = True
             cache_keys_history.append(list(cache))
 
-        queue = collections.deque([1, 2, 3])
-        mock_is_published = mock.MagicMock()
-        mock_is_published.isSet = mock.MagicMock(return_value=True)
-        broker._consumer(consume, queue, mock_is_published)
+        queue = self._queue([1, 2, 3])
+        broker._consumer(consume, queue, broker._Stats())
         self.assertEqual([[1], [1, 2], [1, 2, 3]], cache_keys_history)
 
-    def test__consumer_fails(self):
-        queue = collections.deque([1, 2, 3])
+    @mock.patch("rally.common.broker.LOG")
+    def test__consumer_fails(self, mock_log):
+        queue = self._queue([1, 2, 3])
         mock_consume = mock.MagicMock(side_effect=Exception())
-        mock_is_published = mock.MagicMock()
-        mock_is_published.isSet = mock.MagicMock(return_value=True)
-        broker._consumer(mock_consume, queue, mock_is_published)
-        self.assertEqual(0, len(queue))
+        stats = broker._Stats()
+        broker._consumer(mock_consume, queue, stats)
+        self.assertEqual(3, mock_consume.call_count)
+        self.assertEqual(3, stats.failed)
+        self.assertEqual(3, mock_log.warning.call_count)
 
-    @mock.patch("rally.common.broker.LOG")
-    def test__consumer_indexerror(self, mock_log):
-        consume = mock.Mock()
-        consume.side_effect = IndexError()
-        queue = collections.deque([1, 2, 3])
-        is_published = mock.Mock()
-        is_published.isSet.side_effect = [False, False, True]
-        broker._consumer(consume, queue, is_published)
-        self.assertTrue(mock_log.warning.called)
-        self.assertFalse(queue)
-        expected = [mock.call({}, 1), mock.call({}, 2), mock.call({}, 3)]
-        self.assertEqual(expected, consume.mock_calls)
+    def test__consumer_cancelled(self):
+        cancelled = threading.Event()
+
+        def consume(cache, item):
+            cancelled.set()
+
+        queue = self._queue([1, 2, 3], cancelled=cancelled)
+        stats = broker._Stats()
+        broker._consumer(consume, queue, stats)
+        self.assertEqual(1, stats.consumed)
+        self.assertEqual(2, stats.cancelled)
+
+    def test_job_queue(self):
+        cancelled = threading.Event()
+        queue = broker.JobQueue(cancelled=cancelled)
+        queue.extend([1, 2])
+        cancelled.set()
+        queue.append(3)
+        queue.close(1)
+        self.assertEqual(2, queue.published)
+        self.assertEqual([1, 2], [queue.get(), queue.get()])
+        self.assertIs(broker._STOP, queue.get())
 
     def test_run(self):
 
@@ -92,7 +105,71 @@ class BrokerTestCase(test.TestCase):
 
         def consume(cache, item):
             consumed.add(item)
+            if item == 2:
+                raise Exception()
 
         consumer_count = 2
-        broker.run(publish, consume, consumer_count)
+        stats = broker.run(publish, consume, consumer_count)
         self.assertEqual(set([1, 2, 3]), consumed)
+        self.assertEqual({"published": 3, "consumed": 3, "failed": 1,
+                          "cancelled": 0, "duration": mock.ANY,
+                          "mean_job_duration": mock.ANY,
+                          "max_job_duration": mock.ANY}, stats)
+
+    def test_run_backpressure(self):
+        in_queue = []
+
+        def publish(queue):
+            for i in range(20):
+                queue.append(i)
+                in_queue.append(queue._queue.qsize())
+
+        broker.run(publish, lambda cache, item: None, 2, queue_size=3)
+        self.assertEqual(20, len(in_queue))
+        self.assertTrue(all(size <= 3 for size in in_queue))
+
+    @mock.patch("rally.common.broker._get_pool")
+    def test_run_reuses_threads(self, mock__get_pool):
+        mock__get_pool.return_value = broker._WorkerPool()
+
+        with mock.patch("rally.common.broker.threading.Thread",
+                        wraps=threading.Thread) as mock_thread:
+            broker.run(lambda q: q.extend(range(10)),
+                       lambda cache, item: None, 3)
+            broker.run(lambda q: q.extend(range(10)),
+                       lambda cache, item: None, 3)
+
+        self.assertEqual(3, mock_thread.call_count)
+
+    @mock.patch("rally.common.broker.os.getpid")
+    def test__get_pool(self, mock_getpid):
+        mock_getpid.return_value = -1
+        pool = broker._get_pool()
+        self.assertIs(pool, broker._get_pool())
+        mock_getpid.return_value = -2
+        self.assertIsNot(pool, broker._get_pool())
+
+
+class WorkerPoolTestCase(test.TestCase):
+
+    def test_spawn(self):
+        pool = broker._WorkerPool()
+        result = []
+        done = pool.spawn(result.append, 1)
+        done.wait(5)
+        self.assertEqual([1], result)
+        self.assertEqual(1, len(pool._idle))
+
+        pool.spawn(result.append, 2).wait(5)
+        self.assertEqual([1, 2], result)
+        self.assertEqual(1, len(pool._idle))
+
+    def test_idle_timeout(self):
+        pool = broker._WorkerPool()
+        pool.IDLE_TIMEOUT = 0.01
+        pool.spawn(lambda: None).wait(5)
+        for i in range(100):
+            if not pool._idle:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual([], pool._idle)
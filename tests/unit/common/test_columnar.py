@@ -0,0 +1,84 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import math
+
+from rally.common import columnar
+from rally.common import costilius
+from tests.unit import test
+
+
+def make_iteration(i, error=None, atomic=None, **extra):
+    iteration = {
+        "duration": 1.5 + i,
+        "idle_duration": 0.5,
+        "timestamp": 1000.0 + i,
+        "error": error or [],
+        "scenario_output": {"data": {}, "errors": ""},
+        "atomic_actions": costilius.OrderedDict(atomic or [])}
+    iteration.update(extra)
+    return iteration
+
+
+class ColumnarIterationsTestCase(test.TestCase):
+
+    def test_empty(self):
+        iterations = columnar.ColumnarIterations()
+        self.assertEqual(0, len(iterations))
+        self.assertEqual([], list(iterations))
+        self.assertEqual(0, iterations.failed)
+        self.assertRaises(IndexError, iterations.__getitem__, 0)
+
+    def test_roundtrip(self):
+        raw = [
+            make_iteration(0, atomic=[("a", 0.1), ("b", 0.2)]),
+            make_iteration(1, error=["Error", "msg", "trace"],
+                           atomic=[("a", None)]),
+            make_iteration(2, atomic=[("c", 0.3)], runner_overhead=0.01),
+        ]
+        raw[2]["scenario_output"] = {"data": {"foo": 1}, "errors": ""}
+
+        iterations = columnar.ColumnarIterations(raw)
+
+        self.assertEqual(3, len(iterations))
+        self.assertEqual(1, iterations.failed)
+        self.assertEqual(raw, list(iterations))
+        self.assertEqual(raw[-1], iterations[-1])
+        self.assertEqual(["a", "b", "c"], list(iterations.atomic))
+        self.assertEqual(["a", "b"],
+                         list(iterations[0]["atomic_actions"].keys()))
+
+    def test_columns(self):
+        iterations = columnar.ColumnarIterations()
+        iterations.extend([make_iteration(i, atomic=[("a", i)])
+                           for i in range(3)])
+        iterations.append(make_iteration(3))
+
+        self.assertEqual([1.5, 2.5, 3.5, 4.5],
+                         list(iterations.column("duration")))
+        column = iterations.atomic_column("a")
+        self.assertEqual([0.0, 1.0, 2.0], list(column[:3]))
+        self.assertTrue(math.isnan(column[3]))
+        self.assertEqual([0.0, 1.0, 2.0], iterations.atomic_values("a"))
+        self.assertEqual({}, iterations.errors)
+        self.assertEqual({}, iterations.outputs)
+
+    def test_atomic_values(self):
+        iterations = columnar.ColumnarIterations(
+            [make_iteration(0, atomic=[("a", 0.1)]),
+             make_iteration(1, atomic=[("a", None)]),
+             make_iteration(2, atomic=[("b", 0.2)])])
+        self.assertEqual([0.1], iterations.atomic_values("a"))
+        self.assertEqual([0.2], iterations.atomic_values("b"))
@@ -13,12 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import ddt
-
+import json
 import math
 
+import ddt
+import mock
+
 from rally.common import streaming_algorithms as algo
 from rally import exceptions
+from rally.task.processing import utils
 from tests.unit import test
 
 
@@ -137,15 +140,7 @@ class PercentileComputationTestCase(test.TestCase):
         {"stream": "mixed50", "percent": 0.25, "expected": 25.105},
         {"stream": "mixed50", "percent": 0.50, "expected": 51.89},
         {"stream": "mixed50", "percent": 0.90, "expected":
-            82.81300000000002},
-        {"stream": "mixed5000", "percent": 0.25, "expected":
-            35.54600000000001},
-        {"stream": "mixed5000", "percent": 0.50, "expected": 48.351},
-        {"stream": "mixed5000", "percent": 0.90, "expected":
-            66.05880000000437},
-        {"stream": "range5000", "percent": 0.25, "expected": 1249.75},
-        {"stream": "range5000", "percent": 0.50, "expected": 2499.5},
-        {"stream": "range5000", "percent": 0.90, "expected": 4499.1})
+            82.81300000000002})
     @ddt.unpack
     def test_add_and_result(self, percent, stream, expected):
         comp = algo.PercentileComputation(percent=percent, length=len(
@@ -153,6 +148,29 @@ class PercentileComputationTestCase(test.TestCase):
         [comp.add(i) for i in getattr(self, stream)]
         self.assertEqual(expected, comp.result())
 
+    @ddt.data(
+        {"stream": "mixed5000", "percent": 0.25, "expected": 25.03},
+        {"stream": "mixed5000", "percent": 0.50, "expected": 51.89},
+        {"stream": "mixed5000", "percent": 0.90, "expected": 82.813},
+        {"stream": "mixed5000", "percent": 0.999, "expected": 124},
+        {"stream": "range5000", "percent": 0.25, "expected": 1249.75},
+        {"stream": "range5000", "percent": 0.50, "expected": 2499.5},
+        {"stream": "range5000", "percent": 0.90, "expected": 4499.1},
+        {"stream": "range5000", "percent": 0.999, "expected": 4994.001})
+    @ddt.unpack
+    def test_add_and_result_approximated(self, percent, stream, expected):
+        comp = algo.PercentileComputation(percent=percent)
+        [comp.add(i) for i in getattr(self, stream)]
+        self.assertAlmostEqual(expected, comp.result(), delta=expected * 0.01)
+
+    def test_merge(self):
+        comp1 = algo.PercentileComputation(0.5)
+        comp2 = algo.PercentileComputation(0.5)
+        [comp1.add(i) for i in range(0, 3000, 2)]
+        [comp2.add(i) for i in range(1, 3000, 2)]
+        comp1.merge(comp2)
+        self.assertAlmostEqual(1499.5, comp1.result(), delta=15)
+
     def test_add_raises(self):
         comp = algo.PercentileComputation(0.50, 100)
         self.assertRaises(TypeError, comp.add)
@@ -163,6 +181,111 @@ class PercentileComputationTestCase(test.TestCase):
         self.assertRaises(ValueError, comp.result)
 
 
+@ddt.ddt
+class QuantileSketchTestCase(test.TestCase):
+
+    def test_init_raises(self):
+        self.assertRaises(ValueError, algo.QuantileSketch, 0)
+        self.assertRaises(ValueError, algo.QuantileSketch, 1)
+
+    def test_empty(self):
+        sketch = algo.QuantileSketch()
+        self.assertIsNone(sketch.quantile(0.5))
+        self.assertEqual(0, sketch.count)
+
+    def test_exact(self):
+        sketch = algo.QuantileSketch(exact_size=10)
+        for value in [5, 1, 4, 2, 3]:
+            sketch.add(value)
+        self.assertTrue(sketch.is_exact)
+        self.assertEqual(3, sketch.quantile(0.5))
+        self.assertEqual(1.4, sketch.quantile(0.1))
+
+    @ddt.data(0.5, 0.9, 0.99, 0.999)
+    def test_relative_accuracy(self, percent):
+        # NOTE: long-tail distribution, like latencies usually have
+        values = [math.exp(i / 1000.0) for i in range(10000)]
+        sketch = algo.QuantileSketch(relative_accuracy=0.01, exact_size=0)
+        for value in reversed(values):
+            sketch.add(value)
+        self.assertFalse(sketch.is_exact)
+        expected = values[int(percent * (len(values) - 1))]
+        self.assertAlmostEqual(expected, sketch.quantile(percent),
+                               delta=expected * 0.01)
+
+    def test_negative_and_zero_values(self):
+        sketch = algo.QuantileSketch(exact_size=0)
+        for value in [-100, -10, 0, 0, 10, 100]:
+            sketch.add(value)
+        self.assertAlmostEqual(-100, sketch.quantile(0), delta=1)
+        self.assertEqual(0, sketch.quantile(0.5))
+        self.assertAlmostEqual(100, sketch.quantile(1), delta=1)
+
+    def test_max_buckets(self):
+        sketch = algo.QuantileSketch(max_buckets=10, exact_size=0)
+        for i in range(1, 1000):
+            sketch.add(i)
+        self.assertEqual(10, len(sketch.to_dict()["positive"]))
+        self.assertEqual(999, sketch.count)
+        self.assertAlmostEqual(999, sketch.quantile(1), delta=10)
+
+    def test_quantile_does_not_sort(self):
+        sketch = algo.QuantileSketch(exact_size=0)
+        for value in (1, 10, 100):
+            sketch.add(value)
+        self.assertAlmostEqual(10, sketch.quantile(0.5), delta=0.1)
+
+        with mock.patch("rally.common.streaming_algorithms.sorted",
+                        create=True, side_effect=sorted) as mock_sorted:
+            sketch.add(10)
+            self.assertAlmostEqual(10, sketch.quantile(0.5), delta=0.1)
+            self.assertFalse(mock_sorted.called)
+
+            sketch.add(1000)
+            self.assertAlmostEqual(10, sketch.quantile(0.5), delta=0.1)
+            self.assertAlmostEqual(1000, sketch.quantile(1), delta=10)
+            self.assertEqual(2, mock_sorted.call_count)
+
+    def test_exact_values_are_sorted(self):
+        sketch = algo.QuantileSketch(exact_size=10)
+        for value in [5, 1, 4, 2, 3]:
+            sketch.add(value)
+        sketch.add(0, count=2)
+        self.assertEqual([0, 0, 1, 2, 3, 4, 5], sketch.to_dict()["values"])
+
+    @ddt.data((10, 10), (10, 1000), (1000, 10), (1000, 1000))
+    @ddt.unpack
+    def test_merge(self, size1, size2):
+        sketch1 = algo.QuantileSketch(exact_size=100)
+        sketch2 = algo.QuantileSketch(exact_size=100)
+        for i in range(size1):
+            sketch1.add(i)
+        for i in range(size2):
+            sketch2.add(i)
+        sketch1.merge(sketch2)
+
+        values = list(range(size1)) + list(range(size2))
+        self.assertEqual(len(values), sketch1.count)
+        for percent in (0.5, 0.95):
+            expected = utils.percentile(values, percent)
+            self.assertAlmostEqual(expected, sketch1.quantile(percent),
+                                   delta=expected * 0.01)
+
+    def test_merge_raises(self):
+        self.assertRaises(ValueError, algo.QuantileSketch(0.01).merge,
+                          algo.QuantileSketch(0.02))
+
+    def test_to_dict_from_dict(self):
+        for size in (10, 5000):
+            sketch = algo.QuantileSketch()
+            for i in range(size):
+                sketch.add(i)
+            data = json.loads(json.dumps(sketch.to_dict()))
+            restored = algo.QuantileSketch.from_dict(data)
+            self.assertEqual(sketch.count, restored.count)
+            self.assertEqual(sketch.quantile(0.99), restored.quantile(0.99))
+
+
 class IncrementComputationTestCase(test.TestCase):
 
     def test_add_and_result(self):
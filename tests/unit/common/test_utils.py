@@ -14,6 +14,8 @@
 #    under the License.
 
 from __future__ import print_function
+import copy
+import pickle
 import string
 import sys
 import time
@@ -256,6 +258,47 @@ class TenantIteratorTestCase(test.TestCase):
         self.assertEqual(expected_result, real_result)
 
 
+class LockedDictTestCase(test.TestCase):
+
+    def test_init(self):
+        d = utils.LockedDict(a=1, b={"c": [{"d": 2}]})
+        self.assertEqual({"a": 1, "b": {"c": [{"d": 2}]}}, d)
+        self.assertIsInstance(d["b"], utils.LockedDict)
+        self.assertIsInstance(d["b"]["c"][0], utils.LockedDict)
+
+    def test_readonly(self):
+        d = utils.LockedDict(a=1, b={"c": 2})
+        self.assertRaises(exceptions.ImmutableException,
+                          d.__setitem__, "a", 2)
+        self.assertRaises(exceptions.ImmutableException,
+                          d["b"].__setitem__, "c", 3)
+        self.assertRaises(exceptions.ImmutableException, d.__delitem__, "a")
+        self.assertRaises(exceptions.ImmutableException, d.update, a=2)
+        self.assertRaises(exceptions.ImmutableException, d.pop, "a")
+        self.assertRaises(exceptions.ImmutableException, d.popitem)
+        self.assertRaises(exceptions.ImmutableException, d.clear)
+        self.assertRaises(exceptions.ImmutableException, d.setdefault, "x")
+        self.assertEqual(1, d.setdefault("a", 2))
+        self.assertEqual({"a": 1, "b": {"c": 2}}, d)
+
+    def test_copy(self):
+        d = utils.LockedDict(a=1, b={"c": [{"d": 2}]})
+        self.assertIs(d, copy.copy(d))
+
+        d_copy = copy.deepcopy(d)
+        self.assertEqual(d, d_copy)
+        self.assertNotIsInstance(d_copy, utils.LockedDict)
+        self.assertNotIsInstance(d_copy["b"]["c"][0], utils.LockedDict)
+        d_copy["b"]["c"][0]["d"] = 3
+        self.assertEqual(2, d["b"]["c"][0]["d"])
+
+    def test_pickle(self):
+        d = utils.LockedDict(a=1, b={"c": 2})
+        d_copy = pickle.loads(pickle.dumps(d))
+        self.assertEqual(d, d_copy)
+        self.assertIsInstance(d_copy["b"], utils.LockedDict)
+
+
 class RAMIntTestCase(test.TestCase):
 
     @mock.patch("rally.common.utils.multiprocessing")
@@ -264,6 +307,11 @@ class RAMIntTestCase(test.TestCase):
         mock_multiprocessing.Lock.assert_called_once_with()
         mock_multiprocessing.Value.assert_called_once_with("I", 0)
 
+    def test__init__with_value(self):
+        ram_int = utils.RAMInt(5)
+        self.assertEqual(5, next(ram_int))
+        self.assertEqual(6, int(ram_int))
+
     @mock.patch("rally.common.utils.multiprocessing")
     def test__int__(self, mock_multiprocessing):
         mock_multiprocessing.Value.return_value = mock.Mock(value=42)
@@ -24,6 +24,7 @@ import yaml
 from rally import api
 from rally.task import scenario
 from rally.task import engine
+from rally.task import overhead
 from tests.unit import test
 
 
@@ -125,3 +126,11 @@ class TaskSampleTestCase(test.TestCase):
                     self.assertEqual(json_config, yaml_config,
                                      "Sample task configs are not equal:"
                                      "\n%s\n%s" % (yaml_path, json_path))
+
+    def test_runner_overhead_sample_matches_default_suite(self):
+        path = os.path.join(self.samples_path, "runners", "overhead",
+                            "runner_overhead.yaml")
+        with open(path) as task_file:
+            task_config = yaml.safe_load(
+                api.Task.render_template(task_file.read()))
+        self.assertEqual(overhead.default_suite(), task_config)
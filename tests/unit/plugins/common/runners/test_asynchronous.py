@@ -0,0 +1,166 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import jsonschema
+import mock
+import testtools
+
+from rally import exceptions
+from rally.plugins.common.runners import asynchronous
+from rally.task import runner
+from rally.task import scenario
+from tests.unit import fakes
+from tests.unit import test
+
+
+RUNNERS = "rally.plugins.common.runners."
+
+
+class FakeAsyncScenario(scenario.Scenario):
+
+    running = 0
+    max_running = 0
+
+    def _done_later(self, delay, result=None, exc=None):
+        loop = asynchronous.asyncio.get_event_loop()
+        future = asynchronous.asyncio.Future(loop=loop)
+        FakeAsyncScenario.running += 1
+        FakeAsyncScenario.max_running = max(FakeAsyncScenario.max_running,
+                                            FakeAsyncScenario.running)
+
+        def done():
+            FakeAsyncScenario.running -= 1
+            if exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+        loop.call_later(delay, done)
+        return future
+
+    def do_it(self):
+        return self._done_later(0.01)
+
+    def with_output(self):
+        return self._done_later(0, result={"data": {"a": 1}, "errors": ""})
+
+    def something_went_wrong(self):
+        return self._done_later(0, exc=Exception("Something went wrong"))
+
+    def with_bad_output(self):
+        return self._done_later(0, result={"data": {"a": "b"}, "errors": ""})
+
+    def fail_immediately(self):
+        raise Exception("Failed to start")
+
+    def too_long(self):
+        return self._done_later(10)
+
+
+@testtools.skipIf(asynchronous.asyncio is None, "asyncio is not available")
+class AsyncioScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AsyncioScenarioRunnerTestCase, self).setUp()
+        self.task = mock.MagicMock()
+        self.context = fakes.FakeContext({"task": {"uuid": "uuid"}}).context
+        FakeAsyncScenario.running = 0
+        FakeAsyncScenario.max_running = 0
+
+    def _run(self, config, method_name):
+        runner_obj = asynchronous.AsyncioScenarioRunner(self.task, config)
+        runner_obj._run_scenario(FakeAsyncScenario, method_name,
+                                 self.context, {})
+        return runner_obj
+
+    def test_validate(self):
+        runner.ScenarioRunner.validate(
+            {"type": "asyncio", "times": 10, "concurrency": 10000,
+             "timeout": 5})
+
+    def test_validate_failed(self):
+        self.assertRaises(jsonschema.ValidationError,
+                          runner.ScenarioRunner.validate,
+                          {"type": "asyncio", "concurrency": 0})
+
+    def test__run_scenario(self):
+        runner_obj = self._run({"times": 20, "concurrency": 5}, "do_it")
+
+        self.assertEqual(20, len(runner_obj.result_queue))
+        self.assertEqual(5, FakeAsyncScenario.max_running)
+        for result in runner_obj.result_queue:
+            self.assertEqual([], result["error"])
+            self.assertIsNotNone(runner.ScenarioRunnerResult(result))
+
+    @mock.patch(RUNNERS + "asynchronous.asyncio.set_event_loop",
+                wraps=asynchronous.asyncio.set_event_loop)
+    def test__run_scenario_sets_event_loop(self, mock_set_event_loop):
+        self._run({"times": 2, "concurrency": 1}, "do_it")
+
+        self.assertEqual(2, mock_set_event_loop.call_count)
+        loop = mock_set_event_loop.call_args_list[0][0][0]
+        self.assertIsInstance(loop, asynchronous.asyncio.AbstractEventLoop)
+        self.assertTrue(loop.is_closed())
+        mock_set_event_loop.assert_called_with(None)
+
+    def test__run_scenario_with_output(self):
+        runner_obj = self._run({"times": 2}, "with_output")
+
+        self.assertEqual([{"data": {"a": 1}, "errors": ""}] * 2,
+                         [r["scenario_output"]
+                          for r in runner_obj.result_queue])
+
+    def test__run_scenario_exception(self):
+        for method_name in ("something_went_wrong", "fail_immediately"):
+            runner_obj = self._run({"times": 3, "concurrency": 2},
+                                   method_name)
+
+            self.assertEqual(3, len(runner_obj.result_queue))
+            for result in runner_obj.result_queue:
+                self.assertEqual("Exception", result["error"][0])
+                self.assertIsNotNone(runner.ScenarioRunnerResult(result))
+
+    def test__run_scenario_timeout(self):
+        runner_obj = self._run({"times": 2, "concurrency": 2,
+                                "timeout": 0.01}, "too_long")
+
+        self.assertEqual(2, len(runner_obj.result_queue))
+        for result in runner_obj.result_queue:
+            self.assertEqual("TimeoutError", result["error"][0])
+            self.assertEqual(0.01, result["duration"])
+
+    def test__run_scenario_bad_output(self):
+        self.assertRaises(jsonschema.ValidationError, self._run,
+                          {"times": 5, "concurrency": 2}, "with_bad_output")
+
+    def test__run_scenario_context_error(self):
+        del self.context["config"]
+        self.assertRaises(KeyError, self._run, {"times": 5}, "do_it")
+
+    def test__run_scenario_aborted(self):
+        runner_obj = asynchronous.AsyncioScenarioRunner(self.task,
+                                                        {"times": 5})
+        runner_obj.abort()
+        runner_obj._run_scenario(FakeAsyncScenario, "do_it", self.context, {})
+
+        self.assertEqual(0, len(runner_obj.result_queue))
+
+    @mock.patch(RUNNERS + "asynchronous.asyncio", None)
+    def test__run_scenario_without_asyncio(self):
+        runner_obj = asynchronous.AsyncioScenarioRunner(self.task,
+                                                        {"times": 5})
+        self.assertRaises(exceptions.IncompatiblePythonVersion,
+                          runner_obj._run_scenario, FakeAsyncScenario,
+                          "do_it", self.context, {})
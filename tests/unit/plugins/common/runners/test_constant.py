@@ -46,21 +46,19 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
                           runner.ScenarioRunner.validate,
                           self.config)
 
-    @mock.patch(RUNNERS + "constant.time")
     @mock.patch(RUNNERS + "constant.threading.Thread")
     @mock.patch(RUNNERS + "constant.multiprocessing.Queue")
     @mock.patch(RUNNERS + "constant.runner")
-    def test__worker_process(self, mock_runner, mock_queue, mock_thread,
-                             mock_time):
+    def test__worker_process(self, mock_runner, mock_queue, mock_thread):
 
-        mock_thread_instance = mock.MagicMock(
-            isAlive=mock.MagicMock(return_value=False))
+        mock_thread_instance = mock.MagicMock()
         mock_thread.return_value = mock_thread_instance
 
         mock_event = mock.MagicMock(
             is_set=mock.MagicMock(return_value=False))
 
         times = 4
+        concurrency = 3
 
         fake_ram_int = iter(range(10))
 
@@ -68,22 +66,52 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
                               "id": "uuid1"}]}
         info = {"processes_to_start": 1, "processes_counter": 1}
 
-        constant._worker_process(mock_queue, fake_ram_int, 1, 2, times,
-                                 context, "Dummy", "dummy", (), mock_event,
-                                 info)
+        constant._worker_process(mock_queue, fake_ram_int, 1, concurrency,
+                                 times, context, "Dummy", "dummy", (),
+                                 mock_event, info)
+
+        batcher = mock_runner.ResultBatcher.return_value
+        mock_runner.ResultBatcher.assert_called_once_with(mock_queue)
+        self.assertEqual(
+            [mock.call(target=constant._worker_thread,
+                       args=(batcher, fake_ram_int, times, context, "Dummy",
+                             "dummy", (), mock_event))] * concurrency,
+            mock_thread.call_args_list)
+        self.assertEqual(concurrency, mock_thread_instance.start.call_count)
+        self.assertEqual(concurrency, mock_thread_instance.join.call_count)
+        batcher.close.assert_called_once_with()
 
-        self.assertEqual(times, mock_thread.call_count)
-        self.assertEqual(times, mock_thread_instance.start.call_count)
-        self.assertEqual(times, mock_thread_instance.join.call_count)
-        self.assertEqual(times, mock_runner._get_scenario_context.call_count)
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__worker_thread_pool(self, mock_runner):
+        mock_runner._run_scenario_once.side_effect = lambda args: {}
+        mock_results = mock.MagicMock()
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False))
+        times = 3
+
+        constant._worker_thread(mock_results, iter(range(10)), times,
+                                "context", "Dummy", "dummy", (), mock_event)
+
+        scenario_context = mock_runner._get_scenario_context.return_value
+        self.assertEqual(
+            [mock.call((i, "Dummy", "dummy", scenario_context, ()))
+             for i in range(times)],
+            mock_runner._run_scenario_once.mock_calls)
+        self.assertEqual(times, mock_results.put.call_count)
+        for call in mock_results.put.mock_calls:
+            self.assertIn("runner_overhead", call[1][0])
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__worker_thread_pool_aborted(self, mock_runner):
+        mock_results = mock.MagicMock()
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=True))
+
+        constant._worker_thread(mock_results, iter(range(10)), 3,
+                                "context", "Dummy", "dummy", (), mock_event)
 
-        for i in range(times):
-            scenario_context = mock_runner._get_scenario_context(context)
-            call = mock.call(args=(mock_queue,
-                                   (i, "Dummy", "dummy",
-                                    scenario_context, ())),
-                             target=mock_runner._worker_thread)
-            self.assertIn(call, mock_thread.mock_calls)
+        self.assertFalse(mock_runner._run_scenario_once.called)
+        self.assertFalse(mock_results.put.called)
 
     @mock.patch(RUNNERS_BASE + "_run_scenario_once")
     def test__worker_thread(self, mock__run_scenario_once):
@@ -107,6 +135,22 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
         for result in runner_obj.result_queue:
             self.assertIsNotNone(runner.ScenarioRunnerResult(result))
 
+    @mock.patch(RUNNERS + "constant.ConstantScenarioRunner._join_processes")
+    @mock.patch(RUNNERS +
+                "constant.ConstantScenarioRunner._create_process_pool")
+    def test__run_scenario_first_iteration(self, mock__create_process_pool,
+                                           mock__join_processes):
+        runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
+        runner_obj.first_iteration = 10
+
+        runner_obj._run_scenario(
+            fakes.FakeScenario, "do_it", self.context, self.args)
+
+        worker_args = next(mock__create_process_pool.call_args[0][2])
+        iteration_gen, times = worker_args[1], worker_args[4]
+        self.assertEqual(10, next(iteration_gen))
+        self.assertEqual(10 + self.config["times"], times)
+
     def test__run_scenario_exception(self):
         runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
 
@@ -221,6 +265,27 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
                 mock__create_process_pool.return_value,
                 mock_queue.return_value)
 
+    def test_get_stats(self):
+        runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
+        result = {"duration": 1.0, "idle_duration": 0, "error": [],
+                  "timestamp": 1.0, "atomic_actions": {},
+                  "scenario_output": {"errors": "", "data": {}}}
+
+        runner_obj._send_results([dict(result, runner_overhead=0.1),
+                                  dict(result, runner_overhead=0.3),
+                                  result])
+
+        stats = runner_obj.get_stats()
+        self.assertAlmostEqual(0.2, stats["mean_runner_overhead"])
+        self.assertEqual(0.3, stats["max_runner_overhead"])
+        self.assertEqual(3, len(runner_obj.result_queue))
+
+    def test_get_stats_without_results(self):
+        runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
+        self.assertEqual({"mean_runner_overhead": None,
+                          "max_runner_overhead": 0.0},
+                         runner_obj.get_stats())
+
     def test_abort(self):
         runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
         self.assertFalse(runner_obj.aborted.is_set())
@@ -0,0 +1,224 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+import jsonschema
+import mock
+
+from rally import consts
+from rally import exceptions
+from rally.plugins.common.runners import distributed
+from tests.unit import fakes
+from tests.unit import test
+
+
+RUNNERS = "rally.plugins.common.runners."
+STATUSES = consts.DistributedChunkStatus
+
+
+def _chunk(id_, status, worker=None, start=0, count=10, error=None):
+    return mock.Mock(id=id_, status=status, worker=worker, start=start,
+                     count=count, error=error)
+
+
+def _batch(chunk_id, worker, sent_at, count=1):
+    return mock.Mock(chunk_id=chunk_id, worker=worker, sent_at=sent_at,
+                     data=[{"duration": 1, "idle_duration": 0, "error": [],
+                            "timestamp": 100.0, "scenario_output": {},
+                            "atomic_actions": {}} for i in range(count)])
+
+
+class DistributedScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DistributedScenarioRunnerTestCase, self).setUp()
+        self.config = {"type": "distributed", "times": 25, "concurrency": 2,
+                       "chunk_size": 10, "worker_timeout": 30}
+        self.task = {"uuid": "task_uuid"}
+        self.runner = distributed.DistributedScenarioRunner(self.task,
+                                                            self.config)
+        self.runner._name = "Dummy.dummy"
+        self.runner._raw_args = {"sleep": 1}
+
+    def test_validate(self):
+        distributed.DistributedScenarioRunner.validate(self.config)
+
+    def test_validate_failed(self):
+        self.config["rps"] = 10
+        self.assertRaises(jsonschema.ValidationError,
+                          distributed.DistributedScenarioRunner.validate,
+                          self.config)
+
+    @mock.patch(RUNNERS + "distributed.runner.ScenarioRunner.run")
+    def test_run(self, mock_scenario_runner_run):
+        self.runner.run("Dummy.dummy", {"ctx": 1}, {"sleep": 2})
+        self.assertEqual("Dummy.dummy", self.runner._name)
+        self.assertEqual({"sleep": 2}, self.runner._raw_args)
+        mock_scenario_runner_run.assert_called_once_with(
+            "Dummy.dummy", {"ctx": 1}, {"sleep": 2})
+
+    @mock.patch(RUNNERS + "distributed.time.time", return_value=110.0)
+    @mock.patch(RUNNERS + "distributed.db")
+    def test__receive(self, mock_db, mock_time):
+        self.runner._clock_offsets["w1"] = 5.0
+        mock_db.distributed_results_pop.return_value = [
+            _batch(1, "w1", 100.0, count=2),
+            _batch(2, "w2", 108.0),
+            _batch(3, "w1", 100.0)]
+        received = {1: 3}
+
+        self.runner._receive("wid", {1: "w1", 2: "w2", 3: "w3"}, received)
+
+        mock_db.distributed_results_pop.assert_called_once_with("wid")
+        self.assertEqual({1: 5, 2: 1}, received)
+        self.assertEqual({"w1": 5.0, "w2": 2.0}, self.runner._clock_offsets)
+        self.assertEqual(set(["w1", "w2"]), self.runner._workers)
+        results = self.runner.result_queue.get_batch()
+        self.assertEqual([105.0, 105.0, 102.0],
+                         [r["timestamp"] for r in results])
+
+    @mock.patch(RUNNERS + "distributed.timeutils.utcnow")
+    @mock.patch(RUNNERS + "distributed.db")
+    def test__is_worker_alive(self, mock_db, mock_utcnow):
+        now = datetime.datetime(2015, 1, 1, 0, 1, 0)
+        mock_utcnow.return_value = now
+        mock_db.get_worker.return_value = {
+            "updated_at": now - datetime.timedelta(seconds=20)}
+        self.assertTrue(self.runner._is_worker_alive("w1", 30))
+        self.assertFalse(self.runner._is_worker_alive("w1", 10))
+
+    @mock.patch(RUNNERS + "distributed.db")
+    def test__is_worker_alive_not_found(self, mock_db):
+        mock_db.get_worker.side_effect = exceptions.WorkerNotFound(
+            worker="w1")
+        self.assertFalse(self.runner._is_worker_alive("w1", 30))
+
+    @mock.patch(RUNNERS + "distributed.db")
+    def test__requeue_alive(self, mock_db):
+        self.runner._is_worker_alive = mock.Mock(return_value=True)
+        self.runner._requeue(_chunk(1, STATUSES.RUNNING, "w1"), {}, 30)
+        self.assertFalse(mock_db.distributed_chunk_update.called)
+        self.assertEqual(0, self.runner.get_stats()["requeued_chunks"])
+
+    @mock.patch(RUNNERS + "distributed.db")
+    def test__requeue(self, mock_db):
+        self.runner._is_worker_alive = mock.Mock(return_value=False)
+        received = {1: 4}
+        self.runner._requeue(_chunk(1, STATUSES.RUNNING, "w1", start=10),
+                             received, 30)
+        mock_db.distributed_chunk_update.assert_called_once_with(
+            1, {"status": STATUSES.PENDING, "worker": None,
+                "start": 14, "count": 6},
+            statuses=[STATUSES.RUNNING], worker="w1")
+        self.assertEqual({}, received)
+        self.assertEqual(1, self.runner.get_stats()["requeued_chunks"])
+
+    @mock.patch(RUNNERS + "distributed.db")
+    def test__requeue_all_received(self, mock_db):
+        self.runner._is_worker_alive = mock.Mock(return_value=False)
+        self.runner._requeue(_chunk(1, STATUSES.RUNNING, "w1"), {1: 10}, 30)
+        mock_db.distributed_chunk_update.assert_called_once_with(
+            1, {"status": STATUSES.FINISHED},
+            statuses=[STATUSES.RUNNING], worker="w1")
+
+    @mock.patch(RUNNERS + "distributed.db")
+    def test__requeue_aborting(self, mock_db):
+        self.runner._is_worker_alive = mock.Mock(return_value=False)
+        mock_db.distributed_chunk_update.return_value = False
+        self.runner._requeue(_chunk(1, STATUSES.ABORTING, "w1"), {}, 30)
+        mock_db.distributed_chunk_update.assert_called_once_with(
+            1, {"status": STATUSES.ABORTED},
+            statuses=[STATUSES.ABORTING], worker="w1")
+        self.assertEqual(0, self.runner.get_stats()["requeued_chunks"])
+
+    def test__send_failed(self):
+        self.runner._send_failed(
+            _chunk(1, STATUSES.FAILED, "w1", error="ValueError: foo"), {1: 7})
+        results = self.runner.result_queue.get_batch()
+        self.assertEqual(3, len(results))
+        self.assertEqual(["DistributedChunkFailed", "ValueError: foo", ""],
+                         results[0]["error"])
+
+    @mock.patch(RUNNERS + "distributed.time.sleep")
+    @mock.patch(RUNNERS + "distributed.uuid.uuid4", return_value="wid")
+    @mock.patch(RUNNERS + "distributed.distributed.serialize_context",
+                return_value={"serialized": True})
+    @mock.patch(RUNNERS + "distributed.db")
+    def test__run_scenario(self, mock_db, mock_serialize_context,
+                           mock_uuid4, mock_sleep):
+        running = [_chunk(1, STATUSES.RUNNING, "w1"),
+                   _chunk(2, STATUSES.PENDING)]
+        done = [_chunk(1, STATUSES.FINISHED, "w1"),
+                _chunk(2, STATUSES.FAILED, "w2", count=5, error="err")]
+        mock_db.distributed_chunk_get_all.side_effect = [running, done]
+        mock_db.distributed_results_pop.side_effect = [
+            [_batch(1, "w1", 0.0, count=10)], []]
+        self.runner._is_worker_alive = mock.Mock(return_value=True)
+        context = fakes.FakeContext().context
+
+        self.runner._run_scenario(fakes.FakeScenario, "do_it", context, {})
+
+        mock_serialize_context.assert_called_once_with(context)
+        mock_db.distributed_chunks_create.assert_called_once_with(
+            "task_uuid", "wid",
+            {"scenario": "Dummy.dummy", "args": {"sleep": 1},
+             "concurrency": 2, "timeout": 0,
+             "context": {"serialized": True}},
+            [(0, 10), (10, 10), (20, 5)])
+        self.runner._is_worker_alive.assert_called_once_with("w1", 30)
+        mock_sleep.assert_called_once_with(0.5)
+        mock_db.distributed_workload_delete.assert_called_once_with("wid")
+        self.assertEqual(10 + 5, len(self.runner.result_queue))
+        self.assertFalse(mock_db.distributed_chunks_abort.called)
+
+    @mock.patch(RUNNERS + "distributed.time")
+    @mock.patch(RUNNERS + "distributed.distributed.serialize_context")
+    @mock.patch(RUNNERS + "distributed.db")
+    def test__run_scenario_no_workers(self, mock_db, mock_serialize_context,
+                                      mock_time):
+        mock_time.time.side_effect = [0, 10, 40]
+        mock_db.distributed_results_pop.return_value = []
+        mock_db.distributed_chunk_get_all.return_value = [
+            _chunk(1, STATUSES.PENDING)]
+
+        self.assertRaises(exceptions.RallyException,
+                          self.runner._run_scenario, fakes.FakeScenario,
+                          "do_it", fakes.FakeContext().context, {})
+        self.assertEqual(1, mock_time.sleep.call_count)
+        self.assertEqual(1, mock_db.distributed_workload_delete.call_count)
+
+    @mock.patch(RUNNERS + "distributed.time.sleep")
+    @mock.patch(RUNNERS + "distributed.distributed.serialize_context")
+    @mock.patch(RUNNERS + "distributed.db")
+    def test__run_scenario_aborted(self, mock_db, mock_serialize_context,
+                                   mock_sleep):
+        mock_db.distributed_results_pop.return_value = []
+        mock_db.distributed_chunk_get_all.side_effect = [
+            [_chunk(1, STATUSES.RUNNING, "w1")],
+            [_chunk(1, STATUSES.ABORTING, "w1")],
+            [_chunk(1, STATUSES.ABORTED, "w1")]]
+        self.runner._is_worker_alive = mock.Mock(return_value=True)
+        self.runner.abort()
+
+        self.runner._run_scenario(fakes.FakeScenario, "do_it",
+                                  fakes.FakeContext().context, {})
+        mock_db.distributed_chunks_abort.assert_called_once_with(
+            mock_db.distributed_chunks_create.call_args[0][1])
+        self.assertEqual(2, mock_sleep.call_count)
+
+    def test_get_stats(self):
+        self.assertEqual({"workers": 0, "requeued_chunks": 0,
+                          "clock_offsets": {}}, self.runner.get_stats())
@@ -13,6 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import multiprocessing
+import threading
+
 import jsonschema
 import mock
 
@@ -65,10 +68,10 @@ class RPSScenarioRunnerTestCase(test.TestCase):
 
     @mock.patch(RUNNERS + "rps.LOG")
     @mock.patch(RUNNERS + "rps.time")
-    @mock.patch(RUNNERS + "rps.threading.Thread")
+    @mock.patch(RUNNERS + "rps.threading")
     @mock.patch(RUNNERS + "rps.multiprocessing.Queue")
     @mock.patch(RUNNERS + "rps.runner")
-    def test__worker_process(self, mock_runner, mock_queue, mock_thread,
+    def test__worker_process(self, mock_runner, mock_queue, mock_threading,
                              mock_time, mock_log):
 
         def time_side():
@@ -81,11 +84,13 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         mock_time.time = time_side
 
         mock_thread_instance = mock.MagicMock(
-            isAlive=mock.MagicMock(return_value=False))
-        mock_thread.return_value = mock_thread_instance
+            is_alive=mock.MagicMock(return_value=False))
+        mock_threading.Thread.return_value = mock_thread_instance
+        slots = mock_threading.BoundedSemaphore.return_value
 
         mock_event = mock.MagicMock(
-            is_set=mock.MagicMock(return_value=False))
+            is_set=mock.MagicMock(return_value=False),
+            wait=mock.MagicMock(return_value=False))
 
         times = 4
         max_concurrent = 3
@@ -100,36 +105,106 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                             max_concurrent, context, "Dummy", "dummy",
                             (), mock_event, info)
 
+        mock_threading.BoundedSemaphore.assert_called_once_with(
+            max_concurrent)
+        self.assertEqual(times, slots.acquire.call_count)
         self.assertEqual(times, mock_log.debug.call_count)
-        self.assertEqual(times, mock_thread.call_count)
+        self.assertEqual(times, mock_threading.Thread.call_count)
         self.assertEqual(times, mock_thread_instance.start.call_count)
         self.assertEqual(times, mock_thread_instance.join.call_count)
-        self.assertEqual(times - 1, mock_time.sleep.call_count)
-        self.assertEqual(times, mock_thread_instance.isAlive.call_count)
-        self.assertEqual(times * 4 - 1, mock_time.time.count)
         self.assertEqual(times, mock_runner._get_scenario_context.call_count)
 
+        # start of the first iteration is shifted by 0.1s (interval for
+        # 10 rps), next ones are scheduled every 0.1s after it
+        scheduled = [0.13 + 0.1 * i for i in range(times)]
+        self.assertEqual(times, mock_event.wait.call_count)
         for i in range(times):
             scenario_context = mock_runner._get_scenario_context(context)
-            call = mock.call(args=(mock_queue,
-                                   (i, "Dummy", "dummy",
-                                    scenario_context, ())),
-                             target=mock_runner._worker_thread)
-            self.assertIn(call, mock_thread.mock_calls)
+            args = mock_threading.Thread.call_args_list[i][1]["args"]
+            self.assertEqual(mock_runner.ResultBatcher.return_value,
+                             args[0])
+            self.assertEqual(slots, args[1])
+            self.assertAlmostEqual(scheduled[i], args[2])
+            self.assertEqual((i, "Dummy", "dummy", scenario_context, ()),
+                             args[3])
+
+        mock_runner.ResultBatcher.assert_called_once_with(mock_queue)
+        mock_runner.ResultBatcher.return_value.close.assert_called_once_with()
+
+    def test__acquire_slot(self):
+        slots = threading.BoundedSemaphore(1)
+        aborted = multiprocessing.Event()
+
+        self.assertTrue(rps._acquire_slot(slots, aborted, interval=0.01))
+        threading.Timer(0.05, aborted.set).start()
+        self.assertFalse(rps._acquire_slot(slots, aborted, interval=0.01))
+
+        slots.release()
+        self.assertFalse(rps._acquire_slot(slots, aborted, interval=0.01))
+
+    @mock.patch(RUNNERS + "rps.runner")
+    def test__worker_process_aborted_while_waiting_for_slot(self,
+                                                            mock_runner):
+        aborted = multiprocessing.Event()
+        threading.Timer(0.1, aborted.set).start()
+        fake_ram_int = iter(range(10))
+        info = {"processes_to_start": 1, "processes_counter": 0}
+
+        with mock.patch(RUNNERS + "rps._worker_thread",
+                        side_effect=lambda *args: aborted.wait()):
+            rps._worker_process(mock.MagicMock(), fake_ram_int, 0, 1000,
+                                10, 1, {}, "Dummy", "dummy", (), aborted,
+                                info)
+
+        self.assertEqual(1, mock_runner._get_scenario_context.call_count)
 
     @mock.patch(RUNNERS + "rps.runner._run_scenario_once")
     def test__worker_thread(self, mock__run_scenario_once):
-        mock_queue = mock.MagicMock()
+        mock__run_scenario_once.return_value = {"timestamp": 12.5}
+        mock_results = mock.MagicMock()
+        mock_slots = mock.MagicMock()
 
         args = ("some_args",)
 
-        runner._worker_thread(mock_queue, args)
-
-        self.assertEqual(1, mock_queue.put.call_count)
+        rps._worker_thread(mock_results, mock_slots, 10.0, args)
 
+        mock_results.put.assert_called_once_with(
+            {"timestamp": 12.5, "start_lag": 2.5})
+        mock_slots.release.assert_called_once_with()
         expected_calls = [mock.call(("some_args",))]
         self.assertEqual(expected_calls, mock__run_scenario_once.mock_calls)
 
+    @mock.patch(RUNNERS + "rps.runner._run_scenario_once")
+    def test__worker_thread_releases_slot_on_failure(
+            self, mock__run_scenario_once):
+        mock__run_scenario_once.side_effect = KeyboardInterrupt
+        mock_slots = mock.MagicMock()
+
+        self.assertRaises(KeyboardInterrupt, rps._worker_thread,
+                          mock.MagicMock(), mock_slots, 10.0, ())
+        mock_slots.release.assert_called_once_with()
+
+    def test_get_stats(self):
+        runner_obj = rps.RPSScenarioRunner(self.task, {"rps": 10})
+        runner_obj._slot_duration = 0.1
+        result = {"duration": 1.0, "idle_duration": 0, "error": [],
+                  "scenario_output": {"errors": "", "data": {}},
+                  "atomic_actions": {}}
+        results = [dict(result, timestamp=t, start_lag=lag)
+                   for t, lag in ((1.0, 0.0), (1.1, 0.05), (1.5, 0.3))]
+
+        runner_obj._send_results(results)
+
+        self.assertEqual({"rps": 10.0, "achieved_rps": 4.0,
+                          "missed_slots": 1, "max_start_lag": 0.3},
+                         runner_obj.get_stats())
+
+    def test_get_stats_without_results(self):
+        runner_obj = rps.RPSScenarioRunner(self.task, {"rps": 10})
+        self.assertEqual({"rps": 10.0, "achieved_rps": None,
+                          "missed_slots": 0, "max_start_lag": 0.0},
+                         runner_obj.get_stats())
+
     @mock.patch(RUNNERS + "rps.time.sleep")
     def test__run_scenario(self, mock_sleep):
         config = {"times": 20, "rps": 20, "timeout": 5, "max_concurrency": 15}
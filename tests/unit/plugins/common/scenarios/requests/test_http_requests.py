@@ -27,6 +27,16 @@ class RequestScenarioTestCase(test.TestCase):
         Requests.check_request("sample_url", "GET", 200)
         mock__check_request.assert_called_once_with("sample_url", "GET", 200)
 
+    @mock.patch("%s.requests.utils.RequestScenario._check_request_async"
+                % SCN)
+    def test_check_request_async(self, mock__check_request_async):
+        Requests = http_requests.HttpRequests(test.get_test_context())
+        self.assertEqual(
+            mock__check_request_async.return_value,
+            Requests.check_request_async("sample_url", "GET", 200))
+        mock__check_request_async.assert_called_once_with(
+            "sample_url", "GET", 200, headers=None, data=None)
+
     @mock.patch("%s.requests.utils.RequestScenario._check_request" % SCN)
     @mock.patch("%s.requests.http_requests.random.choice" % SCN)
     def test_check_random_request(self, mock_choice, mock__check_request):
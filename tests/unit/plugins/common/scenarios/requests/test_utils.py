@@ -12,11 +12,40 @@
 
 
 import mock
+import testtools
 
 from rally.plugins.common.scenarios.requests import utils
 from tests.unit import test
 
 
+class FakeHTTPServerProtocol(object):
+
+    response = b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n"
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        FakeHTTPServerProtocol.received = data
+        self.transport.write(self.response)
+        self.transport.close()
+
+    def eof_received(self):
+        return False
+
+    def connection_lost(self, exc):
+        pass
+
+
+class SilentHTTPServerProtocol(FakeHTTPServerProtocol):
+
+    def data_received(self, data):
+        SilentHTTPServerProtocol.received = data
+
+    def connection_lost(self, exc):
+        SilentHTTPServerProtocol.closed = True
+
+
 class RequestsTestCase(test.TestCase):
 
     @mock.patch("requests.request")
@@ -36,3 +65,95 @@ class RequestsTestCase(test.TestCase):
 
         self.assertRaises(ValueError, scenario._check_request,
                           status_code=201, url="sample", method="GET")
+
+
+@testtools.skipIf(utils.asyncio is None, "asyncio is not available")
+class AsyncRequestsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AsyncRequestsTestCase, self).setUp()
+        self.loop = utils.asyncio.new_event_loop()
+        utils.asyncio.set_event_loop(self.loop)
+        self.addCleanup(self.loop.close)
+        self.addCleanup(utils.asyncio.set_event_loop, None)
+        server = self.loop.run_until_complete(self.loop.create_server(
+            FakeHTTPServerProtocol, "127.0.0.1", 0))
+        self.addCleanup(server.close)
+        self.url = "http://127.0.0.1:%d/path?a=1" % (
+            server.sockets[0].getsockname()[1])
+
+    def test__check_request_async(self):
+        scenario = utils.RequestScenario(test.get_test_context())
+        self.loop.run_until_complete(scenario._check_request_async(
+            self.url, "POST", 200, headers={"X-Test": "1"}, data="body"))
+
+        self._test_atomic_action_timer(scenario.atomic_actions(),
+                                       "requests.check_request_async")
+        request = FakeHTTPServerProtocol.received.split(b"\r\n")
+        self.assertEqual(b"POST /path?a=1 HTTP/1.1", request[0])
+        self.assertIn(b"X-Test: 1", request)
+        self.assertIn(b"Content-Length: 4", request)
+        self.assertEqual(b"body", request[-1])
+
+    def test__check_request_async_wrong_status(self):
+        scenario = utils.RequestScenario(test.get_test_context())
+        self.assertRaises(ValueError, self.loop.run_until_complete,
+                          scenario._check_request_async(self.url, "GET", 201))
+
+    def test__check_request_async_connection_refused(self):
+        scenario = utils.RequestScenario(test.get_test_context())
+        self.assertRaises(OSError, self.loop.run_until_complete,
+                          scenario._check_request_async(
+                              "http://127.0.0.1:1/", "GET", 200))
+
+    def test__check_request_async_cancelled(self):
+        server = self.loop.run_until_complete(self.loop.create_server(
+            SilentHTTPServerProtocol, "127.0.0.1", 0))
+        self.addCleanup(server.close)
+        url = "http://127.0.0.1:%d/" % server.sockets[0].getsockname()[1]
+        errors = []
+        self.loop.set_exception_handler(lambda loop, ctx: errors.append(ctx))
+        SilentHTTPServerProtocol.received = None
+        SilentHTTPServerProtocol.closed = False
+
+        scenario = utils.RequestScenario(test.get_test_context())
+        result = scenario._check_request_async(url, "GET", 200)
+        for i in range(100):
+            if SilentHTTPServerProtocol.received:
+                break
+            self.loop.run_until_complete(utils.asyncio.sleep(0.01))
+        result.cancel()
+        for i in range(100):
+            self.loop.run_until_complete(utils.asyncio.sleep(0.01))
+            if SilentHTTPServerProtocol.closed:
+                break
+
+        self.assertTrue(result.cancelled())
+        self.assertTrue(SilentHTTPServerProtocol.closed)
+        self.assertEqual([], errors)
+        self.assertIsNone(
+            scenario.atomic_actions()["requests.check_request_async"])
+
+    def test__check_request_async_cancelled_before_connect(self):
+        errors = []
+        self.loop.set_exception_handler(lambda loop, ctx: errors.append(ctx))
+
+        scenario = utils.RequestScenario(test.get_test_context())
+        result = scenario._check_request_async(self.url, "GET", 200)
+        result.cancel()
+        for i in range(5):
+            self.loop.run_until_complete(utils.asyncio.sleep(0.01))
+
+        self.assertTrue(result.cancelled())
+        self.assertEqual([], errors)
+
+    def test_http_status_protocol_invalid_response(self):
+        status = utils.asyncio.Future(loop=self.loop)
+        transport = mock.MagicMock()
+        protocol = utils._HTTPStatusProtocol(b"request", status)
+        protocol.connection_made(transport)
+        protocol.data_received(b"garbage\r\n")
+
+        transport.write.assert_called_once_with(b"request")
+        transport.close.assert_called_once_with()
+        self.assertIsInstance(status.exception(), ValueError)
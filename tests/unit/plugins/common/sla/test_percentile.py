@@ -0,0 +1,103 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+import ddt
+import jsonschema
+
+from rally.plugins.common.sla import percentile
+from tests.unit import test
+
+
+@ddt.ddt
+class MaxDurationPercentileTestCase(test.TestCase):
+
+    @ddt.data({"percentiles": {}},
+              {"percentiles": {"100": 1}},
+              {"percentiles": {"95": 0}},
+              {"percentiles": {"p95": 1}},
+              {"percentiles": {"95": 1}, "min_iterations": 0},
+              {"min_iterations": 10})
+    def test_config_schema_invalid(self, config):
+        self.assertRaises(jsonschema.ValidationError,
+                          percentile.MaxDurationPercentile.validate,
+                          {"max_duration_percentile": config})
+
+    def test_config_schema(self):
+        percentile.MaxDurationPercentile.validate(
+            {"max_duration_percentile": {"percentiles": {"95": 1.5,
+                                                         "99.9": 3},
+                                         "min_iterations": 10}})
+
+    def test_result_no_iterations(self):
+        sla = percentile.MaxDurationPercentile({"percentiles": {"95": 1}})
+        self.assertTrue(sla.result()["success"])
+
+    def test_add_iteration(self):
+        sla = percentile.MaxDurationPercentile(
+            {"percentiles": {"50": 2.0, "90": 4.0}, "min_iterations": 3})
+        self.assertTrue(sla.add_iteration({"duration": 10.0}))
+        self.assertTrue(sla.add_iteration({"duration": 1.0}))
+        # NOTE: failed iterations are ignored
+        self.assertTrue(sla.add_iteration({"duration": 100.0,
+                                           "error": ["error"]}))
+        self.assertFalse(sla.add_iteration({"duration": 1.0}))  # p90 = 8.2
+        for i in range(6):
+            sla.add_iteration({"duration": 1.0})
+        self.assertTrue(sla.result()["success"])  # p90 = 2.8
+        self.assertFalse(sla.add_iteration({"duration": 50.0}))  # p90 = 14
+        self.assertEqual("Failed", sla.status())
+        self.assertEqual("Duration 50%ile 1.00s <= 2.00s, 90%ile 14.00s <= "
+                         "4.00s - Failed", sla.details())
+
+    def test_add_iteration_long_run(self):
+        sla = percentile.MaxDurationPercentile({"percentiles": {"99": 1.0}})
+        for i in range(10000):
+            self.assertTrue(sla.add_iteration({"duration": 0.5}))
+        for i in range(101):
+            self.assertTrue(sla.add_iteration({"duration": 5.0}))
+        self.assertFalse(sla.add_iteration({"duration": 5.0}))
+
+
+class MaxAtomicDurationPercentileTestCase(test.TestCase):
+
+    def test_config_schema(self):
+        percentile.MaxAtomicDurationPercentile.validate(
+            {"max_atomic_duration_percentile": {
+                "actions": {"nova.boot_server": {"95": 10}}}})
+        self.assertRaises(jsonschema.ValidationError,
+                          percentile.MaxAtomicDurationPercentile.validate,
+                          {"max_atomic_duration_percentile": {
+                              "actions": {"nova.boot_server": {}}}})
+        self.assertRaises(jsonschema.ValidationError,
+                          percentile.MaxAtomicDurationPercentile.validate,
+                          {"max_atomic_duration_percentile": {
+                              "actions": {}}})
+
+    def test_add_iteration(self):
+        sla = percentile.MaxAtomicDurationPercentile(
+            {"actions": {"a": {"50": 1.0}, "b": {"95": 2.0}}})
+        self.assertTrue(sla.add_iteration(
+            {"duration": 5, "atomic_actions": {"a": 0.5, "b": 1.0}}))
+        self.assertTrue(sla.add_iteration(
+            {"duration": 5, "atomic_actions": {"a": 0.5, "c": 10.0}}))
+        self.assertFalse(sla.add_iteration(
+            {"duration": 5, "atomic_actions": {"a": 0.5, "b": 3.0}}))
+        self.assertFalse(sla.add_iteration(
+            {"duration": 5, "atomic_actions": {"a": 0.5}}))
+        self.assertFalse(sla.result()["success"])
+        self.assertEqual(
+            "Atomic actions duration a 50%ile 0.50s <= 1.00s; "
+            "b 95%ile 2.90s <= 2.00s - Failed", sla.details())
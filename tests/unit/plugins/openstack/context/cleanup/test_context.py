@@ -45,9 +45,12 @@ class AdminCleanupTestCase(test.TestCase):
                           context.AdminCleanup.validate, {})
 
     @mock.patch("%s.manager.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[mock.MagicMock(_order=1),
+                              mock.MagicMock(_order=2)])
     @mock.patch("%s.manager.SeekAndDestroy" % BASE)
     def test_cleanup(self, mock_seek_and_destroy, mock_find_resource_managers):
+        mock_seek_and_destroy.return_value.exterminate.return_value = {
+            "listed": 0, "deleted": 0, "failed": 0, "duration": 0}
 
         ctx = {
             "config": {"admin_cleanup": ["a", "b"]},
@@ -65,12 +68,14 @@ class AdminCleanupTestCase(test.TestCase):
             mock.call(
                 mock_find_resource_managers.return_value[0],
                 ctx["admin"],
-                ctx["users"]),
+                ctx["users"],
+                workers=mock.ANY),
             mock.call().exterminate(),
             mock.call(
                 mock_find_resource_managers.return_value[1],
                 ctx["admin"],
-                ctx["users"]),
+                ctx["users"],
+                workers=mock.ANY),
             mock.call().exterminate()
         ])
 
@@ -97,9 +102,12 @@ class UserCleanupTestCase(test.TestCase):
                           context.UserCleanup.validate, {})
 
     @mock.patch("%s.manager.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[mock.MagicMock(_order=1),
+                              mock.MagicMock(_order=2)])
     @mock.patch("%s.manager.SeekAndDestroy" % BASE)
     def test_cleanup(self, mock_seek_and_destroy, mock_find_resource_managers):
+        mock_seek_and_destroy.return_value.exterminate.return_value = {
+            "listed": 0, "deleted": 0, "failed": 0, "duration": 0}
 
         ctx = {
             "config": {"cleanup": ["a", "b"]},
@@ -116,10 +124,10 @@ class UserCleanupTestCase(test.TestCase):
         mock_seek_and_destroy.assert_has_calls([
             mock.call(
                 mock_find_resource_managers.return_value[0],
-                None, ctx["users"]),
+                None, ctx["users"], workers=mock.ANY),
             mock.call().exterminate(),
             mock.call(
                 mock_find_resource_managers.return_value[1],
-                None, ctx["users"]),
+                None, ctx["users"], workers=mock.ANY),
             mock.call().exterminate()
         ])
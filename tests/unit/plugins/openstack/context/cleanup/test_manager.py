@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 import mock
 import six
 
@@ -53,8 +55,8 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_resource.delete.side_effect = [Exception, Exception, True]
         mock_resource.is_deleted.side_effect = [False, False, True]
 
-        manager.SeekAndDestroy(None, None, None)._delete_single_resource(
-            mock_resource)
+        self.assertTrue(manager.SeekAndDestroy(
+            None, None, None)._delete_single_resource(mock_resource))
 
         mock_resource.delete.assert_has_calls([mock.call()] * 3)
         self.assertEqual(mock_resource.delete.call_count, 3)
@@ -73,8 +75,8 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_resource.delete.return_value = True
         mock_resource.is_deleted.side_effect = [False, False, True]
 
-        manager.SeekAndDestroy(None, None, None)._delete_single_resource(
-            mock_resource)
+        self.assertFalse(manager.SeekAndDestroy(
+            None, None, None)._delete_single_resource(mock_resource))
 
         mock_resource.delete.assert_called_once_with()
         mock_resource.is_deleted.assert_called_once_with()
@@ -234,6 +236,7 @@ class SeekAndDestroyTestCase(test.TestCase):
             mock_mgr.return_value)
 
         mock_mgr.reset_mock()
+        mock__delete_single_resource.return_value = False
         mock__get_cached_client.reset_mock()
         mock__delete_single_resource.reset_mock()
 
@@ -251,6 +254,24 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock__delete_single_resource.assert_called_once_with(
             mock_mgr.return_value)
 
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    @mock.patch("%s.SeekAndDestroy._delete_single_resource" % BASE)
+    def test__gen_consumer_with_workers(self, mock__delete_single_resource,
+                                        mock__get_cached_client):
+        workers = mock.MagicMock()
+        seek_and_destroy = manager.SeekAndDestroy(mock.MagicMock(), None, None,
+                                                  workers=workers)
+        consumer = seek_and_destroy._gen_consumer()
+
+        mock__delete_single_resource.side_effect = [True, False, True]
+        for res in "res1", "res2", "res3":
+            consumer({}, (None, None, res))
+
+        self.assertEqual(3, workers.__enter__.call_count)
+        self.assertEqual(3, workers.__exit__.call_count)
+        self.assertEqual({"listed": 0, "deleted": 2, "failed": 1,
+                          "duration": 0}, seek_and_destroy.stats)
+
     @mock.patch("%s.SeekAndDestroy._gen_consumer" % BASE)
     @mock.patch("%s.SeekAndDestroy._gen_publisher" % BASE)
     @mock.patch("%s.broker.run" % BASE)
@@ -258,7 +279,9 @@ class SeekAndDestroyTestCase(test.TestCase):
                          mock__gen_consumer):
 
         manager_cls = mock.MagicMock(_threads=5)
-        manager.SeekAndDestroy(manager_cls, None, None).exterminate()
+        stats = manager.SeekAndDestroy(manager_cls, None, None).exterminate()
+        self.assertEqual({"listed": 0, "deleted": 0, "failed": 0,
+                          "duration": mock.ANY}, stats)
 
         mock__gen_publisher.assert_called_once_with()
         mock__gen_consumer.assert_called_once_with()
@@ -335,20 +358,98 @@ class ResourceManagerTestCase(test.TestCase):
 
     @mock.patch("%s.SeekAndDestroy" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[mock.MagicMock(_service="a", _resource="x",
+                                             _order=1),
+                              mock.MagicMock(_service="b", _resource="y",
+                                             _order=2)])
     def test_cleanup(self, mock_find_resource_managers, mock_seek_and_destroy):
-        manager.cleanup(names=["a", "b"], admin_required=True,
-                        admin="admin", users=["user"])
+        mock_seek_and_destroy.return_value.exterminate.return_value = {
+            "listed": 1, "deleted": 1, "failed": 0, "duration": 0.5}
+        result = manager.cleanup(names=["a", "b"], admin_required=True,
+                                 admin="admin", users=["user"])
 
         mock_find_resource_managers.assert_called_once_with(["a", "b"], True)
 
         mock_seek_and_destroy.assert_has_calls([
             mock.call(
-                mock_find_resource_managers.return_value[0], "admin", ["user"]
+                mock_find_resource_managers.return_value[0], "admin", ["user"],
+                workers=mock.ANY
             ),
             mock.call().exterminate(),
             mock.call(
-                mock_find_resource_managers.return_value[1], "admin", ["user"]
+                mock_find_resource_managers.return_value[1], "admin", ["user"],
+                workers=mock.ANY
             ),
             mock.call().exterminate()
         ])
+        stats = mock_seek_and_destroy.return_value.exterminate.return_value
+        self.assertEqual({"a.x": stats, "b.y": stats}, result)
+
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE,
+                return_value=[mock.MagicMock(_service="a", _resource="x",
+                                             _order=1),
+                              mock.MagicMock(_service="a", _resource="y",
+                                             _order=2)])
+    def test_cleanup_failed(self, mock_find_resource_managers,
+                            mock_seek_and_destroy):
+        mock_seek_and_destroy.return_value.exterminate.side_effect = [
+            ValueError("oops"),
+            {"listed": 1, "deleted": 1, "failed": 0, "duration": 0.5}]
+
+        self.assertRaises(ValueError, manager.cleanup)
+        self.assertEqual(
+            2, mock_seek_and_destroy.return_value.exterminate.call_count)
+
+    def test__must_precede(self):
+        def mgr(service, order):
+            return mock.Mock(_service=service, _order=order)
+
+        self.assertTrue(manager._must_precede(mgr("nova", 1), mgr("nova", 2)))
+        self.assertFalse(manager._must_precede(mgr("nova", 2), mgr("nova", 1)))
+        self.assertTrue(manager._must_precede(mgr("heat", 1),
+                                              mgr("neutron", 2)))
+        self.assertFalse(manager._must_precede(mgr("nova", 1),
+                                               mgr("swift", 2)))
+        self.assertFalse(manager._must_precede(mgr("glance", 1),
+                                               mgr("nova", 2)))
+        self.assertTrue(manager._must_precede(mgr("swift", 1),
+                                              mgr("swift", 2)))
+        self.assertTrue(manager._must_precede(mgr("swift", 1),
+                                              mgr("keystone", 2)))
+
+    @mock.patch("%s.find_resource_managers" % BASE)
+    def test_cleanup_runs_independent_managers_in_parallel(
+            self, mock_find_resource_managers):
+        events = []
+        swift_started = threading.Event()
+
+        class FakeSeekAndDestroy(object):
+            def __init__(self, mgr, admin, users, workers=None):
+                self.mgr = mgr
+
+            def exterminate(self):
+                events.append(("start", self.mgr._service))
+                if self.mgr._service == "swift":
+                    swift_started.set()
+                elif self.mgr._service == "nova":
+                    # NOTE: swift doesn't wait for nova
+                    swift_started.wait(5)
+                events.append(("end", self.mgr._service))
+                return {"listed": 0, "deleted": 0, "failed": 0,
+                        "duration": 0}
+
+        mock_find_resource_managers.return_value = [
+            mock.Mock(_service="nova", _resource="servers", _order=1),
+            mock.Mock(_service="neutron", _resource="port", _order=2),
+            mock.Mock(_service="swift", _resource="object", _order=3),
+            mock.Mock(_service="keystone", _resource="user", _order=4)]
+
+        with mock.patch("%s.SeekAndDestroy" % BASE, FakeSeekAndDestroy):
+            manager.cleanup()
+
+        self.assertTrue(swift_started.is_set())
+        self.assertLess(events.index(("end", "nova")),
+                        events.index(("start", "neutron")))
+        self.assertEqual(("end", "keystone"), events[-1])
+        self.assertEqual(("start", "keystone"), events[-2])
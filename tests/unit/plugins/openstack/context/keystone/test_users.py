@@ -309,6 +309,175 @@ class UserGeneratorTestCase(test.ScenarioTestCase):
         # Ensure that tenants get deleted anyway
         self.assertEqual(len(ctx.context["tenants"]), 0)
 
+    def _pooled_tenant(self, id, users_count=None):
+        users_count = users_count or self.users_per_tenant
+        endpoint = objects.Endpoint("foo_url", "user", "pass", "tenant")
+        return mock.Mock(
+            id=id, tenant_id="tenant_%s" % id,
+            data={"tenant": {"id": "tenant_%s" % id, "name": "foo"},
+                  "users": [{"id": "user_%s_%s" % (id, i),
+                             "endpoint": endpoint.to_dict(
+                                 include_permission=True)}
+                            for i in range(users_count)]})
+
+    @mock.patch("%s.objects.Deployment" % CTX)
+    @mock.patch("%s.keystone" % CTX)
+    def test_setup_from_pool(self, mock_keystone, mock_deployment):
+        self.context["config"]["users"]["use_pool"] = True
+        self.context["task"]["deployment_uuid"] = "deployment_uuid"
+        deployment = mock_deployment.get.return_value
+        deployment.lease_pooled_tenants.return_value = [
+            self._pooled_tenant(1)]
+
+        user_generator = users.UserGenerator(self.context)
+        user_generator.setup()
+
+        mock_deployment.get.assert_called_once_with("deployment_uuid")
+        deployment.release_stale_pooled_tenants.assert_called_once_with()
+        deployment.lease_pooled_tenants.assert_called_once_with(
+            "default:default:5", "task_id", self.tenants_num)
+        self.assertEqual({"tenant_1": {"id": "tenant_1", "name": "foo"}},
+                         self.context["tenants"])
+        self.assertEqual(["user_1_%d" % i for i in range(5)],
+                         [u["id"] for u in self.context["users"]])
+        self.assertEqual("user", self.context["users"][0]["endpoint"].username)
+        self.assertFalse(
+            mock_keystone.wrap.return_value.create_project.called)
+        self.assertFalse(deployment.add_pooled_tenant.called)
+
+    @mock.patch("%s.objects.Deployment" % CTX)
+    @mock.patch("%s.keystone" % CTX)
+    def test_setup_from_pool_recreates_invalid(self, mock_keystone,
+                                               mock_deployment):
+        self.context["config"]["users"]["use_pool"] = True
+        self.context["config"]["users"]["tenants"] = 2
+        self.context["task"]["deployment_uuid"] = "deployment_uuid"
+        deployment = mock_deployment.get.return_value
+        invalid = self._pooled_tenant(1, users_count=1)
+        deployment.lease_pooled_tenants.return_value = [
+            invalid, self._pooled_tenant(2)]
+        wrapped_keystone = mock_keystone.wrap.return_value
+        wrapped_keystone.create_project.return_value = mock.Mock(id="new")
+        wrapped_keystone.create_user.side_effect = [
+            mock.Mock(id="new_user_%d" % i) for i in range(5)]
+
+        user_generator = users.UserGenerator(self.context)
+        user_generator.setup()
+
+        wrapped_keystone.delete_user.assert_called_once_with("user_1_0")
+        wrapped_keystone.delete_project.assert_called_once_with("tenant_1")
+        mock_deployment.delete_pooled_tenant.assert_called_once_with(1)
+
+        self.assertEqual(set(["tenant_2", "new"]),
+                         set(self.context["tenants"]))
+        self.assertEqual(10, len(self.context["users"]))
+        deployment.add_pooled_tenant.assert_called_once_with(
+            "new", "default:default:5", mock.ANY, lessee="task_id")
+        data = deployment.add_pooled_tenant.call_args[0][2]
+        self.assertEqual(["new_user_%d" % i for i in range(5)],
+                         sorted(u["id"] for u in data["users"]))
+
+    @mock.patch("%s.objects.Deployment" % CTX)
+    @mock.patch("%s.keystone" % CTX)
+    def test_setup_from_pool_failed(self, mock_keystone, mock_deployment):
+        self.context["config"]["users"]["use_pool"] = True
+        self.context["config"]["users"]["tenants"] = 2
+        self.context["task"]["deployment_uuid"] = "deployment_uuid"
+        deployment = mock_deployment.get.return_value
+        deployment.release_stale_pooled_tenants.return_value = 3
+        deployment.lease_pooled_tenants.return_value = [
+            self._pooled_tenant(1)]
+        mock_deployment.release_pooled_tenants.side_effect = Exception(
+            "release failed")
+        deployment.add_pooled_tenant.side_effect = ValueError("oops")
+        wrapped_keystone = mock_keystone.wrap.return_value
+        wrapped_keystone.create_project.return_value = mock.Mock(id="new")
+
+        user_generator = users.UserGenerator(self.context)
+        self.assertRaises(ValueError, user_generator.setup)
+
+        mock_deployment.release_pooled_tenants.assert_called_once_with(
+            "task_id")
+
+    @mock.patch("%s.objects.Deployment" % CTX)
+    def test__check_pooled_tenants(self, mock_deployment):
+        user_generator = users.UserGenerator(self.context)
+        self.osclients.Clients.return_value.keystone.side_effect = [
+            None, None, None, None, None, Exception("invalid user")] + (
+            [None] * 4)
+
+        self.assertEqual(
+            set([1]), user_generator._check_pooled_tenants(
+                [self._pooled_tenant(1), self._pooled_tenant(2),
+                 self._pooled_tenant(3, users_count=1)]))
+
+    @mock.patch("%s.resource_manager" % CTX)
+    @mock.patch("%s.objects.Deployment" % CTX)
+    def test_cleanup_with_pool(self, mock_deployment, mock_resource_manager):
+        self.context["config"]["users"]["use_pool"] = True
+        self.context["users"] = ["user"]
+        self.context["tenants"] = {"tenant": {}}
+        self.osclients.Clients.return_value.services.return_value = {
+            "compute": "nova", "image": "glance"}
+        mock_resource_manager.list_resource_names.return_value = set(
+            ["nova", "nova.servers", "cinder", "glance"])
+
+        user_generator = users.UserGenerator(self.context)
+        user_generator.cleanup()
+
+        mock_resource_manager.list_resource_names.assert_called_once_with(
+            admin_required=False)
+        mock_resource_manager.cleanup.assert_called_once_with(
+            names=mock.ANY, admin_required=False, users=["user"])
+        self.assertEqual(
+            set(["nova", "glance"]),
+            set(mock_resource_manager.cleanup.call_args[1]["names"]))
+        mock_deployment.release_pooled_tenants.assert_called_once_with(
+            "task_id")
+        self.assertEqual([], self.context["users"])
+        self.assertEqual({}, self.context["tenants"])
+
+    @mock.patch("%s.resource_manager" % CTX)
+    @mock.patch("%s.objects.Deployment" % CTX)
+    def test_cleanup_with_pool_failed(self, mock_deployment,
+                                      mock_resource_manager):
+        self.context["config"]["users"]["use_pool"] = True
+        self.context["users"] = ["user"]
+        mock_resource_manager.cleanup.side_effect = ValueError("oops")
+
+        user_generator = users.UserGenerator(self.context)
+        self.assertRaises(ValueError, user_generator.cleanup)
+
+        mock_deployment.release_pooled_tenants.assert_called_once_with(
+            "task_id")
+        self.assertEqual([], self.context["users"])
+
+    @mock.patch("%s.objects.Deployment" % CTX)
+    @mock.patch("%s.keystone" % CTX)
+    def test_drain_pool(self, mock_keystone, mock_deployment):
+        deployment = mock.MagicMock()
+        deployment.__getitem__.return_value = {
+            "auth_url": "url", "username": "admin", "password": "pass",
+            "tenant_name": "admin"}
+        deployment.get_pooled_tenants.return_value = [
+            self._pooled_tenant(1, users_count=2), self._pooled_tenant(2)]
+
+        users.drain_pool(deployment)
+
+        deployment.__getitem__.assert_called_once_with("admin")
+        wrapped_keystone = mock_keystone.wrap.return_value
+        self.assertEqual(7, wrapped_keystone.delete_user.call_count)
+        wrapped_keystone.delete_project.assert_has_calls(
+            [mock.call("tenant_1"), mock.call("tenant_2")])
+        mock_deployment.delete_pooled_tenant.assert_has_calls(
+            [mock.call(1), mock.call(2)])
+
+    def test_drain_pool_empty(self):
+        deployment = mock.MagicMock()
+        deployment.get_pooled_tenants.return_value = []
+        users.drain_pool(deployment)
+        self.assertFalse(self.osclients.Clients.called)
+
     @mock.patch("%s.keystone" % CTX)
     def test_users_and_tenants_in_context(self, mock_keystone):
         wrapped_keystone = mock.MagicMock()
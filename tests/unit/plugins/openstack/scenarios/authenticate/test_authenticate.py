@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from rally.plugins.openstack.scenarios.authenticate import authenticate
 from rally.task import atomic
 from tests.unit import test
@@ -24,10 +26,13 @@ AUTHENTICATE_MODULE = (
 
 class AuthenticateTestCase(test.ScenarioTestCase):
 
-    def test_keystone(self):
-        scenario_inst = authenticate.Authenticate()
+    @mock.patch("rally.osclients.Clients")
+    def test_keystone(self, mock_clients):
+        scenario_inst = authenticate.Authenticate(
+            context={"user": {"endpoint": "foo_endpoint"}})
         scenario_inst.keystone()
-        self.assertTrue(self.client_created("keystone"))
+        mock_clients.assert_any_call("foo_endpoint")
+        mock_clients.return_value.keystone.assert_called_once_with()
 
     def test_validate_glance(self):
         scenario_inst = authenticate.Authenticate()
@@ -37,7 +37,8 @@ class OpenStackScenarioTestCase(test.TestCase):
         scenario = base_scenario.OpenStackScenario(self.context)
         self.assertEqual(self.context, scenario.context)
         self.osclients.mock.assert_called_once_with(
-            self.context["admin"]["endpoint"])
+            self.context["admin"]["endpoint"],
+            cache=base_scenario.osclients.keystone_cache)
 
         self.assertRaises(
             ValueError, base_scenario.OpenStackScenario,
@@ -55,12 +56,21 @@ class OpenStackScenarioTestCase(test.TestCase):
         scenario = base_scenario.OpenStackScenario(self.context)
         self.assertEqual(self.context, scenario.context)
         self.osclients.mock.assert_called_once_with(
-            self.context["user"]["endpoint"])
+            self.context["user"]["endpoint"],
+            cache=base_scenario.osclients.keystone_cache)
 
         self.assertRaises(
             ValueError, base_scenario.OpenStackScenario,
             self.context, clients="foobar")
 
+    @mock.patch("rally.plugins.openstack.scenario.CONF")
+    def test_init_user_context_without_cache(self, mock_conf):
+        mock_conf.openstack_client_cache = False
+        self.context["user"] = {"endpoint": mock.Mock()}
+        base_scenario.OpenStackScenario(self.context)
+        self.osclients.mock.assert_called_once_with(
+            self.context["user"]["endpoint"], cache=None)
+
     def test_init_user_clients(self):
         scenario = base_scenario.OpenStackScenario(
             self.context, clients="foobar")
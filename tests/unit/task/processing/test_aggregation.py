@@ -0,0 +1,188 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+import mock
+
+from rally.task.processing import aggregation
+from tests.unit import test
+
+
+def generate_iterations():
+    for i in range(4):
+        yield {
+            "duration": i + 1.0,
+            "idle_duration": 0.5,
+            "timestamp": 10.0 - i,
+            "error": ["Error", "msg", "trace"] if i == 3 else [],
+            "scenario_output": {"data": {"foo": i * 2} if i < 2 else {},
+                                "errors": "oops" if i == 1 else ""},
+            "atomic_actions": {"a": i + 0.5}}
+
+
+class ScenarioAggregatorTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ScenarioAggregatorTestCase, self).setUp()
+        self.result = {
+            "key": {"name": "Foo.bar", "pos": 0, "kw": {}},
+            "data": {"raw": generate_iterations(), "sla": ["sla"],
+                     "load_duration": 4, "full_duration": 5}}
+
+    def test_info(self):
+        aggregator = aggregation.ScenarioAggregator(self.result)
+        self.assertEqual(
+            {"atomic": {"a": {"min_duration": 0.5, "max_duration": 3.5}},
+             "output_names": ["foo"],
+             "iterations_count": 4,
+             "iterations_failed": 1,
+             "min_duration": 1.0,
+             "max_duration": 3.0,
+             "tstamp_start": 7.0,
+             "full_duration": 5,
+             "load_duration": 4,
+             "runner_stats": {}},
+            aggregator.info)
+        self.assertEqual(["sla"], aggregator.sla)
+        self.assertEqual(list(generate_iterations()),
+                         list(aggregator.iterations))
+
+    def test_without_sla(self):
+        del self.result["data"]["sla"]
+        aggregator = aggregation.ScenarioAggregator(self.result)
+        self.assertEqual([], aggregator.sla)
+
+    def test_stats_table(self):
+        aggregator = aggregation.ScenarioAggregator(self.result)
+        table = aggregator.stats_table()
+        self.assertEqual(
+            [["a", 0.5, 1.5, 2.3, 2.4, 2.5, 1.5, "75.0%", 4],
+             ["total", 1.0, 2.0, 2.8, 2.9, 3.0, 2.0, "75.0%", 4]],
+            table["rows"])
+
+    def test_output_stats_table(self):
+        aggregator = aggregation.ScenarioAggregator(self.result)
+        self.assertEqual([["foo", 0.0, 1.0, 1.8, 1.9, 2.0, 1.0]],
+                         aggregator.output_stats_table())
+
+    def test_errors(self):
+        aggregator = aggregation.ScenarioAggregator(self.result)
+        self.assertEqual([(1, "oops")], aggregator.output_errors())
+        self.assertEqual([{"iteration": 3, "type": "Error",
+                           "message": "msg", "traceback": "trace"}],
+                         aggregator.errors())
+
+    def test_stats_table_from_stats(self):
+        stats = mock.Mock()
+        aggregator = aggregation.ScenarioAggregator(self.result, stats=stats)
+        self.assertEqual(stats.stats_table.return_value,
+                         aggregator.stats_table())
+
+
+class ScenarioStatsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ScenarioStatsTestCase, self).setUp()
+        self.stats = aggregation.ScenarioStats()
+        for itr in generate_iterations():
+            self.stats.add(itr)
+
+    def test_stats_table(self):
+        # NOTE: the table is the same as built from raw iterations
+        result = {"key": {"name": "Foo.bar", "pos": 0, "kw": {}},
+                  "data": {"raw": generate_iterations(), "sla": [],
+                           "load_duration": 4, "full_duration": 5}}
+        self.assertEqual(
+            aggregation.ScenarioAggregator(result).stats_table(),
+            self.stats.stats_table())
+
+    def test_from_iterations(self):
+        stats = aggregation.ScenarioStats.from_iterations(
+            generate_iterations())
+        self.assertEqual(self.stats.to_rows(), stats.to_rows())
+
+    def test_durations_table(self):
+        self.assertEqual(
+            [["a", 0.5, 1.5, 2.3, 2.4, 2.5, 1.5, "75.0%", 4],
+             ["total", 1.0, 2.0, 2.8, 2.9, 3.0, 2.0, "75.0%", 4]],
+            self.stats.durations_table())
+
+    def test_atomic_actions_table(self):
+        self.assertEqual(
+            [["a", 0.5, 2.0, 3.2, 3.35, 3.5, 2.0, "100.0%", 4],
+             ["total", 1.0, 2.0, 2.8, 2.9, 3.0, 2.0, "75.0%", 4]],
+            self.stats.atomic_actions_table())
+
+    def test_atomic_actions_table_first_successful_iteration(self):
+        stats = aggregation.ScenarioStats()
+        stats.add({"duration": 1.0, "error": ["Error", "msg", "trace"],
+                   "atomic_actions": {"a": 1.0, "b": 2.0},
+                   "scenario_output": {"data": {}, "errors": ""}})
+        stats.add({"duration": 3.0, "error": [],
+                   "atomic_actions": {"a": 3.0, "c": None},
+                   "scenario_output": {"data": {}, "errors": ""}})
+        self.assertEqual(
+            [["a", 1.0, 2.0, 2.8, 2.9, 3.0, 2.0, "100.0%", 2],
+             ["c"] + [None] * 6 + ["0.0%", 2],
+             ["total", 3.0, 3.0, 3.0, 3.0, 3.0, 3.0, "50.0%", 2]],
+            stats.atomic_actions_table())
+
+    def test_atomic_actions_table_no_data(self):
+        self.assertEqual([["total"] + [None] * 6 + ["0.0%", 0]],
+                         aggregation.ScenarioStats().atomic_actions_table())
+        self.assertEqual(
+            {"cols": ["Action", "Min (sec)", "Median (sec)",
+                      "90%ile (sec)", "95%ile (sec)", "Max (sec)",
+                      "Avg (sec)", "Success", "Count"],
+             "rows": [["total"] + ["n/a"] * 7 + [0]]},
+            aggregation.ScenarioStats().stats_table())
+
+    def test_output_stats_table(self):
+        self.stats.add({"duration": 1.0, "error": [], "atomic_actions": {},
+                        "scenario_output": {"data": {"foo": "oops"}}})
+        self.assertEqual([["foo", 0.0, 1.0, 1.8, 1.9, 2.0, 1.0]],
+                         self.stats.output_stats_table())
+
+    def test_output_errors_count(self):
+        self.assertEqual(1, self.stats.output_errors_count)
+        self.assertEqual(0, aggregation.ScenarioStats().output_errors_count)
+
+    def test_to_rows(self):
+        rows = self.stats.to_rows()
+        self.assertEqual(
+            [(0, "atomic", "a", 4, 1, 0.5, 2.5, 1.5, 1.0),
+             (1, "atomic", "total", 4, 1, 1.0, 3.0, 2.0, 1.0),
+             (2, "output", "foo", 2, 0, 0.0, 2.0, 1.0, 2 ** 0.5),
+             (3, "detailed", "a", 4, 0, 0.5, 3.5, 2.0, (5 / 3.0) ** 0.5),
+             (4, "output_errors", "errors", 1, 0, None, None, None, None)],
+            [(r["position"], r["kind"], r["name"], r["count"], r["errors"],
+              r["min_value"], r["max_value"], r["mean"], r["stddev"])
+             for r in rows])
+        # NOTE: rows are stored as JSON
+        self.assertEqual(rows, json.loads(json.dumps(rows)))
+
+    def test_from_rows(self):
+        rows = self.stats.to_rows()
+        rows.reverse()
+        restored = aggregation.ScenarioStats.from_rows(rows)
+        self.assertEqual(self.stats.to_rows(), restored.to_rows())
+        self.assertEqual(self.stats.atomic_actions_table(),
+                         restored.atomic_actions_table())
+        self.assertEqual(self.stats.durations_table(),
+                         restored.durations_table())
+        self.assertEqual(1, restored.output_errors_count)
+        self.assertEqual(self.stats.output_stats_table(),
+                         restored.output_stats_table())
@@ -44,7 +44,7 @@ class ChartTestCase(test.TestCase):
         self.assertEqual(42, chart.base_size)
         self.assertEqual(24, chart.zipped_size)
 
-    @mock.patch(CHARTS + "utils.GraphZipper")
+    @mock.patch(CHARTS + "utils.MinMaxGraphZipper")
     def test_add_iteration_and_render(self, mock_graph_zipper):
         gzipper_a = mock.Mock(get_zipped_graph=lambda: "a_points")
         gzipper_b = mock.Mock(get_zipped_graph=lambda: "b_points")
@@ -278,6 +278,24 @@ class HistogramChartTestCase(test.TestCase):
         chart = self.HistogramChart({"iterations_count": base_size})
         self.assertEqual(expected, chart._init_views(min_value, max_value))
 
+    def test_views_max_bins(self):
+        chart = self.HistogramChart({"iterations_count": 1000000})
+        views = chart._init_views(0, 10)
+        self.assertEqual([charts.HistogramChart.MAX_BINS, 21,
+                          charts.HistogramChart.MAX_BINS,
+                          charts.HistogramChart.MAX_BINS],
+                         [v["bins"] for v in views])
+        self.assertEqual(10, views[-1]["x"][-1])
+
+    def test_add_iteration_out_of_range(self):
+        chart = self.HistogramChart({"iterations_count": 3})
+        [chart.add_iteration({"foo": x}) for x in ({"bar": None},
+                                                   {"bar": 1.2},
+                                                   {"bar": 5.0})]
+        self.assertEqual([[2, 0]] * 2,
+                         [v["y"] for v in chart._data["bar"]["views"]
+                          if v["bins"] == 2])
+
 
 class MainHistogramChartTestCase(test.TestCase):
 
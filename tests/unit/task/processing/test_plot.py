@@ -28,7 +28,6 @@ class PlotTestCase(test.TestCase):
     @mock.patch(PLOT + "charts")
     def test__process_scenario(self, mock_charts):
         for mock_ins, ret in [
-                (mock_charts.MainStatsTable, "main_stats"),
                 (mock_charts.MainStackedAreaChart, "main_stacked"),
                 (mock_charts.AtomicStackedAreaChart, "atomic_stacked"),
                 (mock_charts.OutputStackedAreaChart, "output_stacked"),
@@ -42,18 +41,21 @@ class PlotTestCase(test.TestCase):
              "duration": i + 5, "idle_duration": i,
              "scenario_output": {"errors": "", "data": {}},
              "atomic_actions": {"foo_action": i + 10}} for i in range(10)]
-        data = {"iterations": iterations, "sla": [],
-                "key": {"kw": {"runner": {"type": "constant"}},
-                        "name": "Foo.bar", "pos": 0},
-                "info": {"atomic": {"foo_action": {"max_duration": 19,
-                                                   "min_duration": 10}},
-                         "full_duration": 40, "load_duration": 32,
-                         "iterations_count": 10, "iterations_passed": 10,
-                         "max_duration": 14, "min_duration": 5,
-                         "output_names": [],
-                         "tstamp_end": 25, "tstamp_start": 2}}
+        aggregator = mock.Mock(
+            iterations=iterations, sla=[],
+            key={"kw": {"runner": {"type": "constant"}},
+                 "name": "Foo.bar", "pos": 0},
+            info={"atomic": {"foo_action": {"max_duration": 19,
+                                            "min_duration": 10}},
+                  "full_duration": 40, "load_duration": 32,
+                  "iterations_count": 10, "iterations_failed": 1,
+                  "max_duration": 14, "min_duration": 5,
+                  "output_names": [], "tstamp_start": 2})
+        aggregator.stats_table.return_value = "main_stats"
+        aggregator.errors.return_value = ["error"]
+        aggregator.output_errors.return_value = ["output_error"]
 
-        task_data = plot._process_scenario(data, 1)
+        task_data = plot._process_scenario(aggregator, 1)
         self.assertEqual(
             task_data, {
                 "cls": "Foo", "met": "bar", "name": "bar [2]", "pos": "1",
@@ -65,20 +67,40 @@ class PlotTestCase(test.TestCase):
                            "iter": "atomic_stacked", "pie": "atomic_avg"},
                 "iterations": {"histogram": "main_histogram",
                                "iter": "main_stacked",
-                               "pie": [("success", 10), ("errors", 0)]},
-                "iterations_count": 10, "errors": [],
-                "load_profile": "load_profile",
-                "output": "output_stacked", "output_errors": [],
+                               "pie": [("success", 9), ("errors", 1)]},
+                "iterations_count": 10, "errors": ["error"],
+                "errors_count": 1, "load_profile": "load_profile",
+                "output": "output_stacked",
+                "output_errors": ["output_error"],
                 "sla": [], "sla_success": True, "table": "main_stats"})
 
+    @mock.patch(PLOT + "MAX_ERRORS", 2)
+    @mock.patch(PLOT + "charts")
+    def test__process_scenario_many_errors(self, mock_charts):
+        aggregator = mock.Mock(
+            iterations=[], sla=[],
+            key={"kw": {"runner": {"type": "constant"}},
+                 "name": "Foo.bar", "pos": 0},
+            info={"iterations_count": 5, "full_duration": 4,
+                  "load_duration": 3})
+        aggregator.errors.return_value = ["e1", "e2", "e3"]
+        aggregator.output_errors.return_value = ["o1", "o2", "o3"]
+
+        task_data = plot._process_scenario(aggregator, 0)
+        self.assertEqual(["e1", "e2"], task_data["errors"])
+        self.assertEqual(3, task_data["errors_count"])
+        self.assertEqual(["o1", "o2"], task_data["output_errors"])
+        self.assertEqual([("success", 2), ("errors", 3)],
+                         task_data["iterations"]["pie"])
+
     @mock.patch(PLOT + "_process_scenario")
     @mock.patch(PLOT + "json.dumps", return_value="json_data")
     def test__process_tasks(self, mock_json_dumps, mock__process_scenario):
-        tasks_results = [{"key": {"name": i, "kw": "kw_" + i}}
-                         for i in ("a", "b", "c", "b")]
+        aggregators = [mock.Mock(key={"name": i, "kw": "kw_" + i})
+                       for i in ("a", "b", "c", "b")]
         mock__process_scenario.side_effect = lambda a, b: (
-            {"cls": "%s_cls" % a["key"]["name"], "name": str(b)})
-        source, tasks = plot._process_tasks(tasks_results)
+            {"cls": "%s_cls" % a.key["name"], "name": str(b)})
+        source, tasks = plot._process_tasks(aggregators)
         self.assertEqual(source, "json_data")
         mock_json_dumps.assert_called_once_with(
             {"a": ["kw_a"], "b": ["kw_b", "kw_b"], "c": ["kw_c"]},
@@ -89,30 +111,45 @@ class PlotTestCase(test.TestCase):
              {"cls": "b_cls", "name": "1"}, {"cls": "c_cls", "name": "0"}])
 
     @mock.patch(PLOT + "_process_tasks")
-    @mock.patch(PLOT + "objects")
+    @mock.patch(PLOT + "aggregation.ScenarioAggregator")
     @mock.patch(PLOT + "ui_utils.get_template")
     @mock.patch(PLOT + "json.dumps", side_effect=lambda s: "json_" + s)
-    def test_plot(self, mock_dumps, mock_get_template, mock_objects,
-                  mock__process_tasks):
+    def test_plot(self, mock_dumps, mock_get_template,
+                  mock_scenario_aggregator, mock__process_tasks):
         mock__process_tasks.return_value = "source", "scenarios"
         mock_get_template.return_value.render.return_value = "tasks_html"
-        mock_objects.Task.extend_results.return_value = ["extended_result"]
         tasks_results = [
             {"key": "foo_key", "sla": "foo_sla", "result": "foo_result",
              "full_duration": "foo_full_duration",
              "load_duration": "foo_load_duration"}]
         html = plot.plot(tasks_results)
         self.assertEqual(html, "tasks_html")
-        generic_results = [
-            {"id": None, "created_at": None, "updated_at": None,
-             "task_uuid": None, "key": "foo_key",
+        mock_scenario_aggregator.assert_called_once_with(
+            {"key": "foo_key",
              "data": {"raw": "foo_result",
                       "full_duration": "foo_full_duration",
                       "sla": "foo_sla",
-                      "load_duration": "foo_load_duration"}}]
-        mock_objects.Task.extend_results.assert_called_once_with(
-            generic_results)
+                      "load_duration": "foo_load_duration"}},
+            stats=None)
         mock_get_template.assert_called_once_with("task/report.mako")
-        mock__process_tasks.assert_called_once_with(["extended_result"])
+        mock__process_tasks.assert_called_once_with(
+            [mock_scenario_aggregator.return_value])
         mock_get_template.return_value.render.assert_called_once_with(
             data="json_scenarios", source="json_source")
+
+    @mock.patch(PLOT + "trends_.Trends")
+    @mock.patch(PLOT + "ui_utils.get_template")
+    @mock.patch(PLOT + "json.dumps", return_value="json_trends")
+    def test_trends(self, mock_dumps, mock_get_template, mock_trends):
+        mock_get_template.return_value.render.return_value = "trends_html"
+        html = plot.trends([("task_a", "results_a"), ("task_b", "results_b")])
+        self.assertEqual("trends_html", html)
+        self.assertEqual(
+            [mock.call("task_a", "results_a"),
+             mock.call("task_b", "results_b")],
+            mock_trends.return_value.add_task.mock_calls)
+        mock_dumps.assert_called_once_with(
+            mock_trends.return_value.render.return_value)
+        mock_get_template.assert_called_once_with("task/trends.mako")
+        mock_get_template.return_value.render.assert_called_once_with(
+            data="json_trends")
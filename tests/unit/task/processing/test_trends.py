@@ -0,0 +1,105 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.task.processing import aggregation
+from rally.task.processing import trends
+from tests.unit import test
+
+
+def _stats(*iterations):
+    stats = aggregation.ScenarioStats()
+    for duration, error in iterations:
+        stats.add({"duration": duration, "error": error,
+                   "atomic_actions": {"foo": duration / 2.0},
+                   "scenario_output": {"data": {}}})
+    return stats
+
+
+def _result(name="Foo.bar", kw=None, stats=None, iterations=2, failed=0,
+            load_duration=4.0):
+    return {"key": {"name": name, "pos": 0, "kw": kw or {}},
+            "iterations_count": iterations,
+            "failed_iterations_count": failed,
+            "load_duration": load_duration, "full_duration": 5.0,
+            "sla_success": True, "stats": stats}
+
+
+class TrendsTestCase(test.TestCase):
+
+    def test_render_empty(self):
+        self.assertEqual({"tasks": [], "scenarios": []},
+                         trends.Trends().render())
+
+    def test_add_task_and_render(self):
+        trend = trends.Trends()
+        trend.add_task({"uuid": "a", "created_at": "2015-01-01"},
+                       [_result(stats=_stats((1.0, []), (3.0, []))),
+                        _result(kw={"args": 1}, iterations=None,
+                                failed=None, load_duration=None)])
+        trend.add_task({"uuid": "b", "created_at": "2015-01-02"},
+                       [_result(stats=_stats((2.0, []), (4.0, ["e"])),
+                                failed=1)])
+
+        data = trend.render()
+
+        self.assertEqual([{"idx": 1, "uuid": "a", "created_at": "2015-01-01"},
+                          {"idx": 2, "uuid": "b", "created_at": "2015-01-02"}],
+                         data["tasks"])
+        self.assertEqual(["bar", "bar [2]"],
+                         [s["name"] for s in data["scenarios"]])
+        scenario, other = data["scenarios"]
+
+        self.assertEqual("Foo", scenario["cls"])
+        self.assertEqual("bar", scenario["met"])
+        self.assertEqual(2, scenario["length"])
+        self.assertEqual(["foo", "total"],
+                         [a["name"] for a in scenario["actions"]])
+        total = dict(scenario["actions"][1]["series"])
+        self.assertEqual(list(trends.Trends.DURATIONS),
+                         [s[0] for s in scenario["actions"][1]["series"]])
+        self.assertEqual([[1, 1.0], [2, 2.0]], total["min"])
+        self.assertEqual([[1, 3.0], [2, 2.0]], total["max"])
+        self.assertEqual([("success rate", [[1, 100.0], [2, 50.0]])],
+                         scenario["success"])
+        self.assertEqual([("throughput", [[1, 0.5], [2, 0.5]])],
+                         scenario["throughput"])
+        self.assertEqual(
+            {"idx": 2, "iterations_count": 2, "failed_iterations_count": 1,
+             "success": 50.0, "throughput": 0.5, "load_duration": 4.0,
+             "full_duration": 5.0, "sla_success": True},
+            scenario["tasks"][1])
+
+        self.assertEqual(1, other["length"])
+        self.assertEqual([], other["actions"])
+        self.assertEqual([("success rate", [])], other["success"])
+        self.assertEqual([None], [t["success"] for t in other["tasks"]])
+
+    def test_add_task_same_scenario_twice(self):
+        trend = trends.Trends()
+        for uuid in ("a", "b"):
+            trend.add_task({"uuid": uuid, "created_at": uuid},
+                           [_result(), _result(iterations=4)])
+        data = trend.render()
+        self.assertEqual([2, 2], [s["length"] for s in data["scenarios"]])
+        self.assertEqual([[2, 2], [4, 4]],
+                         [[t["iterations_count"] for t in s["tasks"]]
+                          for s in data["scenarios"]])
+
+    def test_all_iterations_failed(self):
+        trend = trends.Trends()
+        trend.add_task({"uuid": "a", "created_at": "a"},
+                       [_result(stats=_stats((1.0, ["e"])), failed=2)])
+        series = dict(trend.render()["scenarios"][0]["actions"][1]["series"])
+        self.assertEqual([], series["max"])
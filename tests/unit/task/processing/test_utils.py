@@ -99,3 +99,46 @@ class GraphZipperTestCase(test.TestCase):
         self.assertRaises(TypeError, merger.add_point)
         [merger.add_point(1) for value in range(10)]
         self.assertRaises(RuntimeError, merger.add_point, 1)
+
+
+@ddt.ddt
+class MinMaxGraphZipperTestCase(test.TestCase):
+
+    @ddt.data({"data_stream": list(range(1, 11)), "zipped_size": 8,
+               "expected": [[1, 1], [3, 3], [4, 4], [6, 6], [7, 7], [9, 9],
+                            [10, 10]]},
+              {"data_stream": [1, 42, 2, 3, 0, 4, 5, 6, 7, 8],
+               "zipped_size": 4,
+               "expected": [[1, 42], [5, 0], [6, 4], [10, 8]]},
+              {"data_stream": [5, 1, 3, 2], "zipped_size": 2,
+               "expected": [[1, 5], [4, 1]]},
+              {"data_stream": list(range(1, 100)), "zipped_size": 1000,
+               "expected": [[i, i] for i in range(1, 100)]},
+              {"data_stream": [1, 4, 11, None, 42], "zipped_size": 1000,
+               "expected": [[1, 1], [2, 4], [3, 11], [4, 0], [5, 42]]})
+    @ddt.unpack
+    def test_add_point_and_get_zipped_graph(self, data_stream=None,
+                                            zipped_size=None, expected=None):
+        merger = utils.MinMaxGraphZipper(len(data_stream), zipped_size)
+        [merger.add_point(value) for value in data_stream]
+        self.assertEqual(expected, merger.get_zipped_graph())
+
+    def test_zipped_size(self):
+        merger = utils.MinMaxGraphZipper(100001, 1000)
+        [merger.add_point(value % 7) for value in range(100001)]
+        graph = merger.get_zipped_graph()
+        self.assertLessEqual(len(graph), 1000)
+        self.assertEqual([0, 6], [min(p[1] for p in graph),
+                                  max(p[1] for p in graph)])
+        self.assertEqual(100001, graph[-1][0])
+
+    def test_get_zipped_graph_incomplete_bucket(self):
+        merger = utils.MinMaxGraphZipper(10, 4)
+        [merger.add_point(value) for value in (3, 1, 2)]
+        self.assertEqual([[1, 3], [3, 1]], merger.get_zipped_graph())
+
+    def test_add_point_raises(self):
+        merger = utils.MinMaxGraphZipper(10, 8)
+        self.assertRaises(TypeError, merger.add_point)
+        [merger.add_point(1) for value in range(10)]
+        self.assertRaises(RuntimeError, merger.add_point, 1)
@@ -17,12 +17,31 @@
 import jsonschema
 import mock
 
+from rally.common import utils
 from rally import exceptions
 from rally.task import context
 from tests.unit import fakes
 from tests.unit import test
 
 
+@context.configure(name="test_not_mapping", order=1)
+class NotMappingContext(context.Context):
+    setup = cleanup = mock.Mock()
+
+
+@context.configure(name="test_mapping", order=2)
+class MappingContext(context.Context):
+    setup = cleanup = mock.Mock()
+
+    def map_for_scenario(self, context_obj):
+        context_obj["user"] = context_obj["users"][0]
+        return context_obj
+
+
+MAPPING_CONTEXTS = {"test_not_mapping": NotMappingContext,
+                    "test_mapping": MappingContext}
+
+
 class BaseContextTestCase(test.TestCase):
 
     def test_init(self):
@@ -128,6 +147,16 @@ class BaseContextTestCase(test.TestCase):
         self.assertFalse(FakeOtherContext(ctx) == fakes.FakeContext(ctx))
         self.assertTrue(FakeOtherContext(ctx) == FakeOtherContext(ctx))
 
+    def test_is_mapping(self):
+
+        @context.configure(name="mapping", order=1)
+        class FakeMappingContext(fakes.FakeContext):
+            def map_for_scenario(self, context_obj):
+                return context_obj
+
+        self.assertFalse(fakes.FakeContext.is_mapping())
+        self.assertTrue(FakeMappingContext.is_mapping())
+
 
 class ContextManagerTestCase(test.TestCase):
 
@@ -243,3 +272,31 @@ class ContextManagerTestCase(test.TestCase):
         finally:
             mock_context_manager_setup.assert_called_once_with()
             mock_context_manager_cleanup.assert_called_once_with()
+
+    @mock.patch("rally.task.context.Context.get")
+    def test_map_for_scenario(self, mock_context_get):
+        mock_context_get.side_effect = MAPPING_CONTEXTS.get
+        ctx_object = {"config": {"test_not_mapping": {}, "test_mapping": {}},
+                      "task": {"uuid": "foo"}, "users": [{"id": "u1"}]}
+
+        result = context.ContextManager(ctx_object).map_for_scenario()
+
+        self.assertEqual(dict(ctx_object, user={"id": "u1"}), result)
+        self.assertIsNot(ctx_object["users"], result["users"])
+        self.assertNotIn("user", ctx_object)
+
+    @mock.patch("rally.task.context.Context.get")
+    def test_map_for_scenario_locked(self, mock_context_get):
+        mock_context_get.side_effect = MAPPING_CONTEXTS.get
+        ctx_object = utils.LockedDict(
+            {"config": {"test_not_mapping": {}, "test_mapping": {}},
+             "task": {"uuid": "foo"}, "users": [{"id": "u1"}]})
+
+        with mock.patch.object(NotMappingContext, "__init__") as mock_init:
+            result = context.ContextManager(ctx_object).map_for_scenario()
+            self.assertFalse(mock_init.called)
+
+        self.assertEqual(dict(ctx_object, user={"id": "u1"}), result)
+        self.assertNotIsInstance(result, utils.LockedDict)
+        self.assertIs(ctx_object["users"][0], result["user"])
+        self.assertNotIn("user", ctx_object)
@@ -0,0 +1,192 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from rally.common import objects
+from rally import consts
+from rally import exceptions
+from rally.task import distributed
+from tests.unit import test
+
+
+DISTRIBUTED = "rally.task.distributed."
+STATUSES = consts.DistributedChunkStatus
+
+
+class ContextSerializationTestCase(test.TestCase):
+
+    def test_serialize_context(self):
+        endpoint = objects.Endpoint("http://example.com", "admin", "pwd",
+                                    tenant_name="demo")
+        task = objects.Task(task={"uuid": "task_uuid"})
+        context = {"task": task, "admin": {"endpoint": endpoint},
+                   "users": [{"id": "u1", "endpoint": endpoint}],
+                   "config": {"dummy": (1, 2.5, None, True)}}
+
+        serialized = distributed.serialize_context(context)
+
+        self.assertEqual({"uuid": "task_uuid"}, serialized["task"])
+        self.assertEqual(endpoint.to_dict(include_permission=True),
+                         serialized["admin"]["endpoint"]["__endpoint__"])
+        self.assertEqual([1, 2.5, None, True],
+                         serialized["config"]["dummy"])
+
+        restored = distributed.deserialize_context(serialized)
+        self.assertIsInstance(restored["users"][0]["endpoint"],
+                              objects.Endpoint)
+        self.assertEqual(endpoint.to_dict(include_permission=True),
+                         restored["admin"]["endpoint"].to_dict(
+                             include_permission=True))
+        self.assertEqual({"uuid": "task_uuid"}, restored["task"])
+
+    def test_serialize_context_invalid(self):
+        self.assertRaises(exceptions.RallyException,
+                          distributed.serialize_context,
+                          {"config": {"foo": object()}})
+
+
+class WorkerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(WorkerTestCase, self).setUp()
+        self.worker = distributed.Worker("w1")
+        self.chunk = {"id": 1, "task_uuid": "task_uuid", "start": 10,
+                      "count": 3,
+                      "data": {"scenario": "Dummy.dummy",
+                               "args": {"sleep": 0},
+                               "concurrency": 5, "timeout": 0,
+                               "context": {"task": {"uuid": "task_uuid"}}}}
+
+    @mock.patch(DISTRIBUTED + "socket.gethostname", return_value="host")
+    def test_hostname(self, mock_gethostname):
+        self.assertEqual("host", distributed.Worker().hostname)
+
+    @mock.patch(DISTRIBUTED + "db")
+    def test__register(self, mock_db):
+        self.worker._register()
+        mock_db.register_worker.assert_called_once_with({"hostname": "w1"})
+        self.assertFalse(mock_db.update_worker.called)
+
+    @mock.patch(DISTRIBUTED + "db")
+    def test__register_already_registered(self, mock_db):
+        mock_db.register_worker.side_effect = (
+            exceptions.WorkerAlreadyRegistered(worker="w1"))
+        self.worker._register()
+        mock_db.update_worker.assert_called_once_with("w1")
+
+    @mock.patch(DISTRIBUTED + "db")
+    def test_run(self, mock_db):
+        def claim(hostname):
+            if mock_db.distributed_chunk_claim.call_count == 2:
+                self.worker.stop()
+                return None
+            return self.chunk
+
+        mock_db.distributed_chunk_claim.side_effect = claim
+        self.worker.run_chunk = mock.Mock()
+
+        self.worker.run()
+
+        self.worker.run_chunk.assert_called_once_with(self.chunk)
+        mock_db.register_worker.assert_called_once_with({"hostname": "w1"})
+        mock_db.unregister_worker.assert_called_once_with("w1")
+
+    @mock.patch(DISTRIBUTED + "db")
+    def test_run_unregisters_on_error(self, mock_db):
+        mock_db.distributed_chunk_claim.side_effect = KeyboardInterrupt
+        self.assertRaises(KeyboardInterrupt, self.worker.run)
+        mock_db.unregister_worker.assert_called_once_with("w1")
+        self.assertTrue(self.worker.stopped.is_set())
+
+    @mock.patch(DISTRIBUTED + "db")
+    def test__send_results(self, mock_db):
+        runner_obj = mock.Mock()
+        runner_obj.result_queue.get_batch.side_effect = [[{"a": 1}], None]
+        runner_obj.aborted.is_set.return_value = False
+        mock_db.distributed_chunk_update.return_value = True
+
+        self.worker._send_results(self.chunk, runner_obj)
+
+        mock_db.distributed_result_create.assert_called_once_with(
+            1, "w1", mock.ANY, [{"a": 1}])
+        self.assertEqual([STATUSES.RUNNING],
+                         mock_db.distributed_chunk_update.call_args[1][
+                             "statuses"])
+        self.assertFalse(runner_obj.abort.called)
+
+    @mock.patch(DISTRIBUTED + "db")
+    def test__send_results_chunk_taken_away(self, mock_db):
+        runner_obj = mock.Mock()
+        runner_obj.result_queue.get_batch.side_effect = [[{"a": 1}], None]
+        runner_obj.aborted.is_set.return_value = False
+        mock_db.distributed_chunk_update.return_value = False
+
+        self.worker._send_results(self.chunk, runner_obj)
+
+        runner_obj.abort.assert_called_once_with()
+
+    @mock.patch(DISTRIBUTED + "db")
+    @mock.patch(DISTRIBUTED + "runner.ScenarioRunner.get")
+    def test_run_chunk(self, mock_scenario_runner_get, mock_db):
+        runner_obj = mock_scenario_runner_get.return_value.return_value
+        runner_obj.result_queue.get_batch.return_value = None
+        runner_obj.aborted.is_set.return_value = False
+
+        self.worker.run_chunk(self.chunk)
+
+        mock_scenario_runner_get.assert_called_once_with("constant")
+        mock_scenario_runner_get.return_value.assert_called_once_with(
+            {"uuid": "task_uuid"},
+            {"type": "constant", "times": 3, "concurrency": 3})
+        self.assertEqual(10, runner_obj.first_iteration)
+        runner_obj.run.assert_called_once_with(
+            "Dummy.dummy", {"task": {"uuid": "task_uuid"}}, {"sleep": 0})
+        runner_obj.result_queue.close.assert_called_once_with()
+        mock_db.distributed_chunk_update.assert_called_once_with(
+            1, {"status": STATUSES.FINISHED},
+            statuses=[STATUSES.RUNNING, STATUSES.ABORTING], worker="w1")
+
+    @mock.patch(DISTRIBUTED + "db")
+    @mock.patch(DISTRIBUTED + "runner.ScenarioRunner.get")
+    def test_run_chunk_failed(self, mock_scenario_runner_get, mock_db):
+        self.chunk["data"]["timeout"] = 10
+        runner_obj = mock_scenario_runner_get.return_value.return_value
+        runner_obj.result_queue.get_batch.return_value = None
+        runner_obj.aborted.is_set.return_value = False
+        runner_obj.run.side_effect = ValueError("foo")
+
+        self.worker.run_chunk(self.chunk)
+
+        mock_scenario_runner_get.return_value.assert_called_once_with(
+            {"uuid": "task_uuid"},
+            {"type": "constant", "times": 3, "concurrency": 3,
+             "timeout": 10})
+        mock_db.distributed_chunk_update.assert_called_once_with(
+            1, {"status": STATUSES.FAILED, "error": "ValueError: foo"},
+            statuses=[STATUSES.RUNNING, STATUSES.ABORTING], worker="w1")
+
+    @mock.patch(DISTRIBUTED + "db")
+    @mock.patch(DISTRIBUTED + "runner.ScenarioRunner.get")
+    def test_run_chunk_aborted(self, mock_scenario_runner_get, mock_db):
+        runner_obj = mock_scenario_runner_get.return_value.return_value
+        runner_obj.result_queue.get_batch.return_value = None
+        runner_obj.aborted.is_set.return_value = True
+
+        self.worker.run_chunk(self.chunk)
+
+        mock_db.distributed_chunk_update.assert_called_once_with(
+            1, {"status": STATUSES.ABORTED},
+            statuses=[STATUSES.RUNNING, STATUSES.ABORTING], worker="w1")
@@ -15,7 +15,6 @@
 
 """Tests for the Test engine."""
 
-import collections
 import copy
 
 import jsonschema
@@ -24,6 +23,7 @@ import mock
 from rally import consts
 from rally import exceptions
 from rally.task import engine
+from rally.task import runner as runner_module
 from tests.unit import fakes
 from tests.unit import test
 
@@ -103,34 +103,38 @@ class BenchmarkEngineTestCase(test.TestCase):
         self.assertRaises(exceptions.InvalidTaskException, eng.validate)
         self.assertTrue(task.set_failed.called)
 
-    @mock.patch("rally.task.engine.scenario.Scenario.get_all")
-    def test__validate_config_scenarios_name(self, mock_scenario_get_all):
+    @mock.patch("rally.task.engine.scenario.Scenario.get")
+    def test__validate_config_scenarios_name(self, mock_scenario_get):
         config = {
             "a": [],
             "b": []
         }
 
-        mock_scenario_get_all.return_value = [
-            mock.MagicMock(get_name=lambda: "e"),
-            mock.MagicMock(get_name=lambda: "b"),
-            mock.MagicMock(get_name=lambda: "a")
-        ]
         eng = engine.BenchmarkEngine(config, mock.MagicMock())
         eng._validate_config_scenarios_name(config)
+        self.assertEqual([mock.call("a"), mock.call("b")],
+                         mock_scenario_get.mock_calls)
 
-    @mock.patch("rally.task.engine.scenario.Scenario")
-    def test__validate_config_scenarios_name_non_exsisting(self,
-                                                           mock_scenario):
+    @mock.patch("rally.task.engine.scenario.Scenario.get")
+    def test__validate_config_scenarios_name_non_exsisting(
+            self, mock_scenario_get):
         config = {
             "exist": [],
             "nonexist1": [],
             "nonexist2": []
         }
-        mock_scenario.list_benchmark_scenarios.return_value = ["exist", "aaa"]
+
+        def get(name):
+            if name != "exist":
+                raise exceptions.PluginNotFound(name=name,
+                                                namespace="any of")
+
+        mock_scenario_get.side_effect = get
         eng = engine.BenchmarkEngine(config, mock.MagicMock())
 
-        self.assertRaises(exceptions.NotFoundScenarios,
-                          eng._validate_config_scenarios_name, config)
+        e = self.assertRaises(exceptions.NotFoundScenarios,
+                              eng._validate_config_scenarios_name, config)
+        self.assertIn("nonexist1, nonexist2", str(e))
 
     @mock.patch("rally.task.engine.runner.ScenarioRunner.validate")
     @mock.patch("rally.task.engine.context.ContextManager.validate")
@@ -464,19 +468,35 @@ class BenchmarkEngineTestCase(test.TestCase):
 
 class ResultConsumerTestCase(test.TestCase):
 
+    def setUp(self):
+        super(ResultConsumerTestCase, self).setUp()
+        # NOTE: results in these tests are not real iterations
+        self.mock_live_stats = mock.patch(
+            "rally.task.engine.live.LiveStats").start()
+        self.mock_scenario_stats = mock.patch(
+            "rally.task.engine.aggregation.ScenarioStats").start()
+
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
     @mock.patch("rally.task.sla.SLAChecker")
+    @mock.patch("rally.osclients.keystone_cache")
     def test_consume_results(
-            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
-            mock_task_get_status):
+            self, mock_keystone_cache, mock_sla_checker,
+            mock_result_consumer_wait_and_abort, mock_task_get_status):
+        mock_keystone_cache.stats.side_effect = [{"hits": 2, "misses": 1},
+                                                 {"hits": 7, "misses": 3}]
         mock_sla_instance = mock.MagicMock()
+        mock_sla_instance.results.return_value = [{"success": True},
+                                                  {"success": False}]
         mock_sla_checker.return_value = mock_sla_instance
         mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        self.mock_live_stats.return_value.iterations = 2
+        self.mock_live_stats.return_value.errors = 1
         key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
         task = mock.MagicMock()
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque([1, 2])
+        runner.get_stats.return_value = {"foo": "bar"}
+        runner.result_queue = runner_module.ResultQueue([1, 2])
         with engine.ResultConsumer(
                 key, task, runner, False) as consumer_obj:
             pass
@@ -484,7 +504,55 @@ class ResultConsumerTestCase(test.TestCase):
         expected_iteration_calls = [mock.call(1), mock.call(2)]
         self.assertEqual(expected_iteration_calls,
                          mock_sla_instance.add_iteration.mock_calls)
-        self.assertEqual([1, 2], consumer_obj.results)
+        self.assertEqual([], consumer_obj.results)
+        task.append_results.assert_called_once_with(
+            key, {"raw": [], "load_duration": 0, "full_duration": 0,
+                  "sla": [], "completed": False})
+        result_id = task.append_results.return_value["id"]
+        task.append_results_chunk.assert_called_once_with(
+            result_id, 0, [1, 2])
+        live = self.mock_live_stats.return_value.to_dict.return_value
+        task.update_results.assert_called_once_with(
+            result_id, {"raw": [],
+                        "load_duration": runner.run_duration,
+                        "full_duration": mock.ANY,
+                        "runner_stats": {"foo": "bar",
+                                         "keystone_cache_hits": 5,
+                                         "keystone_cache_misses": 2},
+                        "sla": mock_sla_instance.results.return_value,
+                        "live": live},
+            summary={"iterations_count": 2,
+                     "failed_iterations_count": 1,
+                     "load_duration": runner.run_duration,
+                     "full_duration": mock.ANY,
+                     "sla_success": False})
+        self.assertEqual([mock.call(1), mock.call(2)],
+                         self.mock_live_stats.return_value.add.mock_calls)
+        self.assertEqual([mock.call(1), mock.call(2)],
+                         self.mock_scenario_stats.return_value.add.mock_calls)
+        task.append_results_stats.assert_called_once_with(
+            result_id, self.mock_scenario_stats.return_value)
+
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_by_chunks(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status):
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        runner = mock.MagicMock()
+        runner.result_queue = runner_module.ResultQueue([1, 2, 3, 4, 5])
+        with mock.patch.object(engine.ResultConsumer, "CHUNK_SIZE", 2):
+            with engine.ResultConsumer(key, task, runner, False):
+                pass
+
+        result_id = task.append_results.return_value["id"]
+        self.assertEqual(
+            [mock.call(result_id, 0, [1, 2]), mock.call(result_id, 1, [3, 4]),
+             mock.call(result_id, 2, [5])],
+            task.append_results_chunk.call_args_list)
 
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
@@ -499,7 +567,7 @@ class ResultConsumerTestCase(test.TestCase):
         key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
         task = mock.MagicMock()
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque([1, 2, 3, 4])
+        runner.result_queue = runner_module.ResultQueue([1, 2, 3, 4])
 
         with engine.ResultConsumer(key, task, runner, True):
             pass
@@ -513,7 +581,7 @@ class ResultConsumerTestCase(test.TestCase):
     def test_consume_results_abort_manually(self, mock_sla_checker,
                                             mock_event, mock_thread,
                                             mock_task_get_status):
-        runner = mock.MagicMock(result_queue=False)
+        runner = mock.MagicMock(result_queue=runner_module.ResultQueue())
 
         is_done = mock.MagicMock()
         is_done.isSet.side_effect = (False, True)
@@ -546,7 +614,7 @@ class ResultConsumerTestCase(test.TestCase):
         key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
         task = mock.MagicMock()
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque([1, 2, 3, 4])
+        runner.result_queue = runner_module.ResultQueue([1, 2, 3, 4])
 
         with engine.ResultConsumer(key, task, runner, False):
             pass
@@ -565,7 +633,7 @@ class ResultConsumerTestCase(test.TestCase):
         key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
         task = mock.MagicMock()
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque([1])
+        runner.result_queue = runner_module.ResultQueue([1])
         exc = TestException()
         try:
             with engine.ResultConsumer(key, task, runner, False):
@@ -576,6 +644,31 @@ class ResultConsumerTestCase(test.TestCase):
         mock_sla_instance.set_unexpected_failure.assert_has_calls(
             [mock.call(exc)])
 
+    @mock.patch("rally.task.engine.CONF")
+    @mock.patch("rally.task.engine.time.time", return_value=15)
+    @mock.patch("rally.task.engine.threading.Thread")
+    @mock.patch("rally.task.engine.threading.Event")
+    def test__publish_live_stats(self, mock_event, mock_thread, mock_time,
+                                 mock_conf):
+        mock_conf.benchmark.live_stats_interval = 3
+        task = mock.MagicMock()
+        task.update_results.side_effect = [None, Exception("DB is gone")]
+        mock_is_done = mock_event.return_value
+        mock_is_done.is_set.side_effect = [False, False, True]
+        consumer = engine.ResultConsumer(mock.MagicMock(), task,
+                                         mock.MagicMock(), False)
+        consumer.result_id = 42
+        consumer.start = 10
+
+        consumer._publish_live_stats()
+
+        self.assertEqual([mock.call(3)] * 3, mock_is_done.wait.mock_calls)
+        live_stats = self.mock_live_stats.return_value.to_dict.return_value
+        task.update_results.assert_called_with(
+            42, {"raw": [], "load_duration": 0, "full_duration": 5,
+                 "sla": [], "completed": False, "live": live_stats})
+        self.assertEqual(2, task.update_results.call_count)
+
     @mock.patch("rally.task.engine.threading.Thread")
     @mock.patch("rally.task.engine.threading.Event")
     @mock.patch("rally.common.objects.Task.get_status")
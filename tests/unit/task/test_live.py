@@ -0,0 +1,80 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from rally.task import live
+from tests.unit import test
+
+
+def _result(timestamp, duration, error=None, **atomic_actions):
+    return {"timestamp": timestamp, "duration": duration,
+            "idle_duration": 0, "error": error or [],
+            "atomic_actions": atomic_actions, "scenario_output": {}}
+
+
+class LiveStatsTestCase(test.TestCase):
+
+    @mock.patch("rally.task.live.time.time", return_value=100.0)
+    def test_to_dict_empty(self, mock_time):
+        stats = live.LiveStats(window=10)
+        self.assertEqual(
+            {"updated_at": 100.0, "iterations": 0, "errors": 0,
+             "window": 10, "throughput": 0.0, "error_rate": 0.0,
+             "actions": [{"name": "total", "count": 0, "50%ile": None,
+                          "95%ile": None}]},
+            stats.to_dict())
+
+    def test_window_default(self):
+        self.assertEqual(60.0, live.LiveStats().window)
+
+    @mock.patch("rally.task.live.time.time", return_value=0.0)
+    def test_to_dict(self, mock_time):
+        stats = live.LiveStats(window=10)
+        # NOTE: the first iteration finishes out of the window
+        stats.add(_result(1, 2, a=1.5))
+        for i in range(4):
+            stats.add(_result(10 + i, 1 + i, a=0.5 + i, b=0.1))
+        stats.add(_result(15, 2, error=["Error", "msg", ""], a=None))
+
+        snapshot = stats.to_dict(now=20.0)
+
+        self.assertEqual(20.0, snapshot["updated_at"])
+        self.assertEqual(6, snapshot["iterations"])
+        self.assertEqual(1, snapshot["errors"])
+        self.assertEqual(0.5, snapshot["throughput"])
+        self.assertEqual(0.2, snapshot["error_rate"])
+        self.assertEqual(
+            [{"name": "a", "count": 4, "50%ile": 2.0, "95%ile": 3.35},
+             {"name": "b", "count": 4, "50%ile": 0.1, "95%ile": 0.1},
+             {"name": "total", "count": 4, "50%ile": 2.5, "95%ile": 3.85}],
+            [dict(a, **{"95%ile": round(a["95%ile"], 2)})
+             for a in snapshot["actions"]])
+
+    def test_add_drops_old_iterations(self):
+        stats = live.LiveStats(window=10)
+        for i in range(1000):
+            stats.add(_result(i, 1))
+
+        self.assertEqual(1000, stats.iterations)
+        self.assertEqual(11, len(stats._recent))
+        self.assertEqual(990, stats._recent[0][0])
+
+    @mock.patch("rally.task.live.time.time", return_value=0.0)
+    def test_to_dict_throughput_at_start(self, mock_time):
+        stats = live.LiveStats(window=60)
+        for i in range(10):
+            stats.add(_result(0, 1))
+        self.assertEqual(2.0, stats.to_dict(now=5.0)["throughput"])
@@ -0,0 +1,139 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import ddt
+import mock
+
+from rally import exceptions
+from rally.task import overhead
+from tests.unit import test
+
+
+@ddt.ddt
+class OverheadTestCase(test.TestCase):
+
+    def test_default_suite(self):
+        suite = overhead.default_suite(iterations=10, duration=2)
+        workloads = suite["Dummy.dummy"]
+        runners = [w["runner"] for w in workloads]
+
+        self.assertEqual(["Dummy.dummy"], list(suite))
+        self.assertEqual(
+            1 + 2 * len(overhead.CONCURRENCY_LEVELS) +
+            len(overhead.RPS_LEVELS), len(runners))
+        self.assertEqual({"type": "serial", "times": 10}, runners[0])
+        self.assertIn({"type": "constant", "times": 10, "concurrency": 50},
+                      runners)
+        self.assertIn({"type": "constant_for_duration", "duration": 2,
+                       "concurrency": 5}, runners)
+        self.assertIn({"type": "rps", "times": 200, "rps": 100}, runners)
+        for workload in workloads:
+            self.assertEqual({"sleep": 0}, workload["args"])
+        overhead.validate(suite)
+
+    @ddt.data(
+        {"NovaServers.boot_server": [{"runner": {"type": "serial"}}]},
+        {"Dummy.dummy": [{"runner": {"type": "serial"},
+                          "context": {"users": {}}}]},
+        {"Dummy.dummy": [{"runner": {"type": "serial", "times": 0}}]},
+        {"Dummy.dummy": [{"runner": {"type": "serial"},
+                          "sla": {"unknown_sla": 1}}]},
+        {"Dummy.dummy": {"runner": {"type": "serial"}}})
+    def test_validate_invalid(self, config):
+        self.assertRaises(exceptions.InvalidTaskException,
+                          overhead.validate, config)
+
+    def test_run_workload(self):
+        result = overhead.run_workload(
+            "Dummy.dummy", {"runner": {"type": "serial", "times": 5},
+                            "sla": {"failure_rate": {"max": 0}}})
+
+        self.assertEqual({"type": "serial", "times": 5}, result["runner"])
+        self.assertEqual(5, result["iterations"])
+        self.assertEqual(0, result["errors"])
+        self.assertGreater(result["iterations_per_sec"], 0)
+        self.assertGreaterEqual(result["full_duration"],
+                                result["load_duration"])
+        self.assertEqual(set(["mean", "95%ile", "max"]),
+                         set(result["scheduling_delay"]))
+        self.assertIsNotNone(result["scheduling_delay"]["max"])
+        self.assertGreaterEqual(result["parent_cpu"], 0)
+        self.assertGreaterEqual(result["memory_kb_per_1k_iterations"], 0)
+        self.assertEqual([{"criterion": "failure_rate", "success": True,
+                           "detail": mock.ANY}], result["sla"])
+
+    def test_run_workload_errors(self):
+        result = overhead.run_workload(
+            "Dummy.dummy_exception",
+            {"runner": {"type": "serial", "times": 3}})
+
+        self.assertEqual(3, result["iterations"])
+        self.assertEqual(3, result["errors"])
+
+    def test__overhead_consumer_delay(self):
+        consumer = overhead._OverheadConsumer(mock.Mock(), mock.Mock())
+        self.assertEqual({"mean": None, "95%ile": None, "max": None},
+                         consumer.delay())
+
+        result = {"timestamp": 1.0, "duration": 1.0, "idle_duration": 0.5}
+        consumer._add_delay(result)
+        consumer._add_delay(dict(result, timestamp=3.0))
+        consumer._add_delay(dict(result, start_lag=0.25))
+        consumer._add_delay(dict(result, runner_overhead=0.75))
+
+        delay = consumer.delay()
+        self.assertAlmostEqual(0.5, delay["mean"])
+        self.assertAlmostEqual(0.75, delay["max"])
+
+    @mock.patch("rally.task.overhead.run_workload")
+    def test_run(self, mock_run_workload):
+        mock_run_workload.side_effect = [
+            {"runner": {"type": "constant"}, "iterations_per_sec": 10.0},
+            {"runner": {"type": "constant"}, "iterations_per_sec": 30.0},
+            {"runner": {"type": "rps"}, "iterations_per_sec": 20.0}]
+        config = {"Dummy.dummy": [
+            {"runner": {"type": "constant", "concurrency": 1}},
+            {"runner": {"type": "constant", "concurrency": 2}},
+            {"runner": {"type": "rps", "rps": 20}}]}
+
+        results = overhead.run(config)
+
+        self.assertEqual(3, len(results["workloads"]))
+        self.assertEqual({"constant": 30.0, "rps": 20.0}, results["summary"])
+        mock_run_workload.assert_has_calls(
+            [mock.call("Dummy.dummy", kw) for kw in config["Dummy.dummy"]])
+
+    @mock.patch("rally.task.overhead.run_workload")
+    @mock.patch("rally.task.overhead.default_suite")
+    def test_run_default_suite(self, mock_default_suite, mock_run_workload):
+        mock_default_suite.return_value = {
+            "Dummy.dummy": [{"runner": {"type": "serial"}}]}
+        mock_run_workload.return_value = {"runner": {"type": "serial"},
+                                          "iterations_per_sec": 5.0}
+
+        self.assertEqual({"serial": 5.0}, overhead.run()["summary"])
+        mock_default_suite.assert_called_once_with()
+
+    def test_find_regressions(self):
+        baseline = {"summary": {"serial": 100.0, "constant": 100.0,
+                                "rps": 100.0}}
+        results = {"summary": {"serial": 85.0, "constant": 75.0}}
+
+        self.assertEqual([("constant", 100.0, 75.0)],
+                         overhead.find_regressions(results, baseline))
+        self.assertEqual([("constant", 100.0, 75.0),
+                          ("serial", 100.0, 85.0)],
+                         overhead.find_regressions(results, baseline,
+                                                   tolerance=0.1))
@@ -15,10 +15,14 @@
 
 import collections
 import multiprocessing
+import time
 
+import ddt
 import jsonschema
 import mock
+from six.moves import queue as Queue
 
+from rally.common import utils as rutils
 from rally.plugins.common.runners import serial
 from rally.task import runner
 from rally.task import scenario
@@ -124,6 +128,7 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
                          ["Exception", "Something went wrong"])
 
 
+@ddt.ddt
 class ScenarioRunnerResultTestCase(test.TestCase):
 
     def test_validate(self):
@@ -153,10 +158,77 @@ class ScenarioRunnerResultTestCase(test.TestCase):
         self.assertEqual(config[0], runner.ScenarioRunnerResult(config[0]))
         self.assertEqual(config[1], runner.ScenarioRunnerResult(config[1]))
 
-    def test_validate_failed(self):
+    @ddt.data(True, False)
+    def test_validate_failed(self, strict):
         config = {"a": 10}
         self.assertRaises(jsonschema.ValidationError,
-                          runner.ScenarioRunnerResult, config)
+                          runner.ScenarioRunnerResult, config, strict=strict)
+
+    @ddt.data(
+        {"result": {"duration": 1, "timestamp": 2.0, "idle_duration": 0,
+                    "runner_overhead": 0.1, "start_lag": 0.2,
+                    "scenario_output": {"data": {"a": 1}, "errors": ""},
+                    "atomic_actions": {"a": 1.0, "b": None},
+                    "error": []},
+         "valid": True},
+        {"result": {}, "valid": True},
+        {"result": [], "valid": False},
+        {"result": {"duration": "1"}, "valid": False},
+        {"result": {"duration": True}, "valid": False},
+        {"result": {"start_lag": None}, "valid": False},
+        {"result": {"scenario_output": []}, "valid": False},
+        {"result": {"scenario_output": {"foo": {}}}, "valid": False},
+        {"result": {"scenario_output": {"data": []}}, "valid": False},
+        {"result": {"scenario_output": {"data": {"a": "1"}}},
+         "valid": False},
+        {"result": {"scenario_output": {"errors": None}}, "valid": False},
+        {"result": {"atomic_actions": []}, "valid": False},
+        {"result": {"atomic_actions": {"a": "1"}}, "valid": False},
+        {"result": {"error": "error"}, "valid": False},
+        {"result": {"error": [1]}, "valid": False}
+    )
+    @ddt.unpack
+    def test_validate_matches_schema(self, result, valid):
+        for strict in (True, False):
+            if valid:
+                self.assertEqual(
+                    result, runner.ScenarioRunnerResult(result, strict=strict))
+            else:
+                self.assertRaises(jsonschema.ValidationError,
+                                  runner.ScenarioRunnerResult, result,
+                                  strict=strict)
+
+    @mock.patch(BASE + "jsonschema.validate")
+    @mock.patch(BASE + "CONF")
+    def test_strict_option(self, mock_conf, mock_validate):
+        result = {"duration": 1.0}
+        mock_conf.benchmark.strict_result_validation = False
+        runner.ScenarioRunnerResult(result)
+        self.assertFalse(mock_validate.called)
+
+        mock_conf.benchmark.strict_result_validation = True
+        runner.ScenarioRunnerResult(result)
+        mock_validate.assert_called_once_with(
+            result, runner.ScenarioRunnerResult.RESULT_SCHEMA)
+
+    @mock.patch(BASE + "ScenarioRunnerResult.validate")
+    @mock.patch(BASE + "jsonschema.validate")
+    @mock.patch(BASE + "CONF")
+    def test_strict_argument(self, mock_conf, mock_jsonschema_validate,
+                             mock_validate):
+        # NOTE: the argument has priority over strict_result_validation
+        result = {"duration": 1.0}
+        mock_conf.benchmark.strict_result_validation = True
+        runner.ScenarioRunnerResult(result, strict=False)
+        mock_validate.assert_called_once_with(result)
+        self.assertFalse(mock_jsonschema_validate.called)
+
+        mock_validate.reset_mock()
+        mock_conf.benchmark.strict_result_validation = False
+        runner.ScenarioRunnerResult(result, strict=True)
+        mock_jsonschema_validate.assert_called_once_with(
+            result, runner.ScenarioRunnerResult.RESULT_SCHEMA)
+        self.assertFalse(mock_validate.called)
 
 
 class ScenarioRunnerTestCase(test.TestCase):
@@ -192,6 +264,8 @@ class ScenarioRunnerTestCase(test.TestCase):
         expected_config_kwargs = {"image": 1, "flavor": 1}
         runner_obj._run_scenario.assert_called_once_with(
             cls, method_name, context_obj, expected_config_kwargs)
+        self.assertIsInstance(runner_obj._run_scenario.call_args[0][2],
+                              rutils.LockedDict)
 
     def test_runner_send_result_exception(self):
         runner_obj = serial.SerialScenarioRunner(
@@ -233,7 +307,8 @@ class ScenarioRunnerTestCase(test.TestCase):
         processes = 10
         process_pool = collections.deque([process] * processes)
         mock_result_queue = mock.MagicMock(
-            empty=mock.MagicMock(return_value=True))
+            get=mock.MagicMock(side_effect=Queue.Empty),
+            get_nowait=mock.MagicMock(side_effect=Queue.Empty))
 
         runner_obj = serial.SerialScenarioRunner(
             mock.MagicMock(),
@@ -242,4 +317,81 @@ class ScenarioRunnerTestCase(test.TestCase):
         runner_obj._join_processes(process_pool, mock_result_queue)
 
         self.assertEqual(processes, process.join.call_count)
+        self.assertFalse(mock_scenario_runner__send_result.called)
         mock_result_queue.close.assert_called_once_with()
+
+    def test__join_processes_sends_batches(self):
+        process = mock.MagicMock(is_alive=mock.MagicMock(return_value=False))
+        mock_result_queue = mock.MagicMock(
+            get=mock.MagicMock(return_value=[{"a": 1}]),
+            get_nowait=mock.MagicMock(
+                side_effect=[[{"a": 2}, {"a": 3}], Queue.Empty, Queue.Empty]))
+
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+        runner_obj._send_results = mock.MagicMock()
+
+        runner_obj._join_processes(collections.deque([process]),
+                                   mock_result_queue)
+
+        self.assertEqual(
+            [mock.call([{"a": 1}, {"a": 2}, {"a": 3}]), mock.call([])],
+            runner_obj._send_results.mock_calls)
+
+    def test__send_results(self):
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+        result = {"duration": 1.0, "idle_duration": 0, "error": [],
+                  "scenario_output": {"errors": "", "data": {}},
+                  "atomic_actions": {}}
+
+        runner_obj._send_results([result, result])
+        runner_obj._send_results([])
+
+        self.assertEqual([result, result], runner_obj.result_queue.get_batch())
+
+
+class ResultQueueTestCase(test.TestCase):
+
+    def test_get_batch(self):
+        queue = runner.ResultQueue()
+        queue.put_batch([1, 2])
+        queue.put_batch([3])
+        self.assertEqual([1, 2, 3], queue.get_batch())
+        queue.close()
+        self.assertIsNone(queue.get_batch())
+
+    def test_get_batch_after_close(self):
+        queue = runner.ResultQueue([1])
+        queue.close()
+        self.assertEqual([1], queue.get_batch())
+        self.assertIsNone(queue.get_batch())
+
+
+class ResultBatcherTestCase(test.TestCase):
+
+    def test_put_full_batch(self):
+        mock_queue = mock.MagicMock()
+        batcher = runner.ResultBatcher(mock_queue, batch_size=2,
+                                       flush_interval=60)
+        batcher.put(1)
+        batcher.put(2)
+        batcher.put(3)
+        mock_queue.put.assert_called_once_with([1, 2])
+        batcher.close()
+        self.assertEqual([mock.call([1, 2]), mock.call([3])],
+                         mock_queue.put.mock_calls)
+
+    def test_flush_by_interval(self):
+        mock_queue = mock.MagicMock()
+        batcher = runner.ResultBatcher(mock_queue, batch_size=100,
+                                       flush_interval=0.01)
+        batcher.put(1)
+        for i in range(100):
+            if mock_queue.put.called:
+                break
+            time.sleep(0.01)
+        mock_queue.put.assert_called_once_with([1])
+        batcher.close()
@@ -14,6 +14,7 @@
 #    under the License.
 
 import datetime
+import threading
 
 from jsonschema import exceptions as schema_exceptions
 import mock
@@ -484,3 +485,137 @@ class WaitForStatusTestCase(test.TestCase):
                                     check_deletion=True,
                                     update_resource=upd)
         self.assertEqual(res, ret)
+
+
+class FakeServerManager(object):
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.list_calls = 0
+        self.get_calls = 0
+
+    def _resource(self, id, status):
+        return mock.Mock(id=id, user_id="user", manager=self, status=status)
+
+    def list(self):
+        self.list_calls += 1
+        return [self._resource(id, statuses.pop(0) if len(statuses) > 1
+                               else statuses[0])
+                for id, statuses in self.statuses.items()]
+
+    def get(self, id):
+        self.get_calls += 1
+        e = Exception("not found")
+        e.code = 404
+        raise e
+
+
+@mock.patch.dict(utils.StatusPoller.LISTERS,
+                 {"%s.FakeServerManager" % __name__: lambda m: m.list()})
+class StatusPollerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(StatusPollerTestCase, self).setUp()
+        self.poller = utils.StatusPoller(0.05)
+
+    def _wait(self, resource, **kwargs):
+        is_ready = utils._StatusChecker(resource, set(["ACTIVE"]),
+                                        set(["ERROR"]), "status")
+        return self.poller.wait(resource, utils.get_from_manager(), is_ready,
+                                check_interval=0.01, **kwargs)
+
+    def test_wait(self):
+        manager = FakeServerManager(
+            dict((i, ["BUILD", "BUILD", "ACTIVE"]) for i in range(10)))
+        results = []
+        threads = [threading.Thread(target=lambda r=r: results.append(
+                   self._wait(r, timeout=5)))
+                   for r in [manager._resource(i, "BUILD")
+                             for i in range(10)]]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(["ACTIVE"] * 10, [r.status for r in results])
+        self.assertEqual(0, manager.get_calls)
+        self.assertLess(manager.list_calls, 10)
+        self.assertEqual({}, self.poller._groups)
+
+    def test_wait_error_status(self):
+        manager = FakeServerManager({"foo": ["BUILD", "ERROR"]})
+        self.assertRaises(exceptions.GetResourceErrorStatus,
+                          self._wait, manager._resource("foo", "BUILD"))
+
+    def test_wait_not_listed(self):
+        manager = FakeServerManager({})
+        resource = manager._resource("foo", "BUILD")
+        self.assertRaises(exceptions.GetResourceNotFound,
+                          self._wait, resource)
+        self.assertIsNone(self._wait(resource, check_deletion=True))
+        self.assertEqual(2, manager.get_calls)
+
+    def test_wait_timeout(self):
+        manager = FakeServerManager({"foo": ["BUILD"]})
+        self.assertRaises(exceptions.TimeoutException,
+                          self._wait, manager._resource("foo", "BUILD"),
+                          timeout=0.1)
+        self.assertEqual({}, self.poller._groups)
+
+    def test__poll_status_attr(self):
+        update_resource = mock.Mock()
+        update_resource.check_resource.side_effect = lambda r: r
+        group = utils._StatusGroup(
+            lambda m: [mock.Mock(id="foo", status="ACTIVE", power="ON")], 1)
+
+        for status_attr, changed in (("power", True), ("status", False)):
+            waiter = utils._StatusWaiter(
+                mock.Mock(id="foo", status="ACTIVE", power="OFF"),
+                update_resource, lambda r: False, status_attr)
+            self.assertEqual(changed, self.poller._poll(group, [waiter]))
+            self.assertEqual("ON", waiter.resource.power)
+
+    def test_is_batchable(self):
+        manager = FakeServerManager({})
+        resource = manager._resource("foo", "BUILD")
+        upd = utils.get_from_manager()
+
+        self.assertTrue(utils.StatusPoller.is_batchable(resource, upd))
+        self.assertFalse(utils.StatusPoller.is_batchable(
+            resource, lambda r: r))
+        self.assertFalse(utils.StatusPoller.is_batchable(
+            mock.Mock(id="foo", user_id="user"), upd))
+        resource.user_id = None
+        self.assertFalse(utils.StatusPoller.is_batchable(resource, upd))
+
+    @mock.patch("rally.task.utils.CONF")
+    def test_is_batchable_disabled(self, mock_conf):
+        mock_conf.benchmark.batch_status_polling = False
+        resource = FakeServerManager({})._resource("foo", "BUILD")
+        self.assertFalse(utils.StatusPoller.is_batchable(
+            resource, utils.get_from_manager()))
+
+    @mock.patch("rally.task.utils.get_status_poller")
+    def test_wait_for_status_uses_poller(self, mock_get_status_poller):
+        resource = FakeServerManager({})._resource("foo", "BUILD")
+        upd = utils.get_from_manager()
+        poller = mock_get_status_poller.return_value
+
+        result = utils.wait_for_status(resource, ["ACTIVE"],
+                                       update_resource=upd, timeout=10,
+                                       check_interval=2)
+
+        self.assertEqual(poller.wait.return_value, result)
+        poller.wait.assert_called_once_with(
+            resource, upd, mock.ANY, timeout=10, check_interval=2,
+            check_deletion=False, status_attr="status")
+
+    @mock.patch("rally.task.utils.os.getpid")
+    def test_get_status_poller(self, mock_getpid):
+        mock_getpid.return_value = 1
+        poller = utils.get_status_poller()
+        self.assertIsInstance(poller, utils.StatusPoller)
+        self.assertIs(poller, utils.get_status_poller())
+
+        mock_getpid.return_value = 2
+        self.assertIsNot(poller, utils.get_status_poller())
@@ -43,7 +43,7 @@ class TestCase(base.BaseTestCase):
     def setUp(self):
         super(TestCase, self).setUp()
         self.addCleanup(mock.patch.stopall)
-        plugins.load()
+        plugins.load(lazy=False)
 
     def _test_atomic_action_timer(self, atomic_actions, name):
         action_duration = atomic_actions.get(name)
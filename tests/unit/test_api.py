@@ -303,15 +303,18 @@ class DeploymentAPITestCase(BaseDeploymentTestCase):
                           api.Deployment.create, self.deployment_config,
                           "fake_deployment")
 
+    @mock.patch("rally.api.users_ctx.drain_pool")
     @mock.patch("rally.common.objects.deploy.db.deployment_delete")
     @mock.patch("rally.common.objects.deploy.db.deployment_update")
     @mock.patch("rally.common.objects.deploy.db.deployment_get")
     def test_destroy(self, mock_deployment_get,
-                     mock_deployment_update, mock_deployment_delete):
+                     mock_deployment_update, mock_deployment_delete,
+                     mock_drain_pool):
         mock_deployment_get.return_value = self.deployment
         mock_deployment_update.return_value = self.deployment
         api.Deployment.destroy(self.deployment_uuid)
         mock_deployment_get.assert_called_once_with(self.deployment_uuid)
+        self.assertEqual(1, mock_drain_pool.call_count)
         mock_deployment_delete.assert_called_once_with(self.deployment_uuid)
 
     @mock.patch("rally.common.objects.deploy.db.deployment_update")
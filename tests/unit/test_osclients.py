@@ -14,6 +14,8 @@
 #    under the License.
 
 
+import threading
+
 from keystoneclient import exceptions as keystone_exceptions
 import mock
 from oslo_config import cfg
@@ -48,6 +50,67 @@ class CachedTestCase(test.TestCase):
             "foo_cached", cached(ins, "foo", bar="spam"))
 
 
+class KeystoneClientCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(KeystoneClientCacheTestCase, self).setUp()
+        self.cache = osclients.KeystoneClientCache()
+        self.endpoint = objects.Endpoint("http://auth_url", "user", "pass",
+                                         "tenant")
+
+    def _create(self, expire_soon=False):
+        client = mock.Mock()
+        client.auth_ref.will_expire_soon.return_value = expire_soon
+        return mock.Mock(return_value=client)
+
+    def test_get(self):
+        create = self._create()
+        client = self.cache.get(self.endpoint, create)
+        self.assertEqual(create.return_value, client)
+        self.assertEqual(client, self.cache.get(self.endpoint, create))
+        other = objects.Endpoint("http://auth_url", "other", "pass",
+                                 "tenant")
+        self.assertEqual(client, self.cache.get(other, create))
+
+        self.assertEqual(2, create.call_count)
+        self.assertEqual({"hits": 1, "misses": 2}, self.cache.stats())
+        client.auth_ref.will_expire_soon.assert_called_with(
+            cfg.CONF.openstack_client_token_stale_duration)
+
+    def test_get_expiring_token(self):
+        create = self._create(expire_soon=True)
+        self.cache.get(self.endpoint, create)
+        self.cache.get(self.endpoint, create)
+
+        self.assertEqual(2, create.call_count)
+        self.assertEqual({"hits": 0, "misses": 2}, self.cache.stats())
+
+    def test_get_from_threads(self):
+        create = self._create()
+        clients = []
+
+        def get():
+            clients.append(self.cache.get(self.endpoint, create))
+
+        threads = [threading.Thread(target=get) for i in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual([create.return_value] * 10, clients)
+        stats = self.cache.stats()
+        self.assertEqual(10, stats["hits"] + stats["misses"])
+
+    def test_clear(self):
+        create = self._create()
+        self.cache.get(self.endpoint, create)
+        self.cache.clear()
+        self.cache.get(self.endpoint, create)
+
+        self.assertEqual(2, create.call_count)
+
+
 class TestCreateKeystoneClient(test.TestCase):
 
     def setUp(self):
@@ -146,6 +209,18 @@ class OSClientsTestCase(test.TestCase):
         self.mock_create_keystone_client.assert_called_once_with(kwargs)
         self.assertEqual(self.fake_keystone, self.clients.cache["keystone"])
 
+    def test_keystone_with_cache(self):
+        cache = mock.Mock()
+        clients = osclients.Clients(self.endpoint, cache=cache)
+        client = clients.keystone()
+        self.assertEqual(cache.get.return_value, client)
+        cache.get.assert_called_once_with(self.endpoint, mock.ANY)
+        self.assertFalse(self.mock_create_keystone_client.called)
+
+        create = cache.get.call_args[0][1]
+        self.assertEqual(self.fake_keystone, create())
+        self.assertEqual(1, self.mock_create_keystone_client.call_count)
+
     @mock.patch("rally.osclients.Clients.keystone")
     def test_verified_keystone_user_not_admin(self, mock_clients_keystone):
         mock_clients_keystone.return_value = fakes.FakeKeystoneClient()